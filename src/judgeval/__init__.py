@@ -1,9 +1,10 @@
-# Import key components that should be publicly accessible
-from judgeval.clients import client, together_client
-from judgeval.judgment_client import JudgmentClient
-from judgeval.version_check import check_latest_version
+# Import key components that should be publicly accessible.
+# They are resolved lazily so `import judgeval` stays cheap for short-lived processes.
+from typing import TYPE_CHECKING, Any
 
-check_latest_version()
+if TYPE_CHECKING:
+    from judgeval.clients import client, together_client
+    from judgeval.judgment_client import JudgmentClient
 
 __all__ = [
     # Clients
@@ -11,3 +12,15 @@ __all__ = [
     "together_client",
     "JudgmentClient",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    if name in ("client", "together_client"):
+        from judgeval import clients
+
+        return getattr(clients, name)
+    if name == "JudgmentClient":
+        from judgeval.judgment_client import JudgmentClient
+
+        return JudgmentClient
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
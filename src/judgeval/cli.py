@@ -0,0 +1,284 @@
+"""
+Command line entry point, installed as `judgeval`.
+
+    judgeval collector [--socket PATH]   Run the local span collector daemon
+    judgeval upload DIR                  Upload trace segment files written offline
+    judgeval parquet SOURCE... -o FILE   Convert stored traces to Parquet for analytics
+    judgeval analyze SOURCE...           Report critical paths and hot functions
+    judgeval flamegraph SOURCE... -o FILE
+                                         Export stored traces to speedscope or
+                                         collapsed stacks
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import signal
+import sys
+import threading
+from typing import List, Optional
+
+
+def _run_collector(args: argparse.Namespace) -> int:
+    from judgeval.common.tracer.collector import CollectorServer
+
+    server = CollectorServer(
+        socket_path=args.socket,
+        batch_size=args.batch_size,
+        flush_interval=args.flush_interval,
+    ).start()
+
+    stop = threading.Event()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, lambda *_: stop.set())
+    while not stop.wait(1.0):
+        pass
+
+    server.stop()
+    return 0
+
+
+def _run_upload(args: argparse.Namespace) -> int:
+    from judgeval.common.api import JudgmentApiClient
+    from judgeval.common.tracer.file_exporter import upload_segments
+    from judgeval.common.utils import validate_api_key_cached
+
+    api_key = os.getenv("JUDGMENT_API_KEY")
+    organization_id = os.getenv("JUDGMENT_ORG_ID")
+    if not api_key or not organization_id:
+        print("JUDGMENT_API_KEY and JUDGMENT_ORG_ID must be set", file=sys.stderr)
+        return 2
+    try:
+        valid, response = validate_api_key_cached(api_key)
+    except Exception as e:
+        print(f"Could not reach the Judgment API: {e}", file=sys.stderr)
+        return 1
+    if not valid:
+        print(f"Invalid Judgment API key: {response}", file=sys.stderr)
+        return 2
+
+    result = upload_segments(
+        args.directory,
+        JudgmentApiClient(api_key, organization_id),
+        batch_size=args.batch_size,
+        max_workers=args.workers,
+        include_open=args.include_open,
+    )
+    print(
+        f"Uploaded {result.spans} spans, {result.evaluation_runs} evaluation runs "
+        f"and {result.traces} traces from {len(result.segments)} segments"
+    )
+    if result.failed_batches:
+        print(
+            f"{result.failed_batches} batches failed; run the upload again to retry",
+            file=sys.stderr,
+        )
+        return 1
+    return 0
+
+
+def _run_parquet(args: argparse.Namespace) -> int:
+    from judgeval.common.tracer.parquet_exporter import convert_to_parquet
+
+    try:
+        spans = convert_to_parquet(
+            args.sources,
+            args.output,
+            row_group_size=args.row_group_size,
+            compression=args.compression,
+        )
+    except ImportError as e:
+        print(e, file=sys.stderr)
+        return 2
+    print(f"Wrote {spans} spans to {args.output}")
+    return 0
+
+
+def _run_analyze(args: argparse.Namespace) -> int:
+    from judgeval.common.tracer.analysis import format_report
+    from judgeval.common.tracer.trace_sources import iter_trace_documents
+
+    traces = [
+        trace
+        for source in args.sources
+        for trace in iter_trace_documents(source)
+        if args.trace_id is None or trace.get("trace_id") == args.trace_id
+    ]
+    if not traces:
+        print("No traces found", file=sys.stderr)
+        return 1
+    print(format_report(traces, top=args.top))
+    return 0
+
+
+def _run_flamegraph(args: argparse.Namespace) -> int:
+    from judgeval.common.tracer.flamegraph import write_collapsed, write_speedscope
+    from judgeval.common.tracer.trace_sources import iter_trace_documents
+
+    traces = [
+        trace
+        for source in args.sources
+        for trace in iter_trace_documents(source)
+        if (args.trace_id is None or trace.get("trace_id") == args.trace_id)
+        and (args.trace_name is None or trace.get("name") == args.trace_name)
+    ]
+    if not traces:
+        print("No traces found", file=sys.stderr)
+        return 1
+    write = write_collapsed if args.format == "collapsed" else write_speedscope
+    write(traces, args.output, weight=args.weight)
+    print(f"Wrote {len(traces)} traces to {args.output}")
+    return 0
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    from judgeval.common.tracer.collector import DEFAULT_COLLECTOR_SOCKET
+
+    parser = argparse.ArgumentParser(prog="judgeval")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    collector = subparsers.add_parser(
+        "collector",
+        help="Run a local daemon that batches spans from every process on this host",
+        description=(
+            "Accepts spans, evaluation runs and trace upserts over a Unix domain "
+            "socket and uploads them to Judgment in batches. Point tracers at it with "
+            "Tracer(collector_socket=...) or the JUDGMENT_COLLECTOR_SOCKET variable."
+        ),
+    )
+    collector.add_argument(
+        "--socket",
+        default=DEFAULT_COLLECTOR_SOCKET,
+        help=f"Unix domain socket to listen on (default: {DEFAULT_COLLECTOR_SOCKET})",
+    )
+    collector.add_argument(
+        "--batch-size",
+        type=int,
+        default=500,
+        help="Maximum number of items per upload request",
+    )
+    collector.add_argument(
+        "--flush-interval",
+        type=float,
+        default=1.0,
+        help="Seconds between uploads",
+    )
+    collector.set_defaults(handler=_run_collector)
+
+    upload = subparsers.add_parser(
+        "upload",
+        help="Upload trace segment files written with Tracer(trace_file_dir=...)",
+        description=(
+            "Replays spans, evaluation runs and traces from segment files to the "
+            "Judgment API using JUDGMENT_API_KEY and JUDGMENT_ORG_ID. Segments that "
+            "were uploaded before are skipped, so the upload can safely be rerun."
+        ),
+    )
+    upload.add_argument("directory", help="Directory the tracer wrote segments to")
+    upload.add_argument(
+        "--batch-size",
+        type=int,
+        default=500,
+        help="Maximum number of items per upload request",
+    )
+    upload.add_argument(
+        "--workers",
+        type=int,
+        default=4,
+        help="Number of upload requests to run in parallel",
+    )
+    upload.add_argument(
+        "--include-open",
+        action="store_true",
+        help=(
+            "Also upload segments that were never closed, e.g. from a process that "
+            "was killed. Don't use this while processes are still writing."
+        ),
+    )
+    upload.set_defaults(handler=_run_upload)
+
+    parquet = subparsers.add_parser(
+        "parquet",
+        help="Convert stored traces to a Parquet file of spans",
+        description=(
+            "Writes the completed spans of trace documents (.json or .jsonl files, "
+            "directories of them, or s3://bucket/prefix URLs of traces saved with "
+            "Tracer(use_s3=True)) and of segment directories written with "
+            "Tracer(trace_file_dir=...) to one Parquet file with a flat span schema."
+        ),
+    )
+    parquet.add_argument("sources", nargs="+", help="Files, directories or s3:// URLs")
+    parquet.add_argument("-o", "--output", required=True, help="Parquet file to write")
+    parquet.add_argument(
+        "--row-group-size",
+        type=int,
+        default=10_000,
+        help="Number of spans per row group",
+    )
+    parquet.add_argument(
+        "--compression",
+        default="zstd",
+        help="Parquet compression codec (default: zstd)",
+    )
+    parquet.set_defaults(handler=_run_parquet)
+
+    analyze = subparsers.add_parser(
+        "analyze",
+        help="Report why stored traces were slow",
+        description=(
+            "Prints the critical path of the slowest trace and the functions with "
+            "the most self time across all traces. Sources are trace documents "
+            "(.json or .jsonl files, directories of them, or s3://bucket/prefix "
+            "URLs) and segment directories written with Tracer(trace_file_dir=...)."
+        ),
+    )
+    analyze.add_argument("sources", nargs="+", help="Files, directories or s3:// URLs")
+    analyze.add_argument(
+        "--top",
+        type=int,
+        default=10,
+        help="Number of hot functions to list",
+    )
+    analyze.add_argument("--trace-id", help="Only analyze this trace")
+    analyze.set_defaults(handler=_run_analyze)
+
+    flamegraph = subparsers.add_parser(
+        "flamegraph",
+        help="Export stored traces as a flame graph",
+        description=(
+            "Merges the span stacks of stored traces into a speedscope file (one "
+            "profile per trace name) or collapsed stacks for flamegraph.pl and "
+            "inferno. Sources are read as for `judgeval analyze`."
+        ),
+    )
+    flamegraph.add_argument(
+        "sources", nargs="+", help="Files, directories or s3:// URLs"
+    )
+    flamegraph.add_argument("-o", "--output", required=True, help="File to write")
+    flamegraph.add_argument(
+        "--format",
+        choices=["speedscope", "collapsed"],
+        default="speedscope",
+        help="Output format (default: speedscope)",
+    )
+    flamegraph.add_argument(
+        "--weight",
+        choices=["wall", "self", "tokens", "cost"],
+        default="wall",
+        help="What frame widths show (default: wall time)",
+    )
+    flamegraph.add_argument("--trace-id", help="Only export this trace")
+    flamegraph.add_argument("--trace-name", help="Only export traces with this name")
+    flamegraph.set_defaults(handler=_run_flamegraph)
+
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = _build_parser().parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,34 +1,62 @@
 import os
 from dotenv import load_dotenv
-from openai import OpenAI
-from typing import Optional
-from together import Together, AsyncTogether
+from typing import TYPE_CHECKING, Any, Optional
+
+if TYPE_CHECKING:
+    from openai import OpenAI
+    from together import Together, AsyncTogether
 
 PATH_TO_DOTENV = os.path.join(os.path.dirname(__file__), ".env")
 load_dotenv(dotenv_path=PATH_TO_DOTENV)
 
 
-# Initialize optional OpenAI client
-client: Optional["OpenAI"] = None
-if os.getenv("OPENAI_API_KEY"):
-    try:
-        from openai import OpenAI
+# The provider SDKs are slow to import, so the optional clients below are created on
+# first attribute access (PEP 562) rather than when judgeval is imported.
+_clients: dict[str, Any] = {}
+
+
+def _create_openai_client() -> Optional["OpenAI"]:
+    # Initialize optional OpenAI client
+    if os.getenv("OPENAI_API_KEY"):
+        try:
+            from openai import OpenAI
+
+            return OpenAI()
+        except ImportError:
+            # openai package not installed
+            pass
+    return None
+
+
+def _create_together_clients() -> tuple[
+    Optional["Together"], Optional["AsyncTogether"]
+]:
+    # Only initialize Together clients if API key is available
+    together_api_key = os.getenv("TOGETHERAI_API_KEY") or os.getenv("TOGETHER_API_KEY")
+    if together_api_key:
+        try:
+            from together import Together, AsyncTogether
+
+            return Together(api_key=together_api_key), AsyncTogether(
+                api_key=together_api_key
+            )
+        except Exception:
+            pass
+    return None, None
 
-        client = OpenAI()
-    except ImportError:
-        # openai package not installed
-        pass
 
-# Initialize optional Together clients
-together_client: Optional["Together"] = None
-async_together_client: Optional["AsyncTogether"] = None
+def __getattr__(name: str) -> Any:
+    if name in _clients:
+        return _clients[name]
 
-# Only initialize Together clients if API key is available
+    if name == "client":
+        _clients["client"] = _create_openai_client()
+    elif name in ("together_client", "async_together_client"):
+        (
+            _clients["together_client"],
+            _clients["async_together_client"],
+        ) = _create_together_clients()
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-together_api_key = os.getenv("TOGETHERAI_API_KEY") or os.getenv("TOGETHER_API_KEY")
-if together_api_key:
-    try:
-        together_client = Together(api_key=together_api_key)
-        async_together_client = AsyncTogether(api_key=together_api_key)
-    except Exception:
-        pass
+    return _clients[name]
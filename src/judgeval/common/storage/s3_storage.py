@@ -1,7 +1,7 @@
 import os
 import json
 import boto3
-from typing import Optional
+from typing import Iterator, Optional
 from datetime import datetime, UTC
 from botocore.exceptions import ClientError
 from judgeval.common.logger import judgeval_logger
@@ -96,3 +96,22 @@ class S3Storage:
         )
 
         return s3_key
+
+    def iter_traces(self, prefix: str = "traces/") -> Iterator[dict]:
+        """Yield the trace data saved under a key prefix, e.g. traces/<project_name>/.
+
+        Args:
+            prefix: Key prefix to list
+
+        Returns:
+            Iterator[dict]: Trace data, one object at a time
+        """
+        paginator = self.s3_client.get_paginator("list_objects_v2")
+        for page in paginator.paginate(Bucket=self.bucket_name, Prefix=prefix):
+            for entry in page.get("Contents", []):
+                if not entry["Key"].endswith(".json"):
+                    continue
+                response = self.s3_client.get_object(
+                    Bucket=self.bucket_name, Key=entry["Key"]
+                )
+                yield json.loads(response["Body"].read())
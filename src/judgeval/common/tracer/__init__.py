@@ -5,13 +5,50 @@ from judgeval.common.tracer.core import (
     wrap,
     current_span_var,
     current_trace_var,
+    remote_trace_context_var,
     SpanType,
     cost_per_token,
 )
-from judgeval.common.tracer.otel_exporter import JudgmentAPISpanExporter
+from judgeval.common.tracer.analysis import (
+    TraceAnalysis,
+    analyze_trace,
+    hot_functions,
+)
+from judgeval.common.tracer.capture_policy import CapturePolicies, CapturePolicy
+from judgeval.common.tracer.concurrency import (
+    TracedThreadPoolExecutor,
+    submit_with_context,
+    set_traced_default_executor,
+)
+from judgeval.common.tracer.file_exporter import FileSpanExporter, SegmentWriter
+from judgeval.common.tracer.flamegraph import (
+    collapse_stacks,
+    format_collapsed,
+    to_speedscope,
+)
+from judgeval.common.tracer.otel_bridge import OpenTelemetryBridge
+from judgeval.common.tracer.otel_exporter import (
+    FanOutSpanExporter,
+    JudgmentAPISpanExporter,
+)
 from judgeval.common.tracer.otel_span_processor import JudgmentSpanProcessor
+from judgeval.common.tracer.otlp_exporter import (
+    JudgmentOTLPSpanExporter,
+    create_otlp_exporter,
+)
+from judgeval.common.tracer.parquet_exporter import (
+    ParquetSpanExporter,
+    convert_to_parquet,
+)
+from judgeval.common.tracer.propagation import (
+    TraceContext,
+    extract_trace_context,
+    inject_trace_context,
+)
 from judgeval.common.tracer.span_processor import SpanProcessorBase
+from judgeval.common.tracer.sqlite_store import SQLiteTraceStore
 from judgeval.common.tracer.trace_manager import TraceManagerClient
+from judgeval.common.tracer.trace_store import InMemoryTraceStore, SpanNode, TraceTotals
 from judgeval.data import TraceSpan
 
 __all__ = [
@@ -21,9 +58,36 @@ __all__ = [
     "wrap",
     "current_span_var",
     "current_trace_var",
+    "remote_trace_context_var",
+    "TraceContext",
+    "extract_trace_context",
+    "inject_trace_context",
+    "CapturePolicy",
+    "CapturePolicies",
+    "TracedThreadPoolExecutor",
+    "submit_with_context",
+    "set_traced_default_executor",
     "TraceManagerClient",
+    "InMemoryTraceStore",
+    "SQLiteTraceStore",
+    "SpanNode",
+    "TraceTotals",
     "JudgmentAPISpanExporter",
+    "FileSpanExporter",
+    "SegmentWriter",
+    "FanOutSpanExporter",
+    "JudgmentOTLPSpanExporter",
+    "create_otlp_exporter",
+    "ParquetSpanExporter",
+    "TraceAnalysis",
+    "analyze_trace",
+    "hot_functions",
+    "collapse_stacks",
+    "format_collapsed",
+    "to_speedscope",
+    "convert_to_parquet",
     "JudgmentSpanProcessor",
+    "OpenTelemetryBridge",
     "SpanProcessorBase",
     "SpanType",
     "cost_per_token",
@@ -0,0 +1,128 @@
+"""
+Summary spans for high fan-out calls.
+
+An agent that calls a cheap tool thousands of times per trace would otherwise
+export a span per call. With Tracer(aggregate_fanout=N), or
+TraceClient.aggregate_fanout for a single trace, the first N spans of a function
+under the same parent span are kept as they are and the rest are merged into one
+summary span. It is emitted when the parent ends, spans the merged calls from the
+first start to the last end, and records under additional_metadata["aggregate"]:
+
+- count, total_duration, min, max, p50 and p95 of the merged calls' durations
+- errors, the number of merged calls that recorded an error
+- exemplars, the inputs, output, error and timing of the first
+  MAX_SUMMARY_EXEMPLARS merged calls
+
+Spans opened inside a merged call are merged as well, into summaries under its
+summary span, and deep tracing skips them.
+"""
+
+from __future__ import annotations
+
+import math
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+
+from judgeval.data import TraceSpan
+
+MAX_SUMMARY_EXEMPLARS = 3
+
+
+def _percentile(durations: List[float], q: float) -> float:
+    """Nearest-rank percentile of sorted durations."""
+    rank = max(math.ceil(q / 100 * len(durations)), 1)
+    return durations[rank - 1]
+
+
+class SpanSummary:
+    """The merged calls of one function under one parent span."""
+
+    __slots__ = (
+        "span_id",
+        "trace_id",
+        "parent_span_id",
+        "function",
+        "span_type",
+        "depth",
+        "durations",
+        "errors",
+        "exemplars",
+        "start",
+        "end",
+    )
+
+    def __init__(
+        self,
+        trace_id: str,
+        parent_span_id: Optional[str],
+        function: str,
+        span_type: str,
+        depth: int,
+    ):
+        self.span_id = str(uuid.uuid4())
+        self.trace_id = trace_id
+        self.parent_span_id = parent_span_id
+        self.function = function
+        self.span_type = span_type
+        self.depth = depth
+        self.durations: List[float] = []
+        self.errors = 0
+        self.exemplars: List[Dict[str, Any]] = []
+        self.start = math.inf
+        self.end = -math.inf
+
+    def add(self, span: TraceSpan):
+        """Merges a finished span."""
+        duration = span.duration or 0.0
+        self.durations.append(duration)
+        if span.error:
+            self.errors += 1
+        self.start = min(self.start, span.created_at)
+        self.end = max(self.end, span.created_at + duration)
+        if len(self.exemplars) < MAX_SUMMARY_EXEMPLARS:
+            self.exemplars.append(
+                {
+                    "created_at": span.created_at,
+                    "duration": duration,
+                    "inputs": span.inputs,
+                    "output": span.output,
+                    "error": span.error,
+                }
+            )
+
+    def to_span(self) -> TraceSpan:
+        durations = sorted(self.durations)
+        if durations:
+            stats: Dict[str, Any] = {
+                "count": len(durations),
+                "total_duration": sum(durations),
+                "min": durations[0],
+                "max": durations[-1],
+                "p50": _percentile(durations, 50),
+                "p95": _percentile(durations, 95),
+            }
+            start, duration = self.start, self.end - self.start
+        else:
+            # Only spans nested in merged calls that are still open
+            stats = {"count": 0, "total_duration": 0.0}
+            start, duration = time.time(), 0.0
+
+        return TraceSpan(
+            span_id=self.span_id,
+            trace_id=self.trace_id,
+            depth=self.depth,
+            message=self.function,
+            created_at=start,
+            duration=duration,
+            span_type=self.span_type,
+            parent_span_id=self.parent_span_id,
+            function=self.function,
+            additional_metadata={
+                "aggregate": {
+                    **stats,
+                    "errors": self.errors,
+                    "exemplars": self.exemplars,
+                }
+            },
+        )
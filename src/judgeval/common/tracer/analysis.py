@@ -0,0 +1,268 @@
+"""
+Latency analysis of traces: self time, critical paths and hot functions.
+
+A trace's spans only point at their parents. analyze_trace indexes them into a
+tree in one pass and computes, for every span:
+
+- total time: the span's duration
+- self time: the part of the duration not covered by any child span; children
+  that ran concurrently are only counted once
+
+The critical path is the chain of spans that determined when the trace finished:
+starting at the root, the child that finished last, then the child that finished
+last before that one started, and so on, recursively. Speeding up anything off
+the critical path does not make the trace faster.
+
+    analysis = analyze_trace(tracer.traces[-1])
+    for step in analysis.critical_path():
+        print(step.timing.function, step.exclusive_time)
+
+    hot_functions(traces)  # functions ranked by self time across many traces
+
+`judgeval analyze SOURCE...` prints the same as a report for stored traces.
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Union
+
+from judgeval.data import Trace
+from judgeval.data.judgment_types import TraceSpanJudgmentType
+
+# Float timestamps of a child and its parent can differ by rounding
+_EPSILON = 1e-6
+
+# A TraceSpan (Trace.trace_spans is typed with its generated base) or its dict
+SpanLike = Union[TraceSpanJudgmentType, Dict[str, Any]]
+TraceLike = Union[Trace, Dict[str, Any], Sequence[SpanLike]]
+
+
+def _field(span: SpanLike, name: str) -> Any:
+    return span.get(name) if isinstance(span, dict) else getattr(span, name, None)
+
+
+def _timestamp(value: Any) -> float:
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value).timestamp()
+        except ValueError:
+            pass
+    return 0.0
+
+
+def _trace_spans(trace: TraceLike) -> Sequence[SpanLike]:
+    if isinstance(trace, dict):
+        return trace.get("trace_spans") or []
+    if isinstance(trace, Trace):
+        return trace.trace_spans
+    return trace
+
+
+@dataclass
+class SpanTiming:
+    span_id: str
+    parent_span_id: Optional[str]
+    function: str
+    span_type: str
+    start: float
+    end: float
+    self_time: float = 0.0
+    children: List[SpanTiming] = field(default_factory=list)
+    # The span as given, a TraceSpan or a dict
+    span: Any = field(default=None, repr=False)
+
+    @property
+    def total_time(self) -> float:
+        return self.end - self.start
+
+
+@dataclass
+class CriticalPathStep:
+    timing: SpanTiming
+    # Time on the critical path spent in this span itself, not in the children
+    # that follow it on the path
+    exclusive_time: float
+
+
+@dataclass
+class FunctionStats:
+    function: str
+    calls: int = 0
+    total_time: float = 0.0
+    self_time: float = 0.0
+    critical_time: float = 0.0
+    max_time: float = 0.0
+
+    @property
+    def mean_time(self) -> float:
+        return self.total_time / self.calls if self.calls else 0.0
+
+
+def _covered_time(intervals: List[SpanTiming], start: float, end: float) -> float:
+    """Length of the union of the intervals, clipped to [start, end]."""
+    covered = 0.0
+    cursor = start
+    for interval in sorted(intervals, key=lambda timing: timing.start):
+        interval_start = max(interval.start, cursor)
+        interval_end = min(interval.end, end)
+        if interval_end > interval_start:
+            covered += interval_end - interval_start
+            cursor = interval_end
+    return covered
+
+
+class TraceAnalysis:
+    """Span tree of one trace with self times and the critical path."""
+
+    def __init__(self, spans: Sequence[SpanLike]):
+        self.spans: Dict[str, SpanTiming] = {}
+        for span in spans:
+            start = _timestamp(_field(span, "created_at"))
+            span_id = _field(span, "span_id")
+            self.spans[span_id] = SpanTiming(
+                span_id=span_id,
+                parent_span_id=_field(span, "parent_span_id"),
+                function=_field(span, "function") or "",
+                span_type=_field(span, "span_type") or "span",
+                start=start,
+                # Spans that never finished count as instantaneous
+                end=start + (_field(span, "duration") or 0.0),
+                span=span,
+            )
+
+        # Spans whose parent is not in the trace, e.g. a remote caller's, are roots
+        self.roots: List[SpanTiming] = []
+        for timing in self.spans.values():
+            parent = self.spans.get(timing.parent_span_id or "")
+            (parent.children if parent else self.roots).append(timing)
+
+        for timing in self.spans.values():
+            timing.children.sort(key=lambda child: child.start)
+            timing.self_time = timing.total_time - _covered_time(
+                timing.children, timing.start, timing.end
+            )
+        self.roots.sort(key=lambda root: root.start)
+
+    @property
+    def duration(self) -> float:
+        if not self.roots:
+            return 0.0
+        return max(root.end for root in self.roots) - min(
+            root.start for root in self.roots
+        )
+
+    def critical_path(self) -> List[CriticalPathStep]:
+        """
+        The critical path through the longest-running root, in the order the spans
+        started. The exclusive times add up to the root's duration.
+        """
+        if not self.roots:
+            return []
+        root = max(self.roots, key=lambda timing: timing.total_time)
+
+        steps: List[CriticalPathStep] = []
+        stack = [root]
+        while stack:
+            timing = stack.pop()
+            chain = []
+            cursor = timing.end
+            for child in sorted(timing.children, key=lambda c: c.end, reverse=True):
+                starts_inside = child.start >= timing.start - _EPSILON
+                if starts_inside and child.end <= cursor + _EPSILON:
+                    chain.append(child)
+                    cursor = child.start
+            steps.append(
+                CriticalPathStep(
+                    timing=timing,
+                    exclusive_time=timing.total_time
+                    - sum(child.total_time for child in chain),
+                )
+            )
+            # chain is latest first, so popping visits the earliest child first
+            stack.extend(chain)
+        return steps
+
+    def slowest(self, n: int = 10, by: str = "self_time") -> List[SpanTiming]:
+        """The n spans with the highest self_time (or total_time)."""
+        return sorted(
+            self.spans.values(), key=lambda timing: getattr(timing, by), reverse=True
+        )[:n]
+
+
+def analyze_trace(trace: TraceLike) -> TraceAnalysis:
+    """
+    Analyzes a trace: a Trace, a trace dict as in Tracer.traces or stored trace
+    documents, or a list of TraceSpans or span dicts.
+    """
+    return TraceAnalysis(_trace_spans(trace))
+
+
+def hot_functions(traces: Iterable[TraceLike]) -> List[FunctionStats]:
+    """
+    Calls, total, self, critical-path and max time per function across traces,
+    highest self time first.
+    """
+    return _aggregate(analyze_trace(trace) for trace in traces)
+
+
+def _aggregate(analyses: Iterable[TraceAnalysis]) -> List[FunctionStats]:
+    stats: Dict[str, FunctionStats] = defaultdict(lambda: FunctionStats(""))
+    for analysis in analyses:
+        for timing in analysis.spans.values():
+            function_stats = stats[timing.function]
+            function_stats.function = timing.function
+            function_stats.calls += 1
+            function_stats.total_time += timing.total_time
+            function_stats.self_time += timing.self_time
+            function_stats.max_time = max(function_stats.max_time, timing.total_time)
+        for step in analysis.critical_path():
+            stats[step.timing.function].critical_time += step.exclusive_time
+    return sorted(stats.values(), key=lambda s: (-s.self_time, s.function))
+
+
+def _format_seconds(seconds: float) -> str:
+    if seconds < 1:
+        return f"{seconds * 1000:.1f}ms"
+    return f"{seconds:.3f}s"
+
+
+def format_report(traces: Sequence[TraceLike], top: int = 10) -> str:
+    """
+    A plain-text report: the critical path of the slowest trace and the hottest
+    functions across all traces.
+    """
+    analyses = [(trace, analyze_trace(trace)) for trace in traces]
+    if not analyses:
+        return "No traces found"
+
+    trace, slowest = max(analyses, key=lambda pair: pair[1].duration)
+    name = trace.get("name") if isinstance(trace, dict) else getattr(trace, "name", "")
+    lines = [
+        f"Critical path of the slowest trace ({name or 'unnamed'}, "
+        f"{_format_seconds(slowest.duration)}):",
+    ]
+    for step in slowest.critical_path():
+        share = step.exclusive_time / slowest.duration if slowest.duration else 0.0
+        lines.append(
+            f"  {_format_seconds(step.exclusive_time):>10} {share:>6.1%}  "
+            f"{step.timing.function} ({_format_seconds(step.timing.total_time)} total)"
+        )
+
+    lines += [
+        "",
+        f"Hot functions across {len(analyses)} traces:",
+        f"  {'self':>10} {'critical':>10} {'total':>10} {'calls':>7}  function",
+    ]
+    for stats in _aggregate(analysis for _, analysis in analyses)[:top]:
+        lines.append(
+            f"  {_format_seconds(stats.self_time):>10} "
+            f"{_format_seconds(stats.critical_time):>10} "
+            f"{_format_seconds(stats.total_time):>10} {stats.calls:>7}  "
+            f"{stats.function}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,165 @@
+"""
+Per-function capture policies for @observe and observe_tools.
+
+By default every call to an observed function is a span with its inputs, output
+and (for classes registered with identify(track_state=True)) state snapshots. A
+policy records less:
+
+- "full": all of the above
+- "inputs": a span with the inputs, without output or state
+- "outputs": a span with the output, without inputs or state
+- "metadata": a span with only its name, timing, errors and agent name
+- "aggregate": no span; the trace counts the calls and their total duration, see
+  TraceClient.record_aggregate()
+- "none": not traced at all; the function is left undecorated
+
+CapturePolicy(mode, sample_every=N) records one call in N according to mode and
+only counts the others, as "aggregate" does.
+
+Policies are configured on the tracer and resolved when a function is decorated:
+
+    tracer = Tracer(
+        capture_policies={
+            "*.VectorStore.*": "metadata",
+            SearchTools: CapturePolicy("full", sample_every=100),
+            tokenize: "aggregate",
+        }
+    )
+
+Keys are the function itself, a class (applying to its methods and those of its
+subclasses), or a glob on the qualified name, "module.Class.method", which also
+matches without the module. A function's own entry wins over its class's, which
+wins over globs; globs are tried in order. @observe(capture=...) and
+observe_tools(capture=...) override the tracer's policies.
+
+Generator functions are always recorded as spans: "aggregate" and sampling fall
+back to "metadata" and full capture of every call, respectively. Aggregated calls
+made outside any trace are not recorded.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from fnmatch import fnmatchcase
+from typing import Callable, Dict, List, Mapping, Optional, Tuple, Union
+
+CAPTURE_MODES = ("full", "inputs", "outputs", "metadata", "aggregate", "none")
+
+
+@dataclass(frozen=True)
+class CapturePolicy:
+    """How calls to an observed function are recorded."""
+
+    mode: str = "full"
+    sample_every: int = 1
+
+    def __post_init__(self):
+        if self.mode not in CAPTURE_MODES:
+            raise ValueError(
+                f"Capture mode must be one of {', '.join(CAPTURE_MODES)}, got {self.mode!r}"
+            )
+        if self.sample_every < 1:
+            raise ValueError(
+                f"sample_every must be at least 1, got {self.sample_every}"
+            )
+
+    @property
+    def inputs(self) -> bool:
+        return self.mode in ("full", "inputs")
+
+    @property
+    def outputs(self) -> bool:
+        return self.mode in ("full", "outputs")
+
+    @property
+    def state(self) -> bool:
+        return self.mode == "full"
+
+
+FULL_CAPTURE = CapturePolicy()
+
+PolicyLike = Union[str, CapturePolicy]
+PolicyTarget = Union[str, type, Callable]
+
+
+def as_policy(policy: PolicyLike) -> CapturePolicy:
+    return policy if isinstance(policy, CapturePolicy) else CapturePolicy(policy)
+
+
+def qualified_name(func: Callable, owner: Optional[type] = None) -> str:
+    """ "module.qualname" of func, or "module.Owner.name" for a method of owner."""
+    if owner is not None:
+        return f"{owner.__module__}.{owner.__qualname__}.{func.__name__}"
+    qualname = str(
+        getattr(func, "__qualname__", None) or getattr(func, "__name__", repr(func))
+    )
+    module = getattr(func, "__module__", None)
+    return f"{module}.{qualname}" if module else qualname
+
+
+class CapturePolicies:
+    """The capture policies configured on a tracer, see the module docstring."""
+
+    def __init__(self, policies: Optional[Mapping[PolicyTarget, PolicyLike]] = None):
+        self.functions: Dict[Callable, CapturePolicy] = {}
+        self.classes: Dict[type, CapturePolicy] = {}
+        self.patterns: List[Tuple[str, CapturePolicy]] = []
+        for target, policy in (policies or {}).items():
+            self.add(target, policy)
+
+    def __bool__(self) -> bool:
+        return bool(self.functions or self.classes or self.patterns)
+
+    def add(self, target: PolicyTarget, policy: PolicyLike):
+        """Adds a policy; it applies to functions decorated from then on."""
+        policy = as_policy(policy)
+        if isinstance(target, str):
+            self.patterns.append((target, policy))
+        elif isinstance(target, type):
+            self.classes[target] = policy
+        elif callable(target):
+            self.functions[getattr(target, "__func__", target)] = policy
+        else:
+            raise TypeError(
+                f"Capture policy targets are functions, classes or glob strings, got {target!r}"
+            )
+
+    def resolve(self, func: Callable, owner: Optional[type] = None) -> CapturePolicy:
+        """The policy for func, a method of owner if given."""
+        if not self:
+            return FULL_CAPTURE
+
+        policy = self.functions.get(getattr(func, "__func__", func))
+        if policy is not None:
+            return policy
+
+        if self.classes:
+            for cls in owner.__mro__ if owner is not None else ():
+                if cls in self.classes:
+                    return self.classes[cls]
+            if owner is None:
+                # Without an owner, e.g. tracer.observe(Class.method), the
+                # qualified name still leads to the class
+                qualname = getattr(func, "__qualname__", "")
+                module = getattr(func, "__module__", None)
+                for cls, policy in self.classes.items():
+                    if (
+                        cls.__module__ == module
+                        and qualname.startswith(f"{cls.__qualname__}.")
+                        and "." not in qualname[len(cls.__qualname__) + 1 :]
+                    ):
+                        return policy
+
+        if self.patterns:
+            name = qualified_name(func, owner)
+            module = (
+                owner.__module__
+                if owner is not None
+                else getattr(func, "__module__", None)
+            )
+            short_name = name[len(module) + 1 :] if module else name
+            for pattern, policy in self.patterns:
+                if fnmatchcase(name, pattern) or fnmatchcase(short_name, pattern):
+                    return policy
+
+        return FULL_CAPTURE
@@ -0,0 +1,315 @@
+"""
+Local collector for multi-process deployments.
+
+Without a collector every process that traces has its own export thread, HTTP
+connection pool, retries and batching. With `judgeval collector` running on the
+host, processes write spans, evaluation runs and final trace upserts to a Unix
+domain socket instead; the collector batches them across processes and uploads
+them over a single connection pool.
+
+Wire format: each message is a 4-byte big-endian length followed by a UTF-8 JSON
+object {"kind", "api_key", "organization_id", "items"}, where kind is one of
+"spans", "evaluation_runs" or "traces".
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import socket
+import socketserver
+import struct
+import threading
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+
+from judgeval.common.api import JudgmentApiClient
+from judgeval.common.logger import judgeval_logger
+from judgeval.utils.fork import register_after_fork_in_child
+
+DEFAULT_COLLECTOR_SOCKET = os.path.join(
+    os.getenv("XDG_RUNTIME_DIR") or "/tmp", "judgeval-collector.sock"
+)
+COLLECTOR_MESSAGE_KINDS = ("spans", "evaluation_runs", "traces")
+
+_HEADER = struct.Struct(">I")
+
+
+def _fallback_encoder(obj: Any) -> str:
+    try:
+        return repr(obj)
+    except Exception:
+        return f"<Unserializable object of type {type(obj).__name__}>"
+
+
+def encode_message(
+    kind: str, api_key: str, organization_id: str, items: List[Any]
+) -> bytes:
+    body = json.dumps(
+        {
+            "kind": kind,
+            "api_key": api_key,
+            "organization_id": organization_id,
+            "items": items,
+        },
+        default=_fallback_encoder,
+    ).encode("utf-8")
+    return _HEADER.pack(len(body)) + body
+
+
+class CollectorClient:
+    """
+    Connection from a traced process to the local collector.
+
+    The socket is opened lazily and reopened once per send if the collector was
+    restarted. send() returns False when the collector is unreachable so callers
+    can fall back to uploading directly.
+    """
+
+    def __init__(self, socket_path: str = DEFAULT_COLLECTOR_SOCKET):
+        self.socket_path = socket_path
+        self._sock: Optional[socket.socket] = None
+        self._lock = threading.Lock()
+        register_after_fork_in_child(self._after_fork_in_child)
+
+    def send(
+        self, kind: str, api_key: str, organization_id: str, items: List[Any]
+    ) -> bool:
+        if not items:
+            return True
+        frame = encode_message(kind, api_key, organization_id, items)
+        with self._lock:
+            for _ in range(2):
+                try:
+                    if self._sock is None:
+                        self._sock = self._connect()
+                    self._sock.sendall(frame)
+                    return True
+                except OSError:
+                    self._close()
+        return False
+
+    def _connect(self) -> socket.socket:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.connect(self.socket_path)
+        except OSError:
+            sock.close()
+            raise
+        return sock
+
+    def _close(self):
+        if self._sock is not None:
+            try:
+                self._sock.close()
+            except OSError:
+                pass
+            self._sock = None
+
+    def close(self):
+        with self._lock:
+            self._close()
+
+    def _after_fork_in_child(self):
+        # Each process needs its own connection so frames from different processes
+        # are never interleaved on one stream
+        self._lock = threading.Lock()
+        self._close()
+
+
+class CollectorApiClient(JudgmentApiClient):
+    """JudgmentApiClient that hands span and evaluation run batches to the local collector."""
+
+    def __init__(self, api_key: str, organization_id: str, collector: CollectorClient):
+        super().__init__(api_key, organization_id)
+        self.collector = collector
+
+    def send_spans_batch(self, spans: List[Dict[str, Any]]):
+        if self.collector.send("spans", self.api_key, self.organization_id, spans):
+            return {}
+        return super().send_spans_batch(spans)
+
+    def send_evaluation_runs_batch(self, evaluation_entries):
+        if self.collector.send(
+            "evaluation_runs", self.api_key, self.organization_id, evaluation_entries
+        ):
+            return {}
+        return super().send_evaluation_runs_batch(evaluation_entries)
+
+
+class _CollectorRequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        while True:
+            header = self.rfile.read(_HEADER.size)
+            if len(header) < _HEADER.size:
+                return
+            (length,) = _HEADER.unpack(header)
+            body = self.rfile.read(length)
+            if len(body) < length:
+                return
+            try:
+                message = json.loads(body)
+            except ValueError as e:
+                judgeval_logger.warning(f"Collector dropped malformed message: {e}")
+                continue
+            self.server.collector.add(message)  # type: ignore[attr-defined]
+
+
+class _CollectorUnixServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, socket_path: str, collector: "CollectorServer"):
+        self.collector = collector
+        super().__init__(socket_path, _CollectorRequestHandler)
+
+
+class CollectorServer:
+    """
+    Accepts spans, evaluation runs and trace upserts from local processes and
+    uploads them in batches, grouped by API key and organization.
+    """
+
+    def __init__(
+        self,
+        socket_path: str = DEFAULT_COLLECTOR_SOCKET,
+        batch_size: int = 500,
+        flush_interval: float = 1.0,
+    ):
+        self.socket_path = socket_path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        self._pending: Dict[Tuple[str, str], Dict[str, List[Any]]] = defaultdict(
+            lambda: {kind: [] for kind in COLLECTOR_MESSAGE_KINDS}
+        )
+        self._pending_count = 0
+        self._api_clients: Dict[Tuple[str, str], JudgmentApiClient] = {}
+        self._condition = threading.Condition()
+        self._stopped = False
+        self._server: Optional[_CollectorUnixServer] = None
+        self._flush_thread: Optional[threading.Thread] = None
+
+    def add(self, message: Any):
+        if not isinstance(message, dict):
+            judgeval_logger.warning("Collector dropped message that is not an object")
+            return
+        kind = message.get("kind")
+        if kind not in COLLECTOR_MESSAGE_KINDS:
+            judgeval_logger.warning(f"Collector dropped message of unknown kind {kind}")
+            return
+        api_key = message.get("api_key")
+        organization_id = message.get("organization_id")
+        if not isinstance(api_key, str) or not isinstance(organization_id, str):
+            judgeval_logger.warning(
+                f"Collector dropped {kind} message without an API key and organization"
+            )
+            return
+        items = message.get("items") or []
+        if not isinstance(items, list):
+            judgeval_logger.warning(f"Collector dropped {kind} message with bad items")
+            return
+        key = (api_key, organization_id)
+        with self._condition:
+            self._pending[key][kind].extend(items)
+            self._pending_count += len(items)
+            if self._pending_count >= self.batch_size:
+                self._condition.notify()
+
+    def start(self) -> "CollectorServer":
+        """Binds the socket and starts accepting and uploading in background threads."""
+        if os.path.exists(self.socket_path):
+            # A stale socket from a previous run; refuse to steal a live one
+            probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                probe.connect(self.socket_path)
+                raise RuntimeError(
+                    f"A collector is already listening on {self.socket_path}"
+                )
+            except (ConnectionRefusedError, FileNotFoundError):
+                os.unlink(self.socket_path)
+            finally:
+                probe.close()
+
+        old_umask = os.umask(0o177)  # Messages carry API keys
+        try:
+            self._server = _CollectorUnixServer(self.socket_path, self)
+        finally:
+            os.umask(old_umask)
+
+        threading.Thread(
+            target=self._server.serve_forever,
+            name="judgeval-collector-server",
+            daemon=True,
+        ).start()
+        self._flush_thread = threading.Thread(
+            target=self._flush_loop, name="judgeval-collector-flush", daemon=True
+        )
+        self._flush_thread.start()
+        judgeval_logger.info(f"Judgeval collector listening on {self.socket_path}")
+        return self
+
+    def _flush_loop(self):
+        while True:
+            with self._condition:
+                if not self._stopped and self._pending_count < self.batch_size:
+                    self._condition.wait(self.flush_interval)
+                stopped = self._stopped
+            self.flush()
+            if stopped:
+                return
+
+    def flush(self):
+        """Uploads everything received so far."""
+        with self._condition:
+            pending = self._pending
+            self._pending = defaultdict(
+                lambda: {kind: [] for kind in COLLECTOR_MESSAGE_KINDS}
+            )
+            self._pending_count = 0
+
+        for (api_key, organization_id), batches in pending.items():
+            api_client = self._api_client(api_key, organization_id)
+            for start in range(0, len(batches["spans"]), self.batch_size):
+                self._upload(
+                    api_client.send_spans_batch,
+                    batches["spans"][start : start + self.batch_size],
+                )
+            for start in range(0, len(batches["evaluation_runs"]), self.batch_size):
+                self._upload(
+                    api_client.send_evaluation_runs_batch,
+                    batches["evaluation_runs"][start : start + self.batch_size],
+                )
+            for trace_data in batches["traces"]:
+                self._upload(api_client.upsert_trace, trace_data)
+
+    def _api_client(self, api_key: str, organization_id: str) -> JudgmentApiClient:
+        # All clients share judgeval's module-level session, i.e. one connection pool
+        key = (api_key, organization_id)
+        if key not in self._api_clients:
+            self._api_clients[key] = JudgmentApiClient(api_key, organization_id)
+        return self._api_clients[key]
+
+    def _upload(self, send, payload):
+        try:
+            send(payload)
+        except Exception as e:
+            judgeval_logger.error(f"Collector upload failed: {e}")
+
+    def stop(self):
+        """Stops accepting connections and uploads anything still pending."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+            try:
+                os.unlink(self.socket_path)
+            except FileNotFoundError:
+                pass
+        with self._condition:
+            self._stopped = True
+            self._condition.notify()
+        if (
+            self._flush_thread is not None
+            and self._flush_thread is not threading.current_thread()
+        ):
+            self._flush_thread.join()
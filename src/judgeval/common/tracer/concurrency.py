@@ -0,0 +1,59 @@
+"""
+Helpers that carry the current trace and span into thread pools.
+
+Traces and spans are tracked in context variables, which threads started by an
+executor don't inherit: work submitted from inside an observed function would
+otherwise start unrelated traces. These helpers run the work in a copy of the
+submitting context instead, so spans created by it get the right parent without
+relying on the class-level fallback of trace_across_async_contexts=True.
+
+asyncio tasks already copy the context they are created in; the gap there is
+loop.run_in_executor, which set_traced_default_executor closes.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from typing import Any, Callable, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+def submit_with_context(
+    executor: Executor, fn: Callable[..., T], /, *args: Any, **kwargs: Any
+) -> Future[T]:
+    """executor.submit(fn, ...), running fn in a copy of the caller's context."""
+    context = contextvars.copy_context()
+    return executor.submit(context.run, fn, *args, **kwargs)
+
+
+class TracedThreadPoolExecutor(ThreadPoolExecutor):
+    """
+    ThreadPoolExecutor whose tasks run in a copy of the context they were submitted
+    from, so spans created by them are children of the submitting span.
+
+    map() goes through submit() and is covered as well.
+    """
+
+    def submit(self, fn: Callable[..., T], /, *args: Any, **kwargs: Any) -> Future[T]:
+        context = contextvars.copy_context()
+        return super().submit(context.run, fn, *args, **kwargs)
+
+
+def set_traced_default_executor(
+    loop: Optional[asyncio.AbstractEventLoop] = None,
+    max_workers: Optional[int] = None,
+) -> TracedThreadPoolExecutor:
+    """
+    Makes loop.run_in_executor(None, ...) carry the current trace into its worker
+    threads. Uses the running loop if no loop is given.
+    """
+    if loop is None:
+        loop = asyncio.get_running_loop()
+    executor = TracedThreadPoolExecutor(
+        max_workers=max_workers, thread_name_prefix="judgeval-traced"
+    )
+    loop.set_default_executor(executor)
+    return executor
@@ -8,6 +8,7 @@ import asyncio
 import atexit
 import functools
 import inspect
+import itertools
 import os
 import threading
 import time
@@ -15,6 +16,7 @@ import traceback
 import uuid
 import contextvars
 import sys
+from collections import deque
 from contextlib import (
     contextmanager,
 )
@@ -22,51 +24,96 @@ from datetime import datetime, timezone
 from typing import (
     Any,
     Callable,
+    Deque,
+    FrozenSet,
     Dict,
     Generator,
     List,
+    Mapping,
+    MutableMapping,
     Optional,
     Tuple,
     Union,
     TypeAlias,
+    TypeGuard,
+    TYPE_CHECKING,
+    cast,
 )
 import types
 
+from opentelemetry import trace as otel_trace
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SpanExporter
+
+from judgeval.common.tracer.aggregation import SpanSummary
+from judgeval.common.tracer.capture_policy import (
+    FULL_CAPTURE,
+    CapturePolicies,
+    CapturePolicy,
+    PolicyLike,
+    PolicyTarget,
+    as_policy,
+)
 from judgeval.common.tracer.constants import _TRACE_FILEPATH_BLOCKLIST
 
 from judgeval.common.tracer.otel_span_processor import JudgmentSpanProcessor
+from judgeval.common.tracer.collector import CollectorClient
+from judgeval.common.tracer.file_exporter import SegmentWriter
+from judgeval.common.tracer.otel_bridge import OpenTelemetryBridge
+from judgeval.common.tracer.overhead import CallOverhead, OverheadGuard, OverheadStats
+from judgeval.common.tracer.parquet_exporter import ParquetSpanExporter
+from judgeval.common.tracer.otlp_exporter import (
+    JudgmentOTLPSpanExporter,
+    create_otlp_exporter,
+)
+from judgeval.common.tracer.propagation import (
+    TraceContext,
+    extract_trace_context,
+    inject_trace_context,
+)
+from judgeval.common.tracer.resources import (
+    CaptureResources,
+    ResourceProbe,
+    resolve_resources,
+)
 from judgeval.common.tracer.span_processor import SpanProcessorBase
 from judgeval.common.tracer.trace_manager import TraceManagerClient
-from litellm import cost_per_token as _original_cost_per_token
-from openai import OpenAI, AsyncOpenAI
-from openai.types.chat.chat_completion import ChatCompletion
-from openai.types.responses.response import Response
-from openai.types.chat import ParsedChatCompletion
-from together import Together, AsyncTogether
-from anthropic import Anthropic, AsyncAnthropic
-from google import genai
-
-from judgeval.data import Example, Trace, TraceSpan, TraceUsage
+
+from judgeval.data import Example, TraceSpan, TraceUsage
 from judgeval.scorers import APIScorerConfig, BaseScorer
 from judgeval.evaluation_run import EvaluationRun
-from judgeval.common.utils import ExcInfo, validate_api_key
+from judgeval.common.utils import ExcInfo, BackgroundAPIKeyValidation
+from judgeval.constants import MAX_STREAM_SAMPLE_ITEMS
+from judgeval.utils.fork import register_after_fork_in_child
 from judgeval.common.logger import judgeval_logger
+from judgeval.version_check import check_latest_version
 
+if TYPE_CHECKING:
+    # Provider SDKs are only imported for type checking. At runtime wrap() recognizes
+    # clients through sys.modules, so importing judgeval never pulls them in.
+    from openai import OpenAI, AsyncOpenAI
+    from together import Together, AsyncTogether
+    from anthropic import Anthropic, AsyncAnthropic
+    from google import genai
 
 current_trace_var = contextvars.ContextVar[Optional["TraceClient"]](
     "current_trace", default=None
 )
 current_span_var = contextvars.ContextVar[Optional[str]]("current_span", default=None)
+# A trace in another process that new root traces should link to (see continue_trace)
+remote_trace_context_var = contextvars.ContextVar[Optional[TraceContext]](
+    "remote_trace_context", default=None
+)
 
 ApiClient: TypeAlias = Union[
-    OpenAI,
-    Together,
-    Anthropic,
-    AsyncOpenAI,
-    AsyncAnthropic,
-    AsyncTogether,
-    genai.Client,
-    genai.client.AsyncClient,
+    "OpenAI",
+    "Together",
+    "Anthropic",
+    "AsyncOpenAI",
+    "AsyncAnthropic",
+    "AsyncTogether",
+    "genai.Client",
+    "genai.client.AsyncClient",
 ]
 SpanType: TypeAlias = str
 
@@ -84,6 +131,7 @@ class TraceClient:
         enable_evaluations: bool = True,
         parent_trace_id: Optional[str] = None,
         parent_name: Optional[str] = None,
+        parent_span_id: Optional[str] = None,
     ):
         self.name = name
         self.trace_id = trace_id or str(uuid.uuid4())
@@ -93,6 +141,8 @@ class TraceClient:
         self.enable_evaluations = enable_evaluations
         self.parent_trace_id = parent_trace_id
         self.parent_name = parent_name
+        # Parent of the root span when the trace continues one from another process
+        self.parent_span_id = parent_span_id
         self.customer_id: Optional[str] = None
         self.tags: List[Union[str, set, tuple]] = []
         self.metadata: Dict[str, Any] = {}
@@ -106,13 +156,31 @@ class TraceClient:
             tracer.api_key, tracer.organization_id, tracer
         )
         self._span_depths: Dict[str, int] = {}
-
-        self.otel_span_processor = tracer.otel_span_processor
+        # Monotonic start times of open spans, so clock adjustments don't skew durations
+        self._span_start_ns: Dict[str, int] = {}
+        self._span_probes: Dict[str, ResourceProbe] = {}
+        self._aggregate_lock = threading.Lock()
+        # Merge the spans of a function beyond this many under the same parent into
+        # one summary span (see aggregation.py)
+        self.aggregate_fanout: Optional[int] = tracer.aggregate_fanout
+        self._child_counts: Dict[Optional[str], Dict[str, int]] = {}
+        self._span_summaries: Dict[Optional[str], Dict[str, SpanSummary]] = {}
+        # Open merged spans and the summaries they are merged into
+        self._merged_spans: Dict[str, SpanSummary] = {}
+        # Deep-traced spans held back until they turn out to be worth exporting
+        self._buffered_spans: Dict[str, TraceSpan] = {}
+        self._initial_save_attempted = False
+        self.evict_completed_spans = tracer.evict_completed_spans
 
         judgeval_logger.info(
             f"🎯 TraceClient using span processor for trace {self.trace_id}"
         )
 
+    @property
+    def otel_span_processor(self) -> SpanProcessorBase:
+        # Read through the tracer, which replaces it if the API key is rejected
+        return self.tracer.otel_span_processor
+
     def get_current_span(self):
         """Get the current span from the context var"""
         return self.tracer.get_current_span()
@@ -121,15 +189,39 @@ class TraceClient:
         """Set the current span from the context var"""
         return self.tracer.set_current_span(span)
 
-    def reset_current_span(self, token: Any):
+    def reset_current_span(self, token: Any, span_id: Optional[str] = None):
         """Reset the current span from the context var"""
-        self.tracer.reset_current_span(token)
+        self.tracer.reset_current_span(token, span_id)
 
     @contextmanager
-    def span(self, name: str, span_type: SpanType = "span"):
-        """Context manager for creating a trace span, managing the current span via contextvars"""
-        is_first_span = len(self.trace_spans) == 0
-        if is_first_span:
+    def span(
+        self,
+        name: str,
+        span_type: SpanType = "span",
+        capture_resources: Optional[CaptureResources] = None,
+    ):
+        """
+        Context manager for creating a trace span, managing the current span via contextvars.
+        capture_resources overrides the tracer's resource capture for this span.
+        """
+        span = self._start_span(name, span_type, capture_resources)
+        token = self.set_current_span(span.span_id)
+
+        try:
+            yield self
+        finally:
+            self._end_span(span)
+            self.reset_current_span(token, span.span_id)
+
+    def _start_span(
+        self,
+        name: str,
+        span_type: SpanType = "span",
+        capture_resources: Optional[CaptureResources] = None,
+    ) -> TraceSpan:
+        """Creates a span under the current span without making it current."""
+        if not self._initial_save_attempted:
+            self._initial_save_attempted = True
             try:
                 self.save(final_save=False)
             except Exception as e:
@@ -140,8 +232,9 @@ class TraceClient:
 
         span_id = str(uuid.uuid4())
 
-        parent_span_id = self.get_current_span()
-        token = self.set_current_span(span_id)
+        parent_span_id = self.get_current_span() or self.parent_span_id
+        if self._buffered_spans and parent_span_id in self._buffered_spans:
+            self._emit_buffered_spans(parent_span_id)
 
         current_depth = 0
         if parent_span_id and parent_span_id in self._span_depths:
@@ -159,21 +252,146 @@ class TraceClient:
             parent_span_id=parent_span_id,
             function=name,
         )
-        self.add_span(span)
+        if (
+            self.aggregate_fanout is not None or self._merged_spans
+        ) and self._merge_span(span):
+            # Recorded to, but only exported as part of its summary span
+            self.span_id_to_span[span_id] = span
+        else:
+            self.add_span(span)
+            self.otel_span_processor.queue_span_update(span, span_state="input")
 
-        self.otel_span_processor.queue_span_update(span, span_state="input")
+        if capture_resources is None:
+            resources = self.tracer.capture_resources
+        elif isinstance(capture_resources, frozenset):
+            resources = capture_resources
+        else:
+            resources = resolve_resources(capture_resources)
+        if resources:
+            self._span_probes[span_id] = ResourceProbe(resources)
+        self._span_start_ns[span_id] = time.perf_counter_ns()
+        return span
+
+    def _end_span(self, span: TraceSpan):
+        start_ns = self._span_start_ns.pop(span.span_id, None)
+        if start_ns is not None:
+            span.duration = (time.perf_counter_ns() - start_ns) / 1e9
+        else:
+            span.duration = time.time() - span.created_at
+        probe = self._span_probes.pop(span.span_id, None)
+        if probe is not None:
+            span.additional_metadata = {
+                **(span.additional_metadata or {}),
+                "resources": probe.finish(),
+            }
 
-        try:
-            yield self
-        finally:
-            duration = time.time() - start_time
-            span.duration = duration
+        if self._merged_spans and self._fold_merged_span(span):
+            return
+        self._flush_span_summaries(span.span_id)
+
+        overhead = self.tracer.overhead
+        end_ns = time.perf_counter_ns() if overhead is not None else 0
+        self.otel_span_processor.queue_span_update(span, span_state="completed")
+        self.on_span_completed(span)
+        if overhead is not None:
+            overhead.record("span_end", time.perf_counter_ns() - end_ns)
 
-            self.otel_span_processor.queue_span_update(span, span_state="completed")
+        self._span_depths.pop(span.span_id, None)
+
+    def _merge_span(self, span: TraceSpan) -> bool:
+        """
+        Counts a new span under its parent and, past aggregate_fanout spans of its
+        function or inside a merged span, merges it into a summary span.
+        """
+        with self._aggregate_lock:
+            parent_summary = self._merged_spans.get(span.parent_span_id or "")
+            if parent_summary is not None:
+                summary_parent_id: Optional[str] = parent_summary.span_id
+            else:
+                counts = self._child_counts.setdefault(span.parent_span_id, {})
+                count = counts[span.function] = counts.get(span.function, 0) + 1
+                if self.aggregate_fanout is None or count <= self.aggregate_fanout:
+                    return False
+                summary_parent_id = span.parent_span_id
+
+            summaries = self._span_summaries.setdefault(summary_parent_id, {})
+            summary = summaries.get(span.function)
+            if summary is None:
+                summary = summaries[span.function] = SpanSummary(
+                    self.trace_id,
+                    summary_parent_id,
+                    span.function,
+                    span.span_type or "span",
+                    span.depth,
+                )
+            self._merged_spans[span.span_id] = summary
+            return True
+
+    def _fold_merged_span(self, span: TraceSpan) -> bool:
+        """Adds a finished span to its summary, if it was merged."""
+        with self._aggregate_lock:
+            summary = self._merged_spans.pop(span.span_id, None)
+            if summary is None:
+                return False
+            summary.add(span)
+            self._child_counts.pop(span.span_id, None)
+        self.span_id_to_span.pop(span.span_id, None)
+        self._span_depths.pop(span.span_id, None)
+        return True
+
+    def _buffer_span(self, span: TraceSpan):
+        """
+        Holds back a deep-traced span: it is recorded to, but only exported once
+        it or a span under it is emitted.
+        """
+        self._buffered_spans[span.span_id] = span
+        self.span_id_to_span[span.span_id] = span
 
-            if span_id in self._span_depths:
-                del self._span_depths[span_id]
-            self.reset_current_span(token)
+    def _emit_buffered_spans(self, span_id: str):
+        """Exports a buffered span and its buffered ancestors, outermost first."""
+        chain = []
+        while span_id in self._buffered_spans:
+            span = self._buffered_spans.pop(span_id)
+            chain.append(span)
+            span_id = span.parent_span_id or ""
+        for span in reversed(chain):
+            self.add_span(span)
+            self.otel_span_processor.queue_span_update(span, span_state="input")
+
+    def _fold_buffered_span(self, span: TraceSpan):
+        """Drops a finished buffered span, counting it on its parent instead."""
+        self._buffered_spans.pop(span.span_id, None)
+        self.span_id_to_span.pop(span.span_id, None)
+        self._span_depths.pop(span.span_id, None)
+        parent = self.span_id_to_span.get(span.parent_span_id or "")
+        if parent is None:
+            return
+        if parent.additional_metadata is None:
+            parent.additional_metadata = {}
+        folded = parent.additional_metadata.get("folded_spans")
+        if folded is None:
+            folded = parent.additional_metadata["folded_spans"] = {
+                "count": 0,
+                "duration": 0.0,
+            }
+        folded["count"] += 1
+        folded["duration"] += span.duration or 0.0
+
+    def _flush_span_summaries(self, parent_span_id: Optional[str]):
+        """Exports the summary spans under a parent that is ending."""
+        with self._aggregate_lock:
+            self._child_counts.pop(parent_span_id, None)
+            summaries = self._span_summaries.pop(parent_span_id, None)
+        if not summaries:
+            return
+        for summary in summaries.values():
+            summary_span = summary.to_span()
+            self.add_span(summary_span)
+            self.otel_span_processor.queue_span_update(
+                summary_span, span_state="completed"
+            )
+            self.on_span_completed(summary_span)
+            self._flush_span_summaries(summary.span_id)
 
     def async_evaluate(
         self,
@@ -261,8 +479,9 @@ class TraceClient:
         current_span_id = eval_run.trace_span_id
 
         if current_span_id:
-            span = self.span_id_to_span[current_span_id]
-            span.has_evaluation = True
+            span = self.span_id_to_span.get(current_span_id)
+            if span:
+                span.has_evaluation = True
         self.evaluation_runs.append(eval_run)
 
     def record_input(self, inputs: dict):
@@ -274,7 +493,7 @@ class TraceClient:
             span.inputs = inputs
 
             try:
-                self.otel_span_processor.queue_span_update(span, span_state="input")
+                self._queue_span_update(span, span_state="input")
             except Exception as e:
                 judgeval_logger.warning(f"Failed to queue span with input data: {e}")
 
@@ -284,7 +503,7 @@ class TraceClient:
             span = self.span_id_to_span[current_span_id]
             span.agent_name = agent_name
 
-            self.otel_span_processor.queue_span_update(span, span_state="agent_name")
+            self._queue_span_update(span, span_state="agent_name")
 
     def record_state_before(self, state: dict):
         """Records the agent's state before a tool execution on the current span.
@@ -297,7 +516,7 @@ class TraceClient:
             span = self.span_id_to_span[current_span_id]
             span.state_before = state
 
-            self.otel_span_processor.queue_span_update(span, span_state="state_before")
+            self._queue_span_update(span, span_state="state_before")
 
     def record_state_after(self, state: dict):
         """Records the agent's state after a tool execution on the current span.
@@ -310,7 +529,7 @@ class TraceClient:
             span = self.span_id_to_span[current_span_id]
             span.state_after = state
 
-            self.otel_span_processor.queue_span_update(span, span_state="state_after")
+            self._queue_span_update(span, span_state="state_after")
 
     async def _update_coroutine(self, span: TraceSpan, coroutine: Any, field: str):
         """Helper method to update the output of a trace entry once the coroutine completes"""
@@ -319,14 +538,14 @@ class TraceClient:
             setattr(span, field, result)
 
             if field == "output":
-                self.otel_span_processor.queue_span_update(span, span_state="output")
+                self._queue_span_update(span, span_state="output")
 
             return result
         except Exception as e:
             setattr(span, field, f"Error: {str(e)}")
 
             if field == "output":
-                self.otel_span_processor.queue_span_update(span, span_state="output")
+                self._queue_span_update(span, span_state="output")
 
             raise
 
@@ -340,18 +559,37 @@ class TraceClient:
                 asyncio.create_task(self._update_coroutine(span, output, "output"))
 
             if not inspect.iscoroutine(output):
-                self.otel_span_processor.queue_span_update(span, span_state="output")
+                self._queue_span_update(span, span_state="output")
 
             return span
         return None
 
+    def record_aggregate(self, function: str, duration: float, error: bool = False):
+        """
+        Counts a call recorded without a span of its own (see capture_policy.py)
+        in the trace's metadata["aggregated_calls"].
+        """
+        with self._aggregate_lock:
+            aggregates = self.metadata.setdefault("aggregated_calls", {})
+            entry = aggregates.get(function)
+            if entry is None:
+                entry = aggregates[function] = {
+                    "count": 0,
+                    "total_duration": 0.0,
+                    "errors": 0,
+                }
+            entry["count"] += 1
+            entry["total_duration"] += duration
+            if error:
+                entry["errors"] += 1
+
     def record_usage(self, usage: TraceUsage):
         current_span_id = self.get_current_span()
         if current_span_id:
             span = self.span_id_to_span[current_span_id]
             span.usage = usage
 
-            self.otel_span_processor.queue_span_update(span, span_state="usage")
+            self._queue_span_update(span, span_state="usage")
 
             return span
         return None
@@ -362,17 +600,43 @@ class TraceClient:
             span = self.span_id_to_span[current_span_id]
             span.error = error
 
-            self.otel_span_processor.queue_span_update(span, span_state="error")
+            self._queue_span_update(span, span_state="error")
 
             return span
         return None
 
+    def _queue_span_update(self, span: TraceSpan, span_state: str):
+        """Queues an update of a span for export, unless it is merged or buffered."""
+        if (
+            span.span_id not in self._merged_spans
+            and span.span_id not in self._buffered_spans
+        ):
+            self.otel_span_processor.queue_span_update(span, span_state=span_state)
+
     def add_span(self, span: TraceSpan):
         """Add a trace span to this trace context"""
         self.trace_spans.append(span)
         self.span_id_to_span[span.span_id] = span
         return self
 
+    def on_span_completed(self, span: TraceSpan):
+        """
+        Called once a span's final update has been queued for export.
+
+        With evict_completed_spans enabled, the span is dropped from this trace so
+        long-running traces only hold on to the spans that are still open. The span
+        processor already holds everything it needs to export the span.
+        """
+        if not self.evict_completed_spans:
+            return
+        if self.span_id_to_span.pop(span.span_id, None) is None:
+            return
+        # Completed spans are almost always the most recently opened ones
+        for i in range(len(self.trace_spans) - 1, -1, -1):
+            if self.trace_spans[i] is span:
+                del self.trace_spans[i]
+                break
+
     def print(self):
         """Print the complete trace with proper visual structure"""
         for span in self.trace_spans:
@@ -397,6 +661,9 @@ class TraceClient:
         Returns a tuple of (trace_id, server_response) where server_response contains the UI URL and other metadata.
         """
         if final_save:
+            # Summaries under parents that never ended here, e.g. of root spans
+            for parent_span_id in list(self._span_summaries):
+                self._flush_span_summaries(parent_span_id)
             try:
                 self.otel_span_processor.flush_pending_spans()
             except Exception as e:
@@ -717,6 +984,9 @@ class _DeepTracer:
         if event == "call":
             if not self._should_trace(frame):
                 return
+            if parent_span_id in current_trace._merged_spans:
+                # Calls inside a merged span are part of its summary
+                return
 
             span_id = str(uuid.uuid4())
 
@@ -732,7 +1002,7 @@ class _DeepTracer:
                     "span_id": span_id,
                     "parent_span_id": parent_span_id,
                     "function": qual_name,
-                    "start_time": start_time,
+                    "start_ns": time.perf_counter_ns(),
                 }
             )
             self._span_stack.set(span_stack)
@@ -751,7 +1021,10 @@ class _DeepTracer:
                 function=qual_name,
                 agent_name=instance_name,
             )
-            current_trace.add_span(span)
+            if self._tracer.deep_tracing_min_duration is not None:
+                current_trace._buffer_span(span)
+            else:
+                current_trace.add_span(span)
 
             inputs = {}
             try:
@@ -781,17 +1054,38 @@ class _DeepTracer:
             if not span_data:
                 return
 
-            start_time = span_data["start_time"]
-            duration = time.time() - start_time
+            duration = (time.perf_counter_ns() - span_data["start_ns"]) / 1e9
 
-            current_trace.span_id_to_span[span_data["span_id"]].duration = duration
+            span = current_trace.span_id_to_span[span_data["span_id"]]
+            span.duration = duration
 
             if arg is not None:
                 # exception handling will take priority.
                 current_trace.record_output(arg)
 
-            if span_data["span_id"] in current_trace._span_depths:
-                del current_trace._span_depths[span_data["span_id"]]
+            min_duration = self._tracer.deep_tracing_min_duration
+            if span.span_id not in current_trace._buffered_spans:
+                emit = True
+            elif (
+                min_duration is not None and duration < min_duration and not span.error
+            ):
+                # Quick calls without errors or slow calls under them only add to
+                # their parent's self time
+                current_trace._fold_buffered_span(span)
+                emit = False
+            else:
+                current_trace._emit_buffered_spans(span.span_id)
+                emit = True
+
+            if emit:
+                current_trace._flush_span_summaries(span.span_id)
+                current_trace.otel_span_processor.queue_span_update(
+                    span, span_state="completed"
+                )
+                current_trace.on_span_completed(span)
+
+                if span_data["span_id"] in current_trace._span_depths:
+                    del current_trace._span_depths[span_data["span_id"]]
 
             if span_stack:
                 self._tracer.set_current_span(span_stack[-1]["span_id"])
@@ -836,6 +1130,369 @@ class _DeepTracer:
                 self._original_sys_trace = None
                 self._original_threading_trace = None
 
+    @classmethod
+    def _after_fork_in_child(cls):
+        cls._lock = threading.Lock()
+
+
+register_after_fork_in_child(_DeepTracer._after_fork_in_child)
+
+
+class _CapturePlan:
+    """
+    Everything an @observe wrapper needs to know about the decorated function,
+    compiled once at decoration time so each call only binds its arguments.
+
+    Class configuration registered through Tracer.identify() is looked up per
+    instance type and memoized until identify() is called again.
+    """
+
+    __slots__ = (
+        "tracer",
+        "name",
+        "param_names",
+        "has_self",
+        "resources",
+        "inputs",
+        "outputs",
+        "state",
+        "aggregate",
+        "sample_every",
+        "guard",
+        "_calls",
+        "_class_configs",
+        "_class_identifiers_version",
+    )
+
+    def __init__(
+        self,
+        tracer: "Tracer",
+        func: Callable,
+        capture_resources: Optional[CaptureResources] = None,
+        policy: CapturePolicy = FULL_CAPTURE,
+        name: Optional[str] = None,
+    ):
+        self.tracer = tracer
+        self.name: str = name or func.__name__
+        # None defers to the tracer's capture_resources
+        self.resources: Optional[FrozenSet[str]] = (
+            None if capture_resources is None else resolve_resources(capture_resources)
+        )
+        try:
+            self.param_names: Optional[Tuple[str, ...]] = tuple(
+                inspect.signature(func).parameters
+            )
+        except (TypeError, ValueError):
+            self.param_names = None
+        self.has_self: bool = (
+            self.param_names is not None
+            and len(self.param_names) > 0
+            and self.param_names[0] == "self"
+        )
+        self.inputs: bool = policy.inputs
+        self.outputs: bool = policy.outputs
+        self.state: bool = policy.state
+        self.aggregate: bool = policy.mode == "aggregate"
+        self.sample_every: int = policy.sample_every
+        if inspect.isgeneratorfunction(func) or inspect.isasyncgenfunction(func):
+            # Streams always get a span
+            if self.aggregate:
+                self.aggregate = self.inputs = self.outputs = self.state = False
+            self.sample_every = 1
+        self._calls = itertools.count()
+        self.guard = OverheadGuard(getattr(func, "__qualname__", repr(func)))
+        self._class_configs: Dict[type, Optional[Dict[str, Any]]] = {}
+        self._class_identifiers_version: int = tracer._class_identifiers_version
+
+    def combine_args_kwargs(self, args: tuple, kwargs: dict) -> Dict[str, Any]:
+        """Equivalent to combine_args_kwargs(func, args, kwargs), minus `self`."""
+        param_names = self.param_names
+        if param_names is None:
+            return {**{f"arg{i}": arg for i, arg in enumerate(args)}, **kwargs}
+
+        num_params = len(param_names)
+        inputs = {}
+        for i in range(1 if self.has_self else 0, len(args)):
+            inputs[param_names[i] if i < num_params else f"arg{i}"] = args[i]
+        if kwargs:
+            inputs.update(kwargs)
+        return inputs
+
+    def class_config(self, args: tuple) -> Optional[Dict[str, Any]]:
+        """Returns the identify() configuration for the bound instance, if any."""
+        if not self.has_self or not args:
+            return None
+
+        tracer = self.tracer
+        if self._class_identifiers_version != tracer._class_identifiers_version:
+            self._class_configs = {}
+            self._class_identifiers_version = tracer._class_identifiers_version
+
+        cls = args[0].__class__
+        try:
+            return self._class_configs[cls]
+        except KeyError:
+            config = tracer.class_identifiers.get(cls.__name__)
+            if not isinstance(config, dict):
+                config = None
+            self._class_configs[cls] = config
+            return config
+
+    def agent_name(self, args: tuple) -> Optional[str]:
+        if self.class_config(args) is None:
+            return None
+        instance = args[0]
+        return get_instance_prefixed_name(
+            instance, instance.__class__.__name__, self.tracer.class_identifiers
+        )
+
+    def capture_state(
+        self, trace_client_instance: TraceClient, args: tuple, is_before: bool
+    ):
+        """Captures instance state if tracked and records it via the trace_client."""
+        config = self.class_config(args)
+        if not config or not config.get("track_state", False):
+            return
+
+        state = self.tracer._capture_instance_state(args[0], config)
+        if state:
+            if is_before:
+                trace_client_instance.record_state_before(state)
+            else:
+                trace_client_instance.record_state_after(state)
+
+    def record_inputs(
+        self, trace_client: TraceClient, args: tuple, kwargs: dict, full: bool = True
+    ):
+        """Records the arguments, unless full is False, and the agent name."""
+        if full:
+            trace_client.record_input(self.combine_args_kwargs(args, kwargs))
+        agent_name = self.agent_name(args)
+        if agent_name:
+            trace_client.record_agent_name(agent_name)
+
+    def enter(
+        self, trace_client: TraceClient, args: tuple, kwargs: dict, started_ns: int
+    ) -> Optional[CallOverhead]:
+        """
+        Records the inputs, agent name and state before a call. If the tracer
+        measures its overhead, returns the call's timings for leave(); started_ns is
+        when the wrapper started opening the span.
+        """
+        if self.tracer.overhead is None:
+            self.record_inputs(trace_client, args, kwargs, self.inputs)
+            if self.state:
+                self.capture_state(trace_client, args, is_before=True)
+            return None
+
+        entered_ns = time.perf_counter_ns()
+        call = CallOverhead(self.guard.full_capture(), entered_ns - started_ns)
+        self.record_inputs(trace_client, args, kwargs, self.inputs and call.full)
+        inputs_ns = time.perf_counter_ns()
+        call.inputs = inputs_ns - entered_ns
+        if self.state and call.full:
+            self.capture_state(trace_client, args, is_before=True)
+        call.call_start_ns = time.perf_counter_ns()
+        call.state = call.call_start_ns - inputs_ns
+        return call
+
+    def leave(
+        self,
+        trace_client: TraceClient,
+        call: Optional[CallOverhead],
+        args: tuple,
+        result: Any,
+    ):
+        """Records the state and output after a call, and the call's overhead."""
+        if call is None:
+            if self.state:
+                self.capture_state(trace_client, args, is_before=False)
+            if self.outputs:
+                trace_client.record_output(result)
+            return
+
+        left_ns = time.perf_counter_ns()
+        runtime_ns = left_ns - call.call_start_ns
+        if call.full:
+            if self.state:
+                self.capture_state(trace_client, args, is_before=False)
+            state_ns = time.perf_counter_ns()
+            call.state += state_ns - left_ns
+            if self.outputs:
+                trace_client.record_output(result)
+            call.outputs = time.perf_counter_ns() - state_ns
+            self.guard.record(call.total, runtime_ns, self.tracer.overhead_budget)
+
+        overhead = self.tracer.overhead
+        if overhead is not None:
+            overhead.record_call(call)
+        span = trace_client.span_id_to_span.get(trace_client.get_current_span())
+        if span is not None:
+            span.additional_metadata = {
+                **(span.additional_metadata or {}),
+                "overhead": call.to_metadata(runtime_ns),
+            }
+
+    def traced_call(self) -> bool:
+        """Whether this call gets a span, rather than only being counted."""
+        if self.aggregate:
+            return False
+        return self.sample_every == 1 or next(self._calls) % self.sample_every == 0
+
+    def call_aggregated(self, func: Callable, args: tuple, kwargs: dict) -> Any:
+        """Calls func without a span, counting the call in the current trace."""
+        trace_client = self.tracer.get_current_trace()
+        if trace_client is None:
+            return func(*args, **kwargs)
+        start_ns = time.perf_counter_ns()
+        error = False
+        try:
+            return func(*args, **kwargs)
+        except Exception:
+            error = True
+            raise
+        finally:
+            trace_client.record_aggregate(
+                self.name, (time.perf_counter_ns() - start_ns) / 1e9, error
+            )
+
+    async def acall_aggregated(self, func: Callable, args: tuple, kwargs: dict) -> Any:
+        """Async version of call_aggregated."""
+        trace_client = self.tracer.get_current_trace()
+        if trace_client is None:
+            return await func(*args, **kwargs)
+        start_ns = time.perf_counter_ns()
+        error = False
+        try:
+            return await func(*args, **kwargs)
+        except Exception:
+            error = True
+            raise
+        finally:
+            trace_client.record_aggregate(
+                self.name, (time.perf_counter_ns() - start_ns) / 1e9, error
+            )
+
+
+class _StreamSpan:
+    """
+    Span around a call to a generator or async generator function, kept open until
+    the stream is exhausted, closed or fails.
+
+    The span (and its trace, for a root span) is only made current while the
+    generator body runs, so whatever the consumer does between items is not
+    attributed to it. Items are passed through as they are produced; only the
+    first MAX_STREAM_SAMPLE_ITEMS are kept as the span's output.
+    """
+
+    def __init__(
+        self,
+        tracer: "Tracer",
+        plan: _CapturePlan,
+        name: str,
+        span_type: SpanType,
+        args: tuple,
+        kwargs: dict,
+    ):
+        self.tracer = tracer
+        self.plan = plan
+        self.args = args
+        current_trace = tracer.get_current_trace()
+        self.is_root = current_trace is None
+        self.trace_client: TraceClient = current_trace or tracer._new_root_trace(name)
+        self.span = self.trace_client._start_span(name, span_type, plan.resources)
+        self.start_ns = time.perf_counter_ns()
+
+        self.item_count = 0
+        self.sample: List[Any] = []
+        self.time_to_first_item: Optional[float] = None
+        self.closed_early = False
+        self._finished = False
+
+        with self.active():
+            plan.record_inputs(self.trace_client, args, kwargs, plan.inputs)
+            if plan.state:
+                plan.capture_state(self.trace_client, args, is_before=True)
+
+    @contextmanager
+    def active(self):
+        trace_token = (
+            self.tracer.set_current_trace(self.trace_client) if self.is_root else None
+        )
+        span_token = self.tracer.set_current_span(self.span.span_id)
+        try:
+            yield
+        finally:
+            self.tracer.reset_current_span(span_token, self.span.span_id)
+            if self.is_root:
+                self.tracer.reset_current_trace(trace_token, self.trace_client.trace_id)
+
+    def advance(self, step: Callable, *args):
+        """Runs one step of the generator (send/throw/close) with the span current."""
+        with self.active():
+            try:
+                if self.tracer.deep_tracing:
+                    with _DeepTracer(self.tracer):
+                        return step(*args)
+                return step(*args)
+            except (StopIteration, GeneratorExit):
+                raise
+            except Exception:
+                # Inside an except block, so exc_info is never (None, None, None)
+                _capture_exception_for_trace(
+                    self.trace_client, cast(ExcInfo, sys.exc_info())
+                )
+                raise
+
+    async def aadvance(self, step: Callable, *args):
+        """Async version of advance for asend/athrow/aclose."""
+        with self.active():
+            try:
+                if self.tracer.deep_tracing:
+                    with _DeepTracer(self.tracer):
+                        return await step(*args)
+                return await step(*args)
+            except (StopAsyncIteration, GeneratorExit):
+                raise
+            except Exception:
+                # Inside an except block, so exc_info is never (None, None, None)
+                _capture_exception_for_trace(
+                    self.trace_client, cast(ExcInfo, sys.exc_info())
+                )
+                raise
+
+    def record_item(self, item: Any):
+        if self.item_count == 0:
+            self.time_to_first_item = (time.perf_counter_ns() - self.start_ns) / 1e9
+        self.item_count += 1
+        if len(self.sample) < MAX_STREAM_SAMPLE_ITEMS:
+            self.sample.append(item)
+
+    def finish(self):
+        if self._finished:
+            return
+        self._finished = True
+
+        self.span.additional_metadata = {
+            **(self.span.additional_metadata or {}),
+            "stream": {
+                "item_count": self.item_count,
+                "time_to_first_item": self.time_to_first_item,
+                "sampled_items": len(self.sample),
+                "closed_early": self.closed_early,
+            },
+        }
+        with self.active():
+            if self.plan.state:
+                self.plan.capture_state(self.trace_client, self.args, is_before=False)
+            if self.plan.outputs:
+                self.trace_client.record_output(self.sample)
+        self.trace_client._end_span(self.span)
+
+        if self.is_root:
+            trace_token = self.tracer.set_current_trace(self.trace_client)
+            self.tracer._finish_root_trace(self.trace_client, trace_token)
+
 
 class Tracer:
     # Tracer.current_trace class variable is currently used in wrap()
@@ -854,6 +1511,9 @@ class Tracer:
         organization_id: str | None = os.getenv("JUDGMENT_ORG_ID"),
         project_name: str | None = None,
         deep_tracing: bool = False,  # Deep tracing is disabled by default
+        # With deep tracing, only export spans of calls that took at least this many
+        # seconds, raised an error or made such a call
+        deep_tracing_min_duration: Optional[float] = None,
         enable_monitoring: bool = os.getenv("JUDGMENT_MONITORING", "true").lower()
         == "true",
         enable_evaluations: bool = os.getenv("JUDGMENT_EVALUATIONS", "true").lower()
@@ -869,42 +1529,87 @@ class Tracer:
         span_flush_interval: float = 1.0,
         span_max_queue_size: int = 2048,
         span_export_timeout: int = 30000,
+        # Memory bounds for long-running processes
+        evict_completed_spans: bool = False,
+        max_traces: Optional[int] = None,
+        # Send spans through a local `judgeval collector` daemon at this socket path
+        collector_socket: Optional[str] = os.getenv("JUDGMENT_COLLECTOR_SOCKET"),
+        # Also export completed spans to an OpenTelemetry collector over OTLP
+        otlp_endpoint: Optional[str] = os.getenv("JUDGMENT_OTLP_ENDPOINT"),
+        otlp_protocol: str = os.getenv("JUDGMENT_OTLP_PROTOCOL", "http/protobuf"),
+        otlp_headers: Optional[Dict[str, str]] = None,
+        # Extra OpenTelemetry exporters that receive the same span batches
+        span_exporters: Optional[List[SpanExporter]] = None,
+        # Write spans and traces to segment files here instead of uploading them;
+        # replay them with `judgeval upload`
+        trace_file_dir: Optional[str] = os.getenv("JUDGMENT_TRACE_FILE_DIR"),
+        trace_file_compress: bool = False,
+        # Also write completed spans to Parquet files here, for trace analytics
+        parquet_dir: Optional[str] = os.getenv("JUDGMENT_PARQUET_DIR"),
+        # Record spans with this processor instead of exporting them, e.g. an
+        # InMemoryTraceStore in tests. No API key is needed and nothing is uploaded.
+        span_processor: Optional[SpanProcessorBase] = None,
+        # Record CPU time, memory and event loop lag per span: True, or a subset of
+        # "cpu", "memory" and "loop_lag" (see resources.py)
+        capture_resources: CaptureResources = False,
+        # Record the time judgeval adds to each @observe span and keep histograms of
+        # it in Tracer.overhead (see overhead.py)
+        measure_overhead: bool = False,
+        # Measure overhead and capture less of functions whose overhead is more than
+        # this fraction of their runtime, e.g. 0.05
+        overhead_budget: Optional[float] = None,
+        # How much @observe and observe_tools record per function, class or glob on
+        # the qualified name, e.g. {"*.VectorStore.*": "metadata"}; see
+        # capture_policy.py
+        capture_policies: Optional[Mapping[PolicyTarget, PolicyLike]] = None,
+        # Merge the spans of a function beyond this many under the same parent
+        # span into one summary span (see aggregation.py)
+        aggregate_fanout: Optional[int] = None,
     ):
+        self.collector: Optional[CollectorClient] = (
+            CollectorClient(collector_socket) if collector_socket else None
+        )
+        self.trace_file_writer: Optional[SegmentWriter] = (
+            SegmentWriter(trace_file_dir, compress=trace_file_compress)
+            if trace_file_dir
+            else None
+        )
+        self.upload_traces: bool = span_processor is None
+        self.capture_resources: FrozenSet[str] = frozenset()
+        self.overhead_budget: Optional[float] = overhead_budget
+        self.capture_policies = CapturePolicies(capture_policies)
+        self.overhead: Optional[OverheadStats] = (
+            OverheadStats() if measure_overhead or overhead_budget is not None else None
+        )
         try:
-            if not api_key:
+            if not api_key and span_processor is None:
                 raise ValueError(
                     "api_key parameter must be provided. Please provide a valid API key value or set the JUDGMENT_API_KEY environment variable"
                 )
 
-            if not organization_id:
+            if not organization_id and span_processor is None:
                 raise ValueError(
                     "organization_id parameter must be provided. Please provide a valid organization ID value or set the JUDGMENT_ORG_ID environment variable"
                 )
 
-            try:
-                result, response = validate_api_key(api_key)
-            except Exception as e:
-                judgeval_logger.error(
-                    f"Issue with verifying API key, disabling monitoring: {e}"
-                )
-                enable_monitoring = False
-                result = True
-
-            if not result:
-                raise ValueError(f"Issue with passed in Judgment API key: {response}")
-
             if use_s3 and not s3_bucket_name:
                 raise ValueError("S3 bucket name must be provided when use_s3 is True")
 
-            self.api_key: str = api_key
+            self.api_key: str = api_key or ""
             self.project_name: str = project_name or "default_project"
-            self.organization_id: str = organization_id
-            self.traces: List[Trace] = []
+            self.organization_id: str = organization_id or ""
+            self.max_traces: Optional[int] = max_traces
+            self.traces: Union[List[Dict[str, Any]], Deque[Dict[str, Any]]] = (
+                self._new_traces_buffer()
+            )
+            self.evict_completed_spans: bool = evict_completed_spans
+            self.aggregate_fanout: Optional[int] = aggregate_fanout
             self.enable_monitoring: bool = enable_monitoring
             self.enable_evaluations: bool = enable_evaluations
             self.class_identifiers: Dict[
                 str, str
             ] = {}  # Dictionary to store class identifiers
+            self._class_identifiers_version: int = 0
             self.span_id_to_previous_span_id: Dict[str, str | None] = {}
             self.trace_id_to_previous_trace: Dict[str, TraceClient | None] = {}
             self.current_span_id: Optional[str] = None
@@ -932,25 +1637,61 @@ class Tracer:
 
             self.offline_mode = False  # This is used to differentiate traces between online and offline (IE experiments vs monitoring page)
             self.deep_tracing: bool = deep_tracing
+            self.deep_tracing_min_duration: Optional[float] = deep_tracing_min_duration
+            self.capture_resources = resolve_resources(capture_resources)
 
             self.span_batch_size = span_batch_size
             self.span_flush_interval = span_flush_interval
             self.span_max_queue_size = span_max_queue_size
             self.span_export_timeout = span_export_timeout
+
+            # The API key is validated in the background. Span exports wait for the
+            # outcome, so spans recorded in the meantime are buffered, not lost.
+            self.api_key_validation: Optional[BackgroundAPIKeyValidation] = None
+            if span_processor is None:
+                self.api_key_validation = BackgroundAPIKeyValidation(
+                    self.api_key, on_complete=self._on_api_key_validated
+                )
+
+            exporters: List[SpanExporter] = list(span_exporters or [])
+            if parquet_dir:
+                exporters.append(ParquetSpanExporter(parquet_dir))
+            if otlp_endpoint:
+                exporters.append(
+                    JudgmentOTLPSpanExporter(
+                        create_otlp_exporter(
+                            endpoint=otlp_endpoint,
+                            protocol=otlp_protocol,
+                            headers=otlp_headers,
+                        ),
+                        service_name=self.project_name,
+                    )
+                )
+
             self.otel_span_processor: SpanProcessorBase
-            if enable_monitoring:
+            if span_processor is not None:
+                self.otel_span_processor = span_processor
+            elif enable_monitoring:
                 self.otel_span_processor = JudgmentSpanProcessor(
-                    judgment_api_key=api_key,
-                    organization_id=organization_id,
+                    judgment_api_key=self.api_key,
+                    organization_id=self.organization_id,
                     batch_size=span_batch_size,
                     flush_interval=span_flush_interval,
                     max_queue_size=span_max_queue_size,
                     export_timeout=span_export_timeout,
+                    api_key_validation=self.api_key_validation,
+                    collector=self.collector,
+                    span_exporters=exporters,
+                    trace_file_writer=self.trace_file_writer,
                 )
             else:
                 self.otel_span_processor = SpanProcessorBase()
+            if self.api_key_validation is not None:
+                self.api_key_validation.start()
 
             atexit.register(self._cleanup_on_exit)
+            register_after_fork_in_child(self._after_fork_in_child)
+            check_latest_version()
         except Exception as e:
             judgeval_logger.error(
                 f"Issue with initializing Tracer: {e}. Disabling monitoring and evaluations."
@@ -958,6 +1699,60 @@ class Tracer:
             self.enable_monitoring = False
             self.enable_evaluations = False
 
+    def _on_api_key_validated(self, result: Optional[bool], response: Any):
+        """Disables tracing if background API key validation did not succeed."""
+        if result:
+            return
+
+        if self.trace_file_writer is not None:
+            # Nothing is uploaded until `judgeval upload`, which checks the key again
+            judgeval_logger.warning(
+                f"Could not validate Judgment API key, writing traces to files anyway: {response}"
+            )
+            return
+
+        if result is None:
+            judgeval_logger.error(
+                f"Issue with verifying API key, disabling monitoring: {response}"
+            )
+        else:
+            judgeval_logger.error(
+                f"Issue with passed in Judgment API key: {response}. Disabling monitoring and evaluations."
+            )
+            self.enable_evaluations = False
+        self.enable_monitoring = False
+        old_processor = self.otel_span_processor
+        self.otel_span_processor = SpanProcessorBase()
+        # Buffered spans are dropped by the exporter once validation has failed. Its
+        # exports wait for this validation to finish, so shut it down on another thread
+        threading.Thread(
+            target=old_processor.shutdown,
+            name="judgeval-span-processor-shutdown",
+            daemon=True,
+        ).start()
+
+    def _after_fork_in_child(self):
+        """
+        Starts forked children (e.g. pre-fork server workers) without the parent's
+        trace context. Traces that were open in the parent are finished by the parent.
+        """
+        self.span_id_to_previous_span_id = {}
+        self.trace_id_to_previous_trace = {}
+        self.current_span_id = None
+        self.current_trace = None
+        Tracer.current_span_id = None
+        Tracer.current_trace = None
+        current_trace_var.set(None)
+        current_span_var.set(None)
+        remote_trace_context_var.set(None)
+        self.traces = self._new_traces_buffer()
+
+    def _new_traces_buffer(self) -> Union[List[Dict[str, Any]], Deque[Dict[str, Any]]]:
+        """Completed root traces, kept as a ring buffer when max_traces is set."""
+        if self.max_traces is not None:
+            return deque(maxlen=self.max_traces)
+        return []
+
     def set_current_span(self, span_id: str) -> Optional[contextvars.Token[str | None]]:
         self.span_id_to_previous_span_id[span_id] = self.current_span_id
         self.current_span_id = span_id
@@ -992,7 +1787,7 @@ class Tracer:
         if not span_id:
             span_id = self.current_span_id
         if span_id:
-            self.current_span_id = self.span_id_to_previous_span_id.get(span_id)
+            self.current_span_id = self.span_id_to_previous_span_id.pop(span_id, None)
             Tracer.current_span_id = self.current_span_id
 
     def set_current_trace(
@@ -1041,14 +1836,22 @@ class Tracer:
         if not trace_id and self.current_trace:
             trace_id = self.current_trace.trace_id
         if trace_id:
-            self.current_trace = self.trace_id_to_previous_trace.get(trace_id)
+            self.current_trace = self.trace_id_to_previous_trace.pop(trace_id, None)
             Tracer.current_trace = self.current_trace
 
     @contextmanager
     def trace(
-        self, name: str, project_name: str | None = None
+        self,
+        name: str,
+        project_name: str | None = None,
+        remote_context: Union[TraceContext, Mapping[str, str], None] = None,
     ) -> Generator[TraceClient, None, None]:
-        """Start a new trace context using a context manager"""
+        """
+        Start a new trace context using a context manager.
+
+        remote_context links the trace to a trace in another process, either as a
+        TraceContext or as headers carrying a W3C traceparent (see Tracer.inject).
+        """
         trace_id = str(uuid.uuid4())
         project = project_name if project_name is not None else self.project_name
 
@@ -1056,8 +1859,17 @@ class Tracer:
         parent_trace = self.get_current_trace()
         parent_trace_id = None
         parent_name = None
+        parent_span_id = None
+
+        if remote_context is None and not parent_trace:
+            remote_context = remote_trace_context_var.get()
+        if remote_context is not None and not isinstance(remote_context, TraceContext):
+            remote_context = extract_trace_context(remote_context)
 
-        if parent_trace:
+        if remote_context:
+            parent_trace_id = remote_context.trace_id
+            parent_span_id = remote_context.span_id
+        elif parent_trace:
             parent_trace_id = parent_trace.trace_id
             parent_name = parent_trace.name
 
@@ -1070,6 +1882,7 @@ class Tracer:
             enable_evaluations=self.enable_evaluations,
             parent_trace_id=parent_trace_id,
             parent_name=parent_name,
+            parent_span_id=parent_span_id,
         )
 
         # Set the current trace in context variables
@@ -1081,7 +1894,87 @@ class Tracer:
                 yield trace
             finally:
                 # Reset the context variable
-                self.reset_current_trace(token)
+                self.reset_current_trace(token, trace_id)
+
+    def _new_root_trace(self, name: str) -> TraceClient:
+        """TraceClient for a root span started by an observed function."""
+        remote_context = remote_trace_context_var.get()
+        return TraceClient(
+            self,
+            str(uuid.uuid4()),
+            name,
+            project_name=self.project_name,
+            enable_monitoring=self.enable_monitoring,
+            enable_evaluations=self.enable_evaluations,
+            parent_trace_id=remote_context.trace_id if remote_context else None,
+            parent_span_id=remote_context.span_id if remote_context else None,
+        )
+
+    def _finish_root_trace(
+        self,
+        trace_client: TraceClient,
+        trace_token: Optional[contextvars.Token[TraceClient | None]],
+    ):
+        """Saves a finished root trace, keeps its data in self.traces and resets context."""
+        try:
+            trace_client.save(final_save=True)
+
+            complete_trace_data = {
+                "trace_id": trace_client.trace_id,
+                "name": trace_client.name,
+                "created_at": datetime.fromtimestamp(
+                    trace_client.start_time or time.time(),
+                    timezone.utc,
+                ).isoformat(),
+                "duration": trace_client.get_duration(),
+                "trace_spans": [span.model_dump() for span in trace_client.trace_spans],
+                "offline_mode": self.offline_mode,
+                "parent_trace_id": trace_client.parent_trace_id,
+                "parent_name": trace_client.parent_name,
+                "metadata": trace_client.metadata,
+            }
+            self.traces.append(complete_trace_data)
+        except Exception as e:
+            judgeval_logger.warning(f"Issue with save: {e}")
+        finally:
+            self.reset_current_trace(trace_token, trace_client.trace_id)
+
+    def inject(
+        self, carrier: Optional[MutableMapping[str, str]] = None
+    ) -> MutableMapping[str, str]:
+        """
+        Adds W3C traceparent/tracestate headers for the current trace and span to
+        carrier (a new dict by default) and returns it.
+
+        Send the headers along with outgoing requests, or pass the dict to
+        multiprocessing workers, and continue the trace on the other side with
+        Tracer.continue_trace or Tracer.trace(remote_context=...).
+        """
+        if carrier is None:
+            carrier = {}
+        current_trace = self.get_current_trace()
+        current_span_id = self.get_current_span()
+        if current_trace and current_span_id:
+            inject_trace_context(carrier, current_trace.trace_id, current_span_id)
+        return carrier
+
+    @contextmanager
+    def continue_trace(
+        self, remote_context: Union[TraceContext, Mapping[str, str], None]
+    ) -> Generator[Optional[TraceContext], None, None]:
+        """
+        Links root traces started inside the block (by trace() or observed
+        functions) to the remote trace described by remote_context, e.g. incoming
+        request headers produced by Tracer.inject. Missing or invalid context is
+        ignored, so the block then behaves as usual.
+        """
+        if remote_context is not None and not isinstance(remote_context, TraceContext):
+            remote_context = extract_trace_context(remote_context)
+        token = remote_trace_context_var.set(remote_context)
+        try:
+            yield remote_context
+        finally:
+            remote_trace_context_var.reset(token)
 
     def identify(
         self,
@@ -1125,6 +2018,8 @@ class Tracer:
                 "track_attributes": track_attributes,
                 "field_mappings": field_mappings or {},
             }
+            # Invalidate the per-class lookups cached by @observe capture plans
+            self._class_identifiers_version += 1
             return cls
 
         return decorator
@@ -1154,41 +2049,14 @@ class Tracer:
 
         return state
 
-    def _get_instance_state_if_tracked(self, args):
-        """
-        Extract instance state if the instance should be tracked.
-
-        Returns the captured state dict if tracking is enabled, None otherwise.
-        """
-        if args and hasattr(args[0], "__class__"):
-            instance = args[0]
-            class_name = instance.__class__.__name__
-            if (
-                class_name in self.class_identifiers
-                and isinstance(self.class_identifiers[class_name], dict)
-                and self.class_identifiers[class_name].get("track_state", False)
-            ):
-                return self._capture_instance_state(
-                    instance, self.class_identifiers[class_name]
-                )
-
-    def _conditionally_capture_and_record_state(
-        self, trace_client_instance: TraceClient, args: tuple, is_before: bool
-    ):
-        """Captures instance state if tracked and records it via the trace_client."""
-        state = self._get_instance_state_if_tracked(args)
-        if state:
-            if is_before:
-                trace_client_instance.record_state_before(state)
-            else:
-                trace_client_instance.record_state_after(state)
-
     def observe(
         self,
         func=None,
         *,
         name=None,
         span_type: SpanType = "span",
+        capture_resources: Optional[CaptureResources] = None,
+        capture: Optional[PolicyLike] = None,
     ):
         """
         Decorator to trace function execution with detailed entry/exit information.
@@ -1197,6 +2065,11 @@ class Tracer:
             func: The function to decorate
             name: Optional custom name for the span (defaults to function name)
             span_type: Type of span (default "span").
+            capture_resources: CPU time, memory and event loop lag to record for
+                this function's spans (see resources.py); defaults to the tracer's.
+            capture: What to record of each call, e.g. "metadata" or
+                CapturePolicy("full", sample_every=10) (see capture_policy.py);
+                defaults to the tracer's capture_policies.
         """
         # If monitoring is disabled, return the function as is
         try:
@@ -1208,8 +2081,16 @@ class Tracer:
                     f,
                     name=name,
                     span_type=span_type,
+                    capture_resources=capture_resources,
+                    capture=capture,
                 )
 
+            policy = (
+                as_policy(capture)
+                if capture is not None
+                else self.capture_policies.resolve(func)
+            )
+
             # Use provided name or fall back to function name
             original_span_name = name or func.__name__
 
@@ -1217,51 +2098,109 @@ class Tracer:
             func._judgment_span_name = original_span_name
             func._judgment_span_type = span_type
 
+            if policy.mode == "none":
+                return func
+
+            # Compile everything the wrapper needs to know about func up front
+            plan = _CapturePlan(
+                self, func, capture_resources, policy, name=original_span_name
+            )
+
         except Exception:
             return func
 
-        if asyncio.iscoroutinefunction(func):
+        if inspect.isasyncgenfunction(func):
+
+            @functools.wraps(func)
+            async def async_generator_wrapper(*args, **kwargs):
+                stream = _StreamSpan(
+                    self, plan, original_span_name, span_type, args, kwargs
+                )
+                try:
+                    async_generator = func(*args, **kwargs)
+                    send_value: Any = None
+                    throw_value: Optional[BaseException] = None
+                    while True:
+                        try:
+                            if throw_value is None:
+                                item = await stream.aadvance(
+                                    async_generator.asend, send_value
+                                )
+                            else:
+                                item = await stream.aadvance(
+                                    async_generator.athrow, throw_value
+                                )
+                        except StopAsyncIteration:
+                            return
+                        stream.record_item(item)
+                        send_value, throw_value = None, None
+                        try:
+                            send_value = yield item
+                        except GeneratorExit:
+                            stream.closed_early = True
+                            await stream.aadvance(async_generator.aclose)
+                            raise
+                        except BaseException as e:
+                            throw_value = e
+                finally:
+                    stream.finish()
+
+            return async_generator_wrapper
+        elif inspect.isgeneratorfunction(func):
+
+            @functools.wraps(func)
+            def generator_wrapper(*args, **kwargs):
+                stream = _StreamSpan(
+                    self, plan, original_span_name, span_type, args, kwargs
+                )
+                try:
+                    generator = func(*args, **kwargs)
+                    send_value: Any = None
+                    throw_value: Optional[BaseException] = None
+                    while True:
+                        try:
+                            if throw_value is None:
+                                item = stream.advance(generator.send, send_value)
+                            else:
+                                item = stream.advance(generator.throw, throw_value)
+                        except StopIteration as e:
+                            return e.value
+                        stream.record_item(item)
+                        send_value, throw_value = None, None
+                        try:
+                            send_value = yield item
+                        except GeneratorExit:
+                            stream.closed_early = True
+                            stream.advance(generator.close)
+                            raise
+                        except BaseException as e:
+                            throw_value = e
+                finally:
+                    stream.finish()
+
+            return generator_wrapper
+        elif asyncio.iscoroutinefunction(func):
 
             @functools.wraps(func)
             async def async_wrapper(*args, **kwargs):
-                nonlocal original_span_name
-                class_name = None
+                if not plan.traced_call():
+                    return await plan.acall_aggregated(func, args, kwargs)
                 span_name = original_span_name
-                agent_name = None
-
-                if args and hasattr(args[0], "__class__"):
-                    class_name = args[0].__class__.__name__
-                    agent_name = get_instance_prefixed_name(
-                        args[0], class_name, self.class_identifiers
-                    )
+                started_ns = time.perf_counter_ns() if self.overhead is not None else 0
 
                 current_trace = self.get_current_trace()
 
                 if not current_trace:
-                    trace_id = str(uuid.uuid4())
-                    project = self.project_name
-
-                    current_trace = TraceClient(
-                        self,
-                        trace_id,
-                        span_name,
-                        project_name=project,
-                        enable_monitoring=self.enable_monitoring,
-                        enable_evaluations=self.enable_evaluations,
-                    )
-
+                    current_trace = self._new_root_trace(span_name)
                     trace_token = self.set_current_trace(current_trace)
 
                     try:
-                        with current_trace.span(span_name, span_type=span_type) as span:
-                            inputs = combine_args_kwargs(func, args, kwargs)
-                            span.record_input(inputs)
-                            if agent_name:
-                                span.record_agent_name(agent_name)
-
-                            self._conditionally_capture_and_record_state(
-                                span, args, is_before=True
-                            )
+                        with current_trace.span(
+                            span_name,
+                            span_type=span_type,
+                            capture_resources=plan.resources,
+                        ) as span:
+                            call = plan.enter(span, args, kwargs, started_ns)
 
                             try:
                                 if self.deep_tracing:
@@ -1275,52 +2214,16 @@ class Tracer:
                                 )
                                 raise e
 
-                            self._conditionally_capture_and_record_state(
-                                span, args, is_before=False
-                            )
-
-                            span.record_output(result)
+                            plan.leave(span, call, args, result)
                         return result
                     finally:
-                        try:
-                            complete_trace_data = {
-                                "trace_id": current_trace.trace_id,
-                                "name": current_trace.name,
-                                "created_at": datetime.fromtimestamp(
-                                    current_trace.start_time or time.time(),
-                                    timezone.utc,
-                                ).isoformat(),
-                                "duration": current_trace.get_duration(),
-                                "trace_spans": [
-                                    span.model_dump()
-                                    for span in current_trace.trace_spans
-                                ],
-                                "offline_mode": self.offline_mode,
-                                "parent_trace_id": current_trace.parent_trace_id,
-                                "parent_name": current_trace.parent_name,
-                            }
-
-                            trace_id, server_response = current_trace.save(
-                                final_save=True
-                            )
-
-                            self.traces.append(complete_trace_data)
-
-                            self.reset_current_trace(trace_token)
-                        except Exception as e:
-                            judgeval_logger.warning(f"Issue with async_wrapper: {e}")
-                            pass
+                        self._finish_root_trace(current_trace, trace_token)
                 else:
-                    with current_trace.span(span_name, span_type=span_type) as span:
-                        inputs = combine_args_kwargs(func, args, kwargs)
-                        span.record_input(inputs)
-                        if agent_name:
-                            span.record_agent_name(agent_name)
-
-                        # Capture state before execution
-                        self._conditionally_capture_and_record_state(
-                            span, args, is_before=True
-                        )
+                    with current_trace.span(
+                        span_name, span_type=span_type, capture_resources=plan.resources
+                    ) as span:
+                        # Record inputs and capture state before execution
+                        call = plan.enter(span, args, kwargs, started_ns)
 
                         try:
                             if self.deep_tracing:
@@ -1332,12 +2235,8 @@ class Tracer:
                             _capture_exception_for_trace(current_trace, sys.exc_info())
                             raise e
 
-                        # Capture state after execution
-                        self._conditionally_capture_and_record_state(
-                            span, args, is_before=False
-                        )
-
-                        span.record_output(result)
+                        # Capture state after execution and record output
+                        plan.leave(span, call, args, result)
                     return result
 
             return async_wrapper
@@ -1345,46 +2244,27 @@ class Tracer:
             # Non-async function implementation with deep tracing
             @functools.wraps(func)
             def wrapper(*args, **kwargs):
-                nonlocal original_span_name
-                class_name = None
+                if not plan.traced_call():
+                    return plan.call_aggregated(func, args, kwargs)
                 span_name = original_span_name
-                agent_name = None
-                if args and hasattr(args[0], "__class__"):
-                    class_name = args[0].__class__.__name__
-                    agent_name = get_instance_prefixed_name(
-                        args[0], class_name, self.class_identifiers
-                    )
+                started_ns = time.perf_counter_ns() if self.overhead is not None else 0
                 # Get current trace from context
                 current_trace = self.get_current_trace()
 
                 # If there's no current trace, create a root trace
                 if not current_trace:
-                    trace_id = str(uuid.uuid4())
-                    project = self.project_name
-
                     # Create a new trace client to serve as the root
-                    current_trace = TraceClient(
-                        self,
-                        trace_id,
-                        span_name,
-                        project_name=project,
-                        enable_monitoring=self.enable_monitoring,
-                        enable_evaluations=self.enable_evaluations,
-                    )
-
+                    current_trace = self._new_root_trace(span_name)
                     trace_token = self.set_current_trace(current_trace)
 
                     try:
-                        with current_trace.span(span_name, span_type=span_type) as span:
-                            # Record inputs
-                            inputs = combine_args_kwargs(func, args, kwargs)
-                            span.record_input(inputs)
-                            if agent_name:
-                                span.record_agent_name(agent_name)
-                            # Capture state before execution
-                            self._conditionally_capture_and_record_state(
-                                span, args, is_before=True
-                            )
+                        with current_trace.span(
+                            span_name,
+                            span_type=span_type,
+                            capture_resources=plan.resources,
+                        ) as span:
+                            # Record inputs and capture state before execution
+                            call = plan.enter(span, args, kwargs, started_ns)
 
                             try:
                                 if self.deep_tracing:
@@ -1398,52 +2278,17 @@ class Tracer:
                                 )
                                 raise e
 
-                            # Capture state after execution
-                            self._conditionally_capture_and_record_state(
-                                span, args, is_before=False
-                            )
-
-                            # Record output
-                            span.record_output(result)
+                            # Capture state after execution and record output
+                            plan.leave(span, call, args, result)
                         return result
                     finally:
-                        try:
-                            trace_id, server_response = current_trace.save(
-                                final_save=True
-                            )
-
-                            complete_trace_data = {
-                                "trace_id": current_trace.trace_id,
-                                "name": current_trace.name,
-                                "created_at": datetime.fromtimestamp(
-                                    current_trace.start_time or time.time(),
-                                    timezone.utc,
-                                ).isoformat(),
-                                "duration": current_trace.get_duration(),
-                                "trace_spans": [
-                                    span.model_dump()
-                                    for span in current_trace.trace_spans
-                                ],
-                                "offline_mode": self.offline_mode,
-                                "parent_trace_id": current_trace.parent_trace_id,
-                                "parent_name": current_trace.parent_name,
-                            }
-                            self.traces.append(complete_trace_data)
-                            self.reset_current_trace(trace_token)
-                        except Exception as e:
-                            judgeval_logger.warning(f"Issue with save: {e}")
-                            pass
+                        self._finish_root_trace(current_trace, trace_token)
                 else:
-                    with current_trace.span(span_name, span_type=span_type) as span:
-                        inputs = combine_args_kwargs(func, args, kwargs)
-                        span.record_input(inputs)
-                        if agent_name:
-                            span.record_agent_name(agent_name)
-
-                        # Capture state before execution
-                        self._conditionally_capture_and_record_state(
-                            span, args, is_before=True
-                        )
+                    with current_trace.span(
+                        span_name, span_type=span_type, capture_resources=plan.resources
+                    ) as span:
+                        # Record inputs and capture state before execution
+                        call = plan.enter(span, args, kwargs, started_ns)
 
                         try:
                             if self.deep_tracing:
@@ -1455,12 +2300,8 @@ class Tracer:
                             _capture_exception_for_trace(current_trace, sys.exc_info())
                             raise e
 
-                        # Capture state after execution
-                        self._conditionally_capture_and_record_state(
-                            span, args, is_before=False
-                        )
-
-                        span.record_output(result)
+                        # Capture state after execution and record output
+                        plan.leave(span, call, args, result)
                     return result
 
             return wrapper
@@ -1472,6 +2313,7 @@ class Tracer:
         exclude_methods: Optional[List[str]] = None,
         include_private: bool = False,
         warn_on_double_decoration: bool = True,
+        capture: Optional[PolicyLike] = None,
     ):
         """
         Automatically adds @observe(span_type="tool") to all methods in a class.
@@ -1481,6 +2323,7 @@ class Tracer:
             exclude_methods: List of method names to skip decorating. Defaults to common magic methods
             include_private: Whether to decorate methods starting with underscore. Defaults to False
             warn_on_double_decoration: Whether to print warnings when skipping already-decorated methods. Defaults to True
+            capture: What to record of each method call (see capture_policy.py). Defaults to the tracer's capture_policies for each method
         """
 
         if exclude_methods is None:
@@ -1513,7 +2356,13 @@ class Tracer:
                     continue
 
                 try:
-                    decorated_method = self.observe(method, span_type="tool")
+                    decorated_method = self.observe(
+                        method,
+                        span_type="tool",
+                        capture=capture
+                        if capture is not None
+                        else self.capture_policies.resolve(method, cls),
+                    )
                     setattr(cls, name, decorated_method)
                     decorated.append(name)
                 except Exception as e:
@@ -1598,6 +2447,30 @@ class Tracer:
         """Get the OpenTelemetry span processor instance."""
         return self.otel_span_processor
 
+    def instrument_opentelemetry(
+        self, tracer_provider: Optional[TracerProvider] = None
+    ) -> OpenTelemetryBridge:
+        """
+        Records spans from OpenTelemetry instrumentations as spans of the current
+        judgeval trace.
+
+        Args:
+            tracer_provider: The OpenTelemetry SDK TracerProvider the
+                instrumentations report to. Defaults to the global provider, which
+                is set to a new TracerProvider if none has been configured yet.
+        """
+        if tracer_provider is None:
+            global_provider = otel_trace.get_tracer_provider()
+            if isinstance(global_provider, TracerProvider):
+                tracer_provider = global_provider
+            else:
+                tracer_provider = TracerProvider()
+                otel_trace.set_tracer_provider(tracer_provider)
+
+        bridge = OpenTelemetryBridge(self)
+        tracer_provider.add_span_processor(bridge)
+        return bridge
+
     def flush_background_spans(self, timeout_millis: int = 30000):
         """Flush all pending spans in the background service."""
         self.otel_span_processor.force_flush(timeout_millis)
@@ -1691,25 +2564,25 @@ def wrap(
 
         return wrapper
 
-    if isinstance(client, (OpenAI)):
+    if _is_openai(client):
         client.chat.completions.create = wrapped(original_create)
         client.responses.create = wrapped(original_responses_create)
         client.beta.chat.completions.parse = wrapped(original_beta_parse)
-    elif isinstance(client, (AsyncOpenAI)):
+    elif _is_async_openai(client):
         client.chat.completions.create = wrapped_async(original_create)
         client.responses.create = wrapped_async(original_responses_create)
         client.beta.chat.completions.parse = wrapped_async(original_beta_parse)
-    elif isinstance(client, (Together)):
+    elif _is_together(client):
         client.chat.completions.create = wrapped(original_create)
-    elif isinstance(client, (AsyncTogether)):
+    elif _is_async_together(client):
         client.chat.completions.create = wrapped_async(original_create)
-    elif isinstance(client, (Anthropic)):
+    elif _is_anthropic(client):
         client.messages.create = wrapped(original_create)
-    elif isinstance(client, (AsyncAnthropic)):
+    elif _is_async_anthropic(client):
         client.messages.create = wrapped_async(original_create)
-    elif isinstance(client, (genai.Client)):
+    elif _is_genai(client):
         client.models.generate_content = wrapped(original_create)
-    elif isinstance(client, (genai.client.AsyncClient)):
+    elif _is_async_genai(client):
         client.models.generate_content = wrapped_async(original_create)
 
     return client
@@ -1718,6 +2591,74 @@ def wrap(
 # Helper functions for client-specific operations
 
 
+def _is_provider_instance(obj: Any, module_name: str, *class_names: str) -> bool:
+    """
+    isinstance() check against classes of an optional provider SDK.
+
+    The SDK is looked up in sys.modules instead of being imported: if it was never
+    imported, obj cannot be one of its instances.
+    """
+    module = sys.modules.get(module_name)
+    if module is None:
+        return False
+    classes = tuple(
+        cls for cls in (getattr(module, name, None) for name in class_names) if cls
+    )
+    return bool(classes) and isinstance(obj, classes)
+
+
+def _is_openai(client: Any) -> TypeGuard[OpenAI]:
+    return _is_provider_instance(client, "openai", "OpenAI")
+
+
+def _is_async_openai(client: Any) -> TypeGuard[AsyncOpenAI]:
+    return _is_provider_instance(client, "openai", "AsyncOpenAI")
+
+
+def _is_together(client: Any) -> TypeGuard[Together]:
+    return _is_provider_instance(client, "together", "Together")
+
+
+def _is_async_together(client: Any) -> TypeGuard[AsyncTogether]:
+    return _is_provider_instance(client, "together", "AsyncTogether")
+
+
+def _is_anthropic(client: Any) -> TypeGuard[Anthropic]:
+    return _is_provider_instance(client, "anthropic", "Anthropic")
+
+
+def _is_async_anthropic(client: Any) -> TypeGuard[AsyncAnthropic]:
+    return _is_provider_instance(client, "anthropic", "AsyncAnthropic")
+
+
+def _is_genai(client: Any) -> TypeGuard[genai.Client]:
+    return _is_provider_instance(client, "google.genai", "Client")
+
+
+def _is_async_genai(client: Any) -> TypeGuard[genai.client.AsyncClient]:
+    return _is_provider_instance(client, "google.genai.client", "AsyncClient")
+
+
+def _is_openai_client(client: Any) -> TypeGuard[Union[OpenAI, AsyncOpenAI]]:
+    return _is_openai(client) or _is_async_openai(client)
+
+
+def _is_together_client(client: Any) -> TypeGuard[Union[Together, AsyncTogether]]:
+    return _is_together(client) or _is_async_together(client)
+
+
+def _is_anthropic_client(
+    client: Any,
+) -> TypeGuard[Union[Anthropic, AsyncAnthropic]]:
+    return _is_anthropic(client) or _is_async_anthropic(client)
+
+
+def _is_google_client(
+    client: Any,
+) -> TypeGuard[Union[genai.Client, genai.client.AsyncClient]]:
+    return _is_genai(client) or _is_async_genai(client)
+
+
 def _get_client_config(
     client: ApiClient,
 ) -> tuple[str, Callable, Optional[Callable], Optional[Callable], Optional[Callable]]:
@@ -1737,7 +2678,7 @@ def _get_client_config(
     Raises:
         ValueError: If client type is not supported
     """
-    if isinstance(client, (OpenAI, AsyncOpenAI)):
+    if _is_openai_client(client):
         return (
             "OPENAI_API_CALL",
             client.chat.completions.create,
@@ -1745,9 +2686,9 @@ def _get_client_config(
             None,
             client.beta.chat.completions.parse,
         )
-    elif isinstance(client, (Together, AsyncTogether)):
+    elif _is_together_client(client):
         return "TOGETHER_API_CALL", client.chat.completions.create, None, None, None
-    elif isinstance(client, (Anthropic, AsyncAnthropic)):
+    elif _is_anthropic_client(client):
         return (
             "ANTHROPIC_API_CALL",
             client.messages.create,
@@ -1755,7 +2696,7 @@ def _get_client_config(
             client.messages.stream,
             None,
         )
-    elif isinstance(client, (genai.Client, genai.client.AsyncClient)):
+    elif _is_google_client(client):
         return "GOOGLE_API_CALL", client.models.generate_content, None, None, None
     raise ValueError(f"Unsupported client type: {type(client)}")
 
@@ -1780,7 +2721,11 @@ def _format_output_data(
     model_name = None
     message_content = None
 
-    if isinstance(client, (OpenAI, AsyncOpenAI)):
+    if _is_openai_client(client):
+        # openai is necessarily imported already if we got one of its clients
+        from openai.types.chat import ChatCompletion, ParsedChatCompletion
+        from openai.types.responses.response import Response
+
         if isinstance(response, ChatCompletion):
             model_name = response.model
             prompt_tokens = response.usage.prompt_tokens
@@ -1799,14 +2744,14 @@ def _format_output_data(
             message_content = "".join(seg.text for seg in response.output[0].content)
 
         # Note: LiteLLM seems to use cache_read_input_tokens to calculate the cost for OpenAI
-    elif isinstance(client, (Together, AsyncTogether)):
+    elif _is_together_client(client):
         model_name = "together_ai/" + response.model
         prompt_tokens = response.usage.prompt_tokens
         completion_tokens = response.usage.completion_tokens
         message_content = response.choices[0].message.content
 
         # As of 2025-07-14, Together does not do any input cache token tracking
-    elif isinstance(client, (genai.Client, genai.client.AsyncClient)):
+    elif _is_google_client(client):
         model_name = response.model_version
         prompt_tokens = response.usage_metadata.prompt_token_count
         completion_tokens = response.usage_metadata.candidates_token_count
@@ -1814,7 +2759,7 @@ def _format_output_data(
 
         if hasattr(response.usage_metadata, "cached_content_token_count"):
             cache_read_input_tokens = response.usage_metadata.cached_content_token_count
-    elif isinstance(client, (Anthropic, AsyncAnthropic)):
+    elif _is_anthropic_client(client):
         model_name = response.model
         prompt_tokens = response.usage.input_tokens
         completion_tokens = response.usage.output_tokens
@@ -1862,8 +2807,6 @@ def combine_args_kwargs(func, args, kwargs):
         A dictionary combining both args and kwargs
     """
     try:
-        import inspect
-
         sig = inspect.signature(func)
         param_names = list(sig.parameters.keys())
 
@@ -1882,6 +2825,9 @@ def combine_args_kwargs(func, args, kwargs):
 
 def cost_per_token(*args, **kwargs):
     try:
+        # litellm is slow to import; only pay for it once usage is actually recorded
+        from litellm import cost_per_token as _original_cost_per_token
+
         prompt_tokens_cost_usd_dollar, completion_tokens_cost_usd_dollar = (
             _original_cost_per_token(*args, **kwargs)
         )
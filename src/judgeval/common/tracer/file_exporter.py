@@ -0,0 +1,416 @@
+"""
+Local JSONL segment files for spans, evaluation runs and trace upserts.
+
+For batch jobs without access to the Judgment API, and for keeping a copy of what
+was traced while debugging an incident, the tracer can write everything it would
+upload to rotating segment files instead (Tracer(trace_file_dir=...) or the
+JUDGMENT_TRACE_FILE_DIR variable). `judgeval upload DIR` replays them later.
+
+Each line of a segment is a JSON object {"kind", "item"}, where kind is one of
+"spans", "evaluation_runs" or "traces" and item is exactly the payload entry the
+API client would have sent. Every batch is appended with a single write, so a crash
+loses at most the batch in flight; compressed segments hold one gzip member per
+batch, which gzip readers treat as a single stream. Segments are listed in
+manifest.jsonl once they are closed.
+
+Replays are recorded in uploaded.jsonl: {"segment"} once all of a segment went
+through, {"segment", "kind"} once all of its spans or traces did, and
+{"segment", "kind": "evaluation_runs", "positions"} for each batch of its
+evaluation runs, so running the upload again after a failure does not send
+anything twice.
+"""
+
+from __future__ import annotations
+
+import atexit
+import gzip
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+from judgeval.common.api import JudgmentApiClient
+from judgeval.common.logger import judgeval_logger
+from judgeval.common.tracer.collector import COLLECTOR_MESSAGE_KINDS, _fallback_encoder
+from judgeval.common.tracer.otel_exporter import JudgmentAPISpanExporter
+from judgeval.utils.fork import register_after_fork_in_child
+
+MANIFEST_FILE = "manifest.jsonl"
+UPLOADED_FILE = "uploaded.jsonl"
+SEGMENT_PREFIX = "segment-"
+
+
+def _append_line(path: str, entry: Dict[str, Any]):
+    # One O_APPEND write per line keeps lines from several processes intact
+    fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+    try:
+        os.write(fd, (json.dumps(entry) + "\n").encode("utf-8"))
+    finally:
+        os.close(fd)
+
+
+def _read_lines(path: str) -> List[Dict[str, Any]]:
+    if not os.path.exists(path):
+        return []
+    entries = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                entries.append(json.loads(line))
+            except ValueError:
+                continue
+    return entries
+
+
+class SegmentWriter:
+    """
+    Appends records to rotating segment files in a directory. A segment is closed
+    and added to the manifest once it reaches max_segment_bytes (as written to disk)
+    or has been open for max_segment_seconds.
+
+    Safe to share between threads. Forked children start segments of their own.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        max_segment_bytes: int = 64 * 1024 * 1024,
+        max_segment_seconds: float = 300.0,
+        compress: bool = False,
+    ):
+        self.directory = directory
+        self.max_segment_bytes = max_segment_bytes
+        self.max_segment_seconds = max_segment_seconds
+        self.compress = compress
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._fd: Optional[int] = None
+        self._segment: Optional[str] = None
+        self._segment_opened_at = 0.0
+        self._segment_bytes = 0
+        self._segment_records = 0
+
+        register_after_fork_in_child(self._after_fork_in_child)
+        atexit.register(self.close)
+
+    def write(self, kind: str, items: List[Any]):
+        if not items:
+            return
+        data = "".join(
+            json.dumps({"kind": kind, "item": item}, default=_fallback_encoder) + "\n"
+            for item in items
+        ).encode("utf-8")
+        if self.compress:
+            data = gzip.compress(data)
+
+        with self._lock:
+            if self._fd is not None and (
+                time.time() - self._segment_opened_at >= self.max_segment_seconds
+            ):
+                self._close_segment()
+            if self._fd is None:
+                self._open_segment()
+            assert self._fd is not None
+
+            view = memoryview(data)
+            while view:
+                written = os.write(self._fd, view)
+                view = view[written:]
+            self._segment_bytes += len(data)
+            self._segment_records += len(items)
+
+            if self._segment_bytes >= self.max_segment_bytes:
+                self._close_segment()
+
+    def _open_segment(self):
+        extension = ".jsonl.gz" if self.compress else ".jsonl"
+        self._segment = f"{SEGMENT_PREFIX}{time.time_ns()}-{os.getpid()}{extension}"
+        self._fd = os.open(
+            os.path.join(self.directory, self._segment),
+            os.O_WRONLY | os.O_APPEND | os.O_CREAT,
+            0o600,  # Segments hold traced inputs and outputs
+        )
+        self._segment_opened_at = time.time()
+        self._segment_bytes = 0
+        self._segment_records = 0
+
+    def _close_segment(self):
+        if self._fd is None:
+            return
+        os.close(self._fd)
+        self._fd = None
+        _append_line(
+            os.path.join(self.directory, MANIFEST_FILE),
+            {
+                "segment": self._segment,
+                "records": self._segment_records,
+                "bytes": self._segment_bytes,
+                "compressed": self.compress,
+                "opened_at": self._segment_opened_at,
+                "closed_at": time.time(),
+            },
+        )
+
+    def close(self):
+        """Closes the current segment, if any. Later writes start a new one."""
+        with self._lock:
+            self._close_segment()
+
+    def _after_fork_in_child(self):
+        # Closing the inherited descriptor leaves the parent's segment untouched;
+        # the parent still closes it and adds it to the manifest
+        self._lock = threading.Lock()
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+
+class FileApiClient(JudgmentApiClient):
+    """JudgmentApiClient that writes span, evaluation run and trace payloads to segment files."""
+
+    def __init__(self, writer: SegmentWriter):
+        # Nothing is sent, so no credentials are needed or written to disk
+        super().__init__(api_key="", organization_id="")
+        self.writer = writer
+
+    def send_spans_batch(self, spans: List[Dict[str, Any]]):
+        self.writer.write("spans", spans)
+        return {}
+
+    def send_evaluation_runs_batch(self, evaluation_entries):
+        self.writer.write("evaluation_runs", evaluation_entries)
+        return {}
+
+    def upsert_trace(self, trace_data: Dict[str, Any]):
+        self.writer.write("traces", [trace_data])
+        return {}
+
+
+class FileSpanExporter(JudgmentAPISpanExporter):
+    """
+    Span exporter that writes spans and evaluation runs to segment files in the
+    format of JudgmentAPISpanExporter, ready to be replayed with `judgeval upload`.
+    """
+
+    def __init__(self, writer: SegmentWriter):
+        self.api_client = FileApiClient(writer)
+        self.api_key_validation = None
+        self.writer = writer
+
+    def shutdown(self, timeout_millis: int = 30000) -> None:
+        self.writer.close()
+
+
+def read_segment(path: str) -> Iterator[Tuple[str, Any]]:
+    """Yields the (kind, item) records of a segment, skipping damaged lines."""
+    opener: Callable[..., Any] = gzip.open if path.endswith(".gz") else open
+    try:
+        with opener(path, "rt", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # A line cut short by a crash
+                    judgeval_logger.warning(f"Skipping malformed record in {path}")
+                    continue
+                if record.get("kind") in COLLECTOR_MESSAGE_KINDS:
+                    yield record["kind"], record.get("item")
+    except (EOFError, gzip.BadGzipFile) as e:
+        judgeval_logger.warning(f"Segment {path} ends with an incomplete batch: {e}")
+
+
+def pending_segments(directory: str, include_open: bool = False) -> List[str]:
+    """
+    Segment names that have not been uploaded yet, oldest first. Open segments (not
+    in the manifest yet) are only included with include_open, e.g. to recover the
+    files of a process that was killed.
+    """
+    uploaded = {
+        entry.get("segment")
+        for entry in _read_lines(os.path.join(directory, UPLOADED_FILE))
+        if "kind" not in entry
+    }
+    segments: Set[str] = {
+        entry["segment"]
+        for entry in _read_lines(os.path.join(directory, MANIFEST_FILE))
+        if entry.get("segment")
+    }
+    if include_open:
+        segments.update(
+            name for name in os.listdir(directory) if name.startswith(SEGMENT_PREFIX)
+        )
+    return sorted(
+        name
+        for name in segments - uploaded
+        if os.path.exists(os.path.join(directory, name))
+    )
+
+
+@dataclass
+class UploadResult:
+    segments: List[str] = field(default_factory=list)
+    spans: int = 0
+    evaluation_runs: int = 0
+    traces: int = 0
+    failed_batches: int = 0
+
+
+@dataclass
+class _SegmentProgress:
+    """What of a partially uploaded segment already went through."""
+
+    kinds: Set[str] = field(default_factory=set)
+    evaluation_runs: Set[int] = field(default_factory=set)
+
+
+def _upload_progress(directory: str) -> Dict[str, _SegmentProgress]:
+    progress: Dict[str, _SegmentProgress] = defaultdict(_SegmentProgress)
+    for entry in _read_lines(os.path.join(directory, UPLOADED_FILE)):
+        segment, kind = entry.get("segment"), entry.get("kind")
+        if not segment or kind is None:
+            continue
+        if kind == "evaluation_runs" and "positions" in entry:
+            progress[segment].evaluation_runs.update(entry["positions"])
+        else:
+            progress[segment].kinds.add(kind)
+    return progress
+
+
+def upload_segments(
+    directory: str,
+    api_client: JudgmentApiClient,
+    batch_size: int = 500,
+    max_workers: int = 4,
+    include_open: bool = False,
+) -> UploadResult:
+    """
+    Replays pending segments to the Judgment API, oldest first, one segment at a
+    time with max_workers parallel batches.
+
+    Only the latest update (highest update_id) of each span in a segment and the
+    last save of each trace are sent. Both are upserts and the API keeps the
+    highest update_id of a span, so sending them again after a failure is
+    harmless. Evaluation runs are not upserts; each batch of them is recorded as
+    soon as it went through and is not sent again.
+    """
+    result = UploadResult(segments=pending_segments(directory, include_open))
+    progress = _upload_progress(directory)
+    uploaded_path = os.path.join(directory, UPLOADED_FILE)
+
+    def run(job: Tuple[Callable[[Any], Any], Any, Optional[Dict[str, Any]]]) -> bool:
+        send, payload, record = job
+        try:
+            send(payload)
+        except Exception as e:
+            judgeval_logger.error(f"Upload of {send.__name__} batch failed: {e}")
+            return False
+        if record is not None:
+            _append_line(uploaded_path, {**record, "uploaded_at": time.time()})
+        return True
+
+    with ThreadPoolExecutor(
+        max_workers=max_workers, thread_name_prefix="judgeval-upload"
+    ) as executor:
+        for segment in result.segments:
+            failed_batches = _upload_segment(
+                directory,
+                segment,
+                api_client,
+                progress[segment],
+                batch_size,
+                lambda jobs: sum(not ok for ok in executor.map(run, jobs)),
+                result,
+            )
+            result.failed_batches += failed_batches
+            if failed_batches == 0:
+                _append_line(
+                    uploaded_path, {"segment": segment, "uploaded_at": time.time()}
+                )
+    return result
+
+
+def _upload_segment(
+    directory: str,
+    segment: str,
+    api_client: JudgmentApiClient,
+    progress: _SegmentProgress,
+    batch_size: int,
+    run_jobs: Callable[[List[Any]], int],
+    result: UploadResult,
+) -> int:
+    """Uploads what is left of a segment; returns the number of failed batches."""
+    spans: Dict[str, Dict[str, Any]] = {}
+    evaluation_runs: List[Tuple[int, Any]] = []
+    traces: Dict[str, Dict[str, Any]] = {}
+    position = 0
+    for kind, item in read_segment(os.path.join(directory, segment)):
+        if kind == "spans":
+            span_id = item.get("span_id")
+            current = spans.get(span_id)
+            if current is None or item.get("update_id", 0) >= current.get(
+                "update_id", 0
+            ):
+                spans[span_id] = item
+        elif kind == "evaluation_runs":
+            if position not in progress.evaluation_runs:
+                evaluation_runs.append((position, item))
+            position += 1
+        else:
+            traces[item.get("trace_id")] = item
+
+    if "traces" in progress.kinds:
+        traces = {}
+    if "spans" in progress.kinds:
+        spans = {}
+    result.spans += len(spans)
+    result.evaluation_runs += len(evaluation_runs)
+    result.traces += len(traces)
+
+    failed_batches = 0
+    # Traces first, as during live tracing where the initial save precedes the spans
+    if traces:
+        trace_jobs = [
+            (api_client.upsert_trace, trace_data, None)
+            for trace_data in traces.values()
+        ]
+        failed_traces = run_jobs(trace_jobs)
+        failed_batches += failed_traces
+        if not failed_traces:
+            _append_line(
+                os.path.join(directory, UPLOADED_FILE),
+                {"segment": segment, "kind": "traces", "uploaded_at": time.time()},
+            )
+
+    span_items = list(spans.values())
+    span_jobs = [
+        (api_client.send_spans_batch, span_items[start : start + batch_size], None)
+        for start in range(0, len(span_items), batch_size)
+    ]
+    evaluation_run_jobs = [
+        (
+            api_client.send_evaluation_runs_batch,
+            [item for _, item in batch],
+            {
+                "segment": segment,
+                "kind": "evaluation_runs",
+                "positions": [position for position, _ in batch],
+            },
+        )
+        for batch in (
+            evaluation_runs[start : start + batch_size]
+            for start in range(0, len(evaluation_runs), batch_size)
+        )
+    ]
+    failed_spans = run_jobs(span_jobs)
+    failed_batches += failed_spans + run_jobs(evaluation_run_jobs)
+    if span_jobs and not failed_spans:
+        _append_line(
+            os.path.join(directory, UPLOADED_FILE),
+            {"segment": segment, "kind": "spans", "uploaded_at": time.time()},
+        )
+    return failed_batches
@@ -0,0 +1,178 @@
+"""
+Flame graph export of traces for standard profilers.
+
+Traces (including the spans _DeepTracer records for every user function call) are
+converted to stacks of function names from the root span down, weighted by:
+
+- "wall": a span's duration minus its children's durations; frames are as wide as
+  the spans' durations, except that concurrent children add up
+- "self": a span's self time (see analysis.py); concurrent children count once
+- "tokens": total tokens used by LLM spans
+- "cost": total cost in USD of LLM spans
+
+Stacks of many traces are merged, so a flame graph of all traces with the same
+name shows where that kind of request spends its time or money.
+
+    write_speedscope(tracer.traces, "agent.speedscope.json", weight="self")
+
+to_speedscope produces a speedscope file (https://www.speedscope.app) with one
+sampled profile per trace name. format_collapsed produces the collapsed-stack
+format of flamegraph.pl, inferno and speedscope; its weights are integers, so
+times are in microseconds and cost in millionths of a dollar.
+"""
+
+from __future__ import annotations
+
+import json
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from judgeval.common.tracer.analysis import (
+    SpanTiming,
+    TraceLike,
+    _field,
+    analyze_trace,
+)
+
+WEIGHTS = ("wall", "self", "tokens", "cost")
+
+SPEEDSCOPE_SCHEMA = "https://www.speedscope.app/file-format-schema.json"
+_SPEEDSCOPE_UNITS = {
+    "wall": "seconds",
+    "self": "seconds",
+    "tokens": "none",
+    "cost": "none",
+}
+# Collapsed stacks need integer weights
+_COLLAPSED_SCALE = {
+    "wall": 1_000_000,
+    "self": 1_000_000,
+    "tokens": 1,
+    "cost": 1_000_000,
+}
+
+Stacks = Dict[Tuple[str, ...], float]
+
+
+def _usage(timing: SpanTiming, name: str) -> float:
+    usage = _field(timing.span, "usage") if timing.span is not None else None
+    if usage is None:
+        return 0.0
+    return _field(usage, name) or 0.0
+
+
+def _frame_weight(timing: SpanTiming, weight: str) -> float:
+    if weight == "wall":
+        children_time = sum(child.total_time for child in timing.children)
+        return max(timing.total_time - children_time, 0.0)
+    if weight == "self":
+        return timing.self_time
+    if weight == "tokens":
+        return _usage(timing, "total_tokens")
+    return _usage(timing, "total_cost_usd")
+
+
+def collapse_stacks(
+    traces: Iterable[TraceLike], weight: str = "wall", stacks: Optional[Stacks] = None
+) -> Stacks:
+    """
+    Merges the spans of traces into {(root function, ..., function): weight}, the
+    weight each stack has by itself, not counting deeper stacks.
+    """
+    if weight not in WEIGHTS:
+        raise ValueError(f"weight must be one of {', '.join(WEIGHTS)}, got {weight!r}")
+    stacks = defaultdict(float, stacks or {})
+    for trace in traces:
+        pending: List[Tuple[SpanTiming, Tuple[str, ...]]] = [
+            (root, (root.function,)) for root in analyze_trace(trace).roots
+        ]
+        while pending:
+            timing, stack = pending.pop()
+            value = _frame_weight(timing, weight)
+            if value:
+                stacks[stack] += value
+            pending.extend(
+                (child, stack + (child.function,)) for child in timing.children
+            )
+    return dict(stacks)
+
+
+def format_collapsed(stacks: Stacks, weight: str = "wall") -> str:
+    """Collapsed-stack lines, "root;child;grandchild <integer weight>"."""
+    scale = _COLLAPSED_SCALE[weight]
+    lines = []
+    for stack, value in sorted(stacks.items()):
+        scaled = round(value * scale)
+        if scaled:
+            # ";" separates frames, so it can't appear in a frame name
+            frames = ";".join(frame.replace(";", ":") for frame in stack)
+            lines.append(f"{frames} {scaled}")
+    return "\n".join(lines) + "\n" if lines else ""
+
+
+def _trace_name(trace: TraceLike) -> str:
+    if isinstance(trace, dict):
+        return trace.get("name") or "trace"
+    return getattr(trace, "name", None) or "trace"
+
+
+def to_speedscope(
+    traces: Iterable[TraceLike], weight: str = "wall", name: str = "judgeval traces"
+) -> Dict[str, Any]:
+    """A speedscope file with one sampled profile per trace name."""
+    stacks_by_name: Dict[str, Stacks] = {}
+    for trace in traces:
+        trace_name = _trace_name(trace)
+        stacks_by_name[trace_name] = collapse_stacks(
+            [trace], weight, stacks_by_name.get(trace_name)
+        )
+
+    frames: List[Dict[str, str]] = []
+    frame_index: Dict[str, int] = {}
+    profiles = []
+    for trace_name, stacks in stacks_by_name.items():
+        samples = []
+        weights = []
+        for stack, value in sorted(stacks.items()):
+            indices = []
+            for frame in stack:
+                if frame not in frame_index:
+                    frame_index[frame] = len(frames)
+                    frames.append({"name": frame})
+                indices.append(frame_index[frame])
+            samples.append(indices)
+            weights.append(value)
+        profiles.append(
+            {
+                "type": "sampled",
+                "name": trace_name,
+                "unit": _SPEEDSCOPE_UNITS[weight],
+                "startValue": 0,
+                "endValue": sum(weights),
+                "samples": samples,
+                "weights": weights,
+            }
+        )
+
+    return {
+        "$schema": SPEEDSCOPE_SCHEMA,
+        "name": name,
+        "exporter": "judgeval",
+        "activeProfileIndex": 0,
+        "shared": {"frames": frames},
+        "profiles": profiles,
+    }
+
+
+def write_speedscope(
+    traces: Iterable[TraceLike], path: str, weight: str = "wall"
+) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(to_speedscope(traces, weight), f)
+
+
+def write_collapsed(
+    traces: Iterable[TraceLike], path: str, weight: str = "wall"
+) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(format_collapsed(collapse_stacks(traces, weight), weight))
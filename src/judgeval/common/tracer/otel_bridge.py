@@ -0,0 +1,199 @@
+"""
+Bridge from the standard OpenTelemetry SDK into judgeval traces.
+
+Spans recorded by OpenTelemetry auto-instrumentations (httpx, requests, database
+drivers, web frameworks, ...) become TraceSpans of the judgeval trace that is
+active when they start, so HTTP and database latency shows up inside agent traces
+without instrumenting those libraries twice:
+
+    tracer = Tracer(project_name="my-agent")
+    tracer.instrument_opentelemetry()
+    HTTPXClientInstrumentor().instrument()
+
+A foreign span is parented to the foreign span it was started under if that span
+was bridged too, and otherwise to the current judgeval span. Spans started outside
+of a judgeval trace are ignored.
+"""
+
+from __future__ import annotations
+
+import threading
+import uuid
+from typing import TYPE_CHECKING, Any, Dict, NamedTuple, Optional, Tuple
+
+from opentelemetry.context import Context
+from opentelemetry.sdk.trace import ReadableSpan, Span, SpanProcessor
+from opentelemetry.trace import StatusCode
+
+from judgeval.data import TraceSpan, TraceUsage
+from judgeval.utils.fork import register_after_fork_in_child
+
+if TYPE_CHECKING:
+    from judgeval.common.tracer.core import TraceClient, Tracer
+
+# gen_ai semantic convention attributes read back into TraceUsage, the reverse of
+# the mapping used for OTLP export
+_GEN_AI_USAGE_FIELDS = {
+    "gen_ai.usage.input_tokens": "prompt_tokens",
+    "gen_ai.usage.output_tokens": "completion_tokens",
+    "gen_ai.response.model": "model_name",
+}
+
+
+class _BridgedSpan(NamedTuple):
+    trace_client: TraceClient
+    span_id: str
+    parent_span_id: Optional[str]
+    depth: int
+
+
+def _attribute_value(value: Any) -> Any:
+    # OpenTelemetry stores sequence attributes as tuples
+    return list(value) if isinstance(value, tuple) else value
+
+
+class OpenTelemetryBridge(SpanProcessor):
+    """
+    OpenTelemetry span processor that records finished foreign spans as completed
+    TraceSpans. Register it with Tracer.instrument_opentelemetry, or add it to a
+    TracerProvider directly.
+    """
+
+    def __init__(self, tracer: Tracer):
+        self.tracer = tracer
+        self._bridged: Dict[Tuple[int, int], _BridgedSpan] = {}
+        self._lock = threading.Lock()
+
+        register_after_fork_in_child(self._after_fork_in_child)
+
+    def _after_fork_in_child(self) -> None:
+        # Foreign spans open in the parent are finished (and bridged) by the parent
+        self._lock = threading.Lock()
+        self._bridged = {}
+
+    def on_start(self, span: Span, parent_context: Optional[Context] = None) -> None:
+        parent = span.parent
+        with self._lock:
+            bridged_parent = (
+                self._bridged.get((parent.trace_id, parent.span_id))
+                if parent is not None
+                else None
+            )
+
+        if bridged_parent is not None:
+            trace_client = bridged_parent.trace_client
+            parent_span_id: Optional[str] = bridged_parent.span_id
+            depth = bridged_parent.depth + 1
+        else:
+            current_trace = self.tracer.get_current_trace()
+            if current_trace is None:
+                return
+            trace_client = current_trace
+            parent_span_id = (
+                self.tracer.get_current_span() or trace_client.parent_span_id
+            )
+            depth = (
+                trace_client._span_depths[parent_span_id] + 1
+                if parent_span_id in trace_client._span_depths
+                else 0
+            )
+
+        with self._lock:
+            self._bridged[(span.context.trace_id, span.context.span_id)] = _BridgedSpan(
+                trace_client, str(uuid.uuid4()), parent_span_id, depth
+            )
+
+    def on_end(self, span: ReadableSpan) -> None:
+        if span.context is None:
+            return
+        with self._lock:
+            bridged = self._bridged.pop(
+                (span.context.trace_id, span.context.span_id), None
+            )
+        if bridged is None:
+            return
+
+        trace_span = self._to_trace_span(span, bridged)
+        trace_client = bridged.trace_client
+        trace_client.add_span(trace_span)
+        trace_client.otel_span_processor.queue_span_update(
+            trace_span, span_state="completed"
+        )
+        trace_client.on_span_completed(trace_span)
+
+    def _to_trace_span(self, span: ReadableSpan, bridged: _BridgedSpan) -> TraceSpan:
+        attributes = {
+            key: _attribute_value(value)
+            for key, value in (span.attributes or {}).items()
+        }
+        start_time = span.start_time or span.end_time or 0
+        end_time = span.end_time or start_time
+
+        usage_fields = {
+            field_name: attributes[attr_name]
+            for attr_name, field_name in _GEN_AI_USAGE_FIELDS.items()
+            if attributes.get(attr_name) is not None
+        }
+        if "prompt_tokens" in usage_fields and "completion_tokens" in usage_fields:
+            usage_fields["total_tokens"] = (
+                usage_fields["prompt_tokens"] + usage_fields["completion_tokens"]
+            )
+        usage = TraceUsage(**usage_fields) if usage_fields else None
+
+        return TraceSpan(
+            span_id=bridged.span_id,
+            trace_id=bridged.trace_client.trace_id,
+            depth=bridged.depth,
+            message=span.name,
+            function=span.name,
+            created_at=start_time / 1_000_000_000,
+            duration=(end_time - start_time) / 1_000_000_000,
+            span_type="llm" if usage is not None else "span",
+            parent_span_id=bridged.parent_span_id,
+            usage=usage,
+            error=self._error(span),
+            additional_metadata={
+                "otel": {
+                    "trace_id": format(span.context.trace_id, "032x"),
+                    "span_id": format(span.context.span_id, "016x"),
+                    "kind": span.kind.name,
+                    "instrumentation_scope": (
+                        span.instrumentation_scope.name
+                        if span.instrumentation_scope
+                        else None
+                    ),
+                    "attributes": attributes,
+                }
+            },
+        )
+
+    @staticmethod
+    def _error(span: ReadableSpan) -> Optional[Dict[str, Any]]:
+        if span.status.status_code != StatusCode.ERROR:
+            return None
+
+        # Same shape as errors captured from observed functions
+        error: Dict[str, Any] = {
+            "type": "Error",
+            "message": span.status.description or "",
+            "traceback": [],
+        }
+        for event in span.events:
+            if event.name != "exception" or not event.attributes:
+                continue
+            error["type"] = event.attributes.get("exception.type", error["type"])
+            error["message"] = event.attributes.get(
+                "exception.message", error["message"]
+            )
+            stacktrace = event.attributes.get("exception.stacktrace")
+            if stacktrace:
+                error["traceback"] = [str(stacktrace)]
+            break
+        return error
+
+    def shutdown(self) -> None:
+        with self._lock:
+            self._bridged.clear()
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        return True
@@ -7,7 +7,7 @@ The BatchSpanProcessor handles all batching, threading, and retry logic.
 
 from __future__ import annotations
 
-from typing import Any, Dict, List, Sequence
+from typing import Any, Dict, List, Optional, Sequence, TYPE_CHECKING
 
 from opentelemetry.sdk.trace.export import SpanExporter, SpanExportResult
 from opentelemetry.sdk.trace import ReadableSpan
@@ -15,6 +15,11 @@ from opentelemetry.sdk.trace import ReadableSpan
 from judgeval.common.tracer.span_transformer import SpanTransformer
 from judgeval.common.logger import judgeval_logger
 from judgeval.common.api.api import JudgmentApiClient
+from judgeval.common.tracer.collector import CollectorApiClient, CollectorClient
+from judgeval.constants import API_KEY_VALIDATION_TIMEOUT_SECONDS
+
+if TYPE_CHECKING:
+    from judgeval.common.utils import BackgroundAPIKeyValidation
 
 
 class JudgmentAPISpanExporter(SpanExporter):
@@ -29,8 +34,17 @@ class JudgmentAPISpanExporter(SpanExporter):
         self,
         judgment_api_key: str,
         organization_id: str,
+        api_key_validation: Optional[BackgroundAPIKeyValidation] = None,
+        collector: Optional[CollectorClient] = None,
     ):
-        self.api_client = JudgmentApiClient(judgment_api_key, organization_id)
+        self.api_client: JudgmentApiClient
+        if collector is not None:
+            self.api_client = CollectorApiClient(
+                judgment_api_key, organization_id, collector
+            )
+        else:
+            self.api_client = JudgmentApiClient(judgment_api_key, organization_id)
+        self.api_key_validation = api_key_validation
 
     def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
         """
@@ -42,6 +56,17 @@ class JudgmentAPISpanExporter(SpanExporter):
         if not spans:
             return SpanExportResult.SUCCESS
 
+        if self.api_key_validation is not None:
+            # Hold the batch until the API key is known to be valid, but never
+            # block the export thread (and shutdown at exit) on a hung validation
+            result, _ = self.api_key_validation.wait(API_KEY_VALIDATION_TIMEOUT_SECONDS)
+            if not result:
+                if not self.api_key_validation.done:
+                    judgeval_logger.warning(
+                        f"API key validation did not finish within {API_KEY_VALIDATION_TIMEOUT_SECONDS}s, dropping {len(spans)} span(s)"
+                    )
+                return SpanExportResult.FAILURE
+
         try:
             spans_data = []
             eval_runs_data = []
@@ -106,3 +131,42 @@ class JudgmentAPISpanExporter(SpanExporter):
     def force_flush(self, timeout_millis: int = 30000) -> bool:
         """Force flush any pending requests."""
         return True
+
+
+class FanOutSpanExporter(SpanExporter):
+    """
+    Exports each batch to several exporters, e.g. the Judgment API and an OTLP
+    collector. Spans are converted to OpenTelemetry format once by the span
+    processor and the same batch is handed to every exporter, so attributes are not
+    serialized again per destination. A failing exporter does not stop the others.
+    """
+
+    def __init__(self, exporters: Sequence[SpanExporter]):
+        self.exporters = list(exporters)
+
+    def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
+        result = SpanExportResult.SUCCESS
+        for exporter in self.exporters:
+            try:
+                if exporter.export(spans) != SpanExportResult.SUCCESS:
+                    result = SpanExportResult.FAILURE
+            except Exception as e:
+                judgeval_logger.error(
+                    f"Error exporting spans with {type(exporter).__name__}: {e}"
+                )
+                result = SpanExportResult.FAILURE
+        return result
+
+    def shutdown(self) -> None:
+        for exporter in self.exporters:
+            try:
+                exporter.shutdown()
+            except Exception as e:
+                judgeval_logger.warning(
+                    f"Error shutting down {type(exporter).__name__}: {e}"
+                )
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        return all(
+            [exporter.force_flush(timeout_millis) for exporter in self.exporters]
+        )
@@ -8,21 +8,34 @@ of TraceSpan objects converted to OpenTelemetry format.
 from __future__ import annotations
 
 import threading
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Sequence, TYPE_CHECKING
 
 from opentelemetry.context import Context
 from opentelemetry.sdk.trace import ReadableSpan
-from opentelemetry.sdk.trace.export import BatchSpanProcessor, SpanProcessor
+from opentelemetry.sdk.trace.export import (
+    BatchSpanProcessor,
+    SpanExporter,
+    SpanProcessor,
+)
 from opentelemetry.trace import Span, Status, StatusCode, SpanContext, TraceFlags
 from opentelemetry.trace.span import TraceState, INVALID_SPAN_CONTEXT
 from opentelemetry.util.types import Attributes
 
 from judgeval.common.logger import judgeval_logger
-from judgeval.common.tracer.otel_exporter import JudgmentAPISpanExporter
+from judgeval.common.tracer.collector import CollectorClient
+from judgeval.common.tracer.file_exporter import FileSpanExporter, SegmentWriter
+from judgeval.common.tracer.otel_exporter import (
+    FanOutSpanExporter,
+    JudgmentAPISpanExporter,
+)
 from judgeval.common.tracer.span_processor import SpanProcessorBase
 from judgeval.common.tracer.span_transformer import SpanTransformer
 from judgeval.data import TraceSpan
 from judgeval.evaluation_run import EvaluationRun
+from judgeval.utils.fork import register_after_fork_in_child
+
+if TYPE_CHECKING:
+    from judgeval.common.utils import BackgroundAPIKeyValidation
 
 
 class SimpleReadableSpan(ReadableSpan):
@@ -133,6 +146,9 @@ class JudgmentSpanProcessor(SpanProcessor, SpanProcessorBase):
     """
     Span processor that converts TraceSpan objects to OpenTelemetry format
     and uses BatchSpanProcessor for export.
+
+    Batches go to the Judgment API, or to segment files when a trace_file_writer is
+    given, and to any additional span_exporters, such as a JudgmentOTLPSpanExporter.
     """
 
     def __init__(
@@ -143,6 +159,10 @@ class JudgmentSpanProcessor(SpanProcessor, SpanProcessorBase):
         flush_interval: float = 1.0,
         max_queue_size: int = 2048,
         export_timeout: int = 30000,
+        api_key_validation: Optional[BackgroundAPIKeyValidation] = None,
+        collector: Optional[CollectorClient] = None,
+        span_exporters: Optional[Sequence[SpanExporter]] = None,
+        trace_file_writer: Optional[SegmentWriter] = None,
     ):
         self.judgment_api_key = judgment_api_key
         self.organization_id = organization_id
@@ -151,17 +171,37 @@ class JudgmentSpanProcessor(SpanProcessor, SpanProcessorBase):
         self._span_states: Dict[str, str] = {}
         self._cache_lock = threading.RLock()
 
-        self.batch_processor = BatchSpanProcessor(
-            JudgmentAPISpanExporter(
+        self.exporter: SpanExporter
+        if trace_file_writer is not None:
+            self.exporter = FileSpanExporter(trace_file_writer)
+        else:
+            self.exporter = JudgmentAPISpanExporter(
                 judgment_api_key=judgment_api_key,
                 organization_id=organization_id,
-            ),
+                api_key_validation=api_key_validation,
+                collector=collector,
+            )
+        if span_exporters:
+            self.exporter = FanOutSpanExporter([self.exporter, *span_exporters])
+
+        self.batch_processor = BatchSpanProcessor(
+            self.exporter,
             max_queue_size=max_queue_size,
             schedule_delay_millis=int(flush_interval * 1000),
             max_export_batch_size=batch_size,
             export_timeout_millis=export_timeout,
         )
 
+        register_after_fork_in_child(self._after_fork_in_child)
+
+    def _after_fork_in_child(self) -> None:
+        # BatchSpanProcessor restarts its own worker thread and empties its queue in
+        # forked children. Our cache lock may have been held by a parent thread, and
+        # the cached in-flight spans belong to the parent, which still exports them.
+        self._cache_lock = threading.RLock()
+        self._span_cache.clear()
+        self._span_states.clear()
+
     def on_start(self, span: Span, parent_context: Optional[Context] = None) -> None:
         self.batch_processor.on_start(span, parent_context)
 
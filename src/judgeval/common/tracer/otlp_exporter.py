@@ -0,0 +1,201 @@
+"""
+OTLP export of judgeval spans to a standard OpenTelemetry collector.
+
+JudgmentSpanProcessor sends every incremental update of a span (input, output,
+usage, ...) so the Judgment UI can show spans while they run. A collector expects
+each span once, so JudgmentOTLPSpanExporter only forwards completed spans, rebuilt
+as regular OpenTelemetry spans:
+
+- span IDs are the low 64 bits of the judgeval span UUID, the same parent-id that
+  traceparent propagation uses; the full IDs stay in judgment.span_id and
+  judgment.parent_span_id
+- attributes follow SpanTransformer.otel_attributes_to_otlp_attributes
+- errors set an ERROR status and an `exception` event
+
+The OTLP exporters are an optional dependency: pip install "judgeval[otlp]", or
+opentelemetry-exporter-otlp-proto-grpc for the grpc protocol.
+"""
+
+from __future__ import annotations
+
+import importlib.metadata
+import json
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+
+from opentelemetry.sdk.resources import SERVICE_NAME, Resource
+from opentelemetry.sdk.trace import Event, ReadableSpan
+from opentelemetry.sdk.trace.export import SpanExporter, SpanExportResult
+from opentelemetry.sdk.util.instrumentation import InstrumentationScope
+from opentelemetry.trace import SpanContext, SpanKind, Status, StatusCode, TraceFlags
+
+from judgeval.common.logger import judgeval_logger
+from judgeval.common.tracer.propagation import _span_id_to_parent_id
+from judgeval.common.tracer.span_transformer import SpanTransformer
+
+OTLP_PROTOCOLS = ("http/protobuf", "grpc")
+
+
+def _judgeval_version() -> str:
+    try:
+        return importlib.metadata.version("judgeval")
+    except importlib.metadata.PackageNotFoundError:
+        return "unknown"
+
+
+def _to_otel_span_id(span_id: Any) -> Optional[int]:
+    """The OpenTelemetry id of a judgeval span id attribute, or None if it has none."""
+    if not isinstance(span_id, str) or not span_id:
+        return None
+    try:
+        return int(_span_id_to_parent_id(span_id), 16) or None
+    except ValueError:
+        return None
+
+
+def create_otlp_exporter(
+    endpoint: Optional[str] = None,
+    protocol: str = "http/protobuf",
+    headers: Optional[Mapping[str, str]] = None,
+    timeout: Optional[float] = None,
+) -> SpanExporter:
+    """
+    Creates the OpenTelemetry OTLP span exporter for protocol. Unset options fall
+    back to the standard OTEL_EXPORTER_OTLP_* environment variables.
+    """
+    if protocol == "http/protobuf":
+        package = "opentelemetry-exporter-otlp-proto-http"
+        try:
+            from opentelemetry.exporter.otlp.proto.http.trace_exporter import (
+                OTLPSpanExporter,
+            )
+        except ImportError as e:
+            raise ImportError(
+                f"OTLP export over {protocol} requires the {package} package. "
+                'Install it with: pip install "judgeval[otlp]"'
+            ) from e
+    elif protocol == "grpc":
+        package = "opentelemetry-exporter-otlp-proto-grpc"
+        try:
+            from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import (  # type: ignore[no-redef]
+                OTLPSpanExporter,
+            )
+        except ImportError as e:
+            raise ImportError(
+                f"OTLP export over {protocol} requires the {package} package. "
+                f"Install it with: pip install {package}"
+            ) from e
+    else:
+        raise ValueError(
+            f"Unsupported OTLP protocol {protocol!r}, expected one of {OTLP_PROTOCOLS}"
+        )
+
+    return OTLPSpanExporter(
+        endpoint=endpoint,
+        headers=dict(headers) if headers is not None else None,
+        timeout=timeout,
+    )
+
+
+class JudgmentOTLPSpanExporter(SpanExporter):
+    """
+    Forwards completed judgeval spans to an OTLP span exporter, e.g. one created by
+    create_otlp_exporter. Incremental span updates and evaluation runs are skipped.
+    """
+
+    def __init__(
+        self,
+        exporter: SpanExporter,
+        service_name: str = "judgeval",
+        resource_attributes: Optional[Dict[str, Any]] = None,
+    ):
+        self.exporter = exporter
+        self.resource = Resource.create(
+            {SERVICE_NAME: service_name, **(resource_attributes or {})}
+        )
+        self.instrumentation_scope = InstrumentationScope(
+            "judgeval", _judgeval_version()
+        )
+
+    def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
+        otlp_spans = []
+        for span in spans:
+            attributes = span.attributes or {}
+            if attributes.get("judgment.evaluation_run"):
+                continue
+            if attributes.get("judgment.span_state", "completed") != "completed":
+                continue
+            otlp_span = self._to_otlp_span(span)
+            if otlp_span is not None:
+                otlp_spans.append(otlp_span)
+
+        if not otlp_spans:
+            return SpanExportResult.SUCCESS
+        return self.exporter.export(otlp_spans)
+
+    def _to_otlp_span(self, span: ReadableSpan) -> Optional[ReadableSpan]:
+        attributes = dict(span.attributes or {})
+        span_id = _to_otel_span_id(attributes.get("judgment.span_id"))
+        if span_id is None or not span.context.trace_id:
+            judgeval_logger.warning(f"Skipping OTLP export of span {span.name!r}")
+            return None
+
+        trace_flags = TraceFlags(TraceFlags.SAMPLED)
+        context = SpanContext(
+            trace_id=span.context.trace_id,
+            span_id=span_id,
+            is_remote=False,
+            trace_flags=trace_flags,
+        )
+        parent_span_id = _to_otel_span_id(attributes.get("judgment.parent_span_id"))
+        parent = (
+            SpanContext(
+                trace_id=span.context.trace_id,
+                span_id=parent_span_id,
+                is_remote=False,
+                trace_flags=trace_flags,
+            )
+            if parent_span_id is not None
+            else None
+        )
+
+        events: List[Event] = []
+        status = Status(StatusCode.OK)
+        error = SpanTransformer._safe_json_handle(
+            attributes.get("judgment.error"), serialize=False
+        )
+        if isinstance(error, dict):
+            message = str(error.get("message", ""))
+            status = Status(StatusCode.ERROR, message)
+            events.append(
+                Event(
+                    "exception",
+                    attributes={
+                        "exception.type": str(error.get("type", "")),
+                        "exception.message": message,
+                        "exception.stacktrace": "".join(error.get("traceback") or []),
+                    },
+                    timestamp=span.end_time or span.start_time,
+                )
+            )
+        elif error is not None:
+            status = Status(StatusCode.ERROR, json.dumps(error, default=str))
+
+        return ReadableSpan(
+            name=span.name,
+            context=context,
+            parent=parent,
+            resource=self.resource,
+            attributes=SpanTransformer.otel_attributes_to_otlp_attributes(attributes),
+            events=events,
+            kind=SpanKind.INTERNAL,
+            status=status,
+            start_time=span.start_time,
+            end_time=span.end_time,
+            instrumentation_scope=self.instrumentation_scope,
+        )
+
+    def shutdown(self) -> None:
+        self.exporter.shutdown()
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        return self.exporter.force_flush(timeout_millis)
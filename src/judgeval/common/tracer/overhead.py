@@ -0,0 +1,244 @@
+"""
+Accounting of the time judgeval itself adds to traced functions.
+
+With Tracer(measure_overhead=True), every @observe span records how long its
+wrapper spent outside the function under additional_metadata["overhead"], in
+seconds:
+
+- "span_start": creating the span and queueing its first update
+- "inputs": binding the arguments (combine_args_kwargs), looking up the agent
+  name, and serializing and queueing the updates
+- "state": capturing instance state before and after the call
+- "outputs": serializing and queueing the result
+- "total": all of the above, next to "runtime", the function's own duration
+
+Ending the span queues its final update after the metadata is recorded, so that
+part only shows up in the tracer-wide histograms, Tracer.overhead, as "span_end".
+
+Tracer(overhead_budget=0.05) also turns on an adaptive guard: once the overhead of
+a function is more than 5% of its runtime, its spans are recorded without inputs,
+outputs and state, and their overhead metadata has "reduced": True. One call in
+PROBE_INTERVAL is still captured in full to keep measuring, and full capture comes
+back once the overhead fits the budget again.
+
+Spans of generator functions and spans opened with TraceClient.span() are not
+measured, except that "span_end" covers every span.
+"""
+
+from __future__ import annotations
+
+import threading
+from bisect import bisect_left
+from typing import Any, Dict, List, Optional
+
+from judgeval.common.logger import judgeval_logger
+from judgeval.utils.fork import register_after_fork_in_child
+
+PHASES = ("span_start", "inputs", "state", "outputs", "span_end", "total")
+
+# Upper bounds of the histogram buckets in nanoseconds, followed by an overflow bucket
+BUCKET_BOUNDS_NS = (
+    1_000,
+    2_000,
+    5_000,
+    10_000,
+    20_000,
+    50_000,
+    100_000,
+    200_000,
+    500_000,
+    1_000_000,
+    2_000_000,
+    5_000_000,
+    10_000_000,
+    100_000_000,
+    1_000_000_000,
+)
+
+# Fully captured calls measured before the guard decides anything about a function
+GUARD_MIN_SAMPLES = 20
+# While a function's capture is reduced, one call in this many is captured in full
+PROBE_INTERVAL = 50
+# Weight of the latest call in the guard's moving averages
+GUARD_SMOOTHING = 0.1
+
+
+class OverheadHistogram:
+    """Distribution of one phase's overhead over all measured spans."""
+
+    __slots__ = ("counts", "count", "total_ns", "max_ns")
+
+    def __init__(self):
+        self.counts: List[int] = [0] * (len(BUCKET_BOUNDS_NS) + 1)
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+
+    def record(self, ns: int):
+        self.counts[bisect_left(BUCKET_BOUNDS_NS, ns)] += 1
+        self.count += 1
+        self.total_ns += ns
+        if ns > self.max_ns:
+            self.max_ns = ns
+
+    def percentile(self, q: float) -> float:
+        """Upper bound in seconds of the bucket holding the q-th percentile (0-100)."""
+        if not self.count:
+            return 0.0
+        rank = q / 100 * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if count and seen >= rank:
+                if index == len(BUCKET_BOUNDS_NS):
+                    break
+                return min(BUCKET_BOUNDS_NS[index], self.max_ns) / 1e9
+        return self.max_ns / 1e9
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "total": self.total_ns / 1e9,
+            "mean": self.total_ns / self.count / 1e9 if self.count else 0.0,
+            "max": self.max_ns / 1e9,
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+            "buckets": {
+                **{
+                    f"<={bound / 1e9:g}s": count
+                    for bound, count in zip(BUCKET_BOUNDS_NS, self.counts)
+                },
+                f">{BUCKET_BOUNDS_NS[-1] / 1e9:g}s": self.counts[-1],
+            },
+        }
+
+
+class CallOverhead:
+    """Overhead of one call to an @observe function, in nanoseconds per phase."""
+
+    __slots__ = ("full", "span_start", "inputs", "state", "outputs", "call_start_ns")
+
+    def __init__(self, full: bool, span_start: int):
+        self.full = full
+        self.span_start = span_start
+        self.inputs = 0
+        self.state = 0
+        self.outputs = 0
+        self.call_start_ns = 0
+
+    @property
+    def total(self) -> int:
+        return self.span_start + self.inputs + self.state + self.outputs
+
+    def to_metadata(self, runtime_ns: int) -> Dict[str, Any]:
+        metadata: Dict[str, Any] = {
+            "span_start": self.span_start / 1e9,
+            "inputs": self.inputs / 1e9,
+            "state": self.state / 1e9,
+            "outputs": self.outputs / 1e9,
+            "total": self.total / 1e9,
+            "runtime": runtime_ns / 1e9,
+        }
+        if not self.full:
+            metadata["reduced"] = True
+        return metadata
+
+
+class OverheadStats:
+    """Histograms of judgeval's overhead per phase across all spans of a tracer."""
+
+    _lock = threading.Lock()
+
+    def __init__(self):
+        self.histograms: Dict[str, OverheadHistogram] = {
+            phase: OverheadHistogram() for phase in PHASES
+        }
+
+    def record(self, phase: str, ns: int):
+        with self._lock:
+            self.histograms[phase].record(ns)
+
+    def record_call(self, call: CallOverhead):
+        with self._lock:
+            histograms = self.histograms
+            histograms["span_start"].record(call.span_start)
+            histograms["inputs"].record(call.inputs)
+            histograms["state"].record(call.state)
+            histograms["outputs"].record(call.outputs)
+            histograms["total"].record(call.total)
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """Count, total, mean, max, percentiles and buckets per phase, in seconds."""
+        with self._lock:
+            return {
+                phase: histogram.summary()
+                for phase, histogram in self.histograms.items()
+            }
+
+    @classmethod
+    def _after_fork_in_child(cls):
+        cls._lock = threading.Lock()
+
+
+register_after_fork_in_child(OverheadStats._after_fork_in_child)
+
+
+class OverheadGuard:
+    """
+    The adaptive guard's view of one @observe function: moving averages of the
+    overhead and runtime of its fully captured calls. Updated without a lock, since
+    a lost update between threads only delays a decision.
+    """
+
+    __slots__ = ("name", "samples", "overhead_ns", "runtime_ns", "reduced", "skipped")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.samples = 0
+        self.overhead_ns = 0.0
+        self.runtime_ns = 0.0
+        self.reduced = False
+        self.skipped = 0
+
+    def full_capture(self) -> bool:
+        """Whether the next call is captured with its inputs, outputs and state."""
+        if not self.reduced:
+            return True
+        self.skipped += 1
+        if self.skipped >= PROBE_INTERVAL:
+            self.skipped = 0
+            return True
+        return False
+
+    def record(self, overhead_ns: int, runtime_ns: int, budget: Optional[float]):
+        """Updates the averages with a fully captured call and applies the budget."""
+        if budget is None:
+            return
+        if self.samples:
+            self.overhead_ns += GUARD_SMOOTHING * (overhead_ns - self.overhead_ns)
+            self.runtime_ns += GUARD_SMOOTHING * (runtime_ns - self.runtime_ns)
+        else:
+            self.overhead_ns = overhead_ns
+            self.runtime_ns = runtime_ns
+        self.samples += 1
+        if self.samples < GUARD_MIN_SAMPLES:
+            return
+
+        reduced = self.overhead_ns > budget * self.runtime_ns
+        if reduced == self.reduced:
+            return
+        self.reduced = reduced
+        self.skipped = 0
+        ratio = self.overhead_ns / max(self.runtime_ns, 1.0)
+        if reduced:
+            judgeval_logger.warning(
+                f"Tracing overhead of {self.name} is {ratio:.0%} of its runtime, over "
+                f"the {budget:.0%} budget; recording its spans without inputs, "
+                "outputs and state"
+            )
+        else:
+            judgeval_logger.info(
+                f"Tracing overhead of {self.name} is back to {ratio:.0%} of its "
+                "runtime; recording its inputs, outputs and state again"
+            )
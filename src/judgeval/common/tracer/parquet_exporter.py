@@ -0,0 +1,366 @@
+"""
+Parquet export of spans for trace analytics with pandas, DuckDB or Spark.
+
+Spans are written with a flat columnar schema (SPAN_COLUMNS): ids, timing, type,
+function, usage and cost as typed columns, and payloads (inputs, output, error, ...)
+as JSON strings. Queries that only touch timing or cost read a few compressed
+columns instead of parsing whole trace documents. Function, span type, agent,
+error type and model names are dictionary encoded and load as categoricals.
+
+Spans can be written while tracing:
+
+    tracer = Tracer(project_name="my-agent", parquet_dir="spans/")
+
+    duckdb.sql("SELECT function, quantile_cont(duration, 0.95) "
+               "FROM 'spans/*.parquet' GROUP BY function")
+
+or converted afterwards from trace documents (JSON or JSONL files, as saved with
+Tracer(use_s3=True), or s3://bucket/prefix URLs) and from segment directories
+written with Tracer(trace_file_dir=...):
+
+    judgeval parquet traces/ s3://my-bucket/traces/my-agent/ -o spans.parquet
+
+Only completed spans are written, each once. pyarrow is an optional dependency:
+pip install "judgeval[parquet]".
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+from opentelemetry.sdk.trace import ReadableSpan
+from opentelemetry.sdk.trace.export import SpanExporter, SpanExportResult
+
+from judgeval.common.logger import judgeval_logger
+from judgeval.common.tracer.file_exporter import SEGMENT_PREFIX, read_segment
+from judgeval.common.tracer.span_transformer import SpanTransformer
+from judgeval.common.tracer.trace_sources import (
+    read_s3_trace_documents,
+    read_trace_documents,
+)
+from judgeval.utils.fork import register_after_fork_in_child
+
+_ID_COLUMNS = ("trace_id", "span_id", "parent_span_id")
+# Few distinct values each, so these are dictionary encoded
+_DICTIONARY_COLUMNS = (
+    "function",
+    "span_type",
+    "agent_name",
+    "error_type",
+    "model_name",
+)
+_USAGE_COLUMNS = (
+    "prompt_tokens",
+    "completion_tokens",
+    "total_tokens",
+    "prompt_tokens_cost_usd",
+    "completion_tokens_cost_usd",
+    "total_cost_usd",
+)
+_PAYLOAD_COLUMNS = (
+    "inputs",
+    "output",
+    "error",
+    "additional_metadata",
+    "state_before",
+    "state_after",
+)
+SPAN_COLUMNS = (
+    *_ID_COLUMNS,
+    *_DICTIONARY_COLUMNS,
+    "depth",
+    "created_at",
+    "duration",
+    "has_error",
+    "has_evaluation",
+    *_USAGE_COLUMNS,
+    *_PAYLOAD_COLUMNS,
+)
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError as e:
+        raise ImportError(
+            "Parquet export requires the pyarrow package. "
+            'Install it with: pip install "judgeval[parquet]"'
+        ) from e
+    return pyarrow, pyarrow.parquet
+
+
+def span_schema():
+    """The pyarrow schema of exported spans."""
+    pa, _ = _import_pyarrow()
+    types = {
+        **{name: pa.string() for name in _ID_COLUMNS},
+        **{
+            name: pa.dictionary(pa.int32(), pa.string()) for name in _DICTIONARY_COLUMNS
+        },
+        "depth": pa.int32(),
+        "created_at": pa.timestamp("us", tz="UTC"),
+        # Seconds
+        "duration": pa.float64(),
+        "has_error": pa.bool_(),
+        "has_evaluation": pa.bool_(),
+        **{
+            name: pa.float64() if name.endswith("_usd") else pa.int64()
+            for name in _USAGE_COLUMNS
+        },
+        **{name: pa.string() for name in _PAYLOAD_COLUMNS},
+    }
+    return pa.schema([(name, types[name]) for name in SPAN_COLUMNS])
+
+
+def _created_at(value: Any) -> Optional[datetime]:
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return datetime.fromtimestamp(value, tz=timezone.utc)
+    try:
+        return datetime.fromisoformat(str(value))
+    except ValueError:
+        return None
+
+
+def _json_blob(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    return json.dumps(value, default=str)
+
+
+def span_to_row(span: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Flattens a span in Judgment API format (a TraceSpan.model_dump() or an uploaded
+    span payload) to a row of SPAN_COLUMNS.
+    """
+    usage = span.get("usage")
+    if not isinstance(usage, dict):
+        usage = {}
+    error = span.get("error")
+    row = {name: span.get(name) for name in _ID_COLUMNS}
+    row.update(
+        function=span.get("function"),
+        span_type=span.get("span_type") or "span",
+        agent_name=span.get("agent_name"),
+        error_type=error.get("type") if isinstance(error, dict) else None,
+        model_name=usage.get("model_name"),
+        depth=span.get("depth"),
+        created_at=_created_at(span.get("created_at")),
+        duration=span.get("duration"),
+        has_error=error is not None,
+        has_evaluation=bool(span.get("has_evaluation")),
+    )
+    row.update({name: usage.get(name) for name in _USAGE_COLUMNS})
+    row.update({name: _json_blob(span.get(name)) for name in _PAYLOAD_COLUMNS})
+    return row
+
+
+class ParquetSpanWriter:
+    """
+    Writes span rows to a Parquet file, one row group per row_group_size rows. The
+    file is only readable once closed, when Parquet writes its footer.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        row_group_size: int = 10_000,
+        compression: str = "zstd",
+    ):
+        self.pa, pq = _import_pyarrow()
+        self.path = path
+        self.row_group_size = row_group_size
+        self.rows = 0
+        self._schema = span_schema()
+        self._columns: Dict[str, List[Any]] = {name: [] for name in SPAN_COLUMNS}
+        self._buffered = 0
+        # Opened here rather than by pyarrow, so a forked child can detach it
+        self._file = open(path, "wb")
+        self._writer = pq.ParquetWriter(
+            self._file,
+            self._schema,
+            compression=compression,
+            use_dictionary=list(_DICTIONARY_COLUMNS),
+        )
+
+    def write(self, rows: Iterable[Dict[str, Any]]):
+        for row in rows:
+            for name, column in self._columns.items():
+                column.append(row[name])
+            self._buffered += 1
+            if self._buffered >= self.row_group_size:
+                self.flush()
+
+    def flush(self):
+        """Writes buffered rows as a row group."""
+        if not self._buffered:
+            return
+        table = self.pa.Table.from_pydict(self._columns, schema=self._schema)
+        self._writer.write_table(table, row_group_size=self._buffered)
+        self.rows += self._buffered
+        self._columns = {name: [] for name in SPAN_COLUMNS}
+        self._buffered = 0
+
+    def close(self):
+        self.flush()
+        self._writer.close()
+        self._file.close()
+
+    def detach(self):
+        """
+        Drops the file without writing to it, e.g. in a forked child where the
+        parent still owns it. Anything the inherited writer writes goes nowhere.
+        """
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        try:
+            os.dup2(devnull, self._file.fileno())
+        finally:
+            os.close(devnull)
+
+
+class ParquetSpanExporter(SpanExporter):
+    """
+    Span exporter that writes completed spans to Parquet files in a directory.
+
+    A file is named spans-<ns>-<pid>.parquet once it is closed, after
+    max_rows_per_file rows or on shutdown; until then it has an .inprogress suffix
+    so globs like 'spans/*.parquet' only match complete files.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        row_group_size: int = 10_000,
+        max_rows_per_file: int = 1_000_000,
+        compression: str = "zstd",
+    ):
+        _import_pyarrow()
+        self.directory = directory
+        self.row_group_size = row_group_size
+        self.max_rows_per_file = max_rows_per_file
+        self.compression = compression
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._writer: Optional[ParquetSpanWriter] = None
+        self._file_rows = 0
+
+        register_after_fork_in_child(self._after_fork_in_child)
+
+    def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
+        rows = []
+        for span in spans:
+            attributes = dict(span.attributes or {})
+            if attributes.get("judgment.evaluation_run") or (
+                attributes.get("judgment.span_state") != "completed"
+            ):
+                continue
+            span_data = SpanTransformer.otel_attributes_to_judgment_data(attributes)
+            span_data["function"] = span.name
+            rows.append(span_to_row(span_data))
+        if not rows:
+            return SpanExportResult.SUCCESS
+
+        try:
+            with self._lock:
+                while rows:
+                    if self._writer is None:
+                        self._writer = ParquetSpanWriter(
+                            self._in_progress_path(),
+                            row_group_size=self.row_group_size,
+                            compression=self.compression,
+                        )
+                        self._file_rows = 0
+                    room = self.max_rows_per_file - self._file_rows
+                    chunk, rows = rows[:room], rows[room:]
+                    self._writer.write(chunk)
+                    self._file_rows += len(chunk)
+                    if self._file_rows >= self.max_rows_per_file:
+                        self._close_file()
+        except Exception as e:
+            judgeval_logger.error(f"Error writing spans to Parquet: {e}")
+            return SpanExportResult.FAILURE
+        return SpanExportResult.SUCCESS
+
+    def _in_progress_path(self) -> str:
+        name = f"spans-{time.time_ns()}-{os.getpid()}.parquet"
+        return os.path.join(self.directory, name + ".inprogress")
+
+    def _close_file(self):
+        if self._writer is None:
+            return
+        writer, self._writer = self._writer, None
+        writer.close()
+        os.replace(writer.path, writer.path[: -len(".inprogress")])
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        with self._lock:
+            if self._writer is not None:
+                self._writer.flush()
+        return True
+
+    def shutdown(self) -> None:
+        with self._lock:
+            self._close_file()
+
+    def _after_fork_in_child(self):
+        # The parent finishes its file; the child starts one of its own
+        self._lock = threading.Lock()
+        if self._writer is not None:
+            self._writer.detach()
+            self._writer = None
+
+
+def iter_source_spans(source: str) -> Iterator[Dict[str, Any]]:
+    """
+    Completed spans, in Judgment API format, from a trace document file, a directory
+    of them and/or of segment files, or an s3:// URL of saved traces.
+    """
+    if source.startswith("s3://"):
+        for trace in read_s3_trace_documents(source):
+            yield from trace.get("trace_spans") or []
+        return
+
+    if os.path.isdir(source):
+        paths = [os.path.join(source, name) for name in sorted(os.listdir(source))]
+    else:
+        paths = [source]
+    for path in paths:
+        name = os.path.basename(path)
+        if name.startswith(SEGMENT_PREFIX):
+            # Segments hold every incremental update; the completed one is the last
+            for kind, item in read_segment(path):
+                if kind == "spans" and item.get("span_state") == "completed":
+                    yield item
+        elif name.endswith((".json", ".jsonl")) and os.path.isfile(path):
+            for trace in read_trace_documents(path):
+                yield from trace.get("trace_spans") or []
+
+
+def convert_to_parquet(
+    sources: Sequence[str],
+    output: str,
+    row_group_size: int = 10_000,
+    compression: str = "zstd",
+) -> int:
+    """
+    Writes the spans of every source (see iter_source_spans) to one Parquet file
+    and returns the number of spans written. Sources are streamed, so memory use is
+    bounded by the row group size rather than the number of traces.
+    """
+    writer = ParquetSpanWriter(
+        output, row_group_size=row_group_size, compression=compression
+    )
+    try:
+        for source in sources:
+            writer.write(span_to_row(span) for span in iter_source_spans(source))
+    finally:
+        writer.close()
+    return writer.rows
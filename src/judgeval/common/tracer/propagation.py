@@ -0,0 +1,133 @@
+"""
+W3C Trace Context (https://www.w3.org/TR/trace-context/) propagation.
+
+Lets a trace continue in another process or service: the caller injects a
+`traceparent` header for its current trace and span, and the callee extracts it
+and links its own trace to them via parent_trace_id and parent_span_id.
+
+judgeval span IDs are 128-bit UUIDs while a traceparent parent-id only holds 64
+bits, so the full span ID also travels in a `judgment` tracestate entry. It is
+only trusted when it matches the parent-id, i.e. when no other tracer has
+created a span in between.
+"""
+
+from __future__ import annotations
+
+import re
+import uuid
+from dataclasses import dataclass
+from typing import Mapping, MutableMapping, Optional
+
+TRACEPARENT_HEADER = "traceparent"
+TRACESTATE_HEADER = "tracestate"
+TRACESTATE_KEY = "judgment"
+
+_TRACEPARENT_RE = re.compile(
+    r"^(?P<version>[0-9a-f]{2})-(?P<trace_id>[0-9a-f]{32})-"
+    r"(?P<parent_id>[0-9a-f]{16})-(?P<flags>[0-9a-f]{2})(?P<rest>-.*)?$"
+)
+
+
+@dataclass(frozen=True)
+class TraceContext:
+    """A trace and span to continue, usually extracted from a remote caller."""
+
+    trace_id: str
+    span_id: str
+    sampled: bool = True
+
+
+def _span_id_to_parent_id(span_id: str) -> str:
+    # The low 64 bits of the span UUID, or the ID itself if it already has 64 bits
+    try:
+        return uuid.UUID(span_id).hex[16:]
+    except ValueError:
+        return span_id.lower()
+
+
+def format_traceparent(trace_id: str, span_id: str, sampled: bool = True) -> str:
+    return (
+        f"00-{uuid.UUID(trace_id).hex}-{_span_id_to_parent_id(span_id)}-"
+        f"{'01' if sampled else '00'}"
+    )
+
+
+def inject_trace_context(
+    carrier: MutableMapping[str, str], trace_id: str, span_id: str
+) -> MutableMapping[str, str]:
+    """Writes traceparent/tracestate headers for the given trace and span into carrier."""
+    carrier[TRACEPARENT_HEADER] = format_traceparent(trace_id, span_id)
+
+    entries = (
+        [f"{TRACESTATE_KEY}={uuid.UUID(span_id).hex}"] if _is_uuid(span_id) else []
+    )
+    # Keep other vendors' entries, with ours moved to the front as the spec requires
+    existing = _get_header(carrier, TRACESTATE_HEADER)
+    if existing:
+        entries.extend(
+            entry.strip()
+            for entry in existing.split(",")
+            if entry.strip() and not entry.strip().startswith(f"{TRACESTATE_KEY}=")
+        )
+    if entries:
+        carrier[TRACESTATE_HEADER] = ",".join(entries)
+    return carrier
+
+
+def extract_trace_context(carrier: Mapping[str, str]) -> Optional[TraceContext]:
+    """
+    Reads the traceparent (and judgment tracestate entry) from carrier, e.g. request
+    headers. Returns None if there is no valid traceparent.
+    """
+    traceparent = _get_header(carrier, TRACEPARENT_HEADER)
+    if not traceparent:
+        return None
+
+    match = _TRACEPARENT_RE.match(traceparent.strip())
+    if not match:
+        return None
+    version, trace_id, parent_id = (
+        match.group("version"),
+        match.group("trace_id"),
+        match.group("parent_id"),
+    )
+    # Version ff is invalid; version 00 must not have trailing fields
+    if version == "ff" or (version == "00" and match.group("rest")):
+        return None
+    if trace_id == "0" * 32 or parent_id == "0" * 16:
+        return None
+
+    span_id = parent_id
+    tracestate = _get_header(carrier, TRACESTATE_HEADER) or ""
+    for entry in tracestate.split(","):
+        key, _, value = entry.strip().partition("=")
+        if key == TRACESTATE_KEY and _is_uuid(value):
+            full_span_id = str(uuid.UUID(value))
+            if _span_id_to_parent_id(full_span_id) == parent_id:
+                span_id = full_span_id
+            break
+
+    return TraceContext(
+        trace_id=str(uuid.UUID(trace_id)),
+        span_id=span_id,
+        sampled=bool(int(match.group("flags"), 16) & 0x01),
+    )
+
+
+def _is_uuid(value: str) -> bool:
+    try:
+        uuid.UUID(value)
+    except ValueError:
+        return False
+    return True
+
+
+def _get_header(carrier: Mapping[str, str], name: str) -> Optional[str]:
+    # HTTP headers are case-insensitive, but plain dict carriers are not
+    value = carrier.get(name)
+    if value is not None:
+        return value
+    for key, value in carrier.items():
+        if key.lower() == name:
+            return value
+    return None
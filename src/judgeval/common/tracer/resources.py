@@ -0,0 +1,153 @@
+"""
+Opt-in resource capture for spans.
+
+Span durations are wall time, which can't tell CPU-bound Python from waiting on
+I/O or on a blocked event loop. With Tracer(capture_resources=...), or per
+function with @observe(capture_resources=...), spans also record under
+additional_metadata["resources"]:
+
+- "cpu": cpu_time, CPU seconds of the span's thread (time.thread_time_ns) while
+  the span was open. For async spans this is the event loop's thread, so it
+  includes other tasks that ran in the meantime.
+- "memory": memory_delta_bytes, the change in memory allocated through Python
+  while the span was open, from tracemalloc (started if it isn't running). This
+  is process-wide and slows allocations down noticeably, so it is never on by
+  default.
+- "loop_lag": loop_lag_max and loop_lag_total, how late the span's event loop
+  ran a timer that is due every LOOP_LAG_INTERVAL seconds while the span was
+  open. Lag means something blocked the loop. Only for spans opened while an
+  event loop is running in their thread.
+
+capture_resources=True selects "cpu" and "loop_lag".
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+import tracemalloc
+import weakref
+from typing import Any, Dict, FrozenSet, Iterable, Optional, Set, Union
+
+RESOURCES = ("cpu", "memory", "loop_lag")
+DEFAULT_RESOURCES: FrozenSet[str] = frozenset({"cpu", "loop_lag"})
+LOOP_LAG_INTERVAL = 0.01
+
+CaptureResources = Union[bool, Iterable[str]]
+
+
+def resolve_resources(capture: CaptureResources) -> FrozenSet[str]:
+    """The resources selected by a capture_resources option."""
+    if capture is True:
+        return DEFAULT_RESOURCES
+    if not capture:
+        return frozenset()
+    resources = frozenset(capture)  # type: ignore[arg-type]
+    unknown = resources.difference(RESOURCES)
+    if unknown:
+        raise ValueError(
+            f"Unknown resources {sorted(unknown)}; choose from {', '.join(RESOURCES)}"
+        )
+    return resources
+
+
+class _LoopLagMonitor:
+    """
+    A timer on one event loop, due every LOOP_LAG_INTERVAL seconds while any
+    span on that loop captures loop lag. Only used from the loop's thread.
+    """
+
+    _monitors: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _LoopLagMonitor]" = weakref.WeakKeyDictionary()
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self.loop = loop
+        self.probes: Set[ResourceProbe] = set()
+        self._handle: Optional[asyncio.TimerHandle] = None
+        self._due = 0.0
+
+    @classmethod
+    def for_loop(cls, loop: asyncio.AbstractEventLoop) -> _LoopLagMonitor:
+        monitor = cls._monitors.get(loop)
+        if monitor is None:
+            monitor = cls._monitors[loop] = cls(loop)
+        return monitor
+
+    def add(self, probe: ResourceProbe):
+        self.probes.add(probe)
+        if self._handle is None:
+            self._schedule()
+
+    def remove(self, probe: ResourceProbe):
+        # The lag of a timer that is overdue right now, e.g. after a blocking call
+        # at the end of the span, would otherwise be missed
+        probe.record_loop_lag(max(self.loop.time() - self._due, 0.0))
+        self.probes.discard(probe)
+        if not self.probes and self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+
+    def _schedule(self):
+        self._due = self.loop.time() + LOOP_LAG_INTERVAL
+        self._handle = self.loop.call_at(self._due, self._tick)
+
+    def _tick(self):
+        lag = max(self.loop.time() - self._due, 0.0)
+        for probe in self.probes:
+            probe.record_loop_lag(lag)
+        self._schedule()
+
+
+class ResourceProbe:
+    """Resource readings of one open span."""
+
+    __slots__ = (
+        "resources",
+        "cpu_start_ns",
+        "memory_start",
+        "loop_lag_monitor",
+        "loop_lag_max",
+        "loop_lag_total",
+        "__weakref__",
+    )
+
+    def __init__(self, resources: FrozenSet[str]):
+        self.resources = resources
+        self.loop_lag_monitor: Optional[_LoopLagMonitor] = None
+        self.loop_lag_max = 0.0
+        self.loop_lag_total = 0.0
+
+        if "loop_lag" in resources:
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                loop = None
+            if loop is not None:
+                self.loop_lag_monitor = _LoopLagMonitor.for_loop(loop)
+                self.loop_lag_monitor.add(self)
+        if "memory" in resources:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            self.memory_start = tracemalloc.get_traced_memory()[0]
+        if "cpu" in resources:
+            self.cpu_start_ns = time.thread_time_ns()
+
+    def record_loop_lag(self, lag: float):
+        self.loop_lag_total += lag
+        if lag > self.loop_lag_max:
+            self.loop_lag_max = lag
+
+    def finish(self) -> Dict[str, Any]:
+        """Stops the probe and returns its readings as span metadata."""
+        readings: Dict[str, Any] = {}
+        if "cpu" in self.resources:
+            readings["cpu_time"] = (time.thread_time_ns() - self.cpu_start_ns) / 1e9
+        if "memory" in self.resources and tracemalloc.is_tracing():
+            readings["memory_delta_bytes"] = (
+                tracemalloc.get_traced_memory()[0] - self.memory_start
+            )
+        if self.loop_lag_monitor is not None:
+            self.loop_lag_monitor.remove(self)
+            self.loop_lag_monitor = None
+            readings["loop_lag_max"] = self.loop_lag_max
+            readings["loop_lag_total"] = self.loop_lag_total
+        return readings
@@ -12,6 +12,19 @@ from pydantic import BaseModel
 from judgeval.data import TraceSpan
 from judgeval.evaluation_run import EvaluationRun
 
+# Bookkeeping attributes for incremental updates to the Judgment API. Spans sent
+# over OTLP are only exported once they are complete, so these are dropped.
+_OTLP_EXCLUDED_ATTRIBUTES = frozenset(
+    {"judgment.update_id", "judgment.span_state", "judgment.queued_at"}
+)
+
+# TraceUsage fields mirrored onto OpenTelemetry GenAI semantic convention attributes
+_OTLP_USAGE_ATTRIBUTES = {
+    "prompt_tokens": "gen_ai.usage.input_tokens",
+    "completion_tokens": "gen_ai.usage.output_tokens",
+    "model_name": "gen_ai.response.model",
+}
+
 
 class SpanTransformer:
     @staticmethod
@@ -161,6 +174,40 @@ class SpanTransformer:
             },
         }
 
+    @staticmethod
+    def otel_attributes_to_otlp_attributes(
+        attributes: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        """
+        Maps the attributes of a completed span to the stable set sent over OTLP.
+
+        Every TraceSpan field stays under its `judgment.` name, with complex values
+        as the JSON already produced by trace_span_to_otel_attributes, so they are
+        not serialized again. Usage and errors are also mirrored onto the standard
+        OpenTelemetry attribute names that collectors and backends understand.
+        """
+        otlp_attributes = {
+            key: value
+            for key, value in attributes.items()
+            if key not in _OTLP_EXCLUDED_ATTRIBUTES
+        }
+
+        usage = SpanTransformer._safe_json_handle(
+            attributes.get("judgment.usage"), serialize=False
+        )
+        if isinstance(usage, dict):
+            for field_name, attr_name in _OTLP_USAGE_ATTRIBUTES.items():
+                if usage.get(field_name) is not None:
+                    otlp_attributes[attr_name] = usage[field_name]
+
+        error = SpanTransformer._safe_json_handle(
+            attributes.get("judgment.error"), serialize=False
+        )
+        if isinstance(error, dict) and error.get("type"):
+            otlp_attributes["error.type"] = str(error["type"])
+
+        return otlp_attributes
+
     @staticmethod
     def evaluation_run_to_otel_attributes(
         evaluation_run: EvaluationRun, span_id: str, span_data: TraceSpan
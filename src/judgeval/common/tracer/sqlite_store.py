@@ -0,0 +1,401 @@
+"""
+SQLite trace store for on-box analysis of large numbers of spans.
+
+SQLiteTraceStore is an OpenTelemetry span exporter, so each batch from the span
+processor's export thread becomes one transaction. Add it next to the Judgment
+API, or next to segment files when running offline:
+
+    store = SQLiteTraceStore("traces.db")
+    tracer = Tracer(project_name="my-agent", span_exporters=[store])
+
+    store.latency_percentiles()      # p50/p95/p99 per function
+    store.error_rates()
+    store.cost_by_model()
+
+The database runs in WAL mode, so it can be queried (also from other processes,
+e.g. the sqlite3 shell) while spans are being written. Rows are upserted by
+span_id and only replaced by a higher update_id, so spans show up while they run
+and end with their completed state. Span columns follow TraceSpan and usage columns
+follow TraceUsage; payloads (inputs, output, error, ...) are stored as the JSON
+the span processor already produced.
+"""
+
+from __future__ import annotations
+
+import math
+import sqlite3
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from opentelemetry.sdk.trace import ReadableSpan
+from opentelemetry.sdk.trace.export import SpanExporter, SpanExportResult
+
+from judgeval.common.logger import judgeval_logger
+from judgeval.common.tracer.span_transformer import SpanTransformer
+from judgeval.data import TraceSpan, TraceUsage
+from judgeval.utils.fork import register_after_fork_in_child
+
+_UNSET = object()
+
+_SCALAR_COLUMNS = {
+    "span_id": "TEXT PRIMARY KEY",
+    "trace_id": "TEXT NOT NULL",
+    "parent_span_id": "TEXT",
+    "function": "TEXT NOT NULL",
+    "span_type": "TEXT",
+    "depth": "INTEGER",
+    "created_at": "REAL",
+    "duration": "REAL",
+    "update_id": "INTEGER",
+    "span_state": "TEXT",
+    "has_error": "INTEGER NOT NULL",
+    "has_evaluation": "INTEGER",
+    "agent_name": "TEXT",
+}
+# Stored as produced by SpanTransformer.trace_span_to_otel_attributes
+_PAYLOAD_COLUMNS = (
+    "inputs",
+    "output",
+    "error",
+    "expected_tools",
+    "additional_metadata",
+    "state_before",
+    "state_after",
+)
+_USAGE_COLUMNS = {
+    name: (
+        "INTEGER"
+        if "tokens" in name and "cost" not in name
+        else ("TEXT" if name == "model_name" else "REAL")
+    )
+    for name in TraceUsage.model_fields
+}
+_COLUMNS = [*_SCALAR_COLUMNS, *_PAYLOAD_COLUMNS, *_USAGE_COLUMNS]
+
+_SCHEMA = [
+    "CREATE TABLE IF NOT EXISTS spans ("
+    + ", ".join(
+        [f"{name} {kind}" for name, kind in _SCALAR_COLUMNS.items()]
+        + [f"{name} TEXT" for name in _PAYLOAD_COLUMNS]
+        + [f"{name} {kind}" for name, kind in _USAGE_COLUMNS.items()]
+    )
+    + ")",
+    "CREATE INDEX IF NOT EXISTS spans_trace_id ON spans (trace_id)",
+    "CREATE INDEX IF NOT EXISTS spans_parent_span_id ON spans (parent_span_id)",
+    # Also serves the ordered scan behind latency_percentiles
+    "CREATE INDEX IF NOT EXISTS spans_function ON spans (function, duration)",
+    "CREATE INDEX IF NOT EXISTS spans_span_type ON spans (span_type)",
+    "CREATE INDEX IF NOT EXISTS spans_created_at ON spans (created_at)",
+    "CREATE INDEX IF NOT EXISTS spans_duration ON spans (duration)",
+]
+
+_UPSERT = (
+    f"INSERT INTO spans ({', '.join(_COLUMNS)}) "
+    f"VALUES ({', '.join('?' for _ in _COLUMNS)}) "
+    "ON CONFLICT (span_id) DO UPDATE SET "
+    + ", ".join(f"{name} = excluded.{name}" for name in _COLUMNS if name != "span_id")
+    + " WHERE excluded.update_id >= spans.update_id"
+)
+
+
+@dataclass
+class LatencyPercentiles:
+    function: str
+    count: int
+    # Nearest-rank percentile -> duration in seconds
+    percentiles: Dict[float, float]
+
+
+@dataclass
+class ErrorRate:
+    function: str
+    spans: int
+    errors: int
+
+    @property
+    def rate(self) -> float:
+        return self.errors / self.spans if self.spans else 0.0
+
+
+@dataclass
+class ModelCost:
+    model_name: str
+    spans: int
+    prompt_tokens: int
+    completion_tokens: int
+    total_tokens: int
+    total_cost_usd: float
+
+
+def _epoch_seconds(created_at: Any) -> Optional[float]:
+    if created_at is None or isinstance(created_at, (int, float)):
+        return created_at
+    try:
+        return datetime.fromisoformat(str(created_at)).timestamp()
+    except ValueError:
+        return None
+
+
+class SQLiteTraceStore(SpanExporter):
+    """Span exporter that upserts spans into a SQLite database, with helper queries."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+
+        connection = self._connection()
+        connection.execute("PRAGMA journal_mode=WAL")
+        with connection:
+            for statement in _SCHEMA:
+                connection.execute(statement)
+
+        register_after_fork_in_child(self._after_fork_in_child)
+
+    def _connection(self) -> sqlite3.Connection:
+        # One connection per thread: WAL lets readers run alongside the export thread
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, check_same_thread=False)
+            connection.row_factory = sqlite3.Row
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute("PRAGMA busy_timeout=5000")
+            self._local.connection = connection
+            with self._connections_lock:
+                self._connections.append(connection)
+        return connection
+
+    def _after_fork_in_child(self):
+        # SQLite connections must not be used across fork(); children open their own
+        self._local = threading.local()
+        self._connections = []
+        self._connections_lock = threading.Lock()
+
+    def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
+        rows = [
+            self._to_row(span.name, span.attributes or {})
+            for span in spans
+            if span.attributes and not span.attributes.get("judgment.evaluation_run")
+        ]
+        if not rows:
+            return SpanExportResult.SUCCESS
+        try:
+            self._insert_rows(rows)
+        except sqlite3.Error as e:
+            judgeval_logger.error(f"Error writing spans to {self.path}: {e}")
+            return SpanExportResult.FAILURE
+        return SpanExportResult.SUCCESS
+
+    def _insert_rows(self, rows: Iterable[Tuple[Any, ...]]):
+        connection = self._connection()
+        with connection:
+            connection.executemany(_UPSERT, rows)
+
+    @staticmethod
+    def _to_row(name: str, attributes: Any) -> Tuple[Any, ...]:
+        def attribute(field_name: str) -> Any:
+            return attributes.get(f"judgment.{field_name}")
+
+        usage = SpanTransformer._safe_json_handle(attribute("usage"), serialize=False)
+        if not isinstance(usage, dict):
+            usage = {}
+
+        scalars = {
+            "span_id": attribute("span_id"),
+            "trace_id": attribute("trace_id"),
+            "parent_span_id": attribute("parent_span_id"),
+            "function": name,
+            "span_type": attribute("span_type") or "span",
+            "depth": attribute("depth"),
+            "created_at": _epoch_seconds(attribute("created_at")),
+            "duration": attribute("duration"),
+            "update_id": attribute("update_id") or 0,
+            "span_state": attribute("span_state"),
+            "has_error": int(attribute("error") is not None),
+            "has_evaluation": attribute("has_evaluation"),
+            "agent_name": attribute("agent_name"),
+        }
+        return (
+            *scalars.values(),
+            *(attribute(field_name) for field_name in _PAYLOAD_COLUMNS),
+            *(usage.get(field_name) for field_name in _USAGE_COLUMNS),
+        )
+
+    @staticmethod
+    def _to_trace_span(row: sqlite3.Row) -> TraceSpan:
+        usage_fields = {
+            name: row[name] for name in _USAGE_COLUMNS if row[name] is not None
+        }
+        return TraceSpan(
+            span_id=row["span_id"],
+            trace_id=row["trace_id"],
+            parent_span_id=row["parent_span_id"],
+            function=row["function"],
+            span_type=row["span_type"],
+            depth=row["depth"] or 0,
+            created_at=row["created_at"],
+            duration=row["duration"],
+            update_id=row["update_id"],
+            has_evaluation=bool(row["has_evaluation"]),
+            agent_name=row["agent_name"],
+            usage=TraceUsage(**usage_fields) if usage_fields else None,
+            **{
+                name: SpanTransformer._safe_json_handle(row[name], serialize=False)
+                for name in _PAYLOAD_COLUMNS
+            },
+        )
+
+    def _query(self, sql: str, parameters: Sequence[Any] = ()) -> List[sqlite3.Row]:
+        return self._connection().execute(sql, parameters).fetchall()
+
+    def spans(
+        self,
+        trace_id: Optional[str] = None,
+        function: Optional[str] = None,
+        span_type: Optional[str] = None,
+        parent_span_id: object = _UNSET,
+        min_duration: Optional[float] = None,
+        since: Optional[float] = None,
+        limit: Optional[int] = None,
+    ) -> List[TraceSpan]:
+        """
+        Spans matching every given filter, in the order they started. Pass
+        parent_span_id=None for root spans; since is a Unix timestamp.
+        """
+        conditions, parameters = self._filters(
+            trace_id, function, span_type, parent_span_id, min_duration, since
+        )
+        sql = f"SELECT * FROM spans {conditions} ORDER BY created_at"
+        if limit is not None:
+            sql += " LIMIT ?"
+            parameters.append(limit)
+        return [self._to_trace_span(row) for row in self._query(sql, parameters)]
+
+    def slowest(
+        self, n: int = 10, function: Optional[str] = None, **filters
+    ) -> List[TraceSpan]:
+        """The n completed spans with the longest duration, slowest first."""
+        conditions, parameters = self._filters(
+            function=function, completed=True, **filters
+        )
+        rows = self._query(
+            f"SELECT * FROM spans {conditions} ORDER BY duration DESC LIMIT ?",
+            [*parameters, n],
+        )
+        return [self._to_trace_span(row) for row in rows]
+
+    def latency_percentiles(
+        self,
+        percentiles: Sequence[float] = (50, 95, 99),
+        function: Optional[str] = None,
+    ) -> List[LatencyPercentiles]:
+        """Nearest-rank duration percentiles of completed spans, per function."""
+        conditions, parameters = self._filters(function=function, completed=True)
+        cursor = self._connection().execute(
+            f"SELECT function, duration FROM spans {conditions} "
+            "AND duration IS NOT NULL ORDER BY function, duration",
+            parameters,
+        )
+
+        results = []
+        current: Optional[str] = None
+        durations: List[float] = []
+
+        def summarize():
+            count = len(durations)
+            results.append(
+                LatencyPercentiles(
+                    function=current,  # type: ignore[arg-type]
+                    count=count,
+                    percentiles={
+                        p: durations[max(math.ceil(p / 100 * count), 1) - 1]
+                        for p in percentiles
+                    },
+                )
+            )
+
+        # Rows arrive sorted, so only one function's durations are held at a time
+        for row_function, duration in cursor:
+            if row_function != current:
+                if durations:
+                    summarize()
+                current, durations = row_function, []
+            durations.append(duration)
+        if durations:
+            summarize()
+        return results
+
+    def error_rates(self) -> List[ErrorRate]:
+        """Completed spans and errors per function, highest error rate first."""
+        rows = self._query(
+            "SELECT function, COUNT(*) AS spans, SUM(has_error) AS errors "
+            "FROM spans WHERE span_state = 'completed' GROUP BY function"
+        )
+        rates = [
+            ErrorRate(
+                function=row["function"], spans=row["spans"], errors=row["errors"]
+            )
+            for row in rows
+        ]
+        return sorted(rates, key=lambda rate: (-rate.rate, rate.function))
+
+    def cost_by_model(self) -> List[ModelCost]:
+        """Token usage and cost per model, most expensive first."""
+        rows = self._query(
+            "SELECT model_name, COUNT(*) AS spans, "
+            "COALESCE(SUM(prompt_tokens), 0) AS prompt_tokens, "
+            "COALESCE(SUM(completion_tokens), 0) AS completion_tokens, "
+            "COALESCE(SUM(total_tokens), 0) AS total_tokens, "
+            "COALESCE(SUM(total_cost_usd), 0.0) AS total_cost_usd "
+            "FROM spans WHERE model_name IS NOT NULL "
+            "GROUP BY model_name ORDER BY total_cost_usd DESC"
+        )
+        return [ModelCost(**dict(row)) for row in rows]
+
+    @staticmethod
+    def _filters(
+        trace_id: Optional[str] = None,
+        function: Optional[str] = None,
+        span_type: Optional[str] = None,
+        parent_span_id: object = _UNSET,
+        min_duration: Optional[float] = None,
+        since: Optional[float] = None,
+        completed: bool = False,
+    ) -> Tuple[str, List[Any]]:
+        conditions = ["1 = 1"]
+        parameters: List[Any] = []
+        for column, value in (
+            ("trace_id", trace_id),
+            ("function", function),
+            ("span_type", span_type),
+        ):
+            if value is not None:
+                conditions.append(f"{column} = ?")
+                parameters.append(value)
+        if parent_span_id is None:
+            conditions.append("parent_span_id IS NULL")
+        elif parent_span_id is not _UNSET:
+            conditions.append("parent_span_id = ?")
+            parameters.append(parent_span_id)
+        if min_duration is not None:
+            conditions.append("duration >= ?")
+            parameters.append(min_duration)
+        if since is not None:
+            conditions.append("created_at >= ?")
+            parameters.append(since)
+        if completed:
+            conditions.append("span_state = 'completed'")
+        return "WHERE " + " AND ".join(conditions), parameters
+
+    def shutdown(self) -> None:
+        with self._connections_lock:
+            connections, self._connections = self._connections, []
+        for connection in connections:
+            connection.close()
+        self._local = threading.local()
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        return True
@@ -1,5 +1,5 @@
 from __future__ import annotations
-from typing import List, Optional, TYPE_CHECKING
+from typing import Any, Dict, List, Optional, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from judgeval.common.tracer import Tracer
@@ -54,7 +54,30 @@ class TraceManagerClient:
         Returns:
             dict: Server response containing UI URL and other metadata
         """
-        server_response = self.api_client.upsert_trace(trace_data)
+        collector = self.tracer.collector if self.tracer else None
+        trace_file_writer = self.tracer.trace_file_writer if self.tracer else None
+        server_response: Dict[str, Any]
+        if self.tracer is not None and not self.tracer.upload_traces:
+            # The tracer records spans locally, e.g. in an InMemoryTraceStore
+            server_response = {}
+        elif trace_file_writer is not None:
+            # Written alongside the spans and uploaded with `judgeval upload`
+            trace_file_writer.write("traces", [trace_data])
+            server_response = {}
+        elif (
+            final_save
+            and collector is not None
+            and collector.send(
+                "traces",
+                self.api_client.api_key,
+                self.api_client.organization_id,
+                [trace_data],
+            )
+        ):
+            # Final saves don't show a link, so the collector can upload them later
+            server_response = {}
+        else:
+            server_response = self.api_client.upsert_trace(trace_data)
 
         if self.tracer and self.tracer.use_s3 and final_save:
             try:
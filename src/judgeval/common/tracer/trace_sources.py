@@ -0,0 +1,67 @@
+"""
+Reading stored trace documents for offline tooling (Parquet conversion, trace
+analysis, profiler export).
+
+A trace document is the trace data the tracer saves: a dict with trace_id, name,
+duration and trace_spans, where each span is a TraceSpan.model_dump(). Documents
+are read from:
+
+- .json files holding one document or a list of them, e.g. downloaded from S3
+- .jsonl files with one document per line
+- s3://bucket/prefix URLs of traces saved with Tracer(use_s3=True)
+- directories of the above, and segment directories written with
+  Tracer(trace_file_dir=...), where the last save of each trace is used
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from typing import Any, Dict, Iterable, Iterator
+
+from judgeval.common.tracer.file_exporter import SEGMENT_PREFIX, read_segment
+
+
+def read_trace_documents(path: str) -> Iterator[Dict[str, Any]]:
+    """Trace documents from a .json file (one trace or a list) or a .jsonl file."""
+    documents: Iterable[Any]
+    with open(path, encoding="utf-8") as f:
+        if path.endswith(".json"):
+            document = json.load(f)
+            documents = document if isinstance(document, list) else [document]
+        else:
+            documents = (json.loads(line) for line in f if line.strip())
+        for document in documents:
+            # Skips bookkeeping files such as a segment directory's manifest
+            if isinstance(document, dict) and "trace_spans" in document:
+                yield document
+
+
+def read_s3_trace_documents(url: str) -> Iterator[Dict[str, Any]]:
+    """Trace documents saved under an s3://bucket/prefix URL."""
+    from judgeval.common.storage.s3_storage import S3Storage
+
+    bucket_name, _, prefix = url[len("s3://") :].partition("/")
+    yield from S3Storage(bucket_name=bucket_name).iter_traces(prefix)
+
+
+def iter_trace_documents(source: str) -> Iterator[Dict[str, Any]]:
+    """Trace documents from a file, a directory or an s3:// URL, see above."""
+    if source.startswith("s3://"):
+        yield from read_s3_trace_documents(source)
+        return
+    if not os.path.isdir(source):
+        yield from read_trace_documents(source)
+        return
+
+    # Segments hold every save of a trace; only the last one is complete
+    segment_traces: Dict[str, Dict[str, Any]] = {}
+    for name in sorted(os.listdir(source)):
+        path = os.path.join(source, name)
+        if name.startswith(SEGMENT_PREFIX):
+            for kind, item in read_segment(path):
+                if kind == "traces" and isinstance(item, dict):
+                    segment_traces[item.get("trace_id", "")] = item
+        elif name.endswith((".json", ".jsonl")) and os.path.isfile(path):
+            yield from read_trace_documents(path)
+    yield from segment_traces.values()
@@ -0,0 +1,216 @@
+"""
+In-memory trace store for tests and local debugging.
+
+InMemoryTraceStore is a span processor that keeps every span in memory instead of
+exporting it, indexed by trace, span type, function and parent, with a small
+query API:
+
+    store = InMemoryTraceStore()
+    tracer = Tracer(project_name="unit-tests", span_processor=store)
+
+    run_agent()
+
+    (root,) = store.tree(store.trace_ids()[-1])
+    assert [child.span.function for child in root.children] == ["search", "answer"]
+    assert store.totals().errors == 0
+
+Spans are stored as the TraceSpan objects the tracer updates in place, so queries
+see their latest state. No API key is needed and nothing leaves the process.
+"""
+
+from __future__ import annotations
+
+import heapq
+import threading
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+from judgeval.common.tracer.span_processor import SpanProcessorBase
+from judgeval.data import TraceSpan
+from judgeval.evaluation_run import EvaluationRun
+
+_UNSET = object()
+
+
+@dataclass
+class SpanNode:
+    """A span with its child spans, ordered by start time."""
+
+    span: TraceSpan
+    children: List[SpanNode] = field(default_factory=list)
+
+
+@dataclass
+class TraceTotals:
+    spans: int = 0
+    errors: int = 0
+    # Sum of root span durations, i.e. wall time spent in the traces
+    duration: float = 0.0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    total_tokens: int = 0
+    total_cost_usd: float = 0.0
+
+
+class InMemoryTraceStore(SpanProcessorBase):
+    """Span processor that keeps spans in memory, indexed for queries."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._spans: Dict[str, TraceSpan] = {}
+        self._span_states: Dict[str, str] = {}
+        self._by_trace: Dict[str, List[str]] = defaultdict(list)
+        self._by_span_type: Dict[str, List[str]] = defaultdict(list)
+        self._by_function: Dict[str, List[str]] = defaultdict(list)
+        self._by_parent: Dict[Optional[str], List[str]] = defaultdict(list)
+        self._evaluation_runs: List[Tuple[EvaluationRun, str]] = []
+
+    def queue_span_update(self, span: TraceSpan, span_state: str = "input") -> None:
+        with self._lock:
+            span_id = span.span_id
+            self._span_states[span_id] = span_state
+            if span_id in self._spans:
+                return
+            self._spans[span_id] = span
+            self._by_trace[span.trace_id].append(span_id)
+            self._by_span_type[span.span_type or "span"].append(span_id)
+            self._by_function[span.function].append(span_id)
+            self._by_parent[span.parent_span_id].append(span_id)
+
+    def queue_evaluation_run(
+        self, evaluation_run: EvaluationRun, span_id: str, span_data: TraceSpan
+    ) -> None:
+        with self._lock:
+            self._evaluation_runs.append((evaluation_run, span_id))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._spans.clear()
+            self._span_states.clear()
+            self._by_trace.clear()
+            self._by_span_type.clear()
+            self._by_function.clear()
+            self._by_parent.clear()
+            self._evaluation_runs.clear()
+
+    def trace_ids(self) -> List[str]:
+        """IDs of the stored traces, in the order they started."""
+        with self._lock:
+            return list(self._by_trace)
+
+    def get_span(self, span_id: str) -> Optional[TraceSpan]:
+        with self._lock:
+            return self._spans.get(span_id)
+
+    def spans(
+        self,
+        trace_id: Optional[str] = None,
+        span_type: Optional[str] = None,
+        function: Optional[str] = None,
+        parent_span_id: object = _UNSET,
+        completed: Optional[bool] = None,
+        where: Optional[Callable[[TraceSpan], bool]] = None,
+    ) -> List[TraceSpan]:
+        """
+        Spans matching every given filter, in the order they started. Pass
+        parent_span_id=None for root spans, and completed=True to skip spans that
+        are still running.
+        """
+        with self._lock:
+            candidates: List[List[str]] = []
+            if trace_id is not None:
+                candidates.append(self._by_trace.get(trace_id, []))
+            if span_type is not None:
+                candidates.append(self._by_span_type.get(span_type, []))
+            if function is not None:
+                candidates.append(self._by_function.get(function, []))
+            if parent_span_id is not _UNSET:
+                candidates.append(self._by_parent.get(parent_span_id, []))  # type: ignore[call-overload]
+
+            if candidates:
+                # Scan the smallest index and check the other filters per span
+                span_ids = min(candidates, key=len)
+            else:
+                span_ids = list(self._spans)
+
+            matches = []
+            for span_id in span_ids:
+                span = self._spans[span_id]
+                if trace_id is not None and span.trace_id != trace_id:
+                    continue
+                if span_type is not None and (span.span_type or "span") != span_type:
+                    continue
+                if function is not None and span.function != function:
+                    continue
+                if (
+                    parent_span_id is not _UNSET
+                    and span.parent_span_id != parent_span_id
+                ):
+                    continue
+                if completed is not None and completed != (
+                    self._span_states[span_id] == "completed"
+                ):
+                    continue
+                matches.append(span)
+
+        if where is not None:
+            matches = [span for span in matches if where(span)]
+        return matches
+
+    def children(self, span_id: str) -> List[TraceSpan]:
+        return self.spans(parent_span_id=span_id)
+
+    def tree(self, trace_id: str) -> List[SpanNode]:
+        """
+        The spans of a trace as trees. Usually there is one root; spans whose
+        parent is not in the store (e.g. a remote caller's span) are roots too.
+        """
+        spans = self.spans(trace_id=trace_id)
+        nodes = {span.span_id: SpanNode(span) for span in spans}
+        roots: List[SpanNode] = []
+        for span in sorted(spans, key=lambda span: span.created_at or 0):
+            parent = nodes.get(span.parent_span_id) if span.parent_span_id else None
+            (parent.children if parent else roots).append(nodes[span.span_id])
+        return roots
+
+    def slowest(self, n: int = 10, **filters) -> List[TraceSpan]:
+        """The n completed spans with the longest duration, slowest first."""
+        spans = self.spans(completed=True, **filters)
+        return heapq.nlargest(n, spans, key=lambda span: span.duration or 0.0)
+
+    def totals(self, trace_id: Optional[str] = None) -> TraceTotals:
+        """Span, error, duration, token and cost totals, for one trace or all."""
+        totals = TraceTotals()
+        with self._lock:
+            span_ids = (
+                list(self._by_trace.get(trace_id, []))
+                if trace_id is not None
+                else list(self._spans)
+            )
+            spans = [self._spans[span_id] for span_id in span_ids]
+            stored = set(self._spans)
+
+        for span in spans:
+            totals.spans += 1
+            if span.error:
+                totals.errors += 1
+            if span.parent_span_id not in stored and span.duration:
+                totals.duration += span.duration
+            if span.usage:
+                totals.prompt_tokens += span.usage.prompt_tokens or 0
+                totals.completion_tokens += span.usage.completion_tokens or 0
+                totals.total_tokens += span.usage.total_tokens or 0
+                totals.total_cost_usd += span.usage.total_cost_usd or 0.0
+        return totals
+
+    def evaluation_runs(
+        self, span_id: Optional[str] = None
+    ) -> List[Tuple[EvaluationRun, str]]:
+        """Queued (evaluation_run, span_id) pairs, optionally for one span."""
+        with self._lock:
+            return [
+                (evaluation_run, run_span_id)
+                for evaluation_run, run_span_id in self._evaluation_runs
+                if span_id is None or run_span_id == span_id
+            ]
@@ -11,22 +11,39 @@ NOTE: any function beginning with 'a', e.g. 'afetch_together_api_response', is a
 # Standard library imports
 import asyncio
 import concurrent.futures
+import hashlib
+import json
 import os
+import threading
+import time
 from types import TracebackType
 from judgeval.common.api.constants import ROOT_API
 from judgeval.utils.requests import requests
+from judgeval.utils.fork import register_after_fork_in_child
 import pprint
-from typing import Any, Dict, List, Mapping, Optional, TypeAlias, Union, TypeGuard
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    TypeAlias,
+    Union,
+    TypeGuard,
+)
 
 # Third-party imports
-import litellm
 import pydantic
 from dotenv import load_dotenv
 
 # Local application/library-specific imports
-from judgeval.clients import async_together_client, together_client
+from judgeval import clients
 from judgeval.constants import (
     ACCEPTABLE_MODELS,
+    API_KEY_VALIDATION_CACHE_TTL_SECONDS,
+    API_KEY_VALIDATION_TIMEOUT_SECONDS,
     MAX_WORKER_THREADS,
     TOGETHER_SUPPORTED_MODELS,
     LITELLM_SUPPORTED_MODELS,
@@ -110,8 +127,6 @@ class ChatCompletionRequest(pydantic.BaseModel):
         return response_format
 
 
-os.environ["LITELLM_LOG"] = "DEBUG"
-
 load_dotenv()
 
 
@@ -132,6 +147,7 @@ def validate_api_key(judgment_api_key: str):
         },
         json={},
         verify=True,
+        timeout=API_KEY_VALIDATION_TIMEOUT_SECONDS,
     )
     if response.status_code == 200:
         return True, response.json()
@@ -139,6 +155,161 @@ def validate_api_key(judgment_api_key: str):
         return False, response.json().get("detail", "Error validating API key")
 
 
+def _api_key_cache_path(judgment_api_key: str) -> str:
+    """Cache file for a key. Only a hash of the API URL and key is ever written to disk."""
+    cache_dir = os.getenv("JUDGMENT_CACHE_DIR") or os.path.join(
+        os.path.expanduser("~"), ".cache", "judgeval"
+    )
+    key_hash = hashlib.sha256(f"{ROOT_API}:{judgment_api_key}".encode()).hexdigest()
+    return os.path.join(cache_dir, f"api_key_{key_hash}.json")
+
+
+def _read_cached_api_key_validation(cache_path: str, ttl: float) -> bool:
+    try:
+        with open(cache_path, "r") as f:
+            validated_at = json.load(f)["validated_at"]
+    except (OSError, ValueError, KeyError, TypeError):
+        return False
+    return 0 <= time.time() - validated_at < ttl
+
+
+# Lock files currently held by validate_api_key_cached. flock() locks are shared with
+# forked children through the inherited descriptors, so a child forked mid-validation
+# closes its copies; otherwise the lock would outlive the parent's validation.
+_held_api_key_lock_files: set = set()
+
+
+def _close_inherited_api_key_lock_files():
+    for lock_file in list(_held_api_key_lock_files):
+        try:
+            lock_file.close()
+        except OSError:
+            pass
+    _held_api_key_lock_files.clear()
+
+
+register_after_fork_in_child(_close_inherited_api_key_lock_files)
+
+
+def validate_api_key_cached(
+    judgment_api_key: str, ttl: float = API_KEY_VALIDATION_CACHE_TTL_SECONDS
+):
+    """
+    Same as validate_api_key, but successful validations are cached in a local file for `ttl` seconds.
+
+    Processes sharing a home directory (e.g. forked workers) take a file lock while
+    validating, so only one of them calls the API and the rest read its result.
+    """
+    cache_path = _api_key_cache_path(judgment_api_key)
+    if _read_cached_api_key_validation(cache_path, ttl):
+        return True, {"cached": True}
+
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        lock_file = open(cache_path + ".lock", "a")
+    except OSError:
+        # Cache directory isn't writable, validate without caching
+        return validate_api_key(judgment_api_key)
+
+    with lock_file:
+        _held_api_key_lock_files.add(lock_file)
+        try:
+            try:
+                import fcntl
+
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            except (ImportError, OSError):
+                pass
+
+            # Another process may have validated the key while we waited for the lock
+            if _read_cached_api_key_validation(cache_path, ttl):
+                return True, {"cached": True}
+
+            result, response = validate_api_key(judgment_api_key)
+            if result:
+                try:
+                    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+                    with open(tmp_path, "w") as f:
+                        json.dump({"validated_at": time.time()}, f)
+                    os.replace(tmp_path, cache_path)
+                except OSError as e:
+                    judgeval_logger.debug(f"Could not cache API key validation: {e}")
+            return result, response
+        finally:
+            _held_api_key_lock_files.discard(lock_file)
+
+
+class BackgroundAPIKeyValidation:
+    """
+    Validates an API key on a daemon thread so constructors don't block on the network.
+
+    Call start() once anything the on_complete callback touches is set up. Callers
+    that need the outcome (e.g. before exporting data) use wait(). The optional
+    on_complete callback is invoked from the validation thread with (result, response),
+    or with (None, exception) if validation could not be completed, before wait()
+    returns.
+    """
+
+    def __init__(
+        self,
+        judgment_api_key: str,
+        on_complete: Optional[Callable[[Optional[bool], Any], None]] = None,
+    ):
+        self.judgment_api_key = judgment_api_key
+        self.result: Optional[bool] = None
+        self.response: Any = None
+        self._on_complete = on_complete
+        self._done = threading.Event()
+        self._thread = self._new_thread()
+
+    def _new_thread(self) -> threading.Thread:
+        return threading.Thread(
+            target=self._validate, name="judgeval-api-key-validation", daemon=True
+        )
+
+    def start(self) -> "BackgroundAPIKeyValidation":
+        self._thread.start()
+        register_after_fork_in_child(self._after_fork_in_child)
+        return self
+
+    def _after_fork_in_child(self):
+        # The validation thread does not survive fork(); rerun it if it was in flight
+        if self._done.is_set():
+            return
+        self._done = threading.Event()
+        self._thread = self._new_thread()
+        self._thread.start()
+
+    def _validate(self):
+        try:
+            self.result, self.response = validate_api_key_cached(self.judgment_api_key)
+        except Exception as e:
+            self.result, self.response = None, e
+
+        try:
+            if self._on_complete:
+                self._on_complete(self.result, self.response)
+        except Exception as e:
+            judgeval_logger.warning(f"Error handling API key validation: {e}")
+        finally:
+            self._done.set()
+
+    @property
+    def done(self) -> bool:
+        return self._done.is_set()
+
+    def wait(self, timeout: Optional[float] = None) -> Tuple[Optional[bool], Any]:
+        """
+        Blocks until validation finishes and returns (result, response).
+
+        result is True for a valid key, False for a rejected key, and None if
+        validation failed or did not finish within `timeout`.
+        """
+        if not self._done.wait(timeout):
+            return None, None
+        return self.result, self.response
+
+
 def fetch_together_api_response(
     model: str, messages: List[Mapping], response_format: pydantic.BaseModel = None
 ) -> str:
@@ -154,13 +325,13 @@ def fetch_together_api_response(
     )
 
     if request.response_format is not None:
-        response = together_client.chat.completions.create(
+        response = clients.together_client.chat.completions.create(
             model=request.model,
             messages=request.messages,
             response_format=request.response_format,
         )
     else:
-        response = together_client.chat.completions.create(
+        response = clients.together_client.chat.completions.create(
             model=request.model,
             messages=request.messages,
         )
@@ -179,13 +350,13 @@ async def afetch_together_api_response(
     )
 
     if request.response_format is not None:
-        response = await async_together_client.chat.completions.create(
+        response = await clients.async_together_client.chat.completions.create(
             model=request.model,
             messages=request.messages,
             response_format=request.response_format,
         )
     else:
-        response = await async_together_client.chat.completions.create(
+        response = await clients.async_together_client.chat.completions.create(
             model=request.model,
             messages=request.messages,
         )
@@ -325,6 +496,8 @@ def fetch_litellm_api_response(
         model=model, messages=messages, response_format=response_format
     )
 
+    import litellm
+
     if request.response_format is not None:
         response = litellm.completion(
             model=request.model,
@@ -355,6 +528,8 @@ def fetch_custom_litellm_api_response(
             "Custom model parameters must be a CustomModelParameters object"
         )
 
+    import litellm
+
     if response_format is not None:
         response = litellm.completion(
             model=custom_model_parameters.model_name,
@@ -390,6 +565,8 @@ async def afetch_litellm_api_response(
             f"Model {model} is not in the list of supported models: {ACCEPTABLE_MODELS}."
         )
 
+    import litellm
+
     if response_format is not None:
         response = await litellm.acompletion(
             model=model, messages=messages, response_format=response_format
@@ -421,6 +598,8 @@ async def afetch_custom_litellm_api_response(
             "Custom model parameters must be a CustomModelParameters object"
         )
 
+    import litellm
+
     if response_format is not None:
         response = await litellm.acompletion(
             model=custom_model_parameters.model_name,
@@ -2,10 +2,21 @@
 Constant variables used throughout source code
 """
 
+from collections.abc import Set
 from enum import Enum
-import litellm
+from typing import (
+    AbstractSet,
+    Callable,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    Optional,
+    TypeVar,
+)
 import os
 
+_T = TypeVar("_T")
+
 
 class APIScorerType(str, Enum):
     """
@@ -35,6 +46,48 @@ class APIScorerType(str, Enum):
                 return member
 
 
+class LazyModelSet(Set):
+    """
+    Read-only set of model names that is only built the first time it is used.
+
+    Model registries come from provider SDKs (e.g. litellm) that are expensive to
+    import, so they are loaded on the first membership check instead of at import time.
+    """
+
+    def __init__(self, loader: Callable[[], Iterable[str]]):
+        self._loader = loader
+        self._models: Optional[FrozenSet[str]] = None
+
+    @property
+    def models(self) -> FrozenSet[str]:
+        if self._models is None:
+            self._models = frozenset(self._loader())
+        return self._models
+
+    @classmethod
+    def _from_iterable(cls, it: Iterable[_T]) -> AbstractSet[_T]:
+        # Results of set operations (a | b, a & b, ...) are plain frozensets
+        return frozenset(it)
+
+    def __contains__(self, model: object) -> bool:
+        return model in self.models
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.models)
+
+    def __len__(self) -> int:
+        return len(self.models)
+
+    def __repr__(self) -> str:
+        return repr(set(self.models))
+
+
+def _litellm_model_list() -> Iterable[str]:
+    import litellm
+
+    return litellm.model_list
+
+
 UNBOUNDED_SCORERS: set[APIScorerType] = (
     set()
 )  # scorers whose scores are not bounded between 0-1
@@ -46,7 +99,7 @@ RABBITMQ_HOST = os.getenv(
 RABBITMQ_PORT = os.getenv("RABBITMQ_PORT", 5672)
 RABBITMQ_QUEUE = os.getenv("RABBITMQ_QUEUE", "task_queue")
 # Models
-LITELLM_SUPPORTED_MODELS = set(litellm.model_list)
+LITELLM_SUPPORTED_MODELS = LazyModelSet(_litellm_model_list)
 
 TOGETHER_SUPPORTED_MODELS = [
     "meta-llama/Meta-Llama-3-70B-Instruct-Turbo",
@@ -106,8 +159,12 @@ TOGETHER_SUPPORTED_MODELS = [
 
 JUDGMENT_SUPPORTED_MODELS = {"osiris-large", "osiris-mini", "osiris"}
 
-ACCEPTABLE_MODELS = (
-    set(litellm.model_list) | set(TOGETHER_SUPPORTED_MODELS) | JUDGMENT_SUPPORTED_MODELS
+ACCEPTABLE_MODELS = LazyModelSet(
+    lambda: (
+        set(LITELLM_SUPPORTED_MODELS)
+        | set(TOGETHER_SUPPORTED_MODELS)
+        | JUDGMENT_SUPPORTED_MODELS
+    )
 )
 
 ## System settings
@@ -116,5 +173,17 @@ MAX_WORKER_THREADS = 10
 # Maximum number of concurrent operations for evaluation runs
 MAX_CONCURRENT_EVALUATIONS = 50  # Adjust based on system capabilities
 
+# Number of local scoring results uploaded together while an evaluation runs
+EVAL_LOG_BATCH_SIZE = 25
+
+# How long a successful API key validation is cached on disk
+API_KEY_VALIDATION_CACHE_TTL_SECONDS = 60 * 60
+
+# How long an API key validation request, and an export waiting for it, may take
+API_KEY_VALIDATION_TIMEOUT_SECONDS = 30
+
 # Span lifecycle management
 SPAN_LIFECYCLE_END_UPDATE_ID = 20  # Default ending number for completed spans
+
+# Number of yielded items kept as the output of a traced generator's span
+MAX_STREAM_SAMPLE_ITEMS = 10
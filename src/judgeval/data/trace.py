@@ -9,6 +9,7 @@ from judgeval.data.judgment_types import (
     TraceJudgmentType,
 )
 from judgeval.constants import SPAN_LIFECYCLE_END_UPDATE_ID
+from judgeval.utils import fork
 from pydantic import BaseModel
 
 
@@ -45,6 +46,14 @@ class TraceSpan(TraceSpanJudgmentType):
         super().__init__(**data)
         # Initialize thread lock for thread-safe update_id increment
         self._update_id_lock = threading.Lock()
+        self._update_id_lock_fork_generation = fork.fork_generation
+
+    def _get_update_id_lock(self) -> threading.Lock:
+        # A span inherited through fork() may carry a lock that a parent thread held
+        if self._update_id_lock_fork_generation != fork.fork_generation:
+            self._update_id_lock = threading.Lock()
+            self._update_id_lock_fork_generation = fork.fork_generation
+        return self._update_id_lock
 
     def increment_update_id(self) -> int:
         """
@@ -52,7 +61,7 @@ class TraceSpan(TraceSpanJudgmentType):
         Returns:
             int: The new update_id value after incrementing
         """
-        with self._update_id_lock:
+        with self._get_update_id_lock():
             self.update_id += 1
             return self.update_id
 
@@ -68,7 +77,7 @@ class TraceSpan(TraceSpanJudgmentType):
         Returns:
             int: The new update_id value after setting
         """
-        with self._update_id_lock:
+        with self._get_update_id_lock():
             self.update_id = ending_number
             return self.update_id
 
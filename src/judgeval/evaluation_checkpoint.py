@@ -0,0 +1,244 @@
+"""
+Local checkpoints of evaluation runs with local scorers.
+
+With run_eval(..., checkpoint=True), every completed ScoringResult is appended to
+a JSON lines file while the run scores its examples, keyed by the run's eval_name
+and a hash of the example's content (its input, outputs, context, tools, metadata
+and name, but not its id, index or creation time). Batches that were uploaded are
+recorded as well. The file is removed once the run completed and all of its
+results were uploaded.
+
+run_eval(..., resume=True) reads the checkpoint of an interrupted run back: its
+examples that were already scored are not scored again, their results are merged
+with the new ones, and only the results that were never uploaded are logged,
+appended to the run the interrupted one started. Results recorded with scorers
+configured differently (class, name, threshold, model, ...) are ignored.
+
+Checkpoints are stored under $JUDGMENT_CACHE_DIR/checkpoints (by default
+~/.cache/judgeval/checkpoints), one file per project and eval_name.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+from judgeval.common.logger import judgeval_logger
+from judgeval.data import Example, ScoringResult
+from judgeval.evaluation_run import EvaluationRun
+from judgeval.scorers import BaseScorer
+
+# Fields of an Example that make up its content hash
+EXAMPLE_CONTENT_FIELDS = {
+    "input",
+    "actual_output",
+    "expected_output",
+    "context",
+    "retrieval_context",
+    "additional_metadata",
+    "tools_called",
+    "expected_tools",
+    "name",
+}
+
+
+# Fields of a BaseScorer that hold the outcome of scoring rather than its configuration
+SCORER_RESULT_FIELDS = {
+    "score",
+    "score_breakdown",
+    "reason",
+    "using_native_model",
+    "success",
+    "error",
+    "additional_metadata",
+    "model_client",
+}
+
+
+def example_content_hash(example: Example) -> str:
+    content = example.model_dump(include=EXAMPLE_CONTENT_FIELDS, mode="json")
+    return hashlib.sha256(
+        json.dumps(content, sort_keys=True, default=str).encode()
+    ).hexdigest()
+
+
+def _result_hash(scoring_result: ScoringResult) -> str:
+    example = scoring_result.data_object
+    if not isinstance(example, Example):
+        raise TypeError(
+            f"Only results of Examples can be checkpointed, got {type(example).__name__}"
+        )
+    return example_content_hash(example)
+
+
+def scorer_fingerprint(scorer: BaseScorer, model: Optional[str] = None) -> str:
+    """A hash of a scorer's class and configuration, with model as its default model."""
+    config = scorer.model_dump(exclude=SCORER_RESULT_FIELDS, warnings=False)
+    config["model"] = scorer.model or model
+    config["class"] = f"{type(scorer).__module__}.{type(scorer).__qualname__}"
+    return hashlib.sha256(
+        json.dumps(config, sort_keys=True, default=str).encode()
+    ).hexdigest()
+
+
+def checkpoint_path(project_name: str, eval_name: str) -> str:
+    cache_dir = os.getenv("JUDGMENT_CACHE_DIR") or os.path.join(
+        os.path.expanduser("~"), ".cache", "judgeval"
+    )
+    # Readable names, with a hash so that names that only differ in the
+    # replaced characters don't share a file
+    run_hash = hashlib.sha256(f"{project_name}/{eval_name}".encode()).hexdigest()
+    safe_name = re.sub(r"[^A-Za-z0-9_.-]", "_", f"{project_name}__{eval_name}")
+    return os.path.join(cache_dir, "checkpoints", f"{safe_name}_{run_hash[:12]}.jsonl")
+
+
+class EvaluationCheckpoint:
+    """The checkpoint of one evaluation run, see the module docstring."""
+
+    def __init__(
+        self,
+        path: str,
+        eval_name: str,
+        scorers: List[BaseScorer],
+        model: Optional[str] = None,
+    ):
+        self.path = path
+        self.eval_name = eval_name
+        self.scorer_fingerprints = sorted(
+            scorer_fingerprint(scorer, model) for scorer in scorers
+        )
+        self.results: Dict[str, ScoringResult] = {}
+        # Uploads per example hash; a run can hold several examples with the same content
+        self.uploaded: Counter[str] = Counter()
+        self._claimed: Counter[str] = Counter()
+        self.enabled = True
+
+    @classmethod
+    def open(
+        cls,
+        evaluation_run: EvaluationRun,
+        scorers: List[BaseScorer],
+        resume: bool = False,
+    ) -> "EvaluationCheckpoint":
+        """The checkpoint of a run; read back with resume, otherwise started afresh."""
+        project_name = evaluation_run.project_name or ""
+        eval_name = evaluation_run.eval_name or ""
+        checkpoint = cls(
+            checkpoint_path(project_name, eval_name),
+            eval_name,
+            scorers,
+            evaluation_run.model,
+        )
+        try:
+            os.makedirs(os.path.dirname(checkpoint.path), exist_ok=True)
+            if resume:
+                checkpoint.load()
+            else:
+                open(checkpoint.path, "w").close()
+        except OSError as e:
+            judgeval_logger.warning(
+                f"Could not open evaluation checkpoint {checkpoint.path}, the run won't be resumable: {e}"
+            )
+            checkpoint.enabled = False
+        return checkpoint
+
+    def load(self):
+        try:
+            f = open(self.path, "r")
+        except FileNotFoundError:
+            return
+
+        ignored = 0
+        with f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # The last line of a run that was killed mid-write
+                    continue
+                if record.get("eval_name") != self.eval_name:
+                    continue
+                if "uploaded" in record:
+                    self.uploaded.update(record["uploaded"])
+                elif record.get("scorers") != self.scorer_fingerprints:
+                    ignored += 1
+                else:
+                    self.results[record["example_hash"]] = ScoringResult.model_validate(
+                        record["result"]
+                    )
+
+        if ignored:
+            judgeval_logger.warning(
+                f"Ignoring {ignored} checkpointed result(s) of '{self.eval_name}' scored with different scorers"
+            )
+        judgeval_logger.info(
+            f"Resuming '{self.eval_name}' with {len(self.results)} checkpointed result(s)"
+        )
+
+    def get(self, example: Example) -> Optional[ScoringResult]:
+        """The checkpointed result of example, as a result of this run's example."""
+        scoring_result = self.results.get(example_content_hash(example))
+        if scoring_result is None:
+            return None
+        return scoring_result.model_copy(update={"data_object": example})
+
+    def claim_upload(self, example: Example) -> bool:
+        """
+        Whether a recorded upload of example's content is left that no earlier
+        example of this run claimed, so duplicate examples are each uploaded once.
+        """
+        example_hash = example_content_hash(example)
+        if self._claimed[example_hash] >= self.uploaded[example_hash]:
+            return False
+        self._claimed[example_hash] += 1
+        return True
+
+    def add(self, scoring_result: ScoringResult):
+        """Records the result of an example."""
+        example_hash = _result_hash(scoring_result)
+        self.results[example_hash] = scoring_result
+        self._write(
+            {
+                "eval_name": self.eval_name,
+                "example_hash": example_hash,
+                "scorers": self.scorer_fingerprints,
+                # The example is matched by its hash, see get()
+                "result": scoring_result.model_dump(
+                    mode="json", exclude={"data_object"}, warnings=False
+                ),
+            }
+        )
+
+    def mark_uploaded(self, scoring_results: List[ScoringResult]):
+        """Records that the results were logged to the run."""
+        hashes = [_result_hash(result) for result in scoring_results]
+        self.uploaded.update(hashes)
+        self._write({"eval_name": self.eval_name, "uploaded": hashes})
+
+    def remove(self):
+        """Removes the checkpoint of a run that completed, see the module docstring."""
+        self.enabled = False
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            judgeval_logger.warning(
+                f"Could not remove evaluation checkpoint {self.path}: {e}"
+            )
+
+    def _write(self, record: Dict[str, Any]):
+        if not self.enabled:
+            return
+        try:
+            with open(self.path, "a") as f:
+                f.write(json.dumps(record, default=str) + "\n")
+        except OSError as e:
+            judgeval_logger.warning(
+                f"Could not write evaluation checkpoint {self.path}, the run won't be resumable: {e}"
+            )
+            self.enabled = False
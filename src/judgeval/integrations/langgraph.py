@@ -245,6 +245,7 @@ class JudgevalCallbackHandler(BaseCallbackHandler):
                 trace_client.otel_span_processor.queue_span_update(
                     trace_span, span_state=span_state
                 )
+                trace_client.on_span_completed(trace_span)
 
             # Clean up dictionaries for this specific span
             if span_id in self._span_id_to_start_time:
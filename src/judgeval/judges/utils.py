@@ -2,7 +2,6 @@
 This module contains utility functions for judge models.
 """
 
-import litellm
 from typing import Optional, Union, Tuple, List
 
 from judgeval.common.exceptions import InvalidJudgeModelError
@@ -11,10 +10,9 @@ from judgeval.constants import (
     TOGETHER_SUPPORTED_MODELS,
     JUDGMENT_SUPPORTED_MODELS,
     ACCEPTABLE_MODELS,
+    LITELLM_SUPPORTED_MODELS,
 )
 
-LITELLM_SUPPORTED_MODELS = set(litellm.model_list)
-
 
 def create_judge(
     model: Optional[Union[str, List[str], JudgevalJudge]] = None,
@@ -4,7 +4,18 @@ Implements the JudgmentClient to interact with the Judgment API.
 
 import os
 from uuid import uuid4
-from typing import Optional, List, Dict, Any, Union, Callable
+from typing import (
+    Optional,
+    List,
+    Dict,
+    Any,
+    Union,
+    Callable,
+    Tuple,
+    Iterator,
+    AsyncGenerator,
+    TYPE_CHECKING,
+)
 
 from judgeval.data.datasets import EvalDataset, EvalDatasetClient
 from judgeval.data import (
@@ -19,17 +30,23 @@ from judgeval.scorers import (
 from judgeval.evaluation_run import EvaluationRun
 from judgeval.run_evaluation import (
     run_eval,
+    a_iter_eval,
+    safe_iter_async,
     assert_test,
     run_trace_eval,
 )
 from judgeval.data.trace_run import TraceRun
 from judgeval.common.api import JudgmentApiClient
 from judgeval.common.exceptions import JudgmentAPIError
-from langchain_core.callbacks import BaseCallbackHandler
 from judgeval.common.tracer import Tracer
-from judgeval.common.utils import validate_api_key
+from judgeval.common.utils import BackgroundAPIKeyValidation
 from pydantic import BaseModel, ConfigDict
 from judgeval.common.logger import judgeval_logger
+from judgeval.version_check import check_latest_version
+from judgeval.constants import EVAL_LOG_BATCH_SIZE
+
+if TYPE_CHECKING:
+    from langchain_core.callbacks import BaseCallbackHandler
 
 
 class EvalRunRequestBody(BaseModel):
@@ -75,20 +92,30 @@ class JudgmentClient(metaclass=SingletonMeta):
         self.api_client = JudgmentApiClient(api_key, organization_id)
         self.eval_dataset_client = EvalDatasetClient(api_key, organization_id)
 
-        # Verify API key is valid
-        result, response = validate_api_key(api_key)
+        # Verify API key is valid in the background; it is checked before the first API call
+        self.api_key_validation = BackgroundAPIKeyValidation(api_key).start()
+        judgeval_logger.info("Successfully initialized JudgmentClient!")
+
+        check_latest_version()
+
+    def _ensure_valid_api_key(self):
+        """Waits for background API key validation and raises if it did not succeed."""
+        result, response = self.api_key_validation.wait()
+        if not result:
+            # Allow a new JudgmentClient to be created with a different key
+            SingletonMeta._instances.pop(type(self), None)
+        if result is None:
+            raise JudgmentAPIError(f"Issue with verifying Judgment API key: {response}")
         if not result:
             # May be bad to output their invalid API key...
             raise JudgmentAPIError(f"Issue with passed in Judgment API key: {response}")
-        else:
-            judgeval_logger.info("Successfully initialized JudgmentClient!")
 
     def run_trace_evaluation(
         self,
         scorers: List[Union[APIScorerConfig, BaseScorer]],
         examples: Optional[List[Example]] = None,
         function: Optional[Callable] = None,
-        tracer: Optional[Union[Tracer, BaseCallbackHandler]] = None,
+        tracer: Optional[Union[Tracer, "BaseCallbackHandler"]] = None,
         traces: Optional[List[Trace]] = None,
         tools: Optional[List[Dict[str, Any]]] = None,
         project_name: str = "default_project",
@@ -97,6 +124,7 @@ class JudgmentClient(metaclass=SingletonMeta):
         append: bool = False,
         override: bool = False,
     ) -> List[ScoringResult]:
+        self._ensure_valid_api_key()
         try:
             if examples and not function:
                 raise ValueError("Cannot pass in examples without a function")
@@ -136,6 +164,8 @@ class JudgmentClient(metaclass=SingletonMeta):
         eval_run_name: str = "default_eval_run",
         override: bool = False,
         append: bool = False,
+        resume: bool = False,
+        checkpoint: bool = False,
     ) -> List[ScoringResult]:
         """
         Executes an evaluation of `Example`s using one or more `Scorer`s
@@ -148,10 +178,13 @@ class JudgmentClient(metaclass=SingletonMeta):
             eval_run_name (str): A name for this evaluation run
             override (bool): Whether to override an existing evaluation run with the same name
             append (bool): Whether to append to an existing evaluation run with the same name
+            resume (bool): Whether to resume an interrupted run with local scorers, skipping the examples it already scored
+            checkpoint (bool): Whether to checkpoint a run with local scorers so it can be resumed, implied by resume
 
         Returns:
             List[ScoringResult]: The results of the evaluation
         """
+        self._ensure_valid_api_key()
         if override and append:
             raise ValueError(
                 "Cannot set both override and append to True. Please choose one."
@@ -172,6 +205,8 @@ class JudgmentClient(metaclass=SingletonMeta):
                 eval,
                 self.judgment_api_key,
                 override,
+                resume,
+                checkpoint,
             )
         except ValueError as e:
             raise ValueError(
@@ -180,6 +215,104 @@ class JudgmentClient(metaclass=SingletonMeta):
         except Exception as e:
             raise Exception(f"An unexpected error occurred during evaluation: {str(e)}")
 
+    def iter_evaluation(
+        self,
+        examples: List[Example],
+        scorers: List[Union[APIScorerConfig, BaseScorer]],
+        model: Optional[str] = "gpt-4.1",
+        project_name: str = "default_project",
+        eval_run_name: str = "default_eval_run",
+        override: bool = False,
+        append: bool = False,
+        batch_size: int = EVAL_LOG_BATCH_SIZE,
+        resume: bool = False,
+        checkpoint: bool = False,
+    ) -> Iterator[Tuple[int, ScoringResult]]:
+        """
+        Executes an evaluation of `Example`s using one or more `Scorer`s, yielding
+        each result as soon as it is available. See `a_iter_evaluation`.
+
+        Returns:
+            Iterator[Tuple[int, ScoringResult]]: The index of each example in `examples` and its result
+        """
+        return safe_iter_async(
+            self.a_iter_evaluation(
+                examples,
+                scorers,
+                model=model,
+                project_name=project_name,
+                eval_run_name=eval_run_name,
+                override=override,
+                append=append,
+                batch_size=batch_size,
+                resume=resume,
+                checkpoint=checkpoint,
+            )
+        )
+
+    def a_iter_evaluation(
+        self,
+        examples: List[Example],
+        scorers: List[Union[APIScorerConfig, BaseScorer]],
+        model: Optional[str] = "gpt-4.1",
+        project_name: str = "default_project",
+        eval_run_name: str = "default_eval_run",
+        override: bool = False,
+        append: bool = False,
+        batch_size: int = EVAL_LOG_BATCH_SIZE,
+        resume: bool = False,
+        checkpoint: bool = False,
+    ) -> AsyncGenerator[Tuple[int, ScoringResult], None]:
+        """
+        Executes an evaluation of `Example`s using one or more `Scorer`s, yielding
+        each result as soon as it is available. The run is checked when this is
+        called, so invalid runs raise here rather than on the first iteration.
+
+        With local scorers, results are yielded in the order the examples finish and
+        uploaded in batches of `batch_size` while the run is going, so a run that
+        fails part way keeps the results scored so far. Judgment API scorers run on
+        the server and their results are yielded once the run completes.
+
+        Args:
+            examples (List[Example]): The examples to evaluate
+            scorers (List[Union[APIScorerConfig, BaseScorer]]): A list of scorers to use for evaluation
+            model (str): The model used as a judge when using LLM as a Judge
+            project_name (str): The name of the project the evaluation results belong to
+            eval_run_name (str): A name for this evaluation run
+            override (bool): Whether to override an existing evaluation run with the same name
+            append (bool): Whether to append to an existing evaluation run with the same name
+            batch_size (int): How many local results to upload at a time
+            resume (bool): Whether to resume an interrupted run with local scorers, skipping the examples it already scored
+            checkpoint (bool): Whether to checkpoint a run with local scorers so it can be resumed, implied by resume
+
+        Returns:
+            AsyncGenerator[Tuple[int, ScoringResult], None]: The index of each example in `examples` and its result
+        """
+        self._ensure_valid_api_key()
+        if override and append:
+            raise ValueError(
+                "Cannot set both override and append to True. Please choose one."
+            )
+
+        try:
+            eval = EvaluationRun(
+                append=append,
+                override=override,
+                project_name=project_name,
+                eval_name=eval_run_name,
+                examples=examples,
+                scorers=scorers,
+                model=model,
+                organization_id=self.organization_id,
+            )
+        except ValueError as e:
+            raise ValueError(
+                f"Please check your EvaluationRun object, one or more fields are invalid: \n{str(e)}"
+            )
+        return a_iter_eval(
+            eval, self.judgment_api_key, override, batch_size, resume, checkpoint
+        )
+
     def create_dataset(self) -> EvalDataset:
         return self.eval_dataset_client.create_dataset()
 
@@ -201,6 +334,7 @@ class JudgmentClient(metaclass=SingletonMeta):
         Returns:
             bool: Whether the dataset was successfully uploaded
         """
+        self._ensure_valid_api_key()
         # Set judgment_api_key just in case it was not set
         dataset.judgment_api_key = self.judgment_api_key
         return self.eval_dataset_client.push(dataset, alias, project_name, overwrite)
@@ -211,6 +345,7 @@ class JudgmentClient(metaclass=SingletonMeta):
         """
         Appends an `EvalDataset` to the Judgment platform for storage.
         """
+        self._ensure_valid_api_key()
         return self.eval_dataset_client.append_examples(alias, examples, project_name)
 
     def pull_dataset(self, alias: str, project_name: str) -> EvalDataset:
@@ -223,12 +358,14 @@ class JudgmentClient(metaclass=SingletonMeta):
         Returns:
             EvalDataset: The retrieved dataset
         """
+        self._ensure_valid_api_key()
         return self.eval_dataset_client.pull(alias, project_name)
 
     def delete_dataset(self, alias: str, project_name: str) -> bool:
         """
         Deletes a saved `EvalDataset` from the Judgment platform.
         """
+        self._ensure_valid_api_key()
         return self.eval_dataset_client.delete(alias, project_name)
 
     def pull_project_dataset_stats(self, project_name: str) -> dict:
@@ -241,6 +378,7 @@ class JudgmentClient(metaclass=SingletonMeta):
         Returns:
             dict: The retrieved dataset stats
         """
+        self._ensure_valid_api_key()
         return self.eval_dataset_client.pull_project_dataset_stats(project_name)
 
     # Maybe add option where you can pass in the EvaluationRun object and it will pull the eval results from the backend
@@ -258,12 +396,14 @@ class JudgmentClient(metaclass=SingletonMeta):
                 - id (str): The evaluation run ID
                 - results (List[ScoringResult]): List of scoring results
         """
+        self._ensure_valid_api_key()
         return self.api_client.fetch_evaluation_results(project_name, eval_run_name)
 
     def create_project(self, project_name: str) -> bool:
         """
         Creates a project on the server.
         """
+        self._ensure_valid_api_key()
         self.api_client.create_project(project_name)
         return True
 
@@ -271,6 +411,7 @@ class JudgmentClient(metaclass=SingletonMeta):
         """
         Deletes a project from the server. Which also deletes all evaluations and traces associated with the project.
         """
+        self._ensure_valid_api_key()
         self.api_client.delete_project(project_name)
         return True
 
@@ -316,7 +457,7 @@ class JudgmentClient(metaclass=SingletonMeta):
         scorers: List[Union[APIScorerConfig, BaseScorer]],
         examples: Optional[List[Example]] = None,
         function: Optional[Callable] = None,
-        tracer: Optional[Union[Tracer, BaseCallbackHandler]] = None,
+        tracer: Optional[Union[Tracer, "BaseCallbackHandler"]] = None,
         traces: Optional[List[Trace]] = None,
         tools: Optional[List[Dict[str, Any]]] = None,
         model: Optional[str] = "gpt-4.1",
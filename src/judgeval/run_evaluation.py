@@ -4,23 +4,39 @@ import time
 import json
 import sys
 import threading
-from typing import List, Dict, Union, Optional, Callable, Tuple, Any
+from typing import (
+    List,
+    Dict,
+    Union,
+    Optional,
+    Callable,
+    Tuple,
+    Any,
+    AsyncGenerator,
+    Iterator,
+    TYPE_CHECKING,
+)
 from rich import print as rprint
+from tqdm.asyncio import tqdm_asyncio
 
 from judgeval.data import ScorerData, ScoringResult, Example, Trace
 from judgeval.scorers import BaseScorer, APIScorerConfig
-from judgeval.scorers.score import a_execute_scoring
+from judgeval.scorers.score import a_iter_scoring
 from judgeval.common.api import JudgmentApiClient
 from judgeval.constants import (
     MAX_CONCURRENT_EVALUATIONS,
+    EVAL_LOG_BATCH_SIZE,
 )
 from judgeval.common.exceptions import JudgmentAPIError
 from judgeval.common.api.api import JudgmentAPIException
 from judgeval.common.logger import judgeval_logger
 from judgeval.evaluation_run import EvaluationRun
+from judgeval.evaluation_checkpoint import EvaluationCheckpoint
 from judgeval.data.trace_run import TraceRun
 from judgeval.common.tracer import Tracer
-from langchain_core.callbacks import BaseCallbackHandler
+
+if TYPE_CHECKING:
+    from langchain_core.callbacks import BaseCallbackHandler
 
 
 def safe_run_async(coro):
@@ -46,6 +62,47 @@ def safe_run_async(coro):
         return asyncio.run(coro)
 
 
+def safe_iter_async(agen: AsyncGenerator) -> Iterator:
+    """
+    Iterate over an async generator from synchronous code, whether or not there's
+    already an event loop running (see `safe_run_async`).
+
+    Args:
+        agen: The async generator to iterate over
+
+    Yields:
+        The items of the async generator
+    """
+    try:
+        asyncio.get_running_loop()
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+    except RuntimeError:
+        executor = None
+
+    loop = asyncio.new_event_loop()
+
+    def run(coro):
+        if executor is None:
+            return loop.run_until_complete(coro)
+        # The loop lives on the executor's single thread
+        return executor.submit(loop.run_until_complete, coro).result()
+
+    try:
+        while True:
+            try:
+                item = run(agen.__anext__())
+            except StopAsyncIteration:
+                return
+            yield item
+    finally:
+        # Also runs when the caller stops iterating early, so the generator can clean up
+        run(agen.aclose())
+        run(loop.shutdown_asyncgens())
+        loop.close()
+        if executor is not None:
+            executor.shutdown()
+
+
 def send_to_rabbitmq(evaluation_run: EvaluationRun) -> Dict[str, Any]:
     """
     Sends an evaluation run to the RabbitMQ evaluation queue.
@@ -227,6 +284,64 @@ def log_evaluation_results(
         )
 
 
+class EvaluationResultUploader:
+    """
+    Uploads the results of a local evaluation run in batches as they come in, so
+    a run that fails part way keeps the results scored so far.
+
+    The first batch is logged with the run's own `override`/`append` settings and
+    later batches are appended to it. Each batch carries only its own examples.
+    Uploads are recorded in the run's checkpoint, if it has one; when it already
+    holds uploads of an interrupted run, every batch is appended to that run.
+    """
+
+    def __init__(
+        self,
+        evaluation_run: EvaluationRun,
+        judgment_api_key: str,
+        batch_size: int = EVAL_LOG_BATCH_SIZE,
+        checkpoint: Optional[EvaluationCheckpoint] = None,
+    ):
+        if batch_size < 1:
+            raise ValueError(f"batch_size must be at least 1, got {batch_size}")
+        self.evaluation_run = evaluation_run
+        self.judgment_api_key = judgment_api_key
+        self.batch_size = batch_size
+        self.checkpoint = checkpoint
+        self.pending: List[ScoringResult] = []
+        self.uploaded = (
+            sum(checkpoint.uploaded.values()) if checkpoint is not None else 0
+        )
+        self.url: Optional[str] = None
+
+    def add(self, scoring_result: ScoringResult) -> bool:
+        """Buffers a result; returns whether a full batch is ready to `flush`."""
+        self.pending.append(scoring_result)
+        return len(self.pending) >= self.batch_size
+
+    def flush(self) -> Optional[str]:
+        """Uploads the buffered results and returns the URL of the run's results."""
+        if not self.pending:
+            return self.url
+        batch, self.pending = self.pending, []
+
+        update: Dict[str, Any] = {
+            "examples": [result.data_object for result in batch],
+        }
+        if self.uploaded:
+            update.update(append=True, override=False)
+        run = self.evaluation_run.model_copy(update=update)
+
+        send_results = [
+            scoring_result.model_dump(warnings=False) for scoring_result in batch
+        ]
+        self.url = log_evaluation_results(send_results, run, self.judgment_api_key)
+        self.uploaded += len(batch)
+        if self.checkpoint is not None:
+            self.checkpoint.mark_uploaded(batch)
+        return self.url
+
+
 def check_examples(
     examples: List[Example], scorers: List[Union[APIScorerConfig, BaseScorer]]
 ) -> None:
@@ -262,7 +377,7 @@ def run_trace_eval(
     judgment_api_key: str,
     override: bool = False,
     function: Optional[Callable] = None,
-    tracer: Optional[Union[Tracer, BaseCallbackHandler]] = None,
+    tracer: Optional[Union[Tracer, "BaseCallbackHandler"]] = None,
     examples: Optional[List[Example]] = None,
 ) -> List[ScoringResult]:
     # Call endpoint to check to see if eval run name exists (if we DON'T want to override and DO want to log results)
@@ -292,6 +407,12 @@ def run_trace_eval(
             # This is a callback handler, get the underlying tracer
             actual_tracer = tracer.tracer
 
+        if getattr(actual_tracer, "evict_completed_spans", False):
+            raise ValueError(
+                "Running a function for trace evaluation requires the tracer to keep "
+                "completed spans. Please create the Tracer with evict_completed_spans=False."
+            )
+
         if trace_run.project_name != actual_tracer.project_name:
             raise ValueError(
                 f"Project name mismatch between run_trace_eval and tracer. "
@@ -321,7 +442,9 @@ def run_trace_eval(
             trace.trace_spans[0].expected_tools = examples[i].expected_tools
             new_traces.append(trace)
         trace_run.traces = new_traces
-        actual_tracer.traces = []
+        if isinstance(actual_tracer, Tracer):
+            # Back to a ring buffer if the tracer was created with max_traces
+            actual_tracer.traces = actual_tracer._new_traces_buffer()
 
     # Execute evaluation using Judgment API
     try:  # execute an EvaluationRun with just JudgmentScorers
@@ -485,21 +608,47 @@ def progress_logger(stop_event, msg="Working...", interval=5):
         stop_event.wait(interval)
 
 
-def run_eval(
+def _check_eval_run(
     evaluation_run: EvaluationRun,
     judgment_api_key: str,
     override: bool = False,
-) -> List[ScoringResult]:
+    resume: bool = False,
+    checkpoint: bool = False,
+) -> Tuple[List[APIScorerConfig], List[BaseScorer], Optional[EvaluationCheckpoint]]:
     """
-    Executes an evaluation of `Example`s using one or more `Scorer`s
-
-    Args:
-        evaluation_run (EvaluationRun): Stores example and evaluation together for running
-        override (bool, optional): Whether to override existing evaluation run with same name. Defaults to False.
+    Checks an evaluation run against the existing runs of its project, sets the
+    index of its examples and splits its scorers into Judgment API and local ones.
+    Runs with local scorers get a checkpoint with `checkpoint`, or one read back
+    from an earlier run with `resume`.
 
     Returns:
-        List[ScoringResult]: A list of ScoringResult objects
+        Tuple[List[APIScorerConfig], List[BaseScorer], Optional[EvaluationCheckpoint]]: The Judgment API scorers, the local scorers and the checkpoint
     """
+    judgment_scorers: List[APIScorerConfig] = []
+    local_scorers: List[BaseScorer] = []
+    for scorer in evaluation_run.scorers:
+        if isinstance(scorer, APIScorerConfig):
+            judgment_scorers.append(scorer)
+        else:
+            local_scorers.append(scorer)
+
+    if len(local_scorers) > 0 and len(judgment_scorers) > 0:
+        error_msg = "We currently do not support running both local and Judgment API scorers at the same time. Please run your evaluation with either local scorers or Judgment API scorers, but not both."
+        judgeval_logger.error(error_msg)
+        raise ValueError(error_msg)
+
+    if (resume or checkpoint) and len(judgment_scorers) > 0:
+        raise ValueError(
+            "Only evaluation runs with local scorers can be checkpointed and resumed, Judgment API scorers run on the server."
+        )
+
+    eval_checkpoint = None
+    if resume:
+        eval_checkpoint = EvaluationCheckpoint.open(
+            evaluation_run, local_scorers, resume=True
+        )
+        # The interrupted run already created the eval run
+        override = override or bool(eval_checkpoint.uploaded)
 
     # Call endpoint to check to see if eval run name exists (if we DON'T want to override and DO want to log results)
     if not override and not evaluation_run.append:
@@ -524,21 +673,115 @@ def run_eval(
     for idx, example in enumerate(evaluation_run.examples):
         example.example_index = idx  # Set numeric index
 
-    judgment_scorers: List[APIScorerConfig] = []
-    local_scorers: List[BaseScorer] = []
-    for scorer in evaluation_run.scorers:
-        if isinstance(scorer, APIScorerConfig):
-            judgment_scorers.append(scorer)
-        else:
-            local_scorers.append(scorer)
+    if checkpoint and eval_checkpoint is None:
+        # Only once the checks pass, so a run that was started by mistake doesn't
+        # discard the checkpoint of the run it clashes with
+        eval_checkpoint = EvaluationCheckpoint.open(evaluation_run, local_scorers)
 
-    results: List[ScoringResult] = []
-    url = ""
+    return judgment_scorers, local_scorers, eval_checkpoint
 
-    if len(local_scorers) > 0 and len(judgment_scorers) > 0:
-        error_msg = "We currently do not support running both local and Judgment API scorers at the same time. Please run your evaluation with either local scorers or Judgment API scorers, but not both."
-        judgeval_logger.error(error_msg)
-        raise ValueError(error_msg)
+
+async def _a_iter_local_eval(
+    evaluation_run: EvaluationRun,
+    local_scorers: List[BaseScorer],
+    uploader: EvaluationResultUploader,
+) -> AsyncGenerator[Tuple[int, ScoringResult], None]:
+    """
+    Scores the examples of a run with local scorers, yielding (example index,
+    `ScoringResult`) pairs as they complete and uploading them in batches.
+
+    Examples with a result in the uploader's checkpoint are not scored again;
+    their results are yielded first, and uploaded unless they already were. The
+    checkpoint is removed once all results were scored and uploaded.
+    """
+    checkpoint = uploader.checkpoint
+    pending: List[Tuple[int, Example]] = []
+    pbar = tqdm_asyncio(
+        desc=f"Evaluating {len(evaluation_run.examples)} example(s) in parallel",
+        unit="Example",
+        total=len(evaluation_run.examples),
+        bar_format="{desc}: |{bar}|{percentage:3.0f}% ({n_fmt}/{total_fmt}) [Time Taken: {elapsed}, {rate_fmt}{postfix}]",
+    )
+    try:
+        for index, example in enumerate(evaluation_run.examples):
+            scoring_result = checkpoint.get(example) if checkpoint else None
+            if checkpoint is None or scoring_result is None:
+                pending.append((index, example))
+                continue
+            pbar.update(1)
+            if not checkpoint.claim_upload(example) and uploader.add(scoring_result):
+                await asyncio.to_thread(uploader.flush)
+            yield index, scoring_result
+
+        async for pending_index, scoring_result in a_iter_scoring(
+            [example for _, example in pending],
+            local_scorers,
+            model=evaluation_run.model,
+            throttle_value=0,
+            max_concurrent=MAX_CONCURRENT_EVALUATIONS,
+            pbar=pbar,
+        ):
+            if checkpoint is not None:
+                checkpoint.add(scoring_result)
+            if uploader.add(scoring_result):
+                await asyncio.to_thread(uploader.flush)
+            yield pending[pending_index][0], scoring_result
+    finally:
+        pbar.close()
+        # Keep whatever was scored, also when the run fails or is stopped early
+        await asyncio.to_thread(uploader.flush)
+    # Only reached when the run completed and its last batch was uploaded
+    if checkpoint is not None:
+        checkpoint.remove()
+
+
+def _print_results_url(url: Optional[str]) -> None:
+    rprint(
+        f"\n🔍 You can view your evaluation results here: [rgb(106,0,255)][link={url}]View Results[/link]\n"
+    )
+
+
+def run_eval(
+    evaluation_run: EvaluationRun,
+    judgment_api_key: str,
+    override: bool = False,
+    resume: bool = False,
+    checkpoint: bool = False,
+) -> List[ScoringResult]:
+    """
+    Executes an evaluation of `Example`s using one or more `Scorer`s
+
+    Args:
+        evaluation_run (EvaluationRun): Stores example and evaluation together for running
+        override (bool, optional): Whether to override existing evaluation run with same name. Defaults to False.
+        resume (bool, optional): Whether to resume an interrupted run with local scorers from its checkpoint, see `judgeval.evaluation_checkpoint`. Defaults to False.
+        checkpoint (bool, optional): Whether to checkpoint a run with local scorers so it can be resumed; implied by `resume`. Defaults to False.
+
+    Returns:
+        List[ScoringResult]: A list of ScoringResult objects
+    """
+    judgment_scorers, local_scorers, eval_checkpoint = _check_eval_run(
+        evaluation_run, judgment_api_key, override, resume, checkpoint
+    )
+    return _run_checked_eval(
+        evaluation_run,
+        judgment_api_key,
+        judgment_scorers,
+        local_scorers,
+        eval_checkpoint,
+    )
+
+
+def _run_checked_eval(
+    evaluation_run: EvaluationRun,
+    judgment_api_key: str,
+    judgment_scorers: List[APIScorerConfig],
+    local_scorers: List[BaseScorer],
+    checkpoint: Optional[EvaluationCheckpoint],
+) -> List[ScoringResult]:
+    """Runs an evaluation that passed `_check_eval_run`, see `run_eval`."""
+    results: List[ScoringResult] = []
+    url: Optional[str] = ""
 
     if len(judgment_scorers) > 0:
         check_examples(evaluation_run.examples, judgment_scorers)
@@ -588,25 +831,87 @@ def run_eval(
             t.join()
 
     if len(local_scorers) > 0:
-        results = safe_run_async(
-            a_execute_scoring(
-                evaluation_run.examples,
-                local_scorers,
-                model=evaluation_run.model,
-                throttle_value=0,
-                max_concurrent=MAX_CONCURRENT_EVALUATIONS,
-            )
+        uploader = EvaluationResultUploader(
+            evaluation_run, judgment_api_key, checkpoint=checkpoint
+        )
+        by_index = dict(
+            safe_iter_async(_a_iter_local_eval(evaluation_run, local_scorers, uploader))
         )
+        results = [by_index[index] for index in range(len(evaluation_run.examples))]
+        url = uploader.url
+    _print_results_url(url)
+    return results
 
-        send_results = [
-            scoring_result.model_dump(warnings=False) for scoring_result in results
-        ]
 
-        url = log_evaluation_results(send_results, evaluation_run, judgment_api_key)
-    rprint(
-        f"\n🔍 You can view your evaluation results here: [rgb(106,0,255)][link={url}]View Results[/link]\n"
+def a_iter_eval(
+    evaluation_run: EvaluationRun,
+    judgment_api_key: str,
+    override: bool = False,
+    batch_size: int = EVAL_LOG_BATCH_SIZE,
+    resume: bool = False,
+    checkpoint: bool = False,
+) -> AsyncGenerator[Tuple[int, ScoringResult], None]:
+    """
+    Executes an evaluation of `Example`s using one or more `Scorer`s, yielding
+    each result as soon as it is available.
+
+    The run is checked (see `_check_eval_run`) when this is called, so invalid
+    runs raise here rather than on the first iteration.
+
+    Local scorers yield results in the order the examples finish and upload them
+    in batches of `batch_size` while the run is going. Judgment API scorers run
+    on the server, so their results are yielded once the whole run completes.
+
+    Args:
+        evaluation_run (EvaluationRun): Stores example and evaluation together for running
+        override (bool, optional): Whether to override existing evaluation run with same name. Defaults to False.
+        batch_size (int, optional): How many local results to upload at a time.
+        resume (bool, optional): Whether to resume an interrupted run with local scorers from its checkpoint.
+        checkpoint (bool, optional): Whether to checkpoint a run with local scorers so it can be resumed; implied by `resume`.
+
+    Returns:
+        AsyncGenerator[Tuple[int, ScoringResult], None]: The index of each example in `evaluation_run.examples` and its result
+    """
+    judgment_scorers, local_scorers, eval_checkpoint = _check_eval_run(
+        evaluation_run, judgment_api_key, override, resume, checkpoint
     )
-    return results
+    return _a_iter_checked_eval(
+        evaluation_run,
+        judgment_api_key,
+        judgment_scorers,
+        local_scorers,
+        eval_checkpoint,
+        batch_size,
+    )
+
+
+async def _a_iter_checked_eval(
+    evaluation_run: EvaluationRun,
+    judgment_api_key: str,
+    judgment_scorers: List[APIScorerConfig],
+    local_scorers: List[BaseScorer],
+    checkpoint: Optional[EvaluationCheckpoint],
+    batch_size: int,
+) -> AsyncGenerator[Tuple[int, ScoringResult], None]:
+    if len(judgment_scorers) == 0:
+        uploader = EvaluationResultUploader(
+            evaluation_run, judgment_api_key, batch_size, checkpoint
+        )
+        async for item in _a_iter_local_eval(evaluation_run, local_scorers, uploader):
+            yield item
+        _print_results_url(uploader.url)
+        return
+
+    results = await asyncio.to_thread(
+        _run_checked_eval,
+        evaluation_run,
+        judgment_api_key,
+        judgment_scorers,
+        local_scorers,
+        checkpoint,
+    )
+    for item in enumerate(results):
+        yield item
 
 
 def assert_test(scoring_results: List[ScoringResult]) -> None:
@@ -5,7 +5,17 @@ Infrastructure for executing evaluations of `Example`s using one or more `BaseSc
 import asyncio
 import time
 from tqdm.asyncio import tqdm_asyncio
-from typing import List, Union, Optional, Callable
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Iterable,
+    List,
+    Optional,
+    Sized,
+    Tuple,
+    Union,
+)
 
 from judgeval.data import (
     Example,
@@ -47,104 +57,174 @@ async def safe_a_score_example(
         return
 
 
+ExampleSource = Union[Iterable[Example], AsyncIterable[Example]]
+
+
+async def _aiter_examples(examples: ExampleSource) -> AsyncIterator[Example]:
+    if isinstance(examples, AsyncIterable):
+        async for example in examples:
+            yield example
+    else:
+        for example in examples:
+            yield example
+
+
+async def a_iter_scoring(
+    examples: ExampleSource,
+    scorers: List[BaseScorer],
+    model: Optional[Union[str, List[str], JudgevalJudge]] = "gpt-4.1",
+    ignore_errors: bool = False,
+    throttle_value: int = 0,
+    max_concurrent: int = 100,
+    pbar: Optional[tqdm_asyncio] = None,
+) -> AsyncIterator[Tuple[int, ScoringResult]]:
+    """
+    Scores `Example`s with a pool of `max_concurrent` workers, yielding
+    (example index, `ScoringResult`) pairs in the order the examples finish.
+
+    Examples are pulled from `examples`, a list, iterable or async iterable, only
+    as workers free up, and each worker clones the scorers for the one example it
+    is scoring. At most `max_concurrent` examples (and scorer copies) are in
+    flight, and workers wait while that many results are waiting to be consumed.
+
+    Entries that aren't `Example`s are skipped, as is everything when there are no
+    scorers. With `ignore_errors`, an example whose evaluation fails is logged and
+    skipped; otherwise the error stops the workers and is raised here.
+    """
+    # Add model to scorers
+    for scorer in scorers:
+        if not scorer.model:
+            scorer._add_model(model)
+
+    source = _aiter_examples(examples).__aiter__()
+    next_index = 0
+    source_lock = asyncio.Lock()
+    results: asyncio.Queue = asyncio.Queue(maxsize=max_concurrent)
+    worker_done = object()
+
+    async def next_example() -> Optional[Tuple[int, Any]]:
+        nonlocal next_index
+        # Async generators can't be advanced by two workers at once
+        async with source_lock:
+            try:
+                example = await source.__anext__()
+            except StopAsyncIteration:
+                return None
+            index = next_index
+            next_index += 1
+            await asyncio.sleep(throttle_value)
+            return index, example
+
+    async def worker():
+        try:
+            while True:
+                item = await next_example()
+                if item is None:
+                    break
+                index, example = item
+                if not isinstance(example, Example) or not scorers:
+                    if pbar is not None:
+                        pbar.update(1)
+                    continue
+
+                try:
+                    scoring_result = await a_score_example(
+                        clone_scorers(scorers), example
+                    )
+                except Exception as e:
+                    judgeval_logger.error(f"Error executing function: {e}")
+                    if not ignore_errors:
+                        raise
+                    continue
+                finally:
+                    if pbar is not None:
+                        pbar.update(1)
+                await results.put((index, scoring_result))
+        except asyncio.CancelledError:
+            raise
+        except BaseException as e:
+            # Also e.g. KeyboardInterrupt, which would otherwise leave the
+            # consumer waiting for this worker forever
+            await results.put(e)
+        else:
+            await results.put(worker_done)
+
+    workers = [asyncio.create_task(worker()) for _ in range(max(max_concurrent, 1))]
+    running = len(workers)
+    try:
+        while running:
+            item = await results.get()
+            if item is worker_done:
+                running -= 1
+            elif isinstance(item, BaseException):
+                raise item
+            else:
+                yield item
+    finally:
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+
+
 async def a_execute_scoring(
-    examples: List[Example],
+    examples: ExampleSource,
     scorers: List[BaseScorer],
     model: Optional[Union[str, List[str], JudgevalJudge]] = "gpt-4.1",
     ignore_errors: bool = False,
     throttle_value: int = 0,
     max_concurrent: int = 100,
-) -> List[ScoringResult]:
+) -> List[Optional[ScoringResult]]:
     """
     Executes evaluations of `Example`s asynchronously using one or more `BaseScorer`s.
     Each `Example` will be evaluated by all of the `BaseScorer`s in the `scorers` list.
 
     Args:
-        examples (List[Example]): A list of `Example` objects to be evaluated.
+        examples (Iterable[Example]): The `Example` objects to be evaluated, as a list, iterable or async iterable.
         scorers (List[BaseScorer]): A list of `BaseScorer` objects to evaluate the examples.
         model (Union[str, List[str], JudgevalJudge]): The model to use for evaluation.
         ignore_errors (bool): Whether to ignore errors during evaluation.
-        throttle_value (int): The amount of time to wait between starting each task.
-        max_concurrent (int): The maximum number of concurrent tasks.
-
-        _use_bar_indicator (bool): Whether to use a progress bar indicator.
+        throttle_value (int): The amount of time to wait between starting each example.
+        max_concurrent (int): The maximum number of examples evaluated at once.
 
     Returns:
-        List[ScoringResult]: A list of `ScoringResult` objects containing the evaluation results.
+        List[Optional[ScoringResult]]: A list of `ScoringResult` objects containing the evaluation results,
+        in the order of the examples (None for examples that were skipped).
     """
-
-    semaphore = asyncio.Semaphore(max_concurrent)
-
-    async def execute_with_semaphore(func: Callable, *args, **kwargs):
-        async with semaphore:
-            try:
-                return await func(*args, **kwargs)
-            except Exception as e:
-                judgeval_logger.error(f"Error executing function: {e}")
-                if kwargs.get("ignore_errors", False):
-                    # Simply return None when ignoring errors, as expected by the test
-                    return None
-                # If we're not ignoring errors, propagate the exception
-                raise
-
-    # Add model to scorers
-    for scorer in scorers:
-        if not scorer.model:
-            scorer._add_model(model)
-
-    scoring_results: List[ScoringResult] = [None for _ in examples]
-    tasks = []
-    cloned_scorers: List[BaseScorer]
+    total = len(examples) if isinstance(examples, Sized) else None
+    scoring_results: List[Optional[ScoringResult]] = [None for _ in range(total or 0)]
 
     with tqdm_asyncio(
-        desc=f"Evaluating {len(examples)} example(s) in parallel",
+        desc=f"Evaluating {total if total is not None else 'streamed'} example(s) in parallel",
         unit="Example",
-        total=len(examples),
+        total=total,
         bar_format="{desc}: |{bar}|{percentage:3.0f}% ({n_fmt}/{total_fmt}) [Time Taken: {elapsed}, {rate_fmt}{postfix}]",
     ) as pbar:
-        for i, ex in enumerate(examples):
-            if isinstance(ex, Example):
-                if len(scorers) == 0:
-                    pbar.update(1)
-                    continue
-
-                cloned_scorers = clone_scorers(scorers)
-                task = execute_with_semaphore(
-                    func=a_eval_examples_helper,
-                    scorers=cloned_scorers,
-                    example=ex,
-                    scoring_results=scoring_results,
-                    score_index=i,
-                    ignore_errors=ignore_errors,
-                    pbar=pbar,
+        async for index, scoring_result in a_iter_scoring(
+            examples,
+            scorers,
+            model=model,
+            ignore_errors=ignore_errors,
+            throttle_value=throttle_value,
+            max_concurrent=max_concurrent,
+            pbar=pbar,
+        ):
+            if index >= len(scoring_results):
+                scoring_results.extend(
+                    None for _ in range(index + 1 - len(scoring_results))
                 )
-                tasks.append(asyncio.create_task(task))
-
-            await asyncio.sleep(throttle_value)
-        await asyncio.gather(*tasks)
+            scoring_results[index] = scoring_result
     return scoring_results
 
 
-async def a_eval_examples_helper(
-    scorers: List[BaseScorer],
-    example: Example,
-    scoring_results: List[ScoringResult],
-    score_index: int,
-    ignore_errors: bool,
-    pbar: Optional[tqdm_asyncio] = None,
-) -> None:
+async def a_score_example(scorers: List[BaseScorer], example: Example) -> ScoringResult:
     """
     Evaluate a single example asynchronously using a list of scorers.
 
     Args:
         scorers (List[BaseScorer]): List of BaseScorer objects to evaluate the example.
         example (Example): The example to be evaluated.
-        scoring_results (List[ScoringResult]): List to store the scoring results.
-        score_index (int): Index at which the result should be stored in scoring_results.
-        ignore_errors (bool): Flag to indicate whether to ignore errors during scoring.
-        pbar (Optional[tqdm_asyncio]): Optional progress bar for tracking progress.
     Returns:
-        None
+        ScoringResult: The result of the example, with the data of every scorer that ran.
     """
 
     # scoring the Example
@@ -172,10 +252,32 @@ async def a_eval_examples_helper(
     scoring_end_time = time.perf_counter()
     run_duration = scoring_end_time - scoring_start_time
 
-    scoring_result = generate_scoring_result(
-        example, scorer_data_list, run_duration, success
-    )
-    scoring_results[score_index] = scoring_result
+    return generate_scoring_result(example, scorer_data_list, run_duration, success)
+
+
+async def a_eval_examples_helper(
+    scorers: List[BaseScorer],
+    example: Example,
+    scoring_results: List[ScoringResult],
+    score_index: int,
+    ignore_errors: bool,
+    pbar: Optional[tqdm_asyncio] = None,
+) -> None:
+    """
+    Evaluate a single example asynchronously using a list of scorers, storing the
+    result in `scoring_results[score_index]`. See `a_score_example`.
+
+    Args:
+        scorers (List[BaseScorer]): List of BaseScorer objects to evaluate the example.
+        example (Example): The example to be evaluated.
+        scoring_results (List[ScoringResult]): List to store the scoring results.
+        score_index (int): Index at which the result should be stored in scoring_results.
+        ignore_errors (bool): Flag to indicate whether to ignore errors during scoring.
+        pbar (Optional[tqdm_asyncio]): Optional progress bar for tracking progress.
+    Returns:
+        None
+    """
+    scoring_results[score_index] = await a_score_example(scorers, example)
 
     if pbar is not None:
         pbar.update(1)
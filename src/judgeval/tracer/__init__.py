@@ -1,3 +1,23 @@
-from judgeval.common.tracer import Tracer, wrap, TraceClient, TraceManagerClient
+from judgeval.common.tracer import (
+    Tracer,
+    wrap,
+    TraceClient,
+    TraceManagerClient,
+    TraceContext,
+    InMemoryTraceStore,
+    TracedThreadPoolExecutor,
+    submit_with_context,
+    set_traced_default_executor,
+)
 
-__all__ = ["Tracer", "wrap", "TraceClient", "TraceManagerClient"]
+__all__ = [
+    "Tracer",
+    "wrap",
+    "TraceClient",
+    "TraceManagerClient",
+    "TraceContext",
+    "InMemoryTraceStore",
+    "TracedThreadPoolExecutor",
+    "submit_with_context",
+    "set_traced_default_executor",
+]
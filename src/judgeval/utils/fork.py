@@ -0,0 +1,64 @@
+"""
+Helpers for keeping judgeval usable in forked processes.
+
+Pre-fork servers (gunicorn/uwsgi with preload_app) create judgeval objects in the
+master and then fork workers. A child only inherits the thread that called fork(),
+so background threads are gone, locks held by other threads stay locked forever and
+pooled HTTP connections are shared with the parent. Objects that own such state
+register a hook here to rebuild it in every child.
+"""
+
+import logging
+import os
+import weakref
+from types import MethodType
+from typing import Callable, Union
+
+# judgeval_logger is not imported here since this module is loaded by
+# judgeval.utils.requests, which judgeval.common imports
+_logger = logging.getLogger("judgeval")
+
+# Incremented in every forked child, so objects can lazily detect that they were
+# inherited from a parent process without paying for os.getpid() calls.
+fork_generation = 0
+
+
+def register_after_fork_in_child(callback: Union[Callable[[], None], MethodType]):
+    """
+    Runs `callback` in each child process right after os.fork().
+
+    Bound methods are held weakly, so registering does not keep their object alive.
+    Errors are logged rather than raised, since they would otherwise surface in
+    whatever code happened to call fork().
+    """
+    if not hasattr(os, "register_at_fork"):
+        return
+
+    if isinstance(callback, MethodType):
+        weak_method = weakref.WeakMethod(callback)
+
+        def get_callback():
+            return weak_method()
+    else:
+
+        def get_callback():
+            return callback
+
+    def _after_in_child():
+        reinit = get_callback()
+        if reinit is None:
+            return
+        try:
+            reinit()
+        except Exception as e:
+            _logger.warning(f"Error reinitializing judgeval state after fork: {e}")
+
+    os.register_at_fork(after_in_child=_after_in_child)
+
+
+def _increment_fork_generation():
+    global fork_generation
+    fork_generation += 1
+
+
+register_after_fork_in_child(_increment_fork_generation)
@@ -3,6 +3,8 @@ from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 from http import HTTPStatus
 
+from judgeval.utils.fork import register_after_fork_in_child
+
 
 class RetrySession(requests_original.Session):
     def __init__(
@@ -17,7 +19,7 @@ class RetrySession(requests_original.Session):
         # Store default timeout
         self.default_timeout = default_timeout
 
-        retry_strategy = Retry(
+        self.retry_strategy = Retry(
             total=retries,
             read=retries,
             connect=retries,
@@ -25,7 +27,13 @@ class RetrySession(requests_original.Session):
             status_forcelist=status_forcelist,
         )
 
-        adapter = HTTPAdapter(max_retries=retry_strategy)
+        self._mount_adapters()
+        register_after_fork_in_child(self._mount_adapters)
+
+    def _mount_adapters(self):
+        # Also called in forked children, so they don't reuse the parent's pooled
+        # connections (and pool locks); the inherited pools are simply dropped
+        adapter = HTTPAdapter(max_retries=self.retry_strategy)
         self.mount("http://", adapter)
         self.mount("https://", adapter)
 
@@ -2,9 +2,28 @@ import importlib.metadata
 from judgeval.utils.requests import requests
 import threading
 from judgeval.common.logger import judgeval_logger
+from judgeval.utils.fork import register_after_fork_in_child
+
+
+_checked_packages: set[str] = set()
+_checked_packages_lock = threading.Lock()
+
+
+def _reset_lock_after_fork():
+    global _checked_packages_lock
+    _checked_packages_lock = threading.Lock()
+
+
+register_after_fork_in_child(_reset_lock_after_fork)
 
 
 def check_latest_version(package_name: str = "judgeval"):
+    """Checks PyPI for a newer release in the background, at most once per process."""
+    with _checked_packages_lock:
+        if package_name in _checked_packages:
+            return
+        _checked_packages.add(package_name)
+
     def _check():
         try:
             current_version = importlib.metadata.version(package_name)
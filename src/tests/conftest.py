@@ -0,0 +1,120 @@
+"""
+Shared fixtures for unit tests.
+
+Unit tests never talk to the Judgment API: API key validation and the
+JudgmentApiClient upload calls are patched out. Spans of the `tracer` fixture go to the
+no-op SpanProcessorBase; `make_tracer` builds tracers that export wherever the
+test configures.
+"""
+
+from typing import Any, List
+
+import pytest
+
+from judgeval.common.api.api import JudgmentApiClient
+from judgeval.common.tracer import SpanProcessorBase, Tracer
+from judgeval.data import TraceSpan
+
+
+@pytest.fixture
+def api_key_validation(mocker):
+    """
+    validate_api_key_cached, accepting any key. Tests can change its return_value
+    or side_effect, e.g. to a ConnectionError for an unreachable API.
+    """
+    return mocker.patch(
+        "judgeval.common.utils.validate_api_key_cached", return_value=(True, {})
+    )
+
+
+@pytest.fixture
+def judgment_api(mocker):
+    """
+    Trace upserts and span and evaluation run batches succeed without a request.
+    Tests recording uploads patch these again, on top, by depending on this fixture.
+    """
+    for name in ("upsert_trace", "send_spans_batch", "send_evaluation_runs_batch"):
+        # A plain function rather than a Mock, which would record every call
+        mocker.patch.object(JudgmentApiClient, name, new=lambda self, payload: {})
+
+
+@pytest.fixture
+def make_tracer(api_key_validation, judgment_api):
+    """
+    Builds Tracers with the given constructor arguments on top of the unit-test
+    defaults. Spans are exported to whatever the arguments configure; nothing
+    reaches the Judgment API. The tracers are shut down after the test.
+    """
+    tracers: List[Tracer] = []
+
+    def build(**tracer_kwargs: Any) -> Tracer:
+        tracer_kwargs = {
+            "api_key": "test-api-key",
+            "organization_id": "test-org-id",
+            "project_name": "unit-tests",
+            **tracer_kwargs,
+        }
+        tracer = Tracer(**tracer_kwargs)
+        tracers.append(tracer)
+        return tracer
+
+    yield build
+    for tracer in tracers:
+        tracer.shutdown_background_service()
+
+
+@pytest.fixture
+def tracer(make_tracer) -> Tracer:
+    tracer = make_tracer()
+    assert tracer.api_key_validation is not None
+    assert tracer.api_key_validation.wait(timeout=5) == (True, {})
+    tracer.shutdown_background_service()
+    assert isinstance(tracer.otel_span_processor, SpanProcessorBase)
+    return tracer
+
+
+@pytest.fixture
+def make_span():
+    """Builds a span of function span_id running [start, start + duration] seconds."""
+
+    def build(span_id, start, duration, parent=None, function=None, usage=None):
+        return TraceSpan(
+            span_id=span_id,
+            trace_id="trace-1",
+            function=function or span_id,
+            depth=0,
+            created_at=1_700_000_000.0 + start,
+            duration=duration,
+            parent_span_id=parent,
+            usage=usage,
+        )
+
+    return build
+
+
+@pytest.fixture
+def make_trace():
+    """Builds a trace document of the given spans, as saved by the tracer."""
+
+    def build(name, spans, trace_id="trace-1"):
+        return {"trace_id": trace_id, "name": name, "trace_spans": spans}
+
+    return build
+
+
+@pytest.fixture
+def spans_by_function():
+    """
+    Indexes the spans of a saved trace document by function name. With grouped=True
+    each name maps to a list of its spans, for functions called more than once.
+    """
+
+    def index(trace_data, grouped=False):
+        if not grouped:
+            return {span["function"]: span for span in trace_data["trace_spans"]}
+        spans = {}
+        for span in trace_data["trace_spans"]:
+            spans.setdefault(span["function"], []).append(span)
+        return spans
+
+    return index
@@ -0,0 +1,157 @@
+"""
+Tests for cached, background API key validation.
+"""
+
+import os
+import threading
+import time
+
+import pytest
+
+from judgeval.common import utils
+from judgeval.common.exceptions import JudgmentAPIError
+from judgeval.common.tracer import (
+    JudgmentAPISpanExporter,
+    SpanProcessorBase,
+    TraceClient,
+    Tracer,
+    otel_exporter,
+)
+from judgeval.common.tracer.otel_span_processor import JudgmentSpanProcessor
+
+
+@pytest.fixture
+def validate_calls(monkeypatch, tmp_path):
+    """Points the cache at a temp dir and counts calls to the validation endpoint."""
+    monkeypatch.setenv("JUDGMENT_CACHE_DIR", str(tmp_path))
+    calls = []
+
+    def fake_validate_api_key(judgment_api_key):
+        calls.append(judgment_api_key)
+        time.sleep(0.05)
+        if judgment_api_key == "invalid-key":
+            return False, "Invalid API key"
+        return True, {}
+
+    monkeypatch.setattr(utils, "validate_api_key", fake_validate_api_key)
+    return calls
+
+
+def test_successful_validation_is_cached(validate_calls, tmp_path):
+    assert utils.validate_api_key_cached("valid-key")[0] is True
+    assert utils.validate_api_key_cached("valid-key")[0] is True
+
+    assert validate_calls == ["valid-key"]
+    cache_files = [name for name in os.listdir(tmp_path) if name.endswith(".json")]
+    assert len(cache_files) == 1
+    with open(tmp_path / cache_files[0]) as f:
+        assert "valid-key" not in f.read()
+
+
+def test_expired_validation_is_refreshed(validate_calls):
+    utils.validate_api_key_cached("valid-key", ttl=0)
+    utils.validate_api_key_cached("valid-key", ttl=0)
+
+    assert validate_calls == ["valid-key", "valid-key"]
+
+
+def test_rejected_key_is_not_cached(validate_calls):
+    assert utils.validate_api_key_cached("invalid-key") == (False, "Invalid API key")
+    assert utils.validate_api_key_cached("invalid-key") == (False, "Invalid API key")
+
+    assert validate_calls == ["invalid-key", "invalid-key"]
+
+
+def test_concurrent_workers_validate_once(validate_calls):
+    results = []
+    workers = [
+        threading.Thread(
+            target=lambda: results.append(utils.validate_api_key_cached("valid-key"))
+        )
+        for _ in range(8)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    assert all(result for result, _ in results)
+    assert validate_calls == ["valid-key"]
+
+
+def test_background_validation_does_not_block(validate_calls):
+    start = time.perf_counter()
+    validation = utils.BackgroundAPIKeyValidation("valid-key").start()
+    assert time.perf_counter() - start < 0.05
+
+    assert validation.wait(timeout=5) == (True, {})
+    assert validation.done
+
+
+def test_tracer_disables_monitoring_for_rejected_key(validate_calls, mocker):
+    shutdown = mocker.spy(JudgmentSpanProcessor, "shutdown")
+    tracer = Tracer(
+        api_key="invalid-key", organization_id="test-org-id", project_name="unit-tests"
+    )
+    # Created while the key is still being validated
+    trace_client = TraceClient(tracer)
+    assert tracer.api_key_validation.wait(timeout=5)[0] is False
+
+    assert tracer.enable_monitoring is False
+    assert tracer.enable_evaluations is False
+    assert type(tracer.otel_span_processor) is SpanProcessorBase
+    assert trace_client.otel_span_processor is tracer.otel_span_processor
+    # The replaced processor is shut down, stopping its export thread
+    deadline = time.monotonic() + 5
+    while not shutdown.called and time.monotonic() < deadline:
+        time.sleep(0.01)
+    shutdown.assert_called_once()
+
+
+def test_exporter_drops_buffered_spans_for_rejected_key(validate_calls, mocker):
+    validation = utils.BackgroundAPIKeyValidation("invalid-key").start()
+    exporter = JudgmentAPISpanExporter(
+        judgment_api_key="invalid-key",
+        organization_id="test-org-id",
+        api_key_validation=validation,
+    )
+    send_spans = mocker.patch.object(exporter, "_send_spans_batch")
+
+    result = exporter.export([mocker.MagicMock(attributes={})])
+
+    assert result.name == "FAILURE"
+    send_spans.assert_not_called()
+
+
+def test_exporter_does_not_wait_for_a_hung_validation(monkeypatch, mocker):
+    release = threading.Event()
+    monkeypatch.setattr(
+        utils, "validate_api_key_cached", lambda key: (release.wait(), {})
+    )
+    monkeypatch.setattr(otel_exporter, "API_KEY_VALIDATION_TIMEOUT_SECONDS", 0.05)
+    validation = utils.BackgroundAPIKeyValidation("valid-key").start()
+    exporter = JudgmentAPISpanExporter(
+        judgment_api_key="valid-key",
+        organization_id="test-org-id",
+        api_key_validation=validation,
+    )
+    send_spans = mocker.patch.object(exporter, "_send_spans_batch")
+
+    try:
+        result = exporter.export([mocker.MagicMock(attributes={})])
+    finally:
+        release.set()
+
+    assert result.name == "FAILURE"
+    send_spans.assert_not_called()
+
+
+def test_judgment_client_raises_on_first_api_call(validate_calls):
+    from judgeval.judgment_client import JudgmentClient, SingletonMeta
+
+    SingletonMeta._instances.pop(JudgmentClient, None)
+    client = JudgmentClient(api_key="invalid-key", organization_id="test-org-id")
+
+    with pytest.raises(JudgmentAPIError):
+        client.create_project("unit-tests")
+    assert JudgmentClient not in SingletonMeta._instances
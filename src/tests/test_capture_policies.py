@@ -0,0 +1,207 @@
+"""
+Tests for per-function capture policies of @observe and observe_tools.
+"""
+
+import asyncio
+
+import pytest
+
+from judgeval.common.tracer.capture_policy import CapturePolicies, CapturePolicy
+
+
+class Store:
+    def search(self, query):
+        return [query]
+
+    def fetch(self, key):
+        return key
+
+
+class CachedStore(Store):
+    def lookup(self, key):
+        return key
+
+
+def tokenize(text):
+    return text.split()
+
+
+def test_policy_resolution_order():
+    policies = CapturePolicies(
+        {
+            "*.Store.fetch": "inputs",
+            "tokenize": "aggregate",
+            Store: "metadata",
+            Store.search: CapturePolicy("outputs", sample_every=2),
+        }
+    )
+
+    assert policies.resolve(Store.search).mode == "outputs"
+    assert policies.resolve(Store.search).sample_every == 2
+    # The class entry wins over the glob
+    assert policies.resolve(Store.fetch).mode == "metadata"
+    # Methods of subclasses, including inherited ones
+    assert policies.resolve(CachedStore.lookup, CachedStore).mode == "metadata"
+    assert policies.resolve(Store.fetch, CachedStore).mode == "metadata"
+    # Globs match with or without the module
+    assert policies.resolve(tokenize).mode == "aggregate"
+    module_glob = f"{tokenize.__module__}.tok*"
+    assert CapturePolicies({module_glob: "none"}).resolve(tokenize).mode == "none"
+    assert CapturePolicies({"*.Store.fetch": "inputs"}).resolve(
+        Store.fetch, CachedStore
+    ) == CapturePolicy("full")
+    assert CapturePolicies().resolve(tokenize) == CapturePolicy()
+
+
+def test_invalid_policies():
+    with pytest.raises(ValueError, match="sometimes"):
+        CapturePolicy("sometimes")
+    with pytest.raises(ValueError):
+        CapturePolicy("full", sample_every=0)
+    with pytest.raises(TypeError):
+        CapturePolicies({42: "full"})
+
+
+def test_capture_modes(tracer, spans_by_function):
+    @tracer.observe(capture="metadata")
+    def quiet(document):
+        return document
+
+    @tracer.observe(capture="inputs")
+    def ingest(document):
+        return document
+
+    @tracer.observe(capture="outputs")
+    def produce(document):
+        return document
+
+    @tracer.observe
+    def agent():
+        quiet("a")
+        ingest("b")
+        produce("c")
+
+    agent()
+
+    spans = spans_by_function(tracer.traces[-1])
+    assert (spans["quiet"]["inputs"], spans["quiet"]["output"]) == (None, None)
+    assert (spans["ingest"]["inputs"], spans["ingest"]["output"]) == (
+        {"document": "b"},
+        None,
+    )
+    assert (spans["produce"]["inputs"], spans["produce"]["output"]) == (None, "c")
+
+
+def test_aggregate_and_sampled_calls_are_counted(tracer):
+    tracer.capture_policies = CapturePolicies(
+        {"*tokenize": "aggregate", "*rerank": CapturePolicy("full", sample_every=3)}
+    )
+
+    def tokenize(text):
+        if not text:
+            raise ValueError("empty")
+        return text.split()
+
+    tokenize = tracer.observe(tokenize)
+
+    @tracer.observe
+    async def rerank(results):
+        return results
+
+    @tracer.observe
+    async def agent():
+        for text in ["a b", "c", ""]:
+            try:
+                tokenize(text)
+            except ValueError:
+                pass
+        for _ in range(6):
+            await rerank([1])
+
+    asyncio.run(agent())
+
+    trace = tracer.traces[-1]
+    functions = [span["function"] for span in trace["trace_spans"]]
+    assert "tokenize" not in functions
+    assert functions.count("rerank") == 2
+    aggregated = trace["metadata"]["aggregated_calls"]
+    assert aggregated["tokenize"]["count"] == 3
+    assert aggregated["tokenize"]["errors"] == 1
+    assert aggregated["tokenize"]["total_duration"] >= 0
+    assert aggregated["rerank"]["count"] == 4
+
+
+def test_none_leaves_the_function_undecorated(tracer):
+    tracer.capture_policies = CapturePolicies({tokenize: "none"})
+
+    assert tracer.observe(tokenize) is tokenize
+
+
+def test_observe_tools_applies_class_policies(tracer, spans_by_function):
+    # observe marks the functions it decorates, so these tests use their own classes
+    class Index:
+        def search(self, query):
+            return [query]
+
+    class CachedIndex(Index):
+        def lookup(self, key):
+            return key
+
+    tracer.capture_policies = CapturePolicies(
+        {Index: "metadata", CachedIndex.lookup: "aggregate"}
+    )
+
+    @tracer.observe_tools
+    class Tools(CachedIndex):
+        pass
+
+    tracer.capture_policies = CapturePolicies()
+
+    @tracer.observe
+    def agent():
+        tools = Tools()
+        tools.search("q")
+        tools.lookup("k")
+
+    agent()
+
+    trace = tracer.traces[-1]
+    spans = spans_by_function(trace)
+    assert spans["search"]["inputs"] is None
+    assert "lookup" not in spans
+    assert trace["metadata"]["aggregated_calls"]["lookup"]["count"] == 1
+
+
+def test_observe_tools_capture_override(tracer, spans_by_function):
+    class Cache:
+        def fetch(self, key):
+            return key
+
+    @tracer.observe_tools(capture="outputs")
+    class Tools(Cache):
+        pass
+
+    @tracer.observe
+    def agent():
+        return Tools().fetch("k")
+
+    agent()
+
+    fetch = spans_by_function(tracer.traces[-1])["fetch"]
+    assert (fetch["inputs"], fetch["output"]) == (None, "k")
+
+
+def test_generators_always_get_spans(tracer, spans_by_function):
+    @tracer.observe(capture=CapturePolicy("aggregate"))
+    def stream(n):
+        yield from range(n)
+
+    @tracer.observe
+    def agent():
+        return list(stream(2))
+
+    agent()
+
+    span = spans_by_function(tracer.traces[-1])["stream"]
+    assert span["inputs"] is None
+    assert span["additional_metadata"]["stream"]["item_count"] == 2
@@ -0,0 +1,166 @@
+"""
+Tests for the local collector daemon and the tracer's collector client.
+"""
+
+import os
+import tempfile
+import time
+
+import pytest
+
+from judgeval.common.api.api import JudgmentApiClient
+from judgeval.common.tracer.collector import (
+    CollectorApiClient,
+    CollectorClient,
+    CollectorServer,
+)
+
+pytestmark = pytest.mark.skipif(
+    not hasattr(os, "fork"), reason="Unix domain sockets are not available"
+)
+
+
+@pytest.fixture
+def uploads(judgment_api, mocker):
+    """Records what would have been uploaded to the Judgment API, per organization."""
+    recorded = []
+
+    def record(kind):
+        def send(self, payload):
+            recorded.append((kind, self.organization_id, payload))
+            return {}
+
+        return send
+
+    mocker.patch.object(JudgmentApiClient, "send_spans_batch", new=record("spans"))
+    mocker.patch.object(
+        JudgmentApiClient, "send_evaluation_runs_batch", new=record("evaluation_runs")
+    )
+    mocker.patch.object(JudgmentApiClient, "upsert_trace", new=record("traces"))
+    return recorded
+
+
+@pytest.fixture
+def socket_path():
+    # pytest's tmp_path can exceed the ~100 byte limit on Unix socket paths
+    with tempfile.TemporaryDirectory(prefix="jv-") as directory:
+        yield os.path.join(directory, "collector.sock")
+
+
+@pytest.fixture
+def collector(socket_path, uploads):
+    server = CollectorServer(socket_path, batch_size=100, flush_interval=0.05).start()
+    yield server
+    server.stop()
+
+
+def _wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            pytest.fail("Timed out waiting for the collector")
+        time.sleep(0.01)
+
+
+def test_batches_across_clients(collector, socket_path, uploads):
+    clients = [CollectorClient(socket_path) for _ in range(4)]
+    for i, client in enumerate(clients):
+        assert client.send(
+            "spans", "key", "org", [{"span_id": f"{i}-{j}"} for j in range(5)]
+        )
+
+    _wait_for(lambda: sum(len(payload) for _, _, payload in uploads) == 20)
+    # Spans from every process are uploaded together rather than per process
+    assert len(uploads) < len(clients)
+    assert {kind for kind, _, _ in uploads} == {"spans"}
+
+
+def test_groups_uploads_by_organization(collector, socket_path, uploads):
+    client = CollectorClient(socket_path)
+    client.send("spans", "key", "org-a", [{"span_id": "a"}])
+    client.send("spans", "key", "org-b", [{"span_id": "b"}])
+    client.send("traces", "key", "org-a", [{"trace_id": "t"}])
+
+    _wait_for(lambda: len(uploads) == 3)
+    assert sorted(uploads) == [
+        ("spans", "org-a", [{"span_id": "a"}]),
+        ("spans", "org-b", [{"span_id": "b"}]),
+        ("traces", "org-a", {"trace_id": "t"}),
+    ]
+
+
+def test_malformed_messages_are_dropped(collector, uploads):
+    collector.add(["not", "an", "object"])
+    collector.add({"kind": "spans", "items": [{"span_id": "a"}]})
+    collector.add(
+        {"kind": "spans", "api_key": "key", "organization_id": "org", "items": "a"}
+    )
+    collector.add(
+        {
+            "kind": "spans",
+            "api_key": "key",
+            "organization_id": "org",
+            "items": [{"span_id": "b"}],
+        }
+    )
+
+    _wait_for(lambda: uploads)
+    assert uploads == [("spans", "org", [{"span_id": "b"}])]
+
+
+def test_stop_uploads_pending_items(socket_path, uploads):
+    server = CollectorServer(socket_path, flush_interval=60).start()
+    client = CollectorClient(socket_path)
+    client.send("evaluation_runs", "key", "org", [{"evaluation_run": {}}])
+    client.close()
+    time.sleep(0.1)
+
+    server.stop()
+
+    assert uploads == [("evaluation_runs", "org", [{"evaluation_run": {}}])]
+    assert not os.path.exists(socket_path)
+
+
+def test_client_falls_back_to_direct_upload(socket_path, uploads):
+    api_client = CollectorApiClient("key", "org", CollectorClient(socket_path))
+
+    api_client.send_spans_batch([{"span_id": "direct"}])
+
+    assert uploads == [("spans", "org", [{"span_id": "direct"}])]
+
+
+def test_tracer_sends_through_collector(
+    collector, socket_path, uploads, make_tracer, monkeypatch
+):
+    sent_kinds = []
+    original_send = CollectorClient.send
+
+    def spy_send(self, kind, *args):
+        sent_kinds.append(kind)
+        return original_send(self, kind, *args)
+
+    monkeypatch.setattr(CollectorClient, "send", spy_send)
+    tracer = make_tracer(span_flush_interval=0.05, collector_socket=socket_path)
+
+    @tracer.observe
+    def agent():
+        return 1
+
+    agent()
+    tracer.flush_background_spans()
+    _wait_for(lambda: len([kind for kind, _, _ in uploads if kind == "traces"]) == 2)
+    _wait_for(lambda: any(kind == "spans" for kind, _, _ in uploads))
+    tracer.shutdown_background_service()
+
+    # The initial save is uploaded directly so its UI link can be shown, the final
+    # save and the spans go through the collector
+    assert "traces" in sent_kinds and "spans" in sent_kinds
+    assert sent_kinds.count("traces") == 1
+    (trace_data,) = tracer.traces
+    uploaded_trace_ids = {
+        span["trace_id"]
+        for kind, _, payload in uploads
+        if kind == "spans"
+        for span in payload
+    }
+    assert uploaded_trace_ids == {trace_data["trace_id"]}
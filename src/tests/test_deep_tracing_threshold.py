@@ -0,0 +1,126 @@
+"""
+Tests for the minimum-duration filter of deep-traced spans.
+"""
+
+import os
+import time
+
+import pytest
+
+import judgeval
+from judgeval.common.tracer import InMemoryTraceStore, _DeepTracer
+from judgeval.common.tracer import core
+
+
+@pytest.fixture(autouse=True)
+def skip_judgeval_frames(monkeypatch):
+    # Deep tracing skips installed packages, but judgeval runs from the source tree
+    # here and would trace itself
+    judgeval_dir = os.path.realpath(os.path.dirname(judgeval.__file__)) + os.sep
+    monkeypatch.setattr(
+        core,
+        "_TRACE_FILEPATH_BLOCKLIST",
+        core._TRACE_FILEPATH_BLOCKLIST + (judgeval_dir,),
+    )
+    _DeepTracer._is_user_code.cache_clear()
+    yield
+    _DeepTracer._is_user_code.cache_clear()
+
+
+def quick(value):
+    return value + 1
+
+
+def slow(value):
+    time.sleep(0.03)
+    return value
+
+
+def fails(value):
+    raise ValueError(value)
+
+
+def outer(value):
+    # Quick itself, but calls something slow
+    return slow(quick(value))
+
+
+def _deep_spans(spans):
+    """Deep-traced spans by function name; their functions are module.qualname."""
+    return {
+        span["function"].rsplit(".", 1)[-1]: span
+        for span in spans
+        if "." in span["function"]
+    }
+
+
+def test_quick_calls_are_folded_into_their_parent(tracer):
+    tracer.deep_tracing = True
+    tracer.deep_tracing_min_duration = 0.01
+
+    @tracer.observe
+    def agent():
+        total = sum(quick(i) for i in range(5))
+        try:
+            fails(total)
+        except ValueError:
+            pass
+        return outer(total)
+
+    agent()
+
+    trace = tracer.traces[-1]
+    # agent's own frame is deep-traced too, since it isn't a module-level name
+    spans = _deep_spans(trace["trace_spans"])
+    assert sorted(spans) == ["agent", "fails", "outer", "slow"]
+    functions = [span["function"] for span in trace["trace_spans"]]
+    # Ancestors are emitted before the spans under them
+    assert functions.index(spans["outer"]["function"]) < functions.index(
+        spans["slow"]["function"]
+    )
+    assert spans["slow"]["parent_span_id"] == spans["outer"]["span_id"]
+    assert spans["fails"]["error"] is not None
+    assert spans["outer"]["inputs"] == {"value": 15}
+    assert spans["agent"]["additional_metadata"]["folded_spans"]["count"] == 5
+    assert spans["outer"]["additional_metadata"]["folded_spans"]["count"] == 1
+
+
+def test_without_a_threshold_every_call_is_a_span(tracer):
+    tracer.deep_tracing = True
+
+    @tracer.observe
+    def agent():
+        return outer(1)
+
+    agent()
+
+    spans = _deep_spans(tracer.traces[-1]["trace_spans"])
+    assert sorted(spans) == ["agent", "outer", "quick", "slow"]
+
+
+def test_folded_spans_are_never_exported(make_tracer):
+    store = InMemoryTraceStore()
+    tracer = make_tracer(
+        api_key=None,
+        organization_id=None,
+        span_processor=store,
+        deep_tracing=True,
+        deep_tracing_min_duration=0.01,
+    )
+
+    @tracer.observe
+    def tool():
+        return quick(1)
+
+    @tracer.observe
+    def agent():
+        quick(0)
+        return outer(tool())
+
+    agent()
+
+    spans = [span.model_dump() for span in store.spans()]
+    assert sorted(_deep_spans(spans)) == ["agent", "outer", "slow"]
+    (tool_span,) = store.spans(function="tool")
+    # An emitted span's buffered ancestors are emitted with it
+    assert store.get_span(tool_span.parent_span_id) is not None
@@ -0,0 +1,134 @@
+"""
+Tests for streaming evaluation results and uploading them in batches.
+"""
+
+import asyncio
+
+import pytest
+
+from judgeval import run_evaluation
+from judgeval.data import Example
+from judgeval.evaluation_run import EvaluationRun
+from judgeval.scorers.base_scorer import BaseScorer
+
+
+class DelayScorer(BaseScorer):
+    """Scores an example after sleeping for its input, in hundredths of a second."""
+
+    score_type: str = "Delay"
+    model: str = "test-model"
+    threshold: float = 0.5
+
+    async def a_score_example(self, example, *args, **kwargs):
+        await asyncio.sleep(float(example.input) / 100)
+        if example.input == "9":
+            raise RuntimeError("scorer crashed")
+        return 1.0
+
+
+@pytest.fixture
+def uploads(monkeypatch):
+    """The (results, run) of every upload, with the run checks stubbed out."""
+    logged = []
+
+    def log_evaluation_results(scoring_results, run, judgment_api_key):
+        logged.append((scoring_results, run))
+        return "https://app.judgmentlabs.ai/results"
+
+    monkeypatch.setattr(
+        run_evaluation, "log_evaluation_results", log_evaluation_results
+    )
+    monkeypatch.setattr(run_evaluation, "check_eval_run_name_exists", lambda *a: None)
+    monkeypatch.setattr(run_evaluation, "check_experiment_type", lambda *a: None)
+    return logged
+
+
+def _run(delays):
+    return EvaluationRun(
+        project_name="project",
+        eval_name="streaming",
+        examples=[Example(input=str(delay), actual_output="ok") for delay in delays],
+        scorers=[DelayScorer()],
+        organization_id="org",
+    )
+
+
+async def _collect(evaluation_run, **kwargs):
+    return [
+        item
+        async for item in run_evaluation.a_iter_eval(evaluation_run, "key", **kwargs)
+    ]
+
+
+def test_results_are_yielded_as_they_complete(uploads):
+    results = asyncio.run(_collect(_run([4, 0, 2, 1, 3]), batch_size=2))
+
+    assert [index for index, _ in results] == [1, 3, 2, 4, 0]
+    assert [result.data_object.example_index for _, result in results] == [
+        1,
+        3,
+        2,
+        4,
+        0,
+    ]
+    assert [len(batch) for batch, _ in uploads] == [2, 2, 1]
+    # Later batches append to the run and only carry their own examples
+    first_run, later_run = uploads[0][1], uploads[1][1]
+    assert (first_run.append, later_run.append) == (False, True)
+    assert [example.input for example in later_run.examples] == ["2", "3"]
+
+
+def test_stopped_runs_keep_the_results_scored_so_far(uploads):
+    async def consume():
+        seen = []
+        async for index, _ in run_evaluation.a_iter_eval(
+            _run([0, 1, 9, 20]), "key", batch_size=10
+        ):
+            seen.append(index)
+            if len(seen) == 2:
+                raise RuntimeError("consumer stopped")
+        return seen
+
+    with pytest.raises(RuntimeError, match="consumer stopped"):
+        asyncio.run(consume())
+    # The partial batch is uploaded when the run stops
+    ((batch, _),) = uploads
+    assert [result["data_object"]["input"] for result in batch] == ["0", "1"]
+
+
+def test_scorer_errors_do_not_stop_the_run(uploads):
+    results = dict(asyncio.run(_collect(_run([9, 0]))))
+
+    assert not results[0].success
+    assert results[1].success
+
+
+def test_run_eval_returns_results_in_example_order(uploads):
+    results = run_evaluation.run_eval(_run([3, 0, 1]), "key")
+
+    assert [result.data_object.input for result in results] == ["3", "0", "1"]
+    assert [len(batch) for batch, _ in uploads] == [3]
+
+
+def test_safe_iter_async_inside_a_running_loop(uploads):
+    async def main():
+        # Called from async code, e.g. in a notebook
+        return list(
+            run_evaluation.safe_iter_async(
+                run_evaluation.a_iter_eval(_run([1, 0]), "key")
+            )
+        )
+
+    results = asyncio.run(main())
+    assert [index for index, _ in results] == [1, 0]
+
+
+def test_runs_are_checked_before_iterating(uploads, monkeypatch):
+    def name_exists(*args):
+        raise ValueError("Eval run name 'streaming' already exists")
+
+    monkeypatch.setattr(run_evaluation, "check_eval_run_name_exists", name_exists)
+
+    with pytest.raises(ValueError, match="already exists"):
+        run_evaluation.a_iter_eval(_run([0]), "key")
+    assert uploads == []
@@ -0,0 +1,215 @@
+"""
+Tests for checkpointing and resuming evaluation runs with local scorers.
+"""
+
+import asyncio
+import os
+from typing import List
+
+import pytest
+
+from judgeval import run_evaluation
+from judgeval.data import Example
+from judgeval.evaluation_checkpoint import checkpoint_path, example_content_hash
+from judgeval.evaluation_run import EvaluationRun
+from judgeval.scorers.base_scorer import BaseScorer
+
+
+class ProcessKilled(BaseException):
+    """Stands in for the process being killed mid run."""
+
+
+# Inputs of the examples scored by CountingScorer
+scored: List[str] = []
+
+
+class CountingScorer(BaseScorer):
+    """Scores the length of the output, counting the examples it scores."""
+
+    score_type: str = "Length"
+    model: str = "test-model"
+    threshold: float = 0.5
+
+    async def a_score_example(self, example: Example, *args, **kwargs) -> float:
+        if example.actual_output == "crash":
+            raise ProcessKilled
+        scored.append(str(example.input))
+        await asyncio.sleep(0)
+        return float(len(example.actual_output or ""))
+
+
+@pytest.fixture
+def uploads(monkeypatch, tmp_path):
+    monkeypatch.setenv("JUDGMENT_CACHE_DIR", str(tmp_path))
+    scored.clear()
+    logged = []
+
+    def log_evaluation_results(scoring_results, run, judgment_api_key):
+        logged.append((scoring_results, run))
+        return "https://app.judgmentlabs.ai/results"
+
+    def check_eval_run_name_exists(eval_name, *args):
+        if logged:
+            raise ValueError(f"Eval run name '{eval_name}' already exists")
+
+    monkeypatch.setattr(
+        run_evaluation, "log_evaluation_results", log_evaluation_results
+    )
+    monkeypatch.setattr(
+        run_evaluation, "check_eval_run_name_exists", check_eval_run_name_exists
+    )
+    monkeypatch.setattr(run_evaluation, "check_experiment_type", lambda *a: None)
+    return logged
+
+
+def _run(outputs, scorer=None):
+    return EvaluationRun(
+        project_name="project",
+        eval_name="long run",
+        examples=[
+            Example(input=f"q{index}", actual_output=output)
+            for index, output in enumerate(outputs)
+        ],
+        scorers=[scorer or CountingScorer()],
+        organization_id="org",
+    )
+
+
+def _uploaded_inputs(uploads):
+    return [result["data_object"]["input"] for batch, _ in uploads for result in batch]
+
+
+def test_example_hash_ignores_identity():
+    first = Example(input="q", actual_output="a", example_index=0)
+    second = Example(input="q", actual_output="a", example_index=3)
+
+    assert example_content_hash(first) == example_content_hash(second)
+    assert example_content_hash(first) != example_content_hash(
+        Example(input="q", actual_output="b")
+    )
+
+
+def test_resume_skips_scored_examples(uploads, monkeypatch):
+    monkeypatch.setattr(run_evaluation, "MAX_CONCURRENT_EVALUATIONS", 1)
+    outputs = ["a", "bb", "crash", "dddd"]
+
+    with pytest.raises(ProcessKilled):
+        run_evaluation.run_eval(_run(outputs), "key", checkpoint=True)
+    assert scored == ["q0", "q1"]
+    assert _uploaded_inputs(uploads) == ["q0", "q1"]
+
+    scored.clear()
+    outputs[2] = "ccc"
+    uploads_before = len(uploads)
+    results = run_evaluation.run_eval(_run(outputs), "key", resume=True)
+
+    # Only the crashed example changed, so only it and the unscored one are scored
+    assert scored == ["q2", "q3"]
+    assert [result.data_object.input for result in results] == ["q0", "q1", "q2", "q3"]
+    assert [result.scorers_data[0].score for result in results] == [1, 2, 3, 4]
+    assert results[0].data_object.example_index == 0
+    # Nothing is uploaded twice, and the rest is appended to the interrupted run
+    assert _uploaded_inputs(uploads[uploads_before:]) == ["q2", "q3"]
+    assert all(run.append for _, run in uploads[uploads_before:])
+    # Everything was uploaded, so the checkpoint is gone
+    assert not os.path.exists(checkpoint_path("project", "long run"))
+
+
+def test_unuploaded_results_are_merged_into_the_upload(uploads, monkeypatch):
+    def failing_upload(scoring_results, run, judgment_api_key):
+        raise run_evaluation.JudgmentAPIError("API unavailable")
+
+    monkeypatch.setattr(run_evaluation, "log_evaluation_results", failing_upload)
+    with pytest.raises(run_evaluation.JudgmentAPIError):
+        run_evaluation.run_eval(_run(["a", "bb"]), "key", checkpoint=True)
+    assert sorted(scored) == ["q0", "q1"]
+
+    monkeypatch.setattr(
+        run_evaluation,
+        "log_evaluation_results",
+        lambda results, run, key: uploads.append((results, run)),
+    )
+    scored.clear()
+
+    run_evaluation.run_eval(_run(["a", "bb", "ccc"]), "key", resume=True)
+
+    assert scored == ["q2"]
+    assert sorted(_uploaded_inputs(uploads)) == ["q0", "q1", "q2"]
+    # Nothing was uploaded before, so the run is created as it was asked for
+    assert not uploads[0][1].append
+
+
+def test_checkpoints_are_opt_in(uploads):
+    with pytest.raises(ProcessKilled):
+        run_evaluation.run_eval(_run(["a", "crash"]), "key")
+
+    assert not os.path.exists(checkpoint_path("project", "long run"))
+
+
+def test_runs_without_resume_start_a_fresh_checkpoint(uploads, monkeypatch):
+    monkeypatch.setattr(run_evaluation, "MAX_CONCURRENT_EVALUATIONS", 1)
+    with pytest.raises(ProcessKilled):
+        run_evaluation.run_eval(_run(["a", "crash"]), "key", checkpoint=True)
+
+    scored.clear()
+    with pytest.raises(ProcessKilled):
+        run_evaluation.run_eval(
+            _run(["a", "bb", "crash"]), "key", override=True, checkpoint=True
+        )
+    assert scored == ["q0", "q1"]
+
+    with open(checkpoint_path("project", "long run")) as f:
+        # The results of q0 and q1 and their upload
+        assert len(f.readlines()) == 3
+
+
+@pytest.mark.parametrize(
+    "scorer",
+    [
+        CountingScorer(name="strict"),
+        CountingScorer(threshold=0.9),
+        CountingScorer(model="other-model"),
+    ],
+)
+def test_results_of_other_scorers_are_not_reused(uploads, monkeypatch, scorer):
+    monkeypatch.setattr(run_evaluation, "MAX_CONCURRENT_EVALUATIONS", 1)
+    with pytest.raises(ProcessKilled):
+        run_evaluation.run_eval(_run(["a", "crash"]), "key", checkpoint=True)
+
+    scored.clear()
+    run_evaluation.run_eval(_run(["a", "bb"], scorer), "key", resume=True)
+    assert scored == ["q0", "q1"]
+
+
+def test_only_local_scorer_runs_can_be_resumed(uploads):
+    from judgeval.scorers import FaithfulnessScorer
+
+    evaluation_run = _run(["a"], FaithfulnessScorer(threshold=0.5))
+    with pytest.raises(ValueError, match="local scorers"):
+        run_evaluation.run_eval(evaluation_run, "key", resume=True)
+
+
+def test_duplicate_examples_are_each_uploaded(uploads, monkeypatch):
+    monkeypatch.setattr(run_evaluation, "MAX_CONCURRENT_EVALUATIONS", 1)
+
+    def duplicates():
+        evaluation_run = _run(["a", "a"])
+        for example in evaluation_run.examples:
+            example.input = "q"
+        return evaluation_run
+
+    async def stop_after_first_upload():
+        async for _ in run_evaluation.a_iter_eval(
+            duplicates(), "key", batch_size=1, checkpoint=True
+        ):
+            raise ProcessKilled
+
+    with pytest.raises(ProcessKilled):
+        asyncio.run(stop_after_first_upload())
+    assert _uploaded_inputs(uploads) == ["q"]
+
+    uploads.clear()
+    run_evaluation.run_eval(duplicates(), "key", resume=True)
+
+    # Only the first of the two identical examples was uploaded
+    assert _uploaded_inputs(uploads) == ["q"]
@@ -0,0 +1,228 @@
+"""
+Tests for writing traces to local segment files and replaying them with `judgeval upload`.
+"""
+
+import gzip
+import json
+import os
+
+import pytest
+
+from judgeval import cli
+from judgeval.common.api.api import JudgmentApiClient
+from judgeval.common.tracer.file_exporter import (
+    MANIFEST_FILE,
+    SegmentWriter,
+    pending_segments,
+    read_segment,
+    upload_segments,
+)
+
+
+@pytest.fixture
+def uploads(judgment_api, mocker):
+    """Records what would have been uploaded to the Judgment API."""
+    recorded = []
+
+    def record(kind):
+        def send(self, payload):
+            recorded.append((kind, payload))
+            return {}
+
+        return send
+
+    mocker.patch.object(JudgmentApiClient, "send_spans_batch", new=record("spans"))
+    mocker.patch.object(
+        JudgmentApiClient, "send_evaluation_runs_batch", new=record("evaluation_runs")
+    )
+    mocker.patch.object(JudgmentApiClient, "upsert_trace", new=record("traces"))
+    return recorded
+
+
+def _uploaded(uploads, kind):
+    items = []
+    for uploaded_kind, payload in uploads:
+        if uploaded_kind == kind:
+            items.extend(payload if isinstance(payload, list) else [payload])
+    return items
+
+
+@pytest.fixture
+def offline_tracer(tmp_path, uploads, make_tracer, api_key_validation):
+    api_key_validation.side_effect = ConnectionError("no route to host")
+    return make_tracer(trace_file_dir=str(tmp_path), trace_file_compress=True)
+
+
+def test_offline_tracer_writes_segments(tmp_path, uploads, offline_tracer):
+    tracer = offline_tracer
+
+    @tracer.observe
+    def tool(i):
+        return i
+
+    @tracer.observe
+    def agent():
+        return [tool(i) for i in range(3)]
+
+    agent()
+    assert tracer.api_key_validation.wait(timeout=5)[0] is None
+    tracer.flush_background_spans()
+    tracer.shutdown_background_service()
+
+    # Nothing reached the API, and a failed key check did not disable tracing
+    assert uploads == []
+    assert tracer.enable_monitoring is True
+
+    (segment,) = pending_segments(str(tmp_path))
+    assert segment.endswith(".jsonl.gz")
+    with open(tmp_path / MANIFEST_FILE) as f:
+        (manifest_entry,) = [json.loads(line) for line in f]
+    assert manifest_entry["segment"] == segment
+    assert manifest_entry["compressed"] is True
+
+    records = list(read_segment(str(tmp_path / segment)))
+    kinds = {kind for kind, _ in records}
+    assert kinds == {"spans", "traces"}
+    # Incremental span updates are kept so the replay matches live tracing
+    assert len([kind for kind, _ in records if kind == "spans"]) > 4
+
+
+def test_upload_sends_latest_updates_once(tmp_path, uploads, offline_tracer):
+    tracer = offline_tracer
+
+    @tracer.observe
+    def tool(i):
+        return i
+
+    @tracer.observe
+    def agent():
+        return [tool(i) for i in range(3)]
+
+    agent()
+    tracer.flush_background_spans()
+    tracer.shutdown_background_service()
+
+    api_client = JudgmentApiClient("test-api-key", "test-org-id")
+    result = upload_segments(str(tmp_path), api_client, batch_size=2)
+
+    assert (result.spans, result.traces, result.failed_batches) == (4, 1, 0)
+    spans = _uploaded(uploads, "spans")
+    assert len(spans) == 4
+    assert {span["span_state"] for span in spans} == {"completed"}
+    assert len({span["span_id"] for span in spans}) == 4
+    (trace,) = _uploaded(uploads, "traces")
+    # The final save, not the initial one made when the first span started
+    assert trace["trace_id"] == tracer.traces[-1]["trace_id"]
+    assert len(trace["trace_spans"]) == 4
+
+    # A second run has nothing left to send
+    uploads.clear()
+    assert upload_segments(str(tmp_path), api_client).segments == []
+    assert uploads == []
+
+
+def test_failed_upload_is_retried(tmp_path, uploads, monkeypatch):
+    writer = SegmentWriter(str(tmp_path))
+    writer.write("spans", [{"span_id": "a", "update_id": 1}])
+    writer.write("spans", [{"span_id": "a", "update_id": 2}])
+    writer.close()
+    api_client = JudgmentApiClient("test-api-key", "test-org-id")
+
+    def fail(self, payload):
+        raise ConnectionError("API unavailable")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(JudgmentApiClient, "send_spans_batch", fail)
+        assert upload_segments(str(tmp_path), api_client).failed_batches == 1
+
+    result = upload_segments(str(tmp_path), api_client)
+
+    assert result.failed_batches == 0
+    assert _uploaded(uploads, "spans") == [{"span_id": "a", "update_id": 2}]
+
+
+def test_retry_does_not_resend_evaluation_runs(tmp_path, uploads, monkeypatch):
+    writer = SegmentWriter(str(tmp_path))
+    writer.write("spans", [{"span_id": "a", "update_id": 1}])
+    writer.write("evaluation_runs", [{"run": 1}, {"run": 2}, {"run": 3}])
+    writer.close()
+    api_client = JudgmentApiClient("test-api-key", "test-org-id")
+    sent_runs = []
+
+    def fail_second_batch(self, payload):
+        if payload == [{"run": 3}]:
+            raise ConnectionError("API unavailable")
+        sent_runs.extend(payload)
+
+    with monkeypatch.context() as patch:
+        patch.setattr(
+            JudgmentApiClient, "send_evaluation_runs_batch", fail_second_batch
+        )
+        result = upload_segments(str(tmp_path), api_client, batch_size=2)
+        assert result.failed_batches == 1
+    assert sent_runs == [{"run": 1}, {"run": 2}]
+
+    uploads.clear()
+    result = upload_segments(str(tmp_path), api_client, batch_size=2)
+
+    assert (result.spans, result.evaluation_runs, result.failed_batches) == (0, 1, 0)
+    assert uploads == [("evaluation_runs", [{"run": 3}])]
+    assert pending_segments(str(tmp_path)) == []
+
+
+def test_segments_rotate_by_size(tmp_path):
+    writer = SegmentWriter(str(tmp_path), max_segment_bytes=1, compress=True)
+    for i in range(3):
+        writer.write("evaluation_runs", [{"n": i}])
+
+    segments = pending_segments(str(tmp_path))
+    assert len(segments) == 3
+    assert [list(read_segment(str(tmp_path / name))) for name in segments] == [
+        [("evaluation_runs", {"n": i})] for i in range(3)
+    ]
+
+
+def test_open_segments_need_include_open(tmp_path, uploads):
+    writer = SegmentWriter(str(tmp_path))
+    writer.write("spans", [{"span_id": "a", "update_id": 1}])
+    segment_path = tmp_path / writer._segment
+    # Simulate a process killed halfway through writing a batch
+    with open(segment_path, "a") as f:
+        f.write('{"kind": "spans", "item": {"span_')
+    api_client = JudgmentApiClient("test-api-key", "test-org-id")
+
+    assert upload_segments(str(tmp_path), api_client).segments == []
+    result = upload_segments(str(tmp_path), api_client, include_open=True)
+
+    assert result.segments == [writer._segment]
+    assert _uploaded(uploads, "spans") == [{"span_id": "a", "update_id": 1}]
+
+
+def test_damaged_compressed_segment_is_read_up_to_the_damage(tmp_path):
+    path = tmp_path / "segment-1-1.jsonl.gz"
+    complete = gzip.compress(b'{"kind": "traces", "item": {"trace_id": "t"}}\n')
+    truncated = gzip.compress(b'{"kind": "traces", "item": {"trace_id": "u"}}\n')
+    path.write_bytes(complete + truncated[:-10])
+
+    assert list(read_segment(str(path))) == [("traces", {"trace_id": "t"})]
+
+
+def test_upload_command(tmp_path, uploads, api_key_validation, monkeypatch, capsys):
+    writer = SegmentWriter(str(tmp_path))
+    writer.write("traces", [{"trace_id": "t", "name": "agent"}])
+    writer.close()
+    monkeypatch.setenv("JUDGMENT_API_KEY", "test-api-key")
+    monkeypatch.setenv("JUDGMENT_ORG_ID", "test-org-id")
+
+    assert cli.main(["upload", str(tmp_path), "--workers", "2"]) == 0
+
+    assert _uploaded(uploads, "traces") == [{"trace_id": "t", "name": "agent"}]
+    assert "1 traces from 1 segments" in capsys.readouterr().out
+    assert os.path.exists(tmp_path / "uploaded.jsonl")
+
+
+def test_upload_command_requires_credentials(tmp_path, monkeypatch, capsys):
+    monkeypatch.delenv("JUDGMENT_API_KEY", raising=False)
+
+    assert cli.main(["upload", str(tmp_path)]) == 2
+    assert "JUDGMENT_API_KEY" in capsys.readouterr().err
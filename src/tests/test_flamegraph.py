@@ -0,0 +1,120 @@
+"""
+Tests for exporting traces as speedscope profiles and collapsed stacks.
+"""
+
+import json
+
+import pytest
+
+from judgeval import cli
+from judgeval.common.tracer import collapse_stacks, format_collapsed, to_speedscope
+from judgeval.data import TraceUsage
+
+
+@pytest.fixture
+def agent_trace(make_span, make_trace):
+    def build(name="agent", cost=0.01):
+        usage = TraceUsage(total_tokens=100, total_cost_usd=cost, model_name="gpt-4.1")
+        # agent [0, 10] with concurrent llm [0, 4] and search [1, 7]
+        spans = [
+            make_span("agent", 0, 10),
+            make_span("llm", 0, 4, parent="agent", usage=usage),
+            make_span("search", 1, 6, parent="agent"),
+        ]
+        return make_trace(name, [span.model_dump() for span in spans])
+
+    return build
+
+
+def test_stack_weights(agent_trace):
+    # The children's durations add up to the agent's, leaving it no width of its own
+    assert collapse_stacks([agent_trace()], "wall") == {
+        ("agent", "llm"): pytest.approx(4),
+        ("agent", "search"): pytest.approx(6),
+    }
+
+    self_time = collapse_stacks([agent_trace()], "self")
+    # The children cover [0, 7] of the agent's 10 seconds
+    assert self_time[("agent",)] == pytest.approx(3)
+
+    assert collapse_stacks([agent_trace(), agent_trace()], "tokens") == {
+        ("agent", "llm"): 200
+    }
+    with pytest.raises(ValueError):
+        collapse_stacks([agent_trace()], "bytes")
+
+
+def test_format_collapsed(agent_trace):
+    stacks = collapse_stacks([agent_trace(cost=0.0125)], "cost")
+    assert format_collapsed(stacks, "cost") == "agent;llm 12500\n"
+
+    stacks = collapse_stacks([agent_trace()], "self")
+    assert format_collapsed(stacks, "self").splitlines() == [
+        "agent 3000000",
+        "agent;llm 4000000",
+        "agent;search 6000000",
+    ]
+
+
+def test_speedscope_profile_per_trace_name(agent_trace):
+    profile = to_speedscope(
+        [agent_trace("agent"), agent_trace("agent"), agent_trace("chat")], weight="self"
+    )
+
+    assert profile["$schema"] == "https://www.speedscope.app/file-format-schema.json"
+    frames = [frame["name"] for frame in profile["shared"]["frames"]]
+    assert frames == ["agent", "llm", "search"]
+    agent, chat = profile["profiles"]
+    assert (agent["name"], agent["type"], agent["unit"]) == (
+        "agent",
+        "sampled",
+        "seconds",
+    )
+    assert agent["samples"] == [[0], [0, 1], [0, 2]]
+    assert agent["weights"] == pytest.approx([6, 8, 12])
+    assert agent["endValue"] == pytest.approx(26)
+    assert chat["weights"] == pytest.approx([3, 4, 6])
+
+
+def test_deep_traced_functions_are_frames(tracer):
+    tracer.deep_tracing = True
+
+    def helper():
+        return 1
+
+    @tracer.observe
+    def agent():
+        return helper()
+
+    agent()
+
+    stacks = collapse_stacks([tracer.traces[-1]], "wall")
+    assert any(stack[-1].endswith("helper") for stack in stacks)
+
+
+def test_flamegraph_command(tmp_path, capsys, agent_trace):
+    (tmp_path / "traces.json").write_text(
+        json.dumps([agent_trace(), agent_trace("chat")])
+    )
+    output = tmp_path / "out.txt"
+
+    assert (
+        cli.main(
+            [
+                "flamegraph",
+                str(tmp_path / "traces.json"),
+                "-o",
+                str(output),
+                "--format",
+                "collapsed",
+                "--weight",
+                "tokens",
+                "--trace-name",
+                "chat",
+            ]
+        )
+        == 0
+    )
+
+    assert output.read_text() == "agent;llm 100\n"
+    assert "Wrote 1 traces" in capsys.readouterr().out
@@ -0,0 +1,161 @@
+"""
+Fork-safety tests for pre-fork servers (gunicorn/uwsgi with preload_app).
+
+The tracer is created in the parent and the process forks while other threads are
+tracing, holding judgeval locks and waiting on API key validation. The child must
+still be able to trace and export its own spans.
+"""
+
+import os
+import threading
+import time
+
+import pytest
+
+from judgeval.common import utils
+from judgeval.common.api.api import JudgmentApiClient
+from judgeval.common.tracer import Tracer, TraceManagerClient
+from judgeval.utils.requests import requests
+
+pytestmark = pytest.mark.skipif(
+    not hasattr(os, "fork"), reason="os.fork is not available on this platform"
+)
+
+CHILD_TIMEOUT_SECONDS = 20
+
+
+@pytest.fixture
+def exported_spans(monkeypatch):
+    exported = []
+    monkeypatch.setattr(
+        JudgmentApiClient,
+        "send_spans_batch",
+        lambda self, spans: exported.extend(spans),
+    )
+    monkeypatch.setattr(
+        TraceManagerClient,
+        "upsert_trace",
+        lambda self, trace_data, **kwargs: {"ui_results_url": ""},
+    )
+    return exported
+
+
+@pytest.fixture
+def validation_released(monkeypatch):
+    """API key validation blocks in the parent until released, so it is in flight during fork."""
+    parent_pid = os.getpid()
+    released = threading.Event()
+
+    def slow_validate(judgment_api_key):
+        if os.getpid() == parent_pid:
+            released.wait()
+        return True, {}
+
+    monkeypatch.setattr(utils, "validate_api_key_cached", slow_validate)
+    yield released
+    released.set()
+
+
+@pytest.fixture
+def monitoring_tracer(exported_spans, validation_released):
+    tracer = Tracer(
+        api_key="test-api-key",
+        organization_id="test-org-id",
+        project_name="unit-tests",
+        span_flush_interval=0.05,
+    )
+    yield tracer
+    validation_released.set()
+    tracer.shutdown_background_service()
+
+
+def _wait_for_child(pid: int) -> int:
+    deadline = time.monotonic() + CHILD_TIMEOUT_SECONDS
+    while time.monotonic() < deadline:
+        finished_pid, status = os.waitpid(pid, os.WNOHANG)
+        if finished_pid:
+            return os.waitstatus_to_exitcode(status)
+        time.sleep(0.05)
+    os.kill(pid, 9)
+    os.waitpid(pid, 0)
+    pytest.fail("Forked child deadlocked")
+
+
+def _hold(lock, acquired: threading.Event, release: threading.Event):
+    with lock:
+        acquired.set()
+        release.wait()
+
+
+def test_child_traces_and_exports_after_fork_under_load(
+    monitoring_tracer, exported_spans, validation_released
+):
+    tracer = monitoring_tracer
+    processor = tracer.otel_span_processor
+    stop = threading.Event()
+
+    @tracer.observe
+    def work(i):
+        return i
+
+    def load():
+        while not stop.is_set():
+            with tracer.trace("parent-load"):
+                for i in range(10):
+                    work(i)
+
+    with tracer.trace("held-span-trace") as trace:
+        work(0)
+    held_span = trace.trace_spans[-1]
+
+    # Threads busy tracing, plus threads holding judgeval locks, at the time of fork
+    release_locks = threading.Event()
+    threads = [threading.Thread(target=load, daemon=True) for _ in range(4)]
+    for lock in (processor._cache_lock, held_span._update_id_lock):
+        acquired = threading.Event()
+        threads.append(
+            threading.Thread(
+                target=_hold, args=(lock, acquired, release_locks), daemon=True
+            )
+        )
+        threads[-1].start()
+        acquired.wait()
+    for thread in threads[:4]:
+        thread.start()
+    time.sleep(0.1)
+
+    parent_adapter = requests.get_adapter("https://")
+    pid = os.fork()
+    if pid == 0:
+        exit_code = 1
+        try:
+            exported_spans.clear()
+            with tracer.trace("child-work") as child_trace:
+                for i in range(5):
+                    work(i)
+            held_span.increment_update_id()
+            tracer.flush_background_spans(timeout_millis=5000)
+
+            exported_trace_ids = {span["trace_id"] for span in exported_spans}
+            if (
+                tracer.api_key_validation.wait(timeout=5)[0]
+                and exported_trace_ids == {child_trace.trace_id}
+                and tracer.get_current_trace() is None
+                and requests.get_adapter("https://") is not parent_adapter
+            ):
+                exit_code = 0
+        finally:
+            os._exit(exit_code)
+
+    try:
+        assert _wait_for_child(pid) == 0
+    finally:
+        stop.set()
+        release_locks.set()
+        validation_released.set()
+        for thread in threads:
+            thread.join(timeout=5)
+
+    # The parent is unaffected and exports its own spans once validation completes
+    tracer.flush_background_spans(timeout_millis=5000)
+    assert exported_spans
@@ -0,0 +1,72 @@
+"""
+Import-time budget for judgeval.
+
+Provider SDKs (litellm, openai, anthropic, ...) take seconds to import, so judgeval
+must only load them when they are actually used. Each check runs in a fresh
+interpreter under `python -X importtime`.
+"""
+
+import subprocess
+import sys
+
+import pytest
+
+IMPORT_TIME_BUDGET_SECONDS = 2.0
+
+PUBLIC_IMPORTS = (
+    "import judgeval; "
+    "from judgeval import JudgmentClient; "
+    "from judgeval.tracer import Tracer, wrap; "
+    "from judgeval.scorers import FaithfulnessScorer; "
+    "from judgeval.data import Example"
+)
+
+LAZY_MODULES = [
+    "litellm",
+    "openai",
+    "anthropic",
+    "together",
+    "google.genai",
+    "langchain_core",
+    "boto3",
+]
+
+
+def _importtime(code: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def _cumulative_import_seconds(importtime_output: str) -> float:
+    """Sums the cumulative time of every top-level import in -X importtime output."""
+    total_us = 0
+    for line in importtime_output.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        # Nested imports are indented under the module that triggered them
+        if not name[1:].startswith(" "):
+            total_us += int(cumulative)
+    return total_us / 1_000_000
+
+
+@pytest.mark.parametrize("module", LAZY_MODULES)
+def test_provider_sdks_are_not_imported(module):
+    result = _importtime(
+        f"{PUBLIC_IMPORTS}; import sys; print({module!r} in sys.modules)"
+    )
+    assert result.stdout.strip() == "False"
+
+
+def test_import_time_budget():
+    baseline = _cumulative_import_seconds(_importtime("pass").stderr)
+    result = _importtime(PUBLIC_IMPORTS)
+    import_seconds = _cumulative_import_seconds(result.stderr) - baseline
+
+    assert import_seconds < IMPORT_TIME_BUDGET_SECONDS, (
+        f"judgeval import took {import_seconds:.3f}s, budget {IMPORT_TIME_BUDGET_SECONDS}s"
+    )
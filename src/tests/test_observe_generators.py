@@ -0,0 +1,191 @@
+"""
+Tests for @observe on generator and async generator functions.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from judgeval.constants import MAX_STREAM_SAMPLE_ITEMS
+
+
+def test_generator_span_stays_open_until_exhausted(tracer, spans_by_function):
+    events = []
+
+    @tracer.observe
+    def stream(n):
+        for i in range(n):
+            time.sleep(0.01)
+            events.append(f"produced {i}")
+            yield i
+
+    for item in stream(3):
+        events.append(f"consumed {item}")
+
+    # Items are passed through one at a time rather than buffered
+    assert events == [
+        "produced 0",
+        "consumed 0",
+        "produced 1",
+        "consumed 1",
+        "produced 2",
+        "consumed 2",
+    ]
+    span = spans_by_function(tracer.traces[-1])["stream"]
+    assert span["duration"] >= 0.03
+    assert span["output"] == [0, 1, 2]
+    assert span["inputs"] == {"n": 3}
+    metadata = span["additional_metadata"]["stream"]
+    assert metadata["item_count"] == 3
+    assert metadata["closed_early"] is False
+    assert 0.01 <= metadata["time_to_first_item"] < span["duration"]
+
+
+def test_generator_sample_is_bounded(tracer, spans_by_function):
+    @tracer.observe
+    def stream():
+        yield from range(MAX_STREAM_SAMPLE_ITEMS * 10)
+
+    assert sum(stream()) == sum(range(MAX_STREAM_SAMPLE_ITEMS * 10))
+
+    span = spans_by_function(tracer.traces[-1])["stream"]
+    assert span["output"] == list(range(MAX_STREAM_SAMPLE_ITEMS))
+    assert span["additional_metadata"]["stream"]["item_count"] == (
+        MAX_STREAM_SAMPLE_ITEMS * 10
+    )
+
+
+def test_generator_span_parents(tracer):
+    @tracer.observe
+    def inner(i):
+        return i
+
+    @tracer.observe
+    def stream():
+        for i in range(2):
+            yield inner(i)
+
+    @tracer.observe
+    def consume(item):
+        return item
+
+    @tracer.observe
+    def pipeline():
+        return [consume(item) for item in stream()]
+
+    assert pipeline() == [0, 1]
+
+    trace_spans = tracer.traces[-1]["trace_spans"]
+    by_id = {span["span_id"]: span["function"] for span in trace_spans}
+    parents = {
+        (span["function"], by_id.get(span["parent_span_id"])) for span in trace_spans
+    }
+    assert parents == {
+        ("pipeline", None),
+        ("stream", "pipeline"),
+        ("inner", "stream"),
+        # The consumer's work between items is not attributed to the generator
+        ("consume", "pipeline"),
+    }
+
+
+def test_generator_closed_early(tracer, spans_by_function):
+    cleaned_up = []
+
+    @tracer.observe
+    def stream():
+        try:
+            yield from range(100)
+        finally:
+            cleaned_up.append(True)
+
+    for item in stream():
+        if item == 2:
+            break
+
+    assert cleaned_up == [True]
+    span = spans_by_function(tracer.traces[-1])["stream"]
+    assert span["additional_metadata"]["stream"]["item_count"] == 3
+    assert span["additional_metadata"]["stream"]["closed_early"] is True
+
+
+def test_generator_error_is_recorded(tracer, spans_by_function):
+    @tracer.observe
+    def stream():
+        yield 1
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError, match="boom"):
+        list(stream())
+
+    span = spans_by_function(tracer.traces[-1])["stream"]
+    assert span["error"]["type"] == "ValueError"
+    assert span["additional_metadata"]["stream"]["item_count"] == 1
+
+
+def test_generator_send_and_return_value(tracer, spans_by_function):
+    @tracer.observe
+    def accumulator():
+        total = 0
+        while total < 10:
+            total += yield total
+        return total
+
+    def drive():
+        generator = accumulator()
+        next(generator)
+        generator.send(4)
+        generator.send(4)
+        try:
+            generator.send(4)
+        except StopIteration as e:
+            return e.value
+
+    assert drive() == 12
+    assert spans_by_function(tracer.traces[-1])["accumulator"]["output"] == [0, 4, 8]
+
+
+def test_async_generator(tracer, spans_by_function):
+    @tracer.observe
+    async def inner(i):
+        return i
+
+    @tracer.observe
+    async def stream(n):
+        for i in range(n):
+            await asyncio.sleep(0.01)
+            yield await inner(i)
+
+    @tracer.observe
+    async def pipeline():
+        return [item async for item in stream(3)]
+
+    assert asyncio.run(pipeline()) == [0, 1, 2]
+
+    spans = spans_by_function(tracer.traces[-1])
+    assert spans["stream"]["duration"] >= 0.03
+    assert spans["stream"]["output"] == [0, 1, 2]
+    assert spans["stream"]["additional_metadata"]["stream"]["item_count"] == 3
+    assert spans["stream"]["parent_span_id"] == spans["pipeline"]["span_id"]
+    assert spans["inner"]["parent_span_id"] == spans["stream"]["span_id"]
+
+
+def test_async_generator_closed_early(tracer, spans_by_function):
+    @tracer.observe
+    async def stream():
+        for i in range(100):
+            yield i
+
+    async def main():
+        generator = stream()
+        async for item in generator:
+            if item == 1:
+                break
+        await generator.aclose()
+
+    asyncio.run(main())
+
+    span = spans_by_function(tracer.traces[-1])["stream"]
+    assert span["additional_metadata"]["stream"]["closed_early"] is True
+    assert span["additional_metadata"]["stream"]["item_count"] == 2
@@ -0,0 +1,92 @@
+"""
+Per-call overhead of @observe wrappers.
+
+The capture plan is compiled when a function is decorated, so the wrapper must not
+inspect signatures on every call. The benchmark compares an observed call inside an
+active trace against the bare function and keeps a generous per-call budget.
+"""
+
+import time
+
+from judgeval.common.tracer import core
+
+
+CALLS = 2000
+PER_CALL_BUDGET_SECONDS = 0.001
+
+
+def test_signature_is_inspected_once_at_decoration(tracer, mocker):
+    def add(a, b, c=1):
+        return a + b + c
+
+    observed = tracer.observe(add)
+    signature_spy = mocker.spy(core.inspect, "signature")
+
+    with tracer.trace("signature-test") as trace:
+        for i in range(10):
+            observed(i, 2, c=3)
+
+    assert signature_spy.call_count == 0
+    inputs = [span.inputs for span in trace.trace_spans if span.function == "add"]
+    assert inputs[0] == {"a": 0, "b": 2, "c": 3}
+    assert len(inputs) == 10
+
+
+def test_capture_plan_matches_combine_args_kwargs(tracer):
+    def func(a, b, *rest, key=None):
+        pass
+
+    plan = core._CapturePlan(tracer, func)
+    args, kwargs = (1, 2, 3, 4), {"key": "value"}
+
+    assert plan.combine_args_kwargs(args, kwargs) == core.combine_args_kwargs(
+        func, args, kwargs
+    )
+
+
+def test_capture_plan_skips_self_and_tracks_identified_state(tracer):
+    class Agent:
+        def __init__(self):
+            self.name = "agent-1"
+            self.counter = 0
+
+        def step(self, amount):
+            self.counter += amount
+            return self.counter
+
+    observed_step = tracer.observe(Agent.step)
+    Agent = tracer.identify(identifier="name", track_state=True)(Agent)
+    agent = Agent()
+
+    with tracer.trace("identify-test") as trace:
+        observed_step(agent, 5)
+
+    span = next(span for span in trace.trace_spans if span.function == "step")
+    assert span.inputs == {"amount": 5}
+    assert span.agent_name == "agent-1"
+    assert span.state_before == {"name": "agent-1", "counter": 0}
+    assert span.state_after == {"name": "agent-1", "counter": 5}
+
+
+def test_observe_per_call_overhead(tracer):
+    def work(x, y):
+        return x * y
+
+    observed = tracer.observe(work)
+
+    with tracer.trace("overhead-benchmark"):
+        start = time.perf_counter()
+        for i in range(CALLS):
+            work(i, 2)
+        bare = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for i in range(CALLS):
+            observed(i, 2)
+        traced = time.perf_counter() - start
+
+    per_call_overhead = (traced - bare) / CALLS
+    assert per_call_overhead < PER_CALL_BUDGET_SECONDS, (
+        f"@observe overhead is {per_call_overhead * 1e6:.1f}us per call "
+        f"over {CALLS} calls, budget {PER_CALL_BUDGET_SECONDS * 1e6:.0f}us"
+    )
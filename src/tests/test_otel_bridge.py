@@ -0,0 +1,93 @@
+"""
+Tests for recording spans from the OpenTelemetry SDK in judgeval traces.
+"""
+
+import time
+
+import pytest
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.trace import SpanKind, Status, StatusCode
+
+
+@pytest.fixture
+def otel_tracer(tracer):
+    provider = TracerProvider()
+    tracer.instrument_opentelemetry(provider)
+    yield provider.get_tracer("test.instrumentation")
+    provider.shutdown()
+
+
+def test_foreign_spans_join_current_trace(tracer, otel_tracer, spans_by_function):
+    @tracer.observe
+    def agent():
+        with otel_tracer.start_as_current_span("POST /search", kind=SpanKind.SERVER):
+            with otel_tracer.start_as_current_span(
+                "SELECT documents",
+                kind=SpanKind.CLIENT,
+                attributes={"db.system": "postgresql", "db.operation": "SELECT"},
+            ):
+                time.sleep(0.01)
+        return "done"
+
+    assert agent() == "done"
+
+    spans = spans_by_function(tracer.traces[-1])
+    agent_span, request, query = (
+        spans["agent"],
+        spans["POST /search"],
+        spans["SELECT documents"],
+    )
+    assert request["parent_span_id"] == agent_span["span_id"]
+    assert query["parent_span_id"] == request["span_id"]
+    assert (agent_span["depth"], request["depth"], query["depth"]) == (0, 1, 2)
+    assert {request["trace_id"], query["trace_id"]} == {agent_span["trace_id"]}
+    assert 0.01 <= query["duration"] <= request["duration"] <= agent_span["duration"]
+
+    otel = query["additional_metadata"]["otel"]
+    assert otel["kind"] == "CLIENT"
+    assert otel["instrumentation_scope"] == "test.instrumentation"
+    assert otel["attributes"] == {"db.system": "postgresql", "db.operation": "SELECT"}
+
+
+def test_foreign_spans_outside_trace_are_ignored(tracer, otel_tracer):
+    with otel_tracer.start_as_current_span("background poll"):
+        pass
+
+    assert tracer.traces == []
+
+
+def test_foreign_span_error(tracer, otel_tracer, spans_by_function):
+    @tracer.observe
+    def agent():
+        with otel_tracer.start_as_current_span("GET /flaky") as span:
+            span.record_exception(ConnectionError("reset by peer"))
+            span.set_status(Status(StatusCode.ERROR, "reset by peer"))
+
+    agent()
+
+    error = spans_by_function(tracer.traces[-1])["GET /flaky"]["error"]
+    assert error["type"] == "ConnectionError"
+    assert error["message"] == "reset by peer"
+
+
+def test_gen_ai_spans_record_usage(tracer, otel_tracer, spans_by_function):
+    @tracer.observe
+    def agent():
+        with otel_tracer.start_as_current_span(
+            "chat gpt-4.1",
+            attributes={
+                "gen_ai.usage.input_tokens": 12,
+                "gen_ai.usage.output_tokens": 3,
+                "gen_ai.response.model": "gpt-4.1",
+            },
+        ):
+            pass
+
+    agent()
+
+    span = spans_by_function(tracer.traces[-1])["chat gpt-4.1"]
+    assert span["span_type"] == "llm"
+    assert span["usage"]["prompt_tokens"] == 12
+    assert span["usage"]["completion_tokens"] == 3
+    assert span["usage"]["total_tokens"] == 15
+    assert span["usage"]["model_name"] == "gpt-4.1"
@@ -0,0 +1,205 @@
+"""
+Tests for exporting judgeval spans over OTLP and fanning out to several exporters.
+"""
+
+import uuid
+
+import pytest
+from opentelemetry.sdk.trace.export import SpanExporter, SpanExportResult
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import (
+    InMemorySpanExporter,
+)
+from opentelemetry.trace import StatusCode
+
+from judgeval.common.tracer import (
+    FanOutSpanExporter,
+    JudgmentAPISpanExporter,
+    JudgmentOTLPSpanExporter,
+    create_otlp_exporter,
+    extract_trace_context,
+)
+from judgeval.common.tracer.span_transformer import SpanTransformer
+
+
+class RecordingExporter(SpanExporter):
+    def __init__(self, result=SpanExportResult.SUCCESS):
+        self.batches = []
+        self.result = result
+
+    def export(self, spans):
+        self.batches.append(list(spans))
+        return self.result
+
+
+class FailingExporter(SpanExporter):
+    def export(self, spans):
+        raise RuntimeError("collector unreachable")
+
+
+@pytest.fixture
+def exporting_tracer(make_tracer, mocker):
+    judgment_batches = []
+    mocker.patch.object(
+        JudgmentAPISpanExporter,
+        "export",
+        new=lambda self, spans: (
+            judgment_batches.append(list(spans)) or SpanExportResult.SUCCESS
+        ),
+    )
+    otlp = InMemorySpanExporter()
+    tracer = make_tracer(
+        span_flush_interval=0.05,
+        span_exporters=[JudgmentOTLPSpanExporter(otlp, service_name="unit-tests")],
+    )
+    tracer.judgment_batches = judgment_batches
+    tracer.otlp = otlp
+    return tracer
+
+
+def _run_agent(tracer):
+    @tracer.observe
+    def failing_tool():
+        raise ValueError("tool broke")
+
+    @tracer.observe
+    def agent():
+        with tracer.trace("retrieval"):
+            pass
+        try:
+            failing_tool()
+        except ValueError:
+            pass
+        return tracer.inject()
+
+    headers = agent()
+    tracer.otel_span_processor.force_flush()
+    return headers
+
+
+def test_otlp_receives_each_completed_span_once(exporting_tracer):
+    _run_agent(exporting_tracer)
+
+    spans = {
+        span.name: span
+        for span in exporting_tracer.otlp.get_finished_spans()
+        if span.name in ("agent", "failing_tool")
+    }
+    assert len(exporting_tracer.otlp.get_finished_spans()) == 3
+    agent, tool = spans["agent"], spans["failing_tool"]
+
+    trace_id = uuid.UUID(agent.attributes["judgment.trace_id"]).int
+    assert agent.context.trace_id == tool.context.trace_id == trace_id
+    assert agent.parent is None
+    assert tool.parent.span_id == agent.context.span_id
+    assert agent.context.span_id < 2**64
+    assert agent.resource.attributes["service.name"] == "unit-tests"
+    assert agent.instrumentation_scope.name == "judgeval"
+    assert "judgment.update_id" not in agent.attributes
+    assert "judgment.span_state" not in agent.attributes
+    assert agent.end_time > agent.start_time
+
+    assert tool.status.status_code == StatusCode.ERROR
+    assert tool.status.description == "tool broke"
+    assert tool.attributes["error.type"] == "ValueError"
+    (event,) = tool.events
+    assert event.name == "exception"
+    assert event.attributes["exception.type"] == "ValueError"
+
+
+def test_judgment_api_and_otlp_share_converted_spans(exporting_tracer, monkeypatch):
+    converted = []
+    original = JudgmentOTLPSpanExporter._to_otlp_span
+
+    def spy(self, span):
+        converted.append(span)
+        return original(self, span)
+
+    monkeypatch.setattr(JudgmentOTLPSpanExporter, "_to_otlp_span", spy)
+    _run_agent(exporting_tracer)
+
+    judgment_spans = [
+        span for batch in exporting_tracer.judgment_batches for span in batch
+    ]
+    # The Judgment API still gets incremental updates; OTLP converts the same
+    # objects rather than serializing the TraceSpans again
+    assert len(judgment_spans) > len(converted) == 3
+    judgment_span_ids = {id(span) for span in judgment_spans}
+    assert all(id(span) in judgment_span_ids for span in converted)
+
+
+def test_traceparent_matches_otlp_span_id(exporting_tracer):
+    headers = _run_agent(exporting_tracer)
+
+    (agent,) = [
+        span
+        for span in exporting_tracer.otlp.get_finished_spans()
+        if span.name == "agent"
+    ]
+    parent_id = headers["traceparent"].split("-")[2]
+    assert int(parent_id, 16) == agent.context.span_id
+    assert (
+        extract_trace_context(headers).span_id == agent.attributes["judgment.span_id"]
+    )
+
+
+def test_otlp_spans_encode_to_protobuf(exporting_tracer):
+    trace_encoder = pytest.importorskip(
+        "opentelemetry.exporter.otlp.proto.common.trace_encoder"
+    )
+    _run_agent(exporting_tracer)
+
+    request = trace_encoder.encode_spans(exporting_tracer.otlp.get_finished_spans())
+
+    (resource_spans,) = request.resource_spans
+    (scope_spans,) = resource_spans.scope_spans
+    assert {span.name for span in scope_spans.spans} == {
+        "agent",
+        "failing_tool",
+        "retrieval",
+    }
+
+
+def test_usage_maps_to_gen_ai_attributes():
+    attributes = SpanTransformer.otel_attributes_to_otlp_attributes(
+        {
+            "judgment.span_type": "llm",
+            "judgment.usage": '{"prompt_tokens": 12, "completion_tokens": 3, '
+            '"model_name": "gpt-4.1"}',
+            "judgment.update_id": 4,
+        }
+    )
+
+    assert attributes == {
+        "judgment.span_type": "llm",
+        "judgment.usage": '{"prompt_tokens": 12, "completion_tokens": 3, '
+        '"model_name": "gpt-4.1"}',
+        "gen_ai.usage.input_tokens": 12,
+        "gen_ai.usage.output_tokens": 3,
+        "gen_ai.response.model": "gpt-4.1",
+    }
+
+
+def test_fan_out_isolates_failing_exporter():
+    healthy = RecordingExporter()
+    fan_out = FanOutSpanExporter([FailingExporter(), healthy])
+    batch = [object()]
+
+    assert fan_out.export(batch) == SpanExportResult.FAILURE
+    assert healthy.batches == [batch]
+
+
+def test_create_otlp_exporter_rejects_unknown_protocol():
+    with pytest.raises(ValueError, match="Unsupported OTLP protocol"):
+        create_otlp_exporter(protocol="thrift")
+
+
+def test_tracer_otlp_endpoint_adds_exporter(make_tracer):
+    pytest.importorskip("opentelemetry.exporter.otlp.proto.http.trace_exporter")
+    tracer = make_tracer(otlp_endpoint="http://localhost:4318/v1/traces")
+
+    fan_out = tracer.otel_span_processor.exporter
+    assert isinstance(fan_out, FanOutSpanExporter)
+    judgment, otlp = fan_out.exporters
+    assert isinstance(judgment, JudgmentAPISpanExporter)
+    assert isinstance(otlp, JudgmentOTLPSpanExporter)
+    assert otlp.exporter._endpoint == "http://localhost:4318/v1/traces"
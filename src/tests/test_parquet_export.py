@@ -0,0 +1,169 @@
+"""
+Tests for exporting spans to Parquet and converting stored traces.
+"""
+
+import json
+import os
+
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+
+from judgeval import cli  # noqa: E402
+from judgeval.common.tracer import (  # noqa: E402
+    ParquetSpanExporter,
+    convert_to_parquet,
+)
+from judgeval.common.tracer.file_exporter import SegmentWriter  # noqa: E402
+from judgeval.common.tracer.otel_span_processor import SimpleReadableSpan  # noqa: E402
+from judgeval.data import TraceSpan, TraceUsage  # noqa: E402
+
+
+def _span_data(span_id, function="search", **fields):
+    return TraceSpan(
+        span_id=span_id,
+        trace_id="trace-1",
+        function=function,
+        depth=0,
+        created_at=1_700_000_000.0,
+        duration=0.25,
+        **fields,
+    ).model_dump()
+
+
+def _readable(span_id, span_state="completed", **fields):
+    span = TraceSpan(
+        span_id=span_id,
+        trace_id="trace-1",
+        function="search",
+        depth=0,
+        created_at=1_700_000_000.0,
+        duration=0.25,
+        **fields,
+    )
+    return SimpleReadableSpan(span, span_state)
+
+
+def test_tracer_writes_parquet(tmp_path, make_tracer):
+    tracer = make_tracer(parquet_dir=str(tmp_path))
+
+    @tracer.observe(span_type="tool")
+    def tool(i):
+        return {"i": i}
+
+    @tracer.observe
+    def agent():
+        return [tool(i) for i in range(3)]
+
+    agent()
+    tracer.flush_background_spans()
+    tracer.shutdown_background_service()
+
+    (name,) = os.listdir(tmp_path)
+    assert name.endswith(".parquet")
+    table = pq.read_table(tmp_path / name)
+    # Each span once, although the processor exported every incremental update
+    assert table.num_rows == 4
+    assert pa.types.is_dictionary(table.schema.field("function").type)
+    rows = table.to_pylist()
+    assert sorted(row["function"] for row in rows) == ["agent", "tool", "tool", "tool"]
+    tool_rows = [row for row in rows if row["function"] == "tool"]
+    assert {row["span_type"] for row in tool_rows} == {"tool"}
+    assert sorted(json.loads(row["output"])["i"] for row in tool_rows) == [0, 1, 2]
+    assert all(row["duration"] is not None for row in rows)
+
+
+def test_exporter_rotates_files_and_row_groups(tmp_path):
+    exporter = ParquetSpanExporter(str(tmp_path), row_group_size=2, max_rows_per_file=3)
+    spans = [_readable(f"span-{i}") for i in range(4)]
+    spans.append(_readable("running", span_state="input"))
+
+    exporter.export(spans)
+    # The first file is full; the second is still being written
+    assert sorted(name.rsplit(".", 1)[-1] for name in os.listdir(tmp_path)) == [
+        "inprogress",
+        "parquet",
+    ]
+    exporter.shutdown()
+
+    files = sorted(tmp_path.iterdir())
+    assert [pq.ParquetFile(path).metadata.num_rows for path in files] == [3, 1]
+    assert pq.ParquetFile(files[0]).metadata.num_row_groups == 2
+
+
+def test_row_columns(tmp_path):
+    exporter = ParquetSpanExporter(str(tmp_path))
+    usage = TraceUsage(
+        prompt_tokens=10,
+        completion_tokens=5,
+        total_tokens=15,
+        total_cost_usd=0.002,
+        model_name="gpt-4.1",
+    )
+    exporter.export(
+        [
+            _readable("llm", span_type="llm", usage=usage),
+            _readable("failed", error={"type": "TimeoutError", "message": "slow"}),
+        ]
+    )
+    exporter.shutdown()
+
+    (path,) = tmp_path.iterdir()
+    llm, failed = pq.read_table(path).to_pylist()
+    assert (llm["model_name"], llm["prompt_tokens"], llm["total_cost_usd"]) == (
+        "gpt-4.1",
+        10,
+        0.002,
+    )
+    assert llm["has_error"] is False
+    assert llm["created_at"].timestamp() == 1_700_000_000.0
+    assert failed["has_error"] is True
+    assert failed["error_type"] == "TimeoutError"
+    assert json.loads(failed["error"])["message"] == "slow"
+
+
+def test_convert_trace_documents_and_segments(tmp_path):
+    traces = tmp_path / "traces"
+    traces.mkdir()
+    (traces / "trace-1_20250101_000000.json").write_text(
+        json.dumps(
+            {
+                "trace_id": "trace-1",
+                "trace_spans": [_span_data("a", "agent"), _span_data("b")],
+            }
+        )
+    )
+    (traces / "more.jsonl").write_text(
+        json.dumps({"trace_id": "trace-2", "trace_spans": [_span_data("c")]}) + "\n"
+    )
+
+    segments = tmp_path / "segments"
+    writer = SegmentWriter(str(segments), compress=True)
+    started = {**_span_data("d"), "span_state": "input", "update_id": 1}
+    completed = {**_span_data("d"), "span_state": "completed", "update_id": 20}
+    writer.write("spans", [started, {**_span_data("e"), "span_state": "output"}])
+    writer.write("spans", [completed])
+    writer.write("traces", [{"trace_id": "trace-3", "trace_spans": [completed]}])
+    writer.close()
+
+    output = tmp_path / "spans.parquet"
+    spans = convert_to_parquet(
+        [str(traces), str(segments)], str(output), row_group_size=2
+    )
+
+    assert spans == 4
+    table = pq.read_table(output)
+    assert table.column("span_id").to_pylist() == ["c", "a", "b", "d"]
+    assert pq.ParquetFile(output).metadata.num_row_groups == 2
+
+
+def test_parquet_command(tmp_path, capsys):
+    source = tmp_path / "trace.json"
+    source.write_text(json.dumps({"trace_spans": [_span_data("a")]}))
+    output = tmp_path / "spans.parquet"
+
+    assert cli.main(["parquet", str(source), "-o", str(output)]) == 0
+
+    assert pq.read_table(output).num_rows == 1
+    assert f"Wrote 1 spans to {output}" in capsys.readouterr().out
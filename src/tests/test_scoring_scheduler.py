@@ -0,0 +1,96 @@
+"""
+Tests for the streaming scheduler of local scorers.
+"""
+
+import asyncio
+
+from judgeval.data import Example
+from judgeval.scorers.base_scorer import BaseScorer
+from judgeval.scorers.score import a_execute_scoring, a_iter_scoring
+
+
+class DelayScorer(BaseScorer):
+    """Scores an example after sleeping for its input, in hundredths of a second."""
+
+    score_type: str = "Delay"
+    model: str = "test-model"
+    threshold: float = 0.5
+
+    async def a_score_example(self, example, *args, **kwargs):
+        await asyncio.sleep(float(example.input) / 100)
+        if example.input == "-1":
+            raise ValueError("negative delay")
+        return 1.0
+
+
+def _examples(delays):
+    return [Example(input=str(delay), actual_output="ok") for delay in delays]
+
+
+async def _collect(examples, **kwargs):
+    return [
+        (index, result)
+        async for index, result in a_iter_scoring(examples, [DelayScorer()], **kwargs)
+    ]
+
+
+def test_results_stream_in_completion_order():
+    results = asyncio.run(_collect(_examples([5, 0, 2]), max_concurrent=3))
+
+    assert [index for index, _ in results] == [1, 2, 0]
+    assert all(result.success for _, result in results)
+    assert results[0][1].data_object.input == "0"
+
+
+def test_examples_are_pulled_lazily():
+    pulled = []
+    in_flight = 0
+    peak = 0
+
+    class CountingScorer(DelayScorer):
+        async def a_score_example(self, example, *args, **kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return 1.0
+
+    def examples():
+        for example in _examples(range(10)):
+            pulled.append(example.input)
+            yield example
+
+    async def first_two():
+        stream = a_iter_scoring(examples(), [CountingScorer()], max_concurrent=2)
+        results = [await stream.__anext__(), await stream.__anext__()]
+        await stream.aclose()
+        return results
+
+    asyncio.run(first_two())
+
+    assert peak == 2
+    # The two finished, the two being scored and at most two waiting in the queue
+    assert len(pulled) <= 6
+
+
+def test_async_iterables_and_ordered_lists():
+    async def examples():
+        for example in _examples([3, 1, 2]):
+            yield example
+
+    results = asyncio.run(a_execute_scoring(examples(), [DelayScorer()]))
+    assert [result.data_object.input for result in results] == ["3", "1", "2"]
+
+    results = asyncio.run(
+        a_execute_scoring(_examples([2, 0]), [DelayScorer()], max_concurrent=1)
+    )
+    assert [result.data_object.input for result in results] == ["2", "0"]
+
+
+def test_scorer_errors_are_recorded_on_the_result():
+    results = asyncio.run(_collect(_examples([0, -1])))
+
+    failed = dict(results)[1]
+    assert not failed.success
+    assert failed.scorers_data[0].error == "negative delay"
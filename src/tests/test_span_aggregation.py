@@ -0,0 +1,130 @@
+"""
+Tests for merging high fan-out child spans into summary spans.
+"""
+
+from judgeval.common.tracer import InMemoryTraceStore
+from judgeval.common.tracer.aggregation import MAX_SUMMARY_EXEMPLARS
+
+
+def test_calls_past_the_fanout_are_merged(tracer, spans_by_function):
+    tracer.aggregate_fanout = 2
+
+    @tracer.observe(span_type="tool")
+    def lookup(key):
+        if key == 5:
+            raise KeyError(key)
+        return key
+
+    @tracer.observe
+    def agent():
+        for key in range(10):
+            try:
+                lookup(key)
+            except KeyError:
+                pass
+
+    agent()
+
+    spans = spans_by_function(tracer.traces[-1], grouped=True)
+    (agent_span,) = spans["agent"]
+    kept = [span for span in spans["lookup"] if not span["additional_metadata"]]
+    (summary,) = [span for span in spans["lookup"] if span["additional_metadata"]]
+    assert [span["inputs"] for span in kept] == [{"key": 0}, {"key": 1}]
+
+    aggregate = summary["additional_metadata"]["aggregate"]
+    assert aggregate["count"] == 8
+    assert aggregate["errors"] == 1
+    assert aggregate["min"] <= aggregate["p50"] <= aggregate["p95"] <= aggregate["max"]
+    assert aggregate["total_duration"] <= summary["duration"]
+    assert len(aggregate["exemplars"]) == MAX_SUMMARY_EXEMPLARS
+    assert aggregate["exemplars"][0]["inputs"] == {"key": 2}
+    assert summary["parent_span_id"] == agent_span["span_id"]
+    assert summary["span_type"] == "tool"
+    assert summary["depth"] == 1
+
+
+def test_spans_inside_merged_calls_are_merged_under_the_summary(
+    tracer, spans_by_function
+):
+    tracer.aggregate_fanout = 1
+
+    @tracer.observe
+    def tokenize(text):
+        return text.split()
+
+    @tracer.observe
+    def embed(text):
+        return len(tokenize(text))
+
+    @tracer.observe
+    def agent():
+        return [embed("a b") for _ in range(3)]
+
+    agent()
+
+    spans = spans_by_function(tracer.traces[-1], grouped=True)
+    embed_summary = next(s for s in spans["embed"] if s["additional_metadata"])
+    tokenize_summary = next(s for s in spans["tokenize"] if s["additional_metadata"])
+    assert tokenize_summary["parent_span_id"] == embed_summary["span_id"]
+    assert tokenize_summary["additional_metadata"]["aggregate"]["count"] == 2
+    assert embed_summary["additional_metadata"]["aggregate"]["count"] == 2
+    # The one kept embed span keeps its own tokenize span
+    assert len(spans["tokenize"]) == 2
+
+
+def test_fanout_is_per_parent_and_per_trace(tracer, spans_by_function):
+    tracer.aggregate_fanout = 2
+
+    @tracer.observe
+    def lookup():
+        return 1
+
+    @tracer.observe
+    def step():
+        lookup()
+        lookup()
+
+    @tracer.observe
+    def agent():
+        step()
+        step()
+
+    agent()
+    assert not any(
+        span["additional_metadata"] for span in tracer.traces[-1]["trace_spans"]
+    )
+
+    @tracer.observe
+    def eager_agent():
+        tracer.get_current_trace().aggregate_fanout = 0
+        step()
+
+    eager_agent()
+    spans = spans_by_function(tracer.traces[-1], grouped=True)
+    assert sorted(spans) == ["eager_agent", "lookup", "step"]
+    (lookup_summary,) = spans["lookup"]
+    assert lookup_summary["additional_metadata"]["aggregate"]["count"] == 2
+
+
+def test_merged_spans_are_only_exported_in_summaries(make_tracer):
+    store = InMemoryTraceStore()
+    tracer = make_tracer(
+        api_key=None,
+        organization_id=None,
+        span_processor=store,
+        aggregate_fanout=1,
+    )
+
+    @tracer.observe
+    def lookup(key):
+        return key
+
+    @tracer.observe
+    def agent():
+        return [lookup(key) for key in range(50)]
+
+    agent()
+
+    lookups = store.spans(function="lookup")
+    assert len(lookups) == 2
+    assert lookups[1].additional_metadata["aggregate"]["count"] == 49
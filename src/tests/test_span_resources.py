@@ -0,0 +1,132 @@
+"""
+Tests for opt-in CPU time, memory and event loop lag capture on spans.
+"""
+
+import asyncio
+import time
+import tracemalloc
+
+import pytest
+
+from judgeval.common.tracer.resources import resolve_resources
+
+
+def _busy(seconds):
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+def test_resources_are_not_captured_by_default(tracer, spans_by_function):
+    @tracer.observe
+    def agent():
+        return 1
+
+    agent()
+
+    assert spans_by_function(tracer.traces[-1])["agent"]["additional_metadata"] is None
+
+
+def test_cpu_time_tells_computing_from_waiting(tracer, spans_by_function):
+    @tracer.observe(capture_resources=["cpu"])
+    def compute():
+        _busy(0.05)
+
+    @tracer.observe(capture_resources=["cpu"])
+    def wait():
+        time.sleep(0.05)
+
+    @tracer.observe
+    def agent():
+        compute()
+        wait()
+
+    agent()
+
+    spans = spans_by_function(tracer.traces[-1])
+    compute_cpu = spans["compute"]["additional_metadata"]["resources"]["cpu_time"]
+    wait_cpu = spans["wait"]["additional_metadata"]["resources"]["cpu_time"]
+    assert compute_cpu >= 0.03
+    assert wait_cpu < 0.02
+    assert spans["wait"]["duration"] >= 0.05
+    # Only the functions that asked for it
+    assert spans["agent"]["additional_metadata"] is None
+
+
+def test_tracer_wide_capture_and_span_override(tracer, spans_by_function):
+    tracer.capture_resources = resolve_resources(True)
+
+    @tracer.observe
+    def agent():
+        with tracer.get_current_trace().span("quiet", capture_resources=False):
+            pass
+
+    agent()
+
+    spans = spans_by_function(tracer.traces[-1])
+    assert set(spans["agent"]["additional_metadata"]["resources"]) == {"cpu_time"}
+    assert spans["quiet"]["additional_metadata"] is None
+
+
+def test_memory_delta(tracer, spans_by_function):
+    was_tracing = tracemalloc.is_tracing()
+    kept = []
+
+    @tracer.observe(capture_resources=["memory"])
+    def allocate():
+        kept.append(bytearray(2_000_000))
+
+    try:
+        allocate()
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+
+    allocate = spans_by_function(tracer.traces[-1])["allocate"]
+    resources = allocate["additional_metadata"]["resources"]
+    assert resources["memory_delta_bytes"] >= 2_000_000
+
+
+def test_event_loop_lag_of_async_spans(tracer):
+    @tracer.observe(capture_resources=True)
+    async def blocking():
+        await asyncio.sleep(0)
+        # Blocks the event loop past the lag timer's due time
+        time.sleep(0.06)
+        await asyncio.sleep(0.02)
+
+    @tracer.observe(capture_resources=True)
+    async def polite():
+        await asyncio.sleep(0.03)
+
+    async def main():
+        await polite()
+        await blocking()
+
+    asyncio.run(main())
+
+    spans = {
+        span["function"]: span["additional_metadata"]["resources"]
+        for trace in tracer.traces
+        for span in trace["trace_spans"]
+    }
+    assert spans["blocking"]["loop_lag_max"] >= 0.04
+    assert spans["blocking"]["loop_lag_total"] >= spans["blocking"]["loop_lag_max"]
+    assert spans["polite"]["loop_lag_max"] < 0.04
+    assert "cpu_time" in spans["polite"]
+
+
+def test_sync_spans_outside_a_loop_have_no_loop_lag(tracer, spans_by_function):
+    @tracer.observe(capture_resources=["loop_lag"])
+    def agent():
+        return 1
+
+    agent()
+
+    agent_span = spans_by_function(tracer.traces[-1])["agent"]
+    assert agent_span["additional_metadata"]["resources"] == {}
+
+
+def test_unknown_resource():
+    with pytest.raises(ValueError, match="gpu"):
+        resolve_resources(["cpu", "gpu"])
@@ -0,0 +1,191 @@
+"""
+Tests for the SQLite trace store.
+"""
+
+import sqlite3
+import threading
+
+import pytest
+
+from judgeval.common.tracer import SQLiteTraceStore
+from judgeval.common.tracer.otel_span_processor import SimpleReadableSpan
+from judgeval.data import TraceSpan, TraceUsage
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = SQLiteTraceStore(str(tmp_path / "traces.db"))
+    yield store
+    store.shutdown()
+
+
+def _span(function, duration, trace_id="trace-1", parent=None, **fields):
+    span = TraceSpan(
+        span_id=f"{function}-{duration}-{trace_id}",
+        trace_id=trace_id,
+        function=function,
+        depth=0 if parent is None else 1,
+        created_at=1_700_000_000.0 + duration,
+        duration=duration,
+        parent_span_id=parent,
+        **fields,
+    )
+    span.set_update_id_to_ending_number()
+    return SimpleReadableSpan(span, "completed")
+
+
+def test_export_round_trips_trace_spans(store):
+    usage = TraceUsage(prompt_tokens=10, completion_tokens=2, model_name="gpt-4.1")
+    root = _span("agent", 2.0, inputs={"query": "hi"}, output={"answer": "hello"})
+    child = _span(
+        "llm_call",
+        1.5,
+        parent="agent-2.0-trace-1",
+        span_type="llm",
+        usage=usage,
+        error={"type": "ValueError", "message": "bad"},
+    )
+
+    assert store.export([root, child]).name == "SUCCESS"
+
+    # Spans come back in start order; the child's created_at is earlier here
+    stored_child, stored_root = store.spans(trace_id="trace-1")
+    assert stored_root.inputs == {"query": "hi"}
+    assert stored_root.output == {"answer": "hello"}
+    assert stored_root.created_at == pytest.approx(1_700_000_002.0)
+    assert stored_child.usage.prompt_tokens == 10
+    assert stored_child.usage.model_name == "gpt-4.1"
+    assert stored_child.error["type"] == "ValueError"
+    assert [span.function for span in store.spans(parent_span_id=None)] == ["agent"]
+    assert store.spans(span_type="llm", min_duration=1.0) == [stored_child]
+
+
+def test_older_updates_do_not_overwrite_newer_ones(store):
+    span = TraceSpan(
+        span_id="s", trace_id="t", function="agent", depth=0, created_at=1.0
+    )
+    span.increment_update_id()
+    started = SimpleReadableSpan(span, "input")
+    span.duration = 3.0
+    span.set_update_id_to_ending_number()
+    completed = SimpleReadableSpan(span, "completed")
+
+    store.export([completed])
+    store.export([started])
+
+    (stored,) = store.spans()
+    assert stored.duration == 3.0
+
+
+def test_latency_percentiles(store):
+    store.export([_span("search", d / 100) for d in range(1, 101)])
+    store.export([_span("answer", 0.5)])
+
+    answer, search = store.latency_percentiles(percentiles=(50, 99, 100))
+    assert (answer.function, answer.count) == ("answer", 1)
+    assert answer.percentiles == {50: 0.5, 99: 0.5, 100: 0.5}
+    assert search.count == 100
+    assert search.percentiles == {50: 0.5, 99: 0.99, 100: 1.0}
+    (only_search,) = store.latency_percentiles(
+        percentiles=(50, 99, 100), function="search"
+    )
+    assert only_search == search
+
+
+def test_error_rates_and_cost_by_model(store):
+    error = {"type": "TimeoutError", "message": "slow"}
+    store.export(
+        [
+            _span("search", 0.1, error=error),
+            _span("search", 0.2),
+            _span("answer", 0.3),
+            _span(
+                "answer",
+                0.4,
+                usage=TraceUsage(
+                    prompt_tokens=100,
+                    completion_tokens=20,
+                    total_cost_usd=0.5,
+                    model_name="gpt-4.1",
+                ),
+            ),
+            _span(
+                "answer",
+                0.5,
+                usage=TraceUsage(
+                    prompt_tokens=50,
+                    completion_tokens=5,
+                    total_cost_usd=0.01,
+                    model_name="gpt-4.1-mini",
+                ),
+            ),
+        ]
+    )
+
+    rates = store.error_rates()
+    assert [(rate.function, rate.spans, rate.errors) for rate in rates] == [
+        ("search", 2, 1),
+        ("answer", 3, 0),
+    ]
+    assert rates[0].rate == 0.5
+
+    costs = store.cost_by_model()
+    assert [(cost.model_name, cost.prompt_tokens) for cost in costs] == [
+        ("gpt-4.1", 100),
+        ("gpt-4.1-mini", 50),
+    ]
+    assert costs[0].total_cost_usd == pytest.approx(0.5)
+    assert [span.duration for span in store.slowest(2)] == [0.5, 0.4]
+
+
+def test_wal_mode_and_indexes(store):
+    connection = sqlite3.connect(store.path)
+    try:
+        assert connection.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        indexes = {row[1] for row in connection.execute("PRAGMA index_list('spans')")}
+    finally:
+        connection.close()
+    assert {
+        "spans_trace_id",
+        "spans_parent_span_id",
+        "spans_function",
+        "spans_span_type",
+        "spans_created_at",
+        "spans_duration",
+    } <= indexes
+
+
+def test_queries_from_other_threads_during_export(store):
+    errors = []
+
+    def write():
+        try:
+            for batch in range(20):
+                store.export([_span("search", batch + i / 100) for i in range(50)])
+        except Exception as e:
+            errors.append(e)
+
+    writer = threading.Thread(target=write)
+    writer.start()
+    while writer.is_alive():
+        store.latency_percentiles()
+    writer.join()
+
+    assert errors == []
+    assert store.latency_percentiles()[0].count == 1000
+
+
+def test_tracer_exports_to_store(store, make_tracer):
+    tracer = make_tracer(span_exporters=[store])
+
+    @tracer.observe
+    def agent():
+        return 1
+
+    agent()
+    tracer.flush_background_spans()
+    tracer.shutdown_background_service()
+
+    (span,) = SQLiteTraceStore(store.path).spans()
+    assert span.function == "agent"
+    assert span.duration is not None
@@ -0,0 +1,129 @@
+"""
+Tests for self-time, critical-path and hot-function analysis of traces.
+"""
+
+import json
+
+import pytest
+
+from judgeval import cli
+from judgeval.common.tracer import analyze_trace, hot_functions
+from judgeval.common.tracer.analysis import format_report
+
+
+@pytest.fixture
+def agent_trace(make_span, make_trace):
+    def build(name="agent"):
+        # agent [0, 10]
+        #   plan   [0, 2]
+        #   search [2, 7]   concurrent with fetch
+        #     embed  [2, 3]
+        #   fetch  [3, 6]
+        #   answer [7, 9]
+        return make_trace(
+            name,
+            [
+                make_span("agent", 0, 10),
+                make_span("plan", 0, 2, parent="agent"),
+                make_span("search", 2, 5, parent="agent"),
+                make_span("embed", 2, 1, parent="search"),
+                make_span("fetch", 3, 3, parent="agent"),
+                make_span("answer", 7, 2, parent="agent"),
+            ],
+        )
+
+    return build
+
+
+def test_self_time_counts_concurrent_children_once(agent_trace):
+    analysis = analyze_trace(agent_trace())
+
+    spans = analysis.spans
+    assert spans["agent"].total_time == pytest.approx(10)
+    # plan, search/fetch (overlapping, [2, 7]) and answer cover 9 of 10 seconds
+    assert spans["agent"].self_time == pytest.approx(1)
+    assert spans["search"].self_time == pytest.approx(4)
+    assert [child.span_id for child in spans["agent"].children] == [
+        "plan",
+        "search",
+        "fetch",
+        "answer",
+    ]
+    assert analysis.duration == pytest.approx(10)
+    assert [timing.span_id for timing in analysis.slowest(2)] == ["search", "fetch"]
+
+
+def test_critical_path_skips_concurrent_work_that_finished_early(agent_trace):
+    path = analyze_trace(agent_trace()).critical_path()
+
+    assert [step.timing.span_id for step in path] == [
+        "agent",
+        "plan",
+        "search",
+        "embed",
+        "answer",
+    ]
+    exclusive = {step.timing.span_id: step.exclusive_time for step in path}
+    assert exclusive["agent"] == pytest.approx(1)
+    assert exclusive["search"] == pytest.approx(4)
+    assert sum(exclusive.values()) == pytest.approx(10)
+
+
+def test_orphan_spans_are_roots_and_dict_spans_work(agent_trace, make_span):
+    spans = [span.model_dump() for span in agent_trace()["trace_spans"]]
+    spans.append(make_span("remote", 20, 1, parent="caller").model_dump())
+
+    analysis = analyze_trace(spans)
+
+    assert [root.span_id for root in analysis.roots] == ["agent", "remote"]
+    assert analysis.spans["agent"].self_time == pytest.approx(1)
+    # Roots run from the start of the first to the end of the last
+    assert analysis.duration == pytest.approx(21)
+
+
+def test_hot_functions_across_traces(agent_trace):
+    stats = hot_functions([agent_trace(), agent_trace()])
+
+    by_function = {entry.function: entry for entry in stats}
+    assert stats[0].function == "search"
+    assert by_function["search"].calls == 2
+    assert by_function["search"].self_time == pytest.approx(8)
+    assert by_function["fetch"].critical_time == 0
+    assert by_function["answer"].critical_time == pytest.approx(4)
+    assert by_function["agent"].max_time == pytest.approx(10)
+
+
+def test_tracer_traces_can_be_analyzed(tracer):
+    @tracer.observe
+    def tool():
+        return 1
+
+    @tracer.observe
+    def agent():
+        return tool() + tool()
+
+    agent()
+
+    analysis = analyze_trace(tracer.traces[-1])
+    (root,) = analysis.roots
+    assert root.function == "agent"
+    assert [child.function for child in root.children] == ["tool", "tool"]
+    assert [step.timing.function for step in analysis.critical_path()][0] == "agent"
+
+
+def test_analyze_command(tmp_path, capsys, agent_trace, make_span, make_trace):
+    slow = agent_trace("slow agent")
+    fast = make_trace(
+        "fast agent", [make_span("agent", 0, 1).model_dump()], trace_id="trace-2"
+    )
+    slow["trace_spans"] = [span.model_dump() for span in slow["trace_spans"]]
+    (tmp_path / "traces.jsonl").write_text(
+        "\n".join(json.dumps(trace) for trace in (fast, slow))
+    )
+
+    assert cli.main(["analyze", str(tmp_path), "--top", "3"]) == 0
+
+    report = capsys.readouterr().out
+    assert report == format_report([fast, slow], top=3) + "\n"
+    assert "slowest trace (slow agent, 10.000s)" in report
+    assert "Hot functions across 2 traces" in report
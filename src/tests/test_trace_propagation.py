@@ -0,0 +1,136 @@
+"""
+Tests for W3C traceparent propagation between processes.
+"""
+
+import contextvars
+
+import pytest
+
+from judgeval.common.tracer import TraceContext, extract_trace_context
+from judgeval.common.tracer.propagation import format_traceparent
+
+
+def _in_new_process_context(func, *args):
+    """Runs func without any of the caller's context vars, like a remote worker would."""
+    return contextvars.Context().run(func, *args)
+
+
+def test_inject_extract_round_trip(tracer):
+    with tracer.trace("caller") as trace:
+        headers = tracer.inject()
+        span_id = tracer.get_current_span()
+
+    assert headers["traceparent"].startswith("00-")
+    assert extract_trace_context(headers) == TraceContext(
+        trace_id=trace.trace_id, span_id=span_id
+    )
+
+
+def test_inject_without_active_trace(tracer):
+    assert tracer.inject() == {}
+
+
+def test_extract_foreign_traceparent():
+    context = extract_trace_context(
+        {
+            "Traceparent": "00-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-00",
+            "tracestate": "congo=t61rcWkgMzE",
+        }
+    )
+
+    assert context == TraceContext(
+        trace_id="4bf92f35-77b3-4da6-a3ce-929d0e0e4736",
+        span_id="00f067aa0ba902b7",
+        sampled=False,
+    )
+
+
+def test_extract_ignores_stale_tracestate_span():
+    trace_id = "4bf92f35-77b3-4da6-a3ce-929d0e0e4736"
+    judgeval_span_id = "c8a3f9e2-1b4d-4e5f-8a6b-7c8d9e0f1a2b"
+    headers = {
+        # Another tracer created span 00f067aa0ba902b7 after ours
+        "traceparent": "00-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-01",
+        "tracestate": "judgment=c8a3f9e21b4d4e5f8a6b7c8d9e0f1a2b",
+    }
+
+    assert extract_trace_context(headers).span_id == "00f067aa0ba902b7"
+
+    headers["traceparent"] = format_traceparent(trace_id, judgeval_span_id)
+    assert extract_trace_context(headers).span_id == judgeval_span_id
+
+
+@pytest.mark.parametrize(
+    "traceparent",
+    [
+        "",
+        "garbage",
+        "00-00000000000000000000000000000000-00f067aa0ba902b7-01",
+        "00-4bf92f3577b34da6a3ce929d0e0e4736-0000000000000000-01",
+        "ff-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-01",
+        "00-4BF92F3577B34DA6A3CE929D0E0E4736-00f067aa0ba902b7-01",
+        "00-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-01-extra",
+    ],
+)
+def test_extract_rejects_invalid_traceparent(traceparent):
+    assert extract_trace_context({"traceparent": traceparent}) is None
+
+
+def test_inject_keeps_other_tracestate_entries(tracer):
+    with tracer.trace("caller"):
+        headers = tracer.inject({"tracestate": "judgment=stale,congo=t61rcWkgMzE"})
+
+    entries = headers["tracestate"].split(",")
+    assert entries[0].startswith("judgment=") and entries[0] != "judgment=stale"
+    assert entries[1:] == ["congo=t61rcWkgMzE"]
+
+
+def test_observe_continues_remote_trace(tracer):
+    with tracer.trace("caller") as caller_trace:
+        headers = tracer.inject()
+        caller_span_id = tracer.get_current_span()
+
+    @tracer.observe
+    def remote_worker():
+        return "done"
+
+    def handle_request(headers):
+        with tracer.continue_trace(headers):
+            return remote_worker()
+
+    assert _in_new_process_context(handle_request, dict(headers)) == "done"
+
+    remote_trace = tracer.traces[-1]
+    assert remote_trace["parent_trace_id"] == caller_trace.trace_id
+    assert remote_trace["trace_id"] != caller_trace.trace_id
+    (root_span,) = remote_trace["trace_spans"]
+    assert root_span["parent_span_id"] == caller_span_id
+
+
+def test_trace_accepts_remote_context(tracer):
+    remote = TraceContext(
+        trace_id="4bf92f35-77b3-4da6-a3ce-929d0e0e4736", span_id="00f067aa0ba902b7"
+    )
+
+    def run():
+        with tracer.trace("remote", remote_context=remote) as trace:
+            pass
+        return trace
+
+    trace = _in_new_process_context(run)
+
+    assert trace.parent_trace_id == remote.trace_id
+    assert trace.trace_spans[0].parent_span_id == remote.span_id
+    assert trace.trace_spans[0].depth == 0
+
+
+def test_continue_trace_ignores_missing_context(tracer):
+    @tracer.observe
+    def worker():
+        return 1
+
+    with tracer.continue_trace({}) as context:
+        worker()
+
+    assert context is None
+    assert tracer.traces[-1]["parent_trace_id"] is None
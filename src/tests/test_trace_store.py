@@ -0,0 +1,151 @@
+"""
+Tests for asserting on traces with the in-memory trace store.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from judgeval.common.tracer import InMemoryTraceStore
+from judgeval.data import TraceUsage
+
+
+@pytest.fixture
+def store():
+    return InMemoryTraceStore()
+
+
+@pytest.fixture
+def local_tracer(make_tracer, api_key_validation, store, monkeypatch):
+    api_key_validation.side_effect = AssertionError(
+        "the in-memory store must not call the API"
+    )
+    monkeypatch.delenv("JUDGMENT_API_KEY", raising=False)
+    monkeypatch.delenv("JUDGMENT_ORG_ID", raising=False)
+    return make_tracer(api_key=None, organization_id=None, span_processor=store)
+
+
+def _run_agent(tracer):
+    @tracer.observe(span_type="tool")
+    def search(query):
+        time.sleep(0.01)
+        return [query]
+
+    @tracer.observe(span_type="llm")
+    def answer(documents):
+        tracer.get_current_trace().record_usage(
+            TraceUsage(
+                prompt_tokens=10,
+                completion_tokens=5,
+                total_tokens=15,
+                total_cost_usd=0.01,
+            )
+        )
+        return documents[0]
+
+    @tracer.observe(span_type="tool")
+    def broken_tool():
+        raise ValueError("no results")
+
+    @tracer.observe
+    def agent(query):
+        try:
+            broken_tool()
+        except ValueError:
+            pass
+        result = answer(search(query))
+        time.sleep(0.02)
+        return result
+
+    return agent("judgeval")
+
+
+def test_tracer_records_into_store_without_credentials(local_tracer, store):
+    assert local_tracer.enable_monitoring is True
+    assert _run_agent(local_tracer) == "judgeval"
+
+    (trace_id,) = store.trace_ids()
+    assert {span.function for span in store.spans(trace_id=trace_id)} == {
+        "agent",
+        "broken_tool",
+        "search",
+        "answer",
+    }
+    assert local_tracer.traces[-1]["trace_id"] == trace_id
+
+
+def test_filters_use_every_index(local_tracer, store):
+    _run_agent(local_tracer)
+    (root,) = store.spans(parent_span_id=None)
+
+    assert [span.function for span in store.spans(span_type="tool")] == [
+        "broken_tool",
+        "search",
+    ]
+    assert [span.function for span in store.children(root.span_id)] == [
+        "broken_tool",
+        "search",
+        "answer",
+    ]
+    assert store.spans(span_type="tool", function="search", trace_id=root.trace_id)
+    assert store.spans(function="search", span_type="llm") == []
+    assert [span.function for span in store.spans(where=lambda s: s.error)] == [
+        "broken_tool"
+    ]
+    assert store.get_span(root.span_id) is root
+
+
+def test_tree(local_tracer, store):
+    _run_agent(local_tracer)
+
+    (root,) = store.tree(store.trace_ids()[0])
+    assert root.span.function == "agent"
+    assert [child.span.function for child in root.children] == [
+        "broken_tool",
+        "search",
+        "answer",
+    ]
+    assert all(child.children == [] for child in root.children)
+
+
+def test_slowest_and_totals(local_tracer, store):
+    _run_agent(local_tracer)
+    _run_agent(local_tracer)
+
+    slowest = store.slowest(2)
+    assert [span.function for span in slowest] == ["agent", "agent"]
+    assert slowest[0].duration >= slowest[1].duration
+    assert [span.function for span in store.slowest(1, span_type="llm")] == ["answer"]
+
+    totals = store.totals()
+    assert totals.spans == 8
+    assert totals.errors == 2
+    assert totals.total_tokens == 30
+    assert totals.total_cost_usd == pytest.approx(0.02)
+    assert totals.duration == pytest.approx(sum(s.duration for s in slowest))
+
+    first_trace = store.totals(store.trace_ids()[0])
+    assert (first_trace.spans, first_trace.prompt_tokens) == (4, 10)
+
+
+def test_running_spans_are_visible(local_tracer, store):
+    seen = {}
+
+    @local_tracer.observe
+    async def agent():
+        seen["running"] = [span.function for span in store.spans(completed=False)]
+        return 1
+
+    asyncio.run(agent())
+
+    assert seen["running"] == ["agent"]
+    assert store.spans(completed=False) == []
+
+
+def test_clear(local_tracer, store):
+    _run_agent(local_tracer)
+    store.clear()
+
+    assert store.trace_ids() == []
+    assert store.totals().spans == 0
@@ -0,0 +1,128 @@
+"""
+Tests that concurrent fan-out inside an observed function keeps parent/child spans
+intact without the class-level fallback of trace_across_async_contexts.
+"""
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from judgeval.common.tracer import (
+    TracedThreadPoolExecutor,
+    set_traced_default_executor,
+    submit_with_context,
+)
+
+FAN_OUT = 8
+
+
+@pytest.fixture
+def assert_fan_out(tracer, spans_by_function):
+    def check(trace_data):
+        assert tracer.trace_across_async_contexts is False
+        spans = spans_by_function(trace_data, grouped=True)
+        (root,) = spans["fan_out"]
+        assert len(spans["child"]) == FAN_OUT
+        assert len(spans["grandchild"]) == FAN_OUT
+        child_ids = {span["span_id"] for span in spans["child"]}
+        assert all(span["parent_span_id"] == root["span_id"] for span in spans["child"])
+        assert {span["parent_span_id"] for span in spans["grandchild"]} == child_ids
+        assert {span["trace_id"] for span in trace_data["trace_spans"]} == {
+            trace_data["trace_id"]
+        }
+
+    return check
+
+
+def _make_workers(tracer, barrier=None):
+    @tracer.observe
+    def grandchild(i):
+        return i
+
+    @tracer.observe
+    def child(i):
+        if barrier is not None:
+            # Keep every child in flight at once to exercise real concurrency
+            barrier.wait(timeout=5)
+        return grandchild(i)
+
+    return child
+
+
+def test_traced_executor_fan_out(tracer, assert_fan_out):
+    child = _make_workers(tracer, threading.Barrier(FAN_OUT))
+
+    @tracer.observe
+    def fan_out():
+        with TracedThreadPoolExecutor(max_workers=FAN_OUT) as executor:
+            return list(executor.map(child, range(FAN_OUT)))
+
+    assert fan_out() == list(range(FAN_OUT))
+    assert_fan_out(tracer.traces[-1])
+
+
+def test_submit_with_context_on_plain_executor(tracer, assert_fan_out):
+    child = _make_workers(tracer, threading.Barrier(FAN_OUT))
+
+    @tracer.observe
+    def fan_out():
+        with ThreadPoolExecutor(max_workers=FAN_OUT) as executor:
+            futures = [submit_with_context(executor, child, i) for i in range(FAN_OUT)]
+            return [future.result() for future in futures]
+
+    assert fan_out() == list(range(FAN_OUT))
+    assert_fan_out(tracer.traces[-1])
+
+
+def test_plain_executor_loses_context(tracer):
+    child = _make_workers(tracer)
+
+    @tracer.observe
+    def fan_out():
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            return list(executor.map(child, range(2)))
+
+    fan_out()
+
+    # Each child started its own disconnected trace
+    assert len(tracer.traces) == 3
+
+
+def test_run_in_executor_with_traced_default_executor(tracer, assert_fan_out):
+    child = _make_workers(tracer)
+
+    @tracer.observe
+    async def fan_out():
+        loop = asyncio.get_running_loop()
+        return await asyncio.gather(
+            *(loop.run_in_executor(None, child, i) for i in range(FAN_OUT))
+        )
+
+    async def main():
+        set_traced_default_executor()
+        return await fan_out()
+
+    assert asyncio.run(main()) == list(range(FAN_OUT))
+    assert_fan_out(tracer.traces[-1])
+
+
+def test_asyncio_tasks_keep_parent_spans(tracer, assert_fan_out):
+    @tracer.observe
+    async def grandchild(i):
+        await asyncio.sleep(0)
+        return i
+
+    @tracer.observe
+    async def child(i):
+        await asyncio.sleep(0.01)
+        return await grandchild(i)
+
+    @tracer.observe
+    async def fan_out():
+        tasks = [asyncio.create_task(child(i)) for i in range(FAN_OUT)]
+        return await asyncio.gather(*tasks)
+
+    assert asyncio.run(fan_out()) == list(range(FAN_OUT))
+    assert_fan_out(tracer.traces[-1])
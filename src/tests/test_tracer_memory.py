@@ -0,0 +1,105 @@
+"""
+Memory regression tests for long-running tracers.
+
+With evict_completed_spans and max_traces set, a tracer must hold on to a bounded
+amount of state no matter how many spans and traces it has produced.
+"""
+
+import logging
+import tracemalloc
+
+import pytest
+
+from judgeval.common.tracer import Tracer
+
+
+@pytest.fixture
+def bounded_tracer(tracer: Tracer) -> Tracer:
+    tracer.evict_completed_spans = True
+    tracer.max_traces = 5
+    tracer.traces = tracer._new_traces_buffer()
+    return tracer
+
+
+def _run_spans(tracer: Tracer, num_spans: int):
+    @tracer.observe
+    def child(i):
+        return i
+
+    with tracer.trace("long-running-agent") as trace:
+        for i in range(num_spans):
+            child(i)
+    return trace
+
+
+def _run_root_traces(tracer: Tracer, num_traces: int):
+    @tracer.observe
+    def handle_request(i):
+        return i
+
+    for i in range(num_traces):
+        handle_request(i)
+
+
+def test_completed_spans_are_evicted(bounded_tracer):
+    @bounded_tracer.observe
+    def child(i):
+        return i
+
+    with bounded_tracer.trace("agent") as trace:
+        for i in range(100):
+            child(i)
+        # Only the still-open root span remains
+        assert len(trace.trace_spans) == 1
+        assert len(trace.span_id_to_span) == 1
+
+    assert trace.trace_spans == []
+    assert trace.span_id_to_span == {}
+    assert trace._span_depths == {}
+
+
+def test_context_bookkeeping_is_cleaned_up(tracer):
+    _run_spans(tracer, 50)
+    _run_root_traces(tracer, 10)
+
+    assert tracer.span_id_to_previous_span_id == {}
+    assert tracer.trace_id_to_previous_trace == {}
+    assert tracer.get_current_trace() is None
+    assert tracer.get_current_span() is None
+
+
+def test_traces_ring_buffer(bounded_tracer):
+    _run_root_traces(bounded_tracer, 20)
+
+    assert len(bounded_tracer.traces) == 5
+
+
+def test_spans_are_kept_by_default(tracer):
+    trace = _run_spans(tracer, 20)
+
+    assert len(trace.trace_spans) == 21
+    assert len(trace.span_id_to_span) == 21
+
+
+def test_memory_does_not_grow_with_span_count(bounded_tracer, caplog):
+    # pytest keeps every captured log record, which would dominate the measurement
+    caplog.set_level(logging.WARNING, logger="judgeval")
+    _run_spans(bounded_tracer, 500)
+    _run_root_traces(bounded_tracer, 50)
+
+    tracemalloc.start()
+    try:
+        baseline, _ = tracemalloc.get_traced_memory()
+        _run_spans(bounded_tracer, 1000)
+        _run_root_traces(bounded_tracer, 100)
+        after_small_run, _ = tracemalloc.get_traced_memory()
+        _run_spans(bounded_tracer, 10000)
+        _run_root_traces(bounded_tracer, 1000)
+        after_large_run, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    small_growth = after_small_run - baseline
+    large_growth = after_large_run - baseline
+    # 10x the work must not retain anything close to 10x the memory
+    assert large_growth < max(2 * small_growth, 512 * 1024)
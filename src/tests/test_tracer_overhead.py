@@ -0,0 +1,130 @@
+"""
+Tests for accounting of judgeval's own overhead and the adaptive capture guard.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from judgeval.common.tracer.overhead import (
+    GUARD_MIN_SAMPLES,
+    PROBE_INTERVAL,
+    OverheadGuard,
+    OverheadHistogram,
+    OverheadStats,
+)
+
+
+def test_overhead_is_not_measured_by_default(tracer, spans_by_function):
+    @tracer.observe
+    def agent():
+        return 1
+
+    agent()
+
+    assert tracer.overhead is None
+    assert spans_by_function(tracer.traces[-1])["agent"]["additional_metadata"] is None
+
+
+def test_overhead_per_span_and_histograms(tracer, spans_by_function):
+    tracer.overhead = OverheadStats()
+
+    @tracer.observe
+    def tool(document):
+        time.sleep(0.01)
+        return document.upper()
+
+    @tracer.observe
+    async def agent():
+        return tool("x" * 100_000)
+
+    asyncio.run(agent())
+
+    spans = spans_by_function(tracer.traces[-1])
+    overhead = spans["tool"]["additional_metadata"]["overhead"]
+    assert set(overhead) == {
+        "span_start",
+        "inputs",
+        "state",
+        "outputs",
+        "total",
+        "runtime",
+    }
+    assert overhead["inputs"] > 0 and overhead["outputs"] > 0
+    assert overhead["total"] == pytest.approx(
+        overhead["span_start"]
+        + overhead["inputs"]
+        + overhead["state"]
+        + overhead["outputs"]
+    )
+    assert overhead["runtime"] >= 0.01
+    assert spans["tool"]["inputs"] == {"document": "x" * 100_000}
+    assert "overhead" in spans["agent"]["additional_metadata"]
+
+    summary = tracer.overhead.summary()
+    assert summary["total"]["count"] == 2
+    assert summary["span_end"]["count"] == 2
+    assert sum(summary["inputs"]["buckets"].values()) == 2
+    assert summary["total"]["max"] >= overhead["total"]
+
+
+def test_histogram_percentiles():
+    histogram = OverheadHistogram()
+    for ns in [1_500] * 90 + [3_000_000] * 10:
+        histogram.record(ns)
+
+    assert histogram.percentile(50) == pytest.approx(2e-6)
+    assert histogram.percentile(99) == pytest.approx(3e-3)
+    assert histogram.summary()["buckets"]["<=5e-06s"] == 0
+
+    histogram.record(5_000_000_000)
+    assert histogram.percentile(100) == pytest.approx(5.0)
+
+
+def test_guard_reduces_capture_of_expensive_functions(tracer, spans_by_function):
+    tracer.overhead = OverheadStats()
+    tracer.overhead_budget = 0.05
+
+    @tracer.observe
+    def cheap(document):
+        return len(document)
+
+    @tracer.observe
+    def agent():
+        time.sleep(0.02)
+        return cheap(list(range(20_000)))
+
+    for _ in range(GUARD_MIN_SAMPLES + 1):
+        agent()
+
+    spans = spans_by_function(tracer.traces[-1])
+    overhead = spans["cheap"]["additional_metadata"]["overhead"]
+    assert overhead["reduced"] is True
+    assert spans["cheap"]["inputs"] is None
+    assert spans["cheap"]["output"] is None
+    # agent spends its time sleeping, so it stays within budget
+    assert "reduced" not in spans["agent"]["additional_metadata"]["overhead"]
+
+
+def test_guard_probes_and_restores_full_capture():
+    guard = OverheadGuard("tool")
+    for _ in range(GUARD_MIN_SAMPLES):
+        guard.record(100, 1_000, budget=0.05)
+    assert guard.reduced
+
+    captured = [guard.full_capture() for _ in range(PROBE_INTERVAL * 2)]
+    assert captured.count(True) == 2
+
+    # Slow calls bring the moving average back within budget
+    for _ in range(50):
+        guard.record(100, 1_000_000, budget=0.05)
+    assert not guard.reduced
+    assert guard.full_capture()
+
+
+def test_guard_without_budget_never_reduces():
+    guard = OverheadGuard("tool")
+    for _ in range(GUARD_MIN_SAMPLES * 2):
+        guard.record(1_000, 1, budget=None)
+    assert not guard.reduced